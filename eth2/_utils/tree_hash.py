@@ -0,0 +1,218 @@
+"""Incremental SSZ tree hashing.
+
+``ssz.hash_tree_root`` rehashes every element of every list of a container, every time. The caches
+in this module keep the Merkle trees of the lists of a container between two calls, and only rehash
+the elements, and the branches above them, which changed in between. Their roots are identical to
+the ones of ``ssz.hash_tree_root``.
+"""
+from typing import (
+    AbstractSet,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+)
+
+from eth_typing import (
+    Hash32,
+)
+
+import ssz
+from ssz.constants import (
+    SSZ_CHUNK_SIZE,
+)
+from ssz.sedes import (
+    List as ListSedes,
+)
+
+from eth2.beacon._utils.hash import (
+    hash_eth2,
+)
+
+
+ZERO_CHUNK = b'\x00' * SSZ_CHUNK_SIZE
+
+# For a list field, the value it had when it was last hashed, and the indices of the items which
+# may have been replaced since
+DirtyIndices = Tuple[Sequence[Any], AbstractSet[int]]
+
+
+class ListTreeHashCache:
+    """
+    Merkle tree of the last value hashed with a ``ssz.sedes.List``.
+
+    The tree is stored as a list of layers, from the chunks to the root, without the zero chunks
+    padding the layers of odd length.
+    """
+    def __init__(self, sedes: ListSedes) -> None:
+        self.sedes = sedes
+        self.value: Sequence[Any] = None
+        self.root: Hash32 = None
+        self._layers: List[List[bytes]] = []
+        self._items_per_chunk = 1
+
+    def hash_tree_root(self,
+                       value: Sequence[Any],
+                       base_value: Sequence[Any]=None,
+                       dirty_indices: Iterable[int]=()) -> Hash32:
+        """
+        Return the tree hash root of ``value``.
+
+        If ``base_value`` is the last value hashed with this cache, ``value`` must only differ from
+        it at ``dirty_indices``, and at the indices beyond the end of the shortest of the two.
+        Otherwise, ``value`` is compared to the last value hashed, item by item.
+        """
+        if value is self.value:
+            return self.root
+
+        if self.value is None or len(self.value) == 0 or len(value) == 0:
+            self._rebuild(value)
+        else:
+            if base_value is not self.value:
+                dirty_indices = self._diff(value)
+            self._update(value, set(dirty_indices))
+
+        self.value = value
+        self.root = hash_eth2(self._layers[-1][0] + len(value).to_bytes(32, 'little'))
+        return self.root
+
+    def _diff(self, value: Sequence[Any]) -> Set[int]:
+        previous_value = self.value
+        return set(
+            index
+            for index, (item, previous_item) in enumerate(zip(value, previous_value))
+            if item is not previous_item and item != previous_item
+        )
+
+    def _rebuild(self, value: Sequence[Any]) -> None:
+        if len(value) == 0:
+            self._layers = [[ZERO_CHUNK]]
+            return
+
+        item_hash_size = len(self.sedes.element_sedes.intermediate_tree_hash(value[0]))
+        if item_hash_size < SSZ_CHUNK_SIZE:
+            self._items_per_chunk = SSZ_CHUNK_SIZE // item_hash_size
+        else:
+            self._items_per_chunk = 1
+        self._layers = [[]]
+        self.value = ()
+        self._update(value, set())
+
+    def _get_chunk(self, value: Sequence[Any], chunk_index: int) -> bytes:
+        element_sedes = self.sedes.element_sedes
+        if self._items_per_chunk == 1:
+            return element_sedes.intermediate_tree_hash(value[chunk_index])
+
+        start = chunk_index * self._items_per_chunk
+        return b''.join(
+            element_sedes.intermediate_tree_hash(item)
+            for item in value[start:start + self._items_per_chunk]
+        ).ljust(SSZ_CHUNK_SIZE, b'\x00')
+
+    def _update(self, value: Sequence[Any], dirty_indices: Set[int]) -> None:
+        layers = self._layers
+        previous_length = len(self.value)
+
+        chunks = layers[0]
+        num_chunks = (len(value) + self._items_per_chunk - 1) // self._items_per_chunk
+        dirty_nodes = set(index // self._items_per_chunk for index in dirty_indices)
+        if len(value) != previous_length:
+            # The last chunk may be partially filled, and the following ones are new
+            dirty_nodes.update(range(
+                min(previous_length, len(value)) // self._items_per_chunk,
+                num_chunks,
+            ))
+        resized = _resize_layer(chunks, num_chunks)
+        for chunk_index in dirty_nodes:
+            chunks[chunk_index] = self._get_chunk(value, chunk_index)
+
+        depth = 0
+        while len(layers[depth]) > 1:
+            children = layers[depth]
+            if depth + 1 == len(layers):
+                layers.append([])
+            parents = layers[depth + 1]
+            num_parents = (len(children) + 1) // 2
+            previous_num_parents = len(parents)
+
+            dirty_parents = set(index // 2 for index in dirty_nodes)
+            if resized:
+                # The last parent may have gained or lost its right child
+                dirty_parents.add(num_parents - 1)
+            if num_parents > previous_num_parents:
+                dirty_parents.update(range(previous_num_parents, num_parents))
+            resized = _resize_layer(parents, num_parents)
+
+            for index in dirty_parents:
+                right_index = 2 * index + 1
+                right_child = children[right_index] if right_index < len(children) else ZERO_CHUNK
+                parents[index] = hash_eth2(children[2 * index] + right_child)
+
+            dirty_nodes = dirty_parents
+            depth += 1
+
+        del layers[depth + 1:]
+
+
+def _resize_layer(layer: List[bytes], length: int) -> bool:
+    if len(layer) == length:
+        return False
+    elif len(layer) > length:
+        del layer[length:]
+    else:
+        layer.extend([ZERO_CHUNK] * (length - len(layer)))
+    return True
+
+
+class ContainerTreeHashCache:
+    """
+    Field hashes, and Merkle trees of the list fields, of the last value hashed with a
+    ``ssz.Serializable`` class.
+    """
+    def __init__(self, sedes: Type[ssz.Serializable]) -> None:
+        self.fields = sedes._meta.fields
+        self._values: Dict[str, Any] = {}
+        self._field_hashes: Dict[str, Hash32] = {}
+        self._list_caches = {
+            field_name: ListTreeHashCache(field_sedes)
+            for field_name, field_sedes in self.fields
+            if isinstance(field_sedes, ListSedes) and not field_sedes.empty
+        }
+
+    def hash_tree_root(self,
+                       value: ssz.Serializable,
+                       dirty_indices: Mapping[str, DirtyIndices]=None) -> Hash32:
+        """
+        Return the tree hash root of ``value``.
+
+        ``dirty_indices`` may map the names of list fields to their value when they were last
+        hashed, and the indices of the items which were replaced since. The other fields are
+        compared to their value when they were last hashed.
+        """
+        if dirty_indices is None:
+            dirty_indices = {}
+
+        field_hashes = []
+        for field_name, field_sedes in self.fields:
+            field_value = getattr(value, field_name)
+            if field_name in self._list_caches:
+                base_value, indices = dirty_indices.get(field_name, (None, ()))
+                field_hash = self._list_caches[field_name].hash_tree_root(
+                    field_value,
+                    base_value,
+                    indices,
+                )
+            elif field_name in self._values and self._values[field_name] == field_value:
+                field_hash = self._field_hashes[field_name]
+            else:
+                field_hash = field_sedes.intermediate_tree_hash(field_value)
+                self._values[field_name] = field_value
+                self._field_hashes[field_name] = field_hash
+            field_hashes.append(field_hash)
+
+        return hash_eth2(b''.join(field_hashes))
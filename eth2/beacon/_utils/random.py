@@ -1,4 +1,5 @@
 
+import functools
 from typing import (
     Iterable,
     Sequence,
@@ -13,26 +14,45 @@ from eth_utils import (
     to_tuple,
     ValidationError,
 )
+import numpy as np
 
 from eth2.beacon._utils.hash import (
     hash_eth2,
 )
 from eth2.beacon.constants import (
-    POWER_OF_TWO_NUMBERS,
     MAX_LIST_SIZE,
 )
 
 
 TItem = TypeVar('TItem')
 
+# Number of permutations kept by ``get_permutation``. A permutation of ``n`` indices takes
+# ``8 * n`` bytes.
+PERMUTATION_CACHE_SIZE = 16
 
-def get_permuted_index(index: int,
-                       list_size: int,
-                       seed: Hash32,
-                       shuffle_round_count: int) -> int:
+
+def _validate_list_size(list_size: int) -> None:
+    if list_size > MAX_LIST_SIZE:
+        raise ValidationError(
+            f"The given `list_size` ({list_size}) should be equal to or less than "
+            f"`MAX_LIST_SIZE` ({MAX_LIST_SIZE}"
+        )
+
+
+def _get_pivot(seed: Hash32, round: int, list_size: int) -> int:
+    return int.from_bytes(
+        hash_eth2(seed + round.to_bytes(1, 'little'))[0:8],
+        'little',
+    ) % list_size
+
+
+def compute_permuted_index(index: int,
+                           list_size: int,
+                           seed: Hash32,
+                           shuffle_round_count: int) -> int:
     """
     Return `p(index)` in a pseudorandom permutation `p` of `0...list_size-1`
-    with ``seed`` as entropy.
+    with ``seed`` as entropy, without computing the rest of the permutation.
 
     Utilizes 'swap or not' shuffling found in
     https://link.springer.com/content/pdf/10.1007%2F978-3-642-32009-5_1.pdf
@@ -42,19 +62,11 @@ def get_permuted_index(index: int,
         raise ValidationError(
             f"The given `index` ({index}) should be less than `list_size` ({list_size}"
         )
-
-    if list_size > MAX_LIST_SIZE:
-        raise ValidationError(
-            f"The given `list_size` ({list_size}) should be equal to or less than "
-            f"`MAX_LIST_SIZE` ({MAX_LIST_SIZE}"
-        )
+    _validate_list_size(list_size)
 
     new_index = index
     for round in range(shuffle_round_count):
-        pivot = int.from_bytes(
-            hash_eth2(seed + round.to_bytes(1, 'little'))[0:8],
-            'little',
-        ) % list_size
+        pivot = _get_pivot(seed, round, list_size)
 
         flip = (pivot - new_index) % list_size
         hash_pos = max(new_index, flip)
@@ -66,6 +78,74 @@ def get_permuted_index(index: int,
     return new_index
 
 
+def compute_permutation(list_size: int,
+                        seed: Hash32,
+                        shuffle_round_count: int) -> np.ndarray:
+    """
+    Return the array ``p`` of all the ``p(index)`` in the pseudorandom permutation ``p`` of
+    `0...list_size-1` with ``seed`` as entropy.
+
+    Each round of the 'swap or not' shuffle is applied to all the indices at once, with the
+    hashes of the round computed only once.
+    """
+    _validate_list_size(list_size)
+
+    indices = np.arange(list_size, dtype=np.int64)
+    if list_size == 0:
+        return indices
+
+    for round in range(shuffle_round_count):
+        round_bytes = round.to_bytes(1, 'little')
+        hash_bytes = np.frombuffer(
+            b''.join(
+                hash_eth2(seed + round_bytes + i.to_bytes(4, 'little'))
+                for i in range((list_size + 255) // 256)
+            ),
+            dtype=np.uint8,
+        )
+        pivot = _get_pivot(seed, round, list_size)
+
+        flips = (pivot - indices) % list_size
+        hash_positions = np.maximum(indices, flips)
+        bits = (hash_bytes[hash_positions >> 3] >> (hash_positions & 7)) & 1
+        indices = np.where(bits == 1, flips, indices)
+
+    return indices
+
+
+@functools.lru_cache(maxsize=PERMUTATION_CACHE_SIZE)
+def get_permutation(list_size: int,
+                    seed: Hash32,
+                    shuffle_round_count: int) -> np.ndarray:
+    """
+    Return the (read-only) result of ``compute_permutation``, cached by
+    ``(list_size, seed, shuffle_round_count)`` so that it is computed only once for all the
+    committees, proposers and epochs sharing the same shuffling.
+    """
+    permutation = compute_permutation(list_size, seed, shuffle_round_count)
+    permutation.flags.writeable = False
+    return permutation
+
+
+def get_permuted_index(index: int,
+                       list_size: int,
+                       seed: Hash32,
+                       shuffle_round_count: int) -> int:
+    """
+    Return `p(index)` in a pseudorandom permutation `p` of `0...list_size-1`
+    with ``seed`` as entropy.
+
+    The whole permutation is computed, and cached, on the first call for a given
+    ``(list_size, seed, shuffle_round_count)``, subsequent calls only look it up.
+    """
+    if index >= list_size:
+        raise ValidationError(
+            f"The given `index` ({index}) should be less than `list_size` ({list_size}"
+        )
+
+    return int(get_permutation(list_size, seed, shuffle_round_count)[index])
+
+
 @to_tuple
 def shuffle(values: Sequence[TItem],
             seed: Hash32,
@@ -78,39 +158,9 @@ def shuffle(values: Sequence[TItem],
     https://link.springer.com/content/pdf/10.1007%2F978-3-642-32009-5_1.pdf
     See the 'generalized domain' algorithm on page 3.
     """
-    list_size = len(values)
-
-    if list_size > MAX_LIST_SIZE:
-        raise ValidationError(
-            f"The `list_size` ({list_size}) should be equal to or less than "
-            f"`MAX_LIST_SIZE` ({MAX_LIST_SIZE}"
-        )
-
-    indices = list(range(list_size))
-    for round in range(shuffle_round_count):
-        hash_bytes = b''.join(
-            [
-                hash_eth2(seed + round.to_bytes(1, 'little') + i.to_bytes(4, 'little'))
-                for i in range((list_size + 255) // 256)
-            ]
-        )
+    permutation = get_permutation(len(values), seed, shuffle_round_count)
 
-        pivot = int.from_bytes(
-            hash_eth2(seed + round.to_bytes(1, 'little'))[:8],
-            'little',
-        ) % list_size
-        for i in range(list_size):
-            flip = (pivot - indices[i]) % list_size
-            hash_position = indices[i] if indices[i] > flip else flip
-            byte = hash_bytes[hash_position // 8]
-            mask = POWER_OF_TWO_NUMBERS[hash_position % 8]
-            if byte & mask:
-                indices[i] = flip
-            else:
-                # not swap
-                pass
-
-    for i in indices:
+    for i in permutation.tolist():
         yield values[i]
 
 
@@ -1,9 +1,13 @@
-import functools
 from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
     Iterable,
     Sequence,
     Tuple,
     TYPE_CHECKING,
+    TypeVar,
 )
 
 from eth_utils import (
@@ -14,6 +18,7 @@ from eth_utils import (
 from eth_typing import (
     Hash32,
 )
+from lru import LRU
 
 from eth2._utils.bitfield import (
     has_voted,
@@ -31,8 +36,12 @@ from eth2.beacon.configs import (
 from eth2.beacon import helpers
 from eth2.beacon.helpers import (
     get_active_validator_indices,
+    get_epoch_start_slot,
     slot_to_epoch,
 )
+from eth2.beacon.datastructures.committee_position import (
+    CommitteePosition,
+)
 from eth2.beacon.datastructures.shuffling_context import (
     ShufflingContext,
 )
@@ -55,6 +64,60 @@ if TYPE_CHECKING:
     from eth2.beacon.types.validator_records import ValidatorRecord  # noqa: F401
 
 
+TValue = TypeVar('TValue')
+
+# Number of entries kept in each of the caches below
+ACTIVE_VALIDATOR_INDICES_CACHE_SIZE = 16
+SHUFFLING_CACHE_SIZE = 8
+EPOCH_COMMITTEES_CACHE_SIZE = 8
+
+
+class RegistryCache:
+    """
+    LRU cache of values derived from a validator registry.
+
+    Entries are keyed on the identity of the registry. ``BeaconState.copy`` shares the registry
+    between states unless it is replaced, so an entry survives balance updates and new slots, but
+    never outlives a change to the registry. The cache holds a reference to the registries of its
+    entries, so their identity can't be reused by another registry.
+    """
+    def __init__(self, size: int) -> None:
+        self._entries: LRU[Hashable, Tuple[Sequence['ValidatorRecord'], Any]] = LRU(size)
+
+    def get(self,
+            validators: Sequence['ValidatorRecord'],
+            key: Hashable,
+            compute: Callable[[], TValue]) -> TValue:
+        cache_key = (id(validators), key)
+        try:
+            cached_validators, value = self._entries[cache_key]
+        except KeyError:
+            pass
+        else:
+            if cached_validators is validators:
+                return value
+
+        value = compute()
+        self._entries[cache_key] = (validators, value)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_active_validator_indices_cache = RegistryCache(ACTIVE_VALIDATOR_INDICES_CACHE_SIZE)
+_shuffling_cache = RegistryCache(SHUFFLING_CACHE_SIZE)
+
+
+def _get_active_validator_indices(validators: Sequence['ValidatorRecord'],
+                                  epoch: Epoch) -> Tuple[ValidatorIndex, ...]:
+    return _active_validator_indices_cache.get(
+        validators,
+        epoch,
+        lambda: get_active_validator_indices(validators, epoch),
+    )
+
+
 def get_epoch_committee_count(
         active_validator_count: int,
         shard_count: int,
@@ -69,13 +132,40 @@ def get_epoch_committee_count(
     ) * slots_per_epoch
 
 
-@functools.lru_cache(maxsize=128)
 def get_shuffling(*,
                   seed: Hash32,
                   validators: Sequence['ValidatorRecord'],
                   epoch: Epoch,
                   committee_config: CommitteeConfig) -> Tuple[Iterable[ValidatorIndex], ...]:
     """
+    Return the result of ``compute_shuffling``, cached for as long as ``validators`` is not
+    replaced.
+    """
+    return _shuffling_cache.get(
+        validators,
+        (
+            seed,
+            epoch,
+            committee_config.SLOTS_PER_EPOCH,
+            committee_config.TARGET_COMMITTEE_SIZE,
+            committee_config.SHARD_COUNT,
+            committee_config.SHUFFLE_ROUND_COUNT,
+        ),
+        lambda: compute_shuffling(
+            seed=seed,
+            validators=validators,
+            epoch=epoch,
+            committee_config=committee_config,
+        ),
+    )
+
+
+def compute_shuffling(*,
+                      seed: Hash32,
+                      validators: Sequence['ValidatorRecord'],
+                      epoch: Epoch,
+                      committee_config: CommitteeConfig) -> Tuple[Iterable[ValidatorIndex], ...]:
+    """
     Shuffle ``validators`` into crosslink committees seeded by ``seed`` and ``epoch``.
     Return a list of ``committee_per_epoch`` committees where each
     committee is itself a list of validator indices.
@@ -91,7 +181,7 @@ def get_shuffling(*,
     shard_count = committee_config.SHARD_COUNT
     shuffle_round_count = committee_config.SHUFFLE_ROUND_COUNT
 
-    active_validator_indices = get_active_validator_indices(validators, epoch)
+    active_validator_indices = _get_active_validator_indices(validators, epoch)
 
     committees_per_epoch = get_epoch_committee_count(
         len(active_validator_indices),
@@ -121,7 +211,7 @@ def get_previous_epoch_committee_count(
         shard_count: int,
         slots_per_epoch: int,
         target_committee_size: int) -> int:
-    previous_active_validators = get_active_validator_indices(
+    previous_active_validators = _get_active_validator_indices(
         state.validator_registry,
         state.previous_shuffling_epoch,
     )
@@ -138,7 +228,7 @@ def get_current_epoch_committee_count(
         shard_count: int,
         slots_per_epoch: int,
         target_committee_size: int) -> int:
-    current_active_validators = get_active_validator_indices(
+    current_active_validators = _get_active_validator_indices(
         state.validator_registry,
         state.current_shuffling_epoch,
     )
@@ -155,7 +245,7 @@ def get_next_epoch_committee_count(
         shard_count: int,
         slots_per_epoch: int,
         target_committee_size: int) -> int:
-    next_active_validators = get_active_validator_indices(
+    next_active_validators = _get_active_validator_indices(
         state.validator_registry,
         state.current_shuffling_epoch + 1,
     )
@@ -279,32 +369,25 @@ def _get_shuffling_contextis_next_epoch_no_registry_change_no_reseed(
     )
 
 
-@functools.lru_cache(maxsize=128)
-@to_tuple
-def get_crosslink_committees_at_slot(
-        state: 'BeaconState',
-        slot: Slot,
-        committee_config: CommitteeConfig,
-        registry_change: bool=False) -> Iterable[Tuple[Iterable[ValidatorIndex], Shard]]:
-    """
-    Return the list of ``(committee, shard)`` tuples for the ``slot``.
-    """
-    genesis_epoch = committee_config.GENESIS_EPOCH
-    shard_count = committee_config.SHARD_COUNT
-    slots_per_epoch = committee_config.SLOTS_PER_EPOCH
-
-    epoch = slot_to_epoch(slot, slots_per_epoch)
-    current_epoch = state.current_epoch(slots_per_epoch)
-    previous_epoch = state.previous_epoch(slots_per_epoch, genesis_epoch)
-    next_epoch = state.next_epoch(slots_per_epoch)
+def _get_shuffling_context(state: 'BeaconState',
+                           epoch: Epoch,
+                           committee_config: CommitteeConfig,
+                           registry_change: bool) -> ShufflingContext:
+    current_epoch = state.current_epoch(committee_config.SLOTS_PER_EPOCH)
+    previous_epoch = state.previous_epoch(
+        committee_config.SLOTS_PER_EPOCH,
+        committee_config.GENESIS_EPOCH,
+    )
+    next_epoch = state.next_epoch(committee_config.SLOTS_PER_EPOCH)
 
     validate_epoch_within_previous_and_next(epoch, previous_epoch, next_epoch)
 
     if epoch == current_epoch:
-        shuffling_context = _get_shuffling_context_is_current_epoch(state, committee_config)
+        return _get_shuffling_context_is_current_epoch(state, committee_config)
     elif epoch == previous_epoch:
-        shuffling_context = _get_shuffling_context_is_previous_epoch(state, committee_config)
-    elif epoch == next_epoch:
+        return _get_shuffling_context_is_previous_epoch(state, committee_config)
+    else:
+        # epoch == next_epoch
         epochs_since_last_registry_update = current_epoch - state.validator_registry_update_epoch
         should_reseed = (
             epochs_since_last_registry_update > 1 and
@@ -312,42 +395,125 @@ def get_crosslink_committees_at_slot(
         )
 
         if registry_change:
-            shuffling_context = _get_shuffling_contextis_next_epoch_registry_change(
+            return _get_shuffling_contextis_next_epoch_registry_change(
                 state,
                 next_epoch,
                 committee_config,
             )
         elif should_reseed:
-            shuffling_context = _get_shuffling_contextis_next_epoch_should_reseed(
+            return _get_shuffling_contextis_next_epoch_should_reseed(
                 state,
                 next_epoch,
                 committee_config,
             )
         else:
-            shuffling_context = _get_shuffling_contextis_next_epoch_no_registry_change_no_reseed(
+            return _get_shuffling_contextis_next_epoch_no_registry_change_no_reseed(
                 state,
                 committee_config,
             )
 
-    shuffling = get_shuffling(
-        seed=shuffling_context.seed,
-        validators=state.validator_registry,
-        epoch=shuffling_context.shuffling_epoch,
-        committee_config=committee_config,
-    )
-    offset = slot % slots_per_epoch
-    committees_per_slot = shuffling_context.committees_per_epoch // slots_per_epoch
-    slot_start_shard = (
-        shuffling_context.shuffling_start_shard +
-        committees_per_slot * offset
-    ) % shard_count
-
-    for index in range(committees_per_slot):
-        committee = shuffling[committees_per_slot * offset + index]
-        yield (
-            committee,
-            Shard((slot_start_shard + index) % shard_count),
+
+class EpochCommittees:
+    """
+    The crosslink committees of all the slots of an epoch, with a reverse index from each
+    validator to its position in the committees.
+    """
+    def __init__(self,
+                 epoch: Epoch,
+                 shuffling: Sequence[Sequence[ValidatorIndex]],
+                 shuffling_context: ShufflingContext,
+                 committee_config: CommitteeConfig) -> None:
+        slots_per_epoch = committee_config.SLOTS_PER_EPOCH
+        shard_count = committee_config.SHARD_COUNT
+        committees_per_slot = shuffling_context.committees_per_epoch // slots_per_epoch
+
+        self.committees_at_slot: Dict[
+            Slot,
+            Tuple[Tuple[Sequence[ValidatorIndex], Shard], ...]
+        ] = {}
+        self.committees: Dict[Tuple[Slot, Shard], Sequence[ValidatorIndex]] = {}
+        self.committee_positions: Dict[ValidatorIndex, CommitteePosition] = {}
+
+        epoch_start_slot = get_epoch_start_slot(epoch, slots_per_epoch)
+        for slot in range(epoch_start_slot, epoch_start_slot + slots_per_epoch):
+            offset = slot % slots_per_epoch
+            first_committee_index = committees_per_slot * offset
+            slot_start_shard = (
+                shuffling_context.shuffling_start_shard + first_committee_index
+            ) % shard_count
+
+            committees_at_slot = tuple(
+                (
+                    shuffling[first_committee_index + index],
+                    Shard((slot_start_shard + index) % shard_count),
+                )
+                for index in range(committees_per_slot)
+            )
+            self.committees_at_slot[Slot(slot)] = committees_at_slot
+
+            for committee, shard in committees_at_slot:
+                self.committees[Slot(slot), shard] = committee
+                for position, validator_index in enumerate(committee):
+                    if validator_index not in self.committee_positions:
+                        self.committee_positions[validator_index] = CommitteePosition(
+                            Slot(slot),
+                            shard,
+                            position,
+                        )
+
+
+_epoch_committees_cache = RegistryCache(EPOCH_COMMITTEES_CACHE_SIZE)
+
+
+def get_epoch_committees(state: 'BeaconState',
+                         epoch: Epoch,
+                         committee_config: CommitteeConfig,
+                         registry_change: bool=False) -> EpochCommittees:
+    """
+    Return the ``EpochCommittees`` of the ``epoch``.
+
+    They are cached by shuffling (seed, shuffling epoch and start shard, committee count) and
+    ``epoch``, for as long as the validator registry of ``state`` is not replaced.
+    """
+    shuffling_context = _get_shuffling_context(state, epoch, committee_config, registry_change)
+
+    def compute() -> EpochCommittees:
+        shuffling = tuple(
+            tuple(committee)
+            for committee in get_shuffling(
+                seed=shuffling_context.seed,
+                validators=state.validator_registry,
+                epoch=shuffling_context.shuffling_epoch,
+                committee_config=committee_config,
+            )
         )
+        return EpochCommittees(epoch, shuffling, shuffling_context, committee_config)
+
+    return _epoch_committees_cache.get(
+        state.validator_registry,
+        (
+            epoch,
+            shuffling_context,
+            committee_config.SLOTS_PER_EPOCH,
+            committee_config.SHARD_COUNT,
+            committee_config.TARGET_COMMITTEE_SIZE,
+            committee_config.SHUFFLE_ROUND_COUNT,
+        ),
+        compute,
+    )
+
+
+def get_crosslink_committees_at_slot(
+        state: 'BeaconState',
+        slot: Slot,
+        committee_config: CommitteeConfig,
+        registry_change: bool=False) -> Tuple[Tuple[Sequence[ValidatorIndex], Shard], ...]:
+    """
+    Return the list of ``(committee, shard)`` tuples for the ``slot``.
+    """
+    epoch = slot_to_epoch(slot, committee_config.SLOTS_PER_EPOCH)
+    epoch_committees = get_epoch_committees(state, epoch, committee_config, registry_change)
+    return epoch_committees.committees_at_slot[slot]
 
 
 def get_beacon_proposer_index(state: 'BeaconState',
@@ -387,11 +553,10 @@ def get_beacon_proposer_index(state: 'BeaconState',
     return first_committee[epoch % len(first_committee)]
 
 
-@to_tuple
 def get_crosslink_committee_for_attestation(
         state: 'BeaconState',
         attestation_data: 'AttestationData',
-        committee_config: CommitteeConfig) -> Iterable[ValidatorIndex]:
+        committee_config: CommitteeConfig) -> Sequence[ValidatorIndex]:
     """
     Return the specific crosslink committee concerning the given ``attestation_data``.
     In particular, the (slot, shard) coordinate in the ``attestation_data`` selects one committee
@@ -400,20 +565,11 @@ def get_crosslink_committee_for_attestation(
     Raise `ValidationError` in the case that this attestation references a shard that
     is not covered in the specified slot.
     """
-    crosslink_committees = get_crosslink_committees_at_slot(
-        state=state,
-        slot=attestation_data.slot,
-        committee_config=committee_config,
-    )
-
+    epoch = slot_to_epoch(attestation_data.slot, committee_config.SLOTS_PER_EPOCH)
+    epoch_committees = get_epoch_committees(state, epoch, committee_config)
     try:
-        return next(
-            committee for (
-                committee,
-                shard,
-            ) in crosslink_committees if shard == attestation_data.shard
-        )
-    except StopIteration:
+        return epoch_committees.committees[attestation_data.slot, attestation_data.shard]
+    except KeyError:
         raise ValidationError(
             "attestation_data.shard ({}) is not in crosslink_committees".format(
                 attestation_data.shard,
@@ -0,0 +1,18 @@
+from typing import (
+    NamedTuple,
+)
+
+from eth2.beacon.typing import (
+    Shard,
+    Slot,
+)
+
+
+class CommitteePosition(NamedTuple):
+    """
+    Where a validator sits in the crosslink committees of an epoch.
+    """
+    slot: Slot
+    shard: Shard
+    # Index of the validator in its committee
+    position: int
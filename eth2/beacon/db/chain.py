@@ -13,6 +13,11 @@ from cytoolz import (
 )
 
 import ssz
+from ssz.sedes import (
+    bytes32,
+    Container,
+    uint64,
+)
 from eth_typing import (
     Hash32,
 )
@@ -86,6 +91,12 @@ class BaseBeaconChainDB(ABC):
     def get_canonical_block_root_by_slot(self, slot: int) -> Hash32:
         pass
 
+    @abstractmethod
+    def get_encoded_canonical_block_range(self,
+                                          start_slot: Slot,
+                                          max_blocks: int) -> Tuple[bytes, ...]:
+        pass
+
     @abstractmethod
     def get_canonical_head(self, block_class: Type[BaseBeaconBlock]) -> BaseBeaconBlock:
         pass
@@ -248,6 +259,58 @@ class BeaconChainDB(BaseBeaconChainDB):
         validate_slot(slot)
         return cls._get_canonical_block_root(db, slot)
 
+    def get_encoded_canonical_block_range(self,
+                                          start_slot: Slot,
+                                          max_blocks: int) -> Tuple[bytes, ...]:
+        """
+        Return the SSZ encodings of up to ``max_blocks`` canonical blocks, at consecutive slots
+        starting with ``start_slot``, without decoding them.
+
+        The range stops at the first slot without a canonical block, and at the canonical head.
+        """
+        return self._get_encoded_canonical_block_range(self.db, start_slot, max_blocks)
+
+    @classmethod
+    def _get_encoded_canonical_block_range(cls,
+                                           db: BaseDB,
+                                           start_slot: Slot,
+                                           max_blocks: int) -> Tuple[bytes, ...]:
+        validate_slot(start_slot)
+        if max_blocks < 0:
+            raise ValueError("Cannot request a negative number of blocks")
+
+        try:
+            head_slot = cls._get_slot_by_root(db, cls._get_canonical_head_root(db))
+        except (CanonicalHeadNotFound, BlockNotFound):
+            return ()
+        # The slot to root lookups above the canonical head are left over by reorgs to shorter
+        # chains, and do not extend it
+        end_slot = min(start_slot + max_blocks, head_slot + 1)
+
+        block_roots = []
+        for slot in range(start_slot, end_slot):
+            try:
+                block_roots.append(cls._get_canonical_block_root(db, Slot(slot)))
+            except BlockNotFound:
+                break
+        encoded_blocks = tuple(db[block_root] for block_root in block_roots)
+
+        # The lookups are not read from a single snapshot of the database, so the canonical chain
+        # may have changed during the reads. Only keep the blocks which are still canonical, and
+        # which are children of the previous block, so that the range is a connected chain.
+        for index, block_root in enumerate(block_roots):
+            try:
+                canonical_root = cls._get_canonical_block_root(db, Slot(start_slot + index))
+            except BlockNotFound:
+                return encoded_blocks[:index]
+            if canonical_root != block_root:
+                return encoded_blocks[:index]
+            if index > 0:
+                parent_root = _get_parent_root_of_encoded_block(encoded_blocks[index])
+                if parent_root != block_roots[index - 1]:
+                    return encoded_blocks[:index]
+        return encoded_blocks
+
     def get_canonical_head(self, block_class: Type[BaseBeaconBlock]) -> BaseBeaconBlock:
         """
         Return the current block at the head of the chain.
@@ -625,3 +688,14 @@ def _decode_block(block_ssz: bytes, sedes: Type[BaseBeaconBlock]) -> BaseBeaconB
 def _decode_state(state_ssz: bytes) -> BeaconState:
     # TODO: forkable BeaconState fields?
     return ssz.decode(state_ssz, sedes=BeaconState)
+
+
+def _get_parent_root_of_encoded_block(block_ssz: bytes) -> Hash32:
+    """
+    Read the parent root of an SSZ encoded block, without decoding the rest of the block.
+
+    Relies on ``slot`` and ``parent_root`` being the first fields of ``BaseBeaconBlock``.
+    """
+    _, parent_root_index = uint64.deserialize_segment(block_ssz, Container.length_bytes)
+    parent_root, _ = bytes32.deserialize_segment(block_ssz, parent_root_index)
+    return Hash32(parent_root)
@@ -2,15 +2,11 @@ from typing import (
     Any,
     Callable,
     Dict,
-    Iterable,
     Sequence,
     Set,
     Tuple,
 )
 
-from eth_utils import (
-    to_dict,
-)
 from eth_utils.toolz import (
     curry,
     first,
@@ -285,7 +281,7 @@ def process_crosslinks(state: BeaconState, config: BeaconConfig) -> BeaconState:
     for slot in range(previous_epoch_start_slot, next_epoch_start_slot):
         crosslink_committees_at_slot = get_crosslink_committees_at_slot(
             state,
-            slot,
+            Slot(slot),
             CommitteeConfig(config),
         )
         for crosslink_committee, shard in crosslink_committees_at_slot:
@@ -321,18 +317,6 @@ def process_crosslinks(state: BeaconState, config: BeaconConfig) -> BeaconState:
     return state
 
 
-@to_dict
-def _update_rewards_or_penalies(
-        index: ValidatorIndex,
-        amount: Gwei,
-        rewards_or_penalties: Dict[ValidatorIndex, Gwei]) -> Iterable[Tuple[ValidatorIndex, Gwei]]:
-    for i in rewards_or_penalties:
-        if i == index:
-            yield i, Gwei(rewards_or_penalties[i] + amount)
-        else:
-            yield i, rewards_or_penalties[i]
-
-
 def _compute_normal_justification_and_finalization_deltas(
         state: BeaconState,
         config: BeaconConfig,
@@ -364,58 +348,33 @@ def _compute_normal_justification_and_finalization_deltas(
     for index in previous_epoch_active_validator_indices:
         # Expected FFG source
         if index in previous_epoch_attester_indices:
-            rewards_received = _update_rewards_or_penalies(
-                index,
-                base_rewards[index] * previous_epoch_attesting_balance // previous_total_balance,
-                rewards_received,
-            )
+            reward = (
+                base_rewards[index] * previous_epoch_attesting_balance
+            ) // previous_total_balance
+            rewards_received[index] = Gwei(rewards_received[index] + reward)
             # Inclusion speed bonus
-            rewards_received = _update_rewards_or_penalies(
-                index,
-                (
-                    base_rewards[index] * config.MIN_ATTESTATION_INCLUSION_DELAY //
-                    inclusion_infos[index].inclusion_distance
-                ),
-                rewards_received,
-            )
+            reward = (
+                base_rewards[index] * config.MIN_ATTESTATION_INCLUSION_DELAY
+            ) // inclusion_infos[index].inclusion_distance
+            rewards_received[index] = Gwei(rewards_received[index] + reward)
         else:
-            penalties_received = _update_rewards_or_penalies(
-                index,
-                base_rewards[index],
-                penalties_received,
-            )
+            penalties_received[index] = Gwei(penalties_received[index] + base_rewards[index])
         # Expected FFG target
         if index in previous_epoch_boundary_attester_indices:
-            rewards_received = _update_rewards_or_penalies(
-                index,
-                (
-                    base_rewards[index] * previous_epoch_boundary_attesting_balance //
-                    previous_total_balance
-                ),
-                rewards_received,
-            )
+            reward = (
+                base_rewards[index] * previous_epoch_boundary_attesting_balance
+            ) // previous_total_balance
+            rewards_received[index] = Gwei(rewards_received[index] + reward)
         else:
-            penalties_received = _update_rewards_or_penalies(
-                index,
-                base_rewards[index],
-                penalties_received,
-            )
+            penalties_received[index] = Gwei(penalties_received[index] + base_rewards[index])
         # Expected head
         if index in previous_epoch_head_attester_indices:
-            rewards_received = _update_rewards_or_penalies(
-                index,
-                (
-                    base_rewards[index] * previous_epoch_head_attesting_balance //
-                    previous_total_balance
-                ),
-                rewards_received,
-            )
+            reward = (
+                base_rewards[index] * previous_epoch_head_attesting_balance
+            ) // previous_total_balance
+            rewards_received[index] = Gwei(rewards_received[index] + reward)
         else:
-            penalties_received = _update_rewards_or_penalies(
-                index,
-                base_rewards[index],
-                penalties_received,
-            )
+            penalties_received[index] = Gwei(penalties_received[index] + base_rewards[index])
         # Proposer bonus
         if index in previous_epoch_attester_indices:
             proposer_index = get_beacon_proposer_index(
@@ -423,11 +382,8 @@ def _compute_normal_justification_and_finalization_deltas(
                 inclusion_infos[index].inclusion_slot,
                 CommitteeConfig(config),
             )
-            rewards_received = _update_rewards_or_penalies(
-                proposer_index,
-                base_rewards[index] // config.ATTESTATION_INCLUSION_REWARD_QUOTIENT,
-                rewards_received,
-            )
+            reward = base_rewards[index] // config.ATTESTATION_INCLUSION_REWARD_QUOTIENT
+            rewards_received[proposer_index] = Gwei(rewards_received[proposer_index] + reward)
     return (rewards_received, penalties_received)
 
 
@@ -458,39 +414,23 @@ def _compute_inactivity_leak_deltas(
     penalties_received = rewards_received.copy()
     for index in previous_epoch_active_validator_indices:
         if index not in previous_epoch_attester_indices:
-            penalties_received = _update_rewards_or_penalies(
-                index,
-                inactivity_penalties[index],
-                penalties_received,
+            penalties_received[index] = Gwei(
+                penalties_received[index] + inactivity_penalties[index]
             )
         else:
             # If a validator did attest, apply a small penalty
             # for getting attestations included late
-            rewards_received = _update_rewards_or_penalies(
-                index,
-                (
-                    base_rewards[index] // config.MIN_ATTESTATION_INCLUSION_DELAY //
-                    inclusion_infos[index].inclusion_distance
-                ),
-                rewards_received,
-            )
-            penalties_received = _update_rewards_or_penalies(
-                index,
-                base_rewards[index],
-                penalties_received,
-            )
+            reward = (
+                base_rewards[index] // config.MIN_ATTESTATION_INCLUSION_DELAY
+            ) // inclusion_infos[index].inclusion_distance
+            rewards_received[index] = Gwei(rewards_received[index] + reward)
+            penalties_received[index] = Gwei(penalties_received[index] + base_rewards[index])
         if index not in previous_epoch_boundary_attester_indices:
-            penalties_received = _update_rewards_or_penalies(
-                index,
-                inactivity_penalties[index],
-                penalties_received,
+            penalties_received[index] = Gwei(
+                penalties_received[index] + inactivity_penalties[index]
             )
         if index not in previous_epoch_head_attester_indices:
-            penalties_received = _update_rewards_or_penalies(
-                index,
-                base_rewards[index],
-                penalties_received,
-            )
+            penalties_received[index] = Gwei(penalties_received[index] + base_rewards[index])
 
     # Penalize slashed-but-inactive validators as though they were active but offline
     current_epoch = state.current_epoch(config.SLOTS_PER_EPOCH)
@@ -501,10 +441,9 @@ def _compute_inactivity_leak_deltas(
             current_epoch < state.validator_registry[i].withdrawable_epoch
         )
         if eligible:
-            penalties_received = _update_rewards_or_penalies(
-                ValidatorIndex(i),
-                2 * inactivity_penalties[ValidatorIndex(i)] + base_rewards[ValidatorIndex(i)],
-                penalties_received,
+            penalty = 2 * inactivity_penalties[ValidatorIndex(i)] + base_rewards[ValidatorIndex(i)]
+            penalties_received[ValidatorIndex(i)] = Gwei(
+                penalties_received[ValidatorIndex(i)] + penalty
             )
     return (rewards_received, penalties_received)
 
@@ -597,7 +536,7 @@ def _process_rewards_and_penalties_for_crosslinks(
     for slot in range(previous_epoch_start_slot, current_epoch_start_slot):
         crosslink_committees_at_slot = get_crosslink_committees_at_slot(
             state,
-            slot,
+            Slot(slot),
             CommitteeConfig(config),
         )
         for crosslink_committee, shard in crosslink_committees_at_slot:
@@ -617,17 +556,10 @@ def _process_rewards_and_penalties_for_crosslinks(
                 crosslink_committee,
             )
             for index in attesting_validator_indices:
-                rewards_received = _update_rewards_or_penalies(
-                    index,
-                    base_rewards[index] * total_attesting_balance // total_balance,
-                    rewards_received,
-                )
+                reward = base_rewards[index] * total_attesting_balance // total_balance
+                rewards_received[index] = Gwei(rewards_received[index] + reward)
             for index in set(crosslink_committee).difference(attesting_validator_indices):
-                penalties_received = _update_rewards_or_penalies(
-                    index,
-                    base_rewards[index],
-                    penalties_received,
-                )
+                penalties_received[index] = Gwei(penalties_received[index] + base_rewards[index])
     return (rewards_received, penalties_received)
 
 
@@ -703,22 +635,19 @@ def process_rewards_and_penalties(state: BeaconState, config: BeaconConfig) -> B
         base_rewards,
     )
 
-    # Apply the overall rewards/penalties
-    for index in range(len(state.validator_registry)):
-        state = state.update_validator_balance(
-            ValidatorIndex(index),
-            # Prevent validator balance under flow
-            max(
-                (
-                    state.validator_balances[index] +
-                    finality_rewards[index] +
-                    crosslinks_rewards[index] -
-                    finality_penalties[index] -
-                    crosslinks_penalties[index]
-                ),
-                0,
-            ),
+    # Apply the overall rewards/penalties, in a single pass over the balances.
+    # `apply_validator_balance_deltas` prevents validator balance under flow.
+    state = state.apply_validator_balance_deltas(
+        tuple(
+            (
+                finality_rewards[index] +
+                crosslinks_rewards[index] -
+                finality_penalties[index] -
+                crosslinks_penalties[index]
+            )
+            for index in range(len(state.validator_registry))
         )
+    )
 
     return state
 
@@ -1110,6 +1039,7 @@ def process_slashings(state: BeaconState,
         current_epoch,
     )
 
+    penalized_balances: Dict[ValidatorIndex, Gwei] = {}
     for validator_index, validator in enumerate(state.validator_registry):
         validator_index = ValidatorIndex(validator_index)
         is_halfway_to_withdrawable_epoch = (
@@ -1123,11 +1053,10 @@ def process_slashings(state: BeaconState,
                 total_penalties=total_penalties,
                 total_balance=total_balance,
             )
-            state = state.update_validator_balance(
-                validator_index=validator_index,
-                balance=state.validator_balances[validator_index] - penalty,
+            penalized_balances[validator_index] = Gwei(
+                state.validator_balances[validator_index] - penalty
             )
-    return state
+    return state.update_validator_balances(penalized_balances)
 
 
 def process_exit_queue(state: BeaconState,
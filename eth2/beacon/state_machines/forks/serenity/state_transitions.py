@@ -25,7 +25,6 @@ from .epoch_processing import (
     process_crosslinks,
     process_ejections,
     process_final_updates,
-    process_rewards_and_penalties,
     process_validator_registry,
 )
 from .operation_processing import (
@@ -37,6 +36,9 @@ from .operation_processing import (
 from .slot_processing import (
     process_slot_transition,
 )
+from .vectorized_epoch_processing import (
+    process_rewards_and_penalties,
+)
 
 
 class SerenityStateTransition(BaseStateTransition):
@@ -0,0 +1,505 @@
+"""
+A NumPy implementation of the Serenity rewards and penalties processing.
+
+The per-validator quantities (balances, effective balances, epochs, attester masks, base rewards)
+are held in arrays, and all the rewards and penalties are computed with array operations instead
+of looping over validator indices.
+
+The results are bit-identical to the ones of the pure-Python functions in
+:mod:`eth2.beacon.state_machines.forks.serenity.epoch_processing`, which remain the reference
+implementation.
+"""
+from typing import (
+    Dict,
+    Iterable,
+    NamedTuple,
+    Tuple,
+)
+
+import numpy as np
+
+from eth2._utils.numeric import (
+    integer_squareroot,
+)
+from eth2.beacon.committee_helpers import (
+    get_attester_indices_from_attestations,
+    get_beacon_proposer_index,
+    get_crosslink_committees_at_slot,
+)
+from eth2.beacon.configs import (
+    BeaconConfig,
+    CommitteeConfig,
+)
+from eth2.beacon.epoch_processing_helpers import (
+    get_inclusion_infos,
+    get_previous_epoch_boundary_attestations,
+    get_previous_epoch_matching_head_attestations,
+    get_winning_root_and_participants,
+)
+from eth2.beacon.helpers import (
+    get_epoch_start_slot,
+)
+from eth2.beacon.datastructures.inclusion_info import InclusionInfo
+from eth2.beacon.types.states import BeaconState
+from eth2.beacon.typing import (
+    Epoch,
+    Gwei,
+    Slot,
+    ValidatorIndex,
+)
+
+
+# Largest value which fits in the arrays used for balances and rewards
+MAX_INT64 = 2 ** 63 - 1
+
+
+class ValidatorArrays(NamedTuple):
+    """
+    The per-validator fields of a ``BeaconState`` which are needed to compute the rewards and
+    penalties, one array element per validator.
+    """
+    balances: np.ndarray
+    effective_balances: np.ndarray
+    # Epochs are unsigned, as they can be ``FAR_FUTURE_EPOCH``
+    activation_epochs: np.ndarray
+    exit_epochs: np.ndarray
+    withdrawable_epochs: np.ndarray
+    slashed: np.ndarray
+
+    @classmethod
+    def from_state(cls, state: BeaconState, max_deposit_amount: Gwei) -> 'ValidatorArrays':
+        balances = np.array(state.validator_balances, dtype=np.int64)
+        return cls(
+            balances=balances,
+            effective_balances=np.minimum(balances, max_deposit_amount),
+            activation_epochs=np.array(
+                [validator.activation_epoch for validator in state.validator_registry],
+                dtype=np.uint64,
+            ),
+            exit_epochs=np.array(
+                [validator.exit_epoch for validator in state.validator_registry],
+                dtype=np.uint64,
+            ),
+            withdrawable_epochs=np.array(
+                [validator.withdrawable_epoch for validator in state.validator_registry],
+                dtype=np.uint64,
+            ),
+            slashed=np.array(
+                [validator.slashed for validator in state.validator_registry],
+                dtype=bool,
+            ),
+        )
+
+    @property
+    def num_validators(self) -> int:
+        return len(self.balances)
+
+    def active_mask(self, epoch: Epoch) -> np.ndarray:
+        """
+        Vectorized ``ValidatorRecord.is_active``.
+        """
+        return (self.activation_epochs <= epoch) & (epoch < self.exit_epochs)
+
+
+def to_mask(indices: Iterable[ValidatorIndex], num_validators: int) -> np.ndarray:
+    """
+    Return a boolean array which is ``True`` at the given validator indices.
+    """
+    mask = np.zeros(num_validators, dtype=bool)
+    mask[np.fromiter(indices, dtype=np.int64)] = True
+    return mask
+
+
+def _floor_mul_div(values: np.ndarray, numerator: int, denominator: int) -> np.ndarray:
+    """
+    Return ``values * numerator // denominator``, element-wise.
+
+    Falls back to Python integers when the products could overflow the array's integer type, so
+    that the result is always the same as with Python integers.
+    """
+    if len(values) == 0:
+        return values
+    elif denominator == 0:
+        raise ZeroDivisionError("integer division or modulo by zero")
+    elif int(values.max()) * numerator > MAX_INT64:
+        return (values.astype(object) * numerator // denominator).astype(np.int64)
+    else:
+        return values * numerator // denominator
+
+
+def get_base_rewards(effective_balances: np.ndarray,
+                     base_reward_quotient: int,
+                     previous_total_balance: Gwei) -> np.ndarray:
+    """
+    Vectorized ``get_base_reward``.
+    """
+    if previous_total_balance == 0:
+        return np.zeros_like(effective_balances)
+    adjusted_quotient = integer_squareroot(previous_total_balance) // base_reward_quotient
+    if adjusted_quotient == 0 and len(effective_balances) > 0:
+        raise ZeroDivisionError("integer division or modulo by zero")
+    return effective_balances // adjusted_quotient // 5
+
+
+def get_inactivity_penalties(base_rewards: np.ndarray,
+                             effective_balances: np.ndarray,
+                             epochs_since_finality: int,
+                             inactivity_penalty_quotient: int) -> np.ndarray:
+    """
+    Vectorized ``get_inactivity_penalty``.
+    """
+    return base_rewards + _floor_mul_div(
+        effective_balances,
+        epochs_since_finality,
+        inactivity_penalty_quotient,
+    ) // 2
+
+
+def get_inclusion_arrays(
+        inclusion_infos: Dict[ValidatorIndex, InclusionInfo],
+        attester_indices: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the inclusion slots and the inclusion distances of the attestations of the given
+    attesters, in the same order as ``attester_indices``.
+    """
+    attester_inclusion_infos = [inclusion_infos[index] for index in attester_indices]
+    inclusion_slots = np.array(
+        [inclusion_info.inclusion_slot for inclusion_info in attester_inclusion_infos],
+        dtype=np.int64,
+    )
+    inclusion_distances = np.array(
+        [inclusion_info.inclusion_distance for inclusion_info in attester_inclusion_infos],
+        dtype=np.int64,
+    )
+    return inclusion_slots, inclusion_distances
+
+
+def _check_inclusion_distances(inclusion_distances: np.ndarray) -> None:
+    if np.any(inclusion_distances == 0):
+        raise ZeroDivisionError("integer division or modulo by zero")
+
+
+def compute_normal_justification_and_finalization_deltas(
+        *,
+        num_validators: int,
+        min_attestation_inclusion_delay: int,
+        attestation_inclusion_reward_quotient: int,
+        previous_epoch_active_mask: np.ndarray,
+        previous_total_balance: Gwei,
+        previous_epoch_attester_mask: np.ndarray,
+        previous_epoch_boundary_attester_mask: np.ndarray,
+        previous_epoch_head_attester_mask: np.ndarray,
+        inclusion_distances: np.ndarray,
+        inclusion_proposer_indices: np.ndarray,
+        effective_balances: np.ndarray,
+        base_rewards: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized ``_compute_normal_justification_and_finalization_deltas``.
+
+    ``inclusion_distances`` and ``inclusion_proposer_indices`` hold the inclusion distance and the
+    proposer of the including block of each previous epoch active attester, in index order.
+    """
+    rewards = np.zeros(num_validators, dtype=np.int64)
+    penalties = np.zeros(num_validators, dtype=np.int64)
+
+    attesters = previous_epoch_active_mask & previous_epoch_attester_mask
+    attester_base_rewards = base_rewards[attesters]
+
+    # Expected FFG source
+    rewards[attesters] += _floor_mul_div(
+        attester_base_rewards,
+        int(effective_balances[previous_epoch_attester_mask].sum()),
+        previous_total_balance,
+    )
+    # Inclusion speed bonus
+    _check_inclusion_distances(inclusion_distances)
+    rewards[attesters] += (
+        attester_base_rewards * min_attestation_inclusion_delay // inclusion_distances
+    )
+    penalties[previous_epoch_active_mask & ~previous_epoch_attester_mask] += (
+        base_rewards[previous_epoch_active_mask & ~previous_epoch_attester_mask]
+    )
+
+    # Expected FFG target and expected head
+    for attester_mask in (previous_epoch_boundary_attester_mask, previous_epoch_head_attester_mask):
+        mask = previous_epoch_active_mask & attester_mask
+        rewards[mask] += _floor_mul_div(
+            base_rewards[mask],
+            int(effective_balances[attester_mask].sum()),
+            previous_total_balance,
+        )
+        mask = previous_epoch_active_mask & ~attester_mask
+        penalties[mask] += base_rewards[mask]
+
+    # Proposer bonus, a proposer can be rewarded for several attesters
+    np.add.at(
+        rewards,
+        inclusion_proposer_indices,
+        attester_base_rewards // attestation_inclusion_reward_quotient,
+    )
+
+    return rewards, penalties
+
+
+def compute_inactivity_leak_deltas(
+        *,
+        num_validators: int,
+        current_epoch: Epoch,
+        min_attestation_inclusion_delay: int,
+        inactivity_penalty_quotient: int,
+        previous_epoch_active_mask: np.ndarray,
+        previous_epoch_attester_mask: np.ndarray,
+        previous_epoch_boundary_attester_mask: np.ndarray,
+        previous_epoch_head_attester_mask: np.ndarray,
+        inclusion_distances: np.ndarray,
+        validator_arrays: ValidatorArrays,
+        base_rewards: np.ndarray,
+        epochs_since_finality: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized ``_compute_inactivity_leak_deltas``.
+
+    ``inclusion_distances`` holds the inclusion distance of each previous epoch active attester,
+    in index order.
+    """
+    inactivity_penalties = get_inactivity_penalties(
+        base_rewards,
+        validator_arrays.effective_balances,
+        epochs_since_finality,
+        inactivity_penalty_quotient,
+    )
+    rewards = np.zeros(num_validators, dtype=np.int64)
+    penalties = np.zeros(num_validators, dtype=np.int64)
+
+    attesters = previous_epoch_active_mask & previous_epoch_attester_mask
+    non_attesters = previous_epoch_active_mask & ~previous_epoch_attester_mask
+    penalties[non_attesters] += inactivity_penalties[non_attesters]
+
+    # If a validator did attest, apply a small penalty for getting attestations included late
+    _check_inclusion_distances(inclusion_distances)
+    rewards[attesters] += (
+        base_rewards[attesters] // min_attestation_inclusion_delay // inclusion_distances
+    )
+    penalties[attesters] += base_rewards[attesters]
+
+    mask = previous_epoch_active_mask & ~previous_epoch_boundary_attester_mask
+    penalties[mask] += inactivity_penalties[mask]
+    mask = previous_epoch_active_mask & ~previous_epoch_head_attester_mask
+    penalties[mask] += base_rewards[mask]
+
+    # Penalize slashed-but-inactive validators as though they were active but offline
+    not_withdrawable_mask = current_epoch < validator_arrays.withdrawable_epochs
+    mask = ~previous_epoch_active_mask & validator_arrays.slashed & not_withdrawable_mask
+    penalties[mask] += 2 * inactivity_penalties[mask] + base_rewards[mask]
+
+    return rewards, penalties
+
+
+def _get_inclusion_proposer_indices(state: BeaconState,
+                                    config: BeaconConfig,
+                                    inclusion_slots: np.ndarray) -> np.ndarray:
+    # The proposer only depends on the slot, so it's looked up once per distinct inclusion slot
+    proposers: Dict[Slot, ValidatorIndex] = {
+        slot: get_beacon_proposer_index(state, slot, CommitteeConfig(config))
+        for slot in set(inclusion_slots.tolist())
+    }
+    return np.array(
+        [proposers[slot] for slot in inclusion_slots.tolist()],
+        dtype=np.int64,
+    )
+
+
+def compute_finality_deltas(
+        state: BeaconState,
+        config: BeaconConfig,
+        validator_arrays: ValidatorArrays,
+        previous_epoch_active_mask: np.ndarray,
+        previous_total_balance: Gwei,
+        previous_epoch_attester_mask: np.ndarray,
+        inclusion_infos: Dict[ValidatorIndex, InclusionInfo],
+        base_rewards: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized ``_process_rewards_and_penalties_for_finality``.
+    """
+    num_validators = validator_arrays.num_validators
+    previous_epoch_boundary_attester_mask = to_mask(
+        get_attester_indices_from_attestations(
+            state=state,
+            attestations=get_previous_epoch_boundary_attestations(
+                state,
+                config.SLOTS_PER_EPOCH,
+                config.GENESIS_EPOCH,
+                config.LATEST_BLOCK_ROOTS_LENGTH,
+            ),
+            committee_config=CommitteeConfig(config),
+        ),
+        num_validators,
+    )
+    previous_epoch_head_attester_mask = to_mask(
+        get_attester_indices_from_attestations(
+            state=state,
+            attestations=get_previous_epoch_matching_head_attestations(
+                state,
+                config.SLOTS_PER_EPOCH,
+                config.GENESIS_EPOCH,
+                config.LATEST_BLOCK_ROOTS_LENGTH,
+            ),
+            committee_config=CommitteeConfig(config),
+        ),
+        num_validators,
+    )
+
+    inclusion_slots, inclusion_distances = get_inclusion_arrays(
+        inclusion_infos,
+        np.flatnonzero(previous_epoch_active_mask & previous_epoch_attester_mask),
+    )
+
+    epochs_since_finality = state.next_epoch(config.SLOTS_PER_EPOCH) - state.finalized_epoch
+    if epochs_since_finality <= 4:
+        return compute_normal_justification_and_finalization_deltas(
+            num_validators=num_validators,
+            min_attestation_inclusion_delay=config.MIN_ATTESTATION_INCLUSION_DELAY,
+            attestation_inclusion_reward_quotient=config.ATTESTATION_INCLUSION_REWARD_QUOTIENT,
+            previous_epoch_active_mask=previous_epoch_active_mask,
+            previous_total_balance=previous_total_balance,
+            previous_epoch_attester_mask=previous_epoch_attester_mask,
+            previous_epoch_boundary_attester_mask=previous_epoch_boundary_attester_mask,
+            previous_epoch_head_attester_mask=previous_epoch_head_attester_mask,
+            inclusion_distances=inclusion_distances,
+            inclusion_proposer_indices=_get_inclusion_proposer_indices(
+                state,
+                config,
+                inclusion_slots,
+            ),
+            effective_balances=validator_arrays.effective_balances,
+            base_rewards=base_rewards,
+        )
+
+    # epochs_since_finality > 4
+    else:
+        return compute_inactivity_leak_deltas(
+            num_validators=num_validators,
+            current_epoch=state.current_epoch(config.SLOTS_PER_EPOCH),
+            min_attestation_inclusion_delay=config.MIN_ATTESTATION_INCLUSION_DELAY,
+            inactivity_penalty_quotient=config.INACTIVITY_PENALTY_QUOTIENT,
+            previous_epoch_active_mask=previous_epoch_active_mask,
+            previous_epoch_attester_mask=previous_epoch_attester_mask,
+            previous_epoch_boundary_attester_mask=previous_epoch_boundary_attester_mask,
+            previous_epoch_head_attester_mask=previous_epoch_head_attester_mask,
+            inclusion_distances=inclusion_distances,
+            validator_arrays=validator_arrays,
+            base_rewards=base_rewards,
+            epochs_since_finality=epochs_since_finality,
+        )
+
+
+def compute_crosslinks_deltas(state: BeaconState,
+                              config: BeaconConfig,
+                              validator_arrays: ValidatorArrays,
+                              base_rewards: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorized ``_process_rewards_and_penalties_for_crosslinks``.
+    """
+    num_validators = validator_arrays.num_validators
+    effective_balances = validator_arrays.effective_balances
+    # `get_winning_root_and_participants` looks up the effective balances by validator index
+    effective_balances_by_index = {
+        ValidatorIndex(index): Gwei(balance)
+        for index, balance in enumerate(effective_balances.tolist())
+    }
+
+    previous_epoch_start_slot = get_epoch_start_slot(
+        state.previous_epoch(config.SLOTS_PER_EPOCH, config.GENESIS_EPOCH),
+        config.SLOTS_PER_EPOCH,
+    )
+    current_epoch_start_slot = get_epoch_start_slot(
+        state.current_epoch(config.SLOTS_PER_EPOCH),
+        config.SLOTS_PER_EPOCH,
+    )
+    rewards = np.zeros(num_validators, dtype=np.int64)
+    penalties = np.zeros(num_validators, dtype=np.int64)
+    for slot in range(previous_epoch_start_slot, current_epoch_start_slot):
+        crosslink_committees_at_slot = get_crosslink_committees_at_slot(
+            state,
+            Slot(slot),
+            CommitteeConfig(config),
+        )
+        for crosslink_committee, shard in crosslink_committees_at_slot:
+            _, attesting_validator_indices = get_winning_root_and_participants(
+                state=state,
+                shard=shard,
+                effective_balances=effective_balances_by_index,
+                committee_config=CommitteeConfig(config),
+            )
+            committee = np.array(crosslink_committee, dtype=np.int64)
+            attesters = np.array(attesting_validator_indices, dtype=np.int64)
+            np.add.at(
+                rewards,
+                attesters,
+                _floor_mul_div(
+                    base_rewards[attesters],
+                    int(effective_balances[attesters].sum()),
+                    int(effective_balances[committee].sum()),
+                ),
+            )
+            non_attesters = np.setdiff1d(committee, attesters)
+            penalties[non_attesters] += base_rewards[non_attesters]
+    return rewards, penalties
+
+
+def process_rewards_and_penalties(state: BeaconState, config: BeaconConfig) -> BeaconState:
+    """
+    Vectorized ``process_rewards_and_penalties``.
+    """
+    validator_arrays = ValidatorArrays.from_state(state, config.MAX_DEPOSIT_AMOUNT)
+    num_validators = validator_arrays.num_validators
+
+    previous_epoch_active_mask = validator_arrays.active_mask(
+        state.previous_epoch(config.SLOTS_PER_EPOCH, config.GENESIS_EPOCH),
+    )
+    previous_total_balance = Gwei(
+        int(validator_arrays.effective_balances[previous_epoch_active_mask].sum())
+    )
+
+    previous_epoch_attestations = state.previous_epoch_attestations
+    previous_epoch_attester_mask = to_mask(
+        get_attester_indices_from_attestations(
+            state=state,
+            attestations=previous_epoch_attestations,
+            committee_config=CommitteeConfig(config),
+        ),
+        num_validators,
+    )
+    inclusion_infos = get_inclusion_infos(
+        state=state,
+        attestations=previous_epoch_attestations,
+        committee_config=CommitteeConfig(config),
+    )
+    base_rewards = get_base_rewards(
+        validator_arrays.effective_balances,
+        config.BASE_REWARD_QUOTIENT,
+        previous_total_balance,
+    )
+
+    # 1. Process rewards and penalties for justification and finalization
+    finality_rewards, finality_penalties = compute_finality_deltas(
+        state,
+        config,
+        validator_arrays,
+        previous_epoch_active_mask,
+        previous_total_balance,
+        previous_epoch_attester_mask,
+        inclusion_infos,
+        base_rewards,
+    )
+    # 2. Process rewards and penalties for crosslinks
+    crosslinks_rewards, crosslinks_penalties = compute_crosslinks_deltas(
+        state,
+        config,
+        validator_arrays,
+        base_rewards,
+    )
+
+    # Apply the overall rewards/penalties
+    return state.apply_validator_balance_deltas(
+        (finality_rewards + crosslinks_rewards - finality_penalties - crosslinks_penalties).tolist()
+    )
@@ -35,6 +35,7 @@ from eth2.beacon.enums import (
 from eth2.beacon.committee_helpers import (
     get_beacon_proposer_index,
     get_crosslink_committees_at_slot,
+    get_epoch_committees,
 )
 from eth2.beacon.configs import (
     BeaconConfig,
@@ -70,9 +71,6 @@ from eth2.beacon.typing import (
     Slot,
     ValidatorIndex,
 )
-from eth2.beacon.validation import (
-    validate_epoch_within_previous_and_next,
-)
 
 from .committee_assignment import (
     CommitteeAssignment,
@@ -572,38 +570,29 @@ def get_committee_assignment(
     ``CommitteeAssignment.is_proposer`` is a bool signalling if the validator is expected to
         propose a beacon block at the assigned slot.
     """
-    current_epoch = state.current_epoch(config.SLOTS_PER_EPOCH)
-    previous_epoch = state.previous_epoch(config.SLOTS_PER_EPOCH, config.GENESIS_EPOCH)
-    next_epoch = Epoch(current_epoch + 1)
-
-    validate_epoch_within_previous_and_next(epoch, previous_epoch, next_epoch)
+    committee_config = CommitteeConfig(config)
 
-    epoch_start_slot = get_epoch_start_slot(epoch, config.SLOTS_PER_EPOCH)
+    epoch_committees = get_epoch_committees(
+        state,
+        epoch,
+        committee_config,
+        registry_change=registry_change,
+    )
+    try:
+        slot, shard, _ = epoch_committees.committee_positions[validator_index]
+    except KeyError:
+        raise NoCommitteeAssignment
 
-    committee_config = CommitteeConfig(config)
+    is_proposer = validator_index == get_beacon_proposer_index(
+        state,
+        slot,
+        committee_config,
+        registry_change=registry_change,
+    )
 
-    for slot in range(epoch_start_slot, epoch_start_slot + config.SLOTS_PER_EPOCH):
-        crosslink_committees = get_crosslink_committees_at_slot(
-            state,
-            slot,
-            committee_config,
-            registry_change=registry_change,
-        )
-        selected_committees = [
-            committee
-            for committee in crosslink_committees
-            if validator_index in committee[0]
-        ]
-        if len(selected_committees) > 0:
-            validators = selected_committees[0][0]
-            shard = selected_committees[0][1]
-            is_proposer = validator_index == get_beacon_proposer_index(
-                state,
-                Slot(slot),
-                committee_config,
-                registry_change=registry_change,
-            )
-
-            return CommitteeAssignment(validators, shard, Slot(slot), is_proposer)
-
-    raise NoCommitteeAssignment
+    return CommitteeAssignment(
+        tuple(epoch_committees.committees[slot, shard]),
+        shard,
+        slot,
+        is_proposer,
+    )
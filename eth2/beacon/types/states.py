@@ -1,4 +1,7 @@
 from typing import (
+    Any,
+    Dict,
+    Mapping,
     Sequence,
 )
 
@@ -20,6 +23,10 @@ from eth.constants import (
     ZERO_HASH32,
 )
 
+from eth2._utils.tree_hash import (
+    ContainerTreeHashCache,
+    DirtyIndices,
+)
 from eth2.beacon._utils.hash import (
     hash_eth2,
 )
@@ -176,11 +183,44 @@ class BeaconState(ssz.Serializable):
             self._hash = hash_eth2(ssz.encode(self))
         return self._hash
 
+    # Shared by all the states copied from one another, see ``hash_tree_root``
+    _tree_hash_cache: ContainerTreeHashCache = None
+    # The list items replaced since the last time ``_tree_hash_cache`` hashed this state or one of
+    # its ancestors
+    _dirty_indices: Dict[str, DirtyIndices] = {}
+    _hash_tree_root = None
+
+    @property
+    def hash_tree_root(self) -> Hash32:
+        """
+        Return the SSZ tree hash root of the state.
+
+        The Merkle trees of the lists of the state are kept in a cache, which is passed on to its
+        copies. Only the fields and the list items which were replaced since the last root
+        computed with the cache are rehashed.
+        """
+        if self._hash_tree_root is None:
+            self._hash_tree_root = self._get_tree_hash_cache().hash_tree_root(
+                self,
+                self._dirty_indices,
+            )
+            self._dirty_indices = {}
+        return self._hash_tree_root
+
     @property
     def root(self) -> Hash32:
-        # Alias of `hash`.
-        # Using flat hash, might change to SSZ tree hash.
-        return self.hash
+        return self.hash_tree_root
+
+    def _get_tree_hash_cache(self) -> ContainerTreeHashCache:
+        if self._tree_hash_cache is None:
+            self._tree_hash_cache = ContainerTreeHashCache(type(self))
+        return self._tree_hash_cache
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = super().__getstate__()
+        state.pop('_tree_hash_cache', None)
+        state.pop('_dirty_indices', None)
+        return state
 
     @property
     def num_validators(self) -> int:
@@ -255,22 +295,68 @@ class BeaconState(ssz.Serializable):
             deposit_index=len(activated_genesis_validators),
         )
 
+    def copy(self, *args: Any, **kwargs: Any) -> 'BeaconState':
+        """
+        Return a copy of the state with the given fields replaced.
+
+        ``ssz.Serializable.copy`` deep-copies every field that is not replaced, which includes the
+        whole validator registry. All the fields of a ``BeaconState`` are immutable, so the copy
+        can share them with this state instead. It also shares the tree hash cache of this state.
+        """
+        fields = dict(zip(self._meta.field_names, self))
+        fields.update(zip(self._meta.field_names, args))
+        fields.update(kwargs)
+        state = type(self)(**fields)
+
+        state._tree_hash_cache = self._get_tree_hash_cache()
+        state._dirty_indices = {
+            field_name: dirty_indices
+            for field_name, dirty_indices in self._dirty_indices.items()
+            if fields[field_name] is getattr(self, field_name)
+        }
+        return state
+
+    def _update_list_items(self, field_name: str, items: Mapping[Any, Any]) -> 'BeaconState':
+        """
+        Return a copy of the state with the given items of the list ``field_name`` replaced, which
+        only rehashes these items in ``hash_tree_root``.
+        """
+        previous_value = getattr(self, field_name)
+        value = list(previous_value)
+        for index, item in items.items():
+            value[index] = item
+
+        state = self.copy(**{field_name: tuple(value)})
+
+        base_value, indices = self._dirty_indices.get(field_name, (previous_value, frozenset()))
+        state._dirty_indices = dict(
+            state._dirty_indices,
+            **{field_name: (base_value, indices | frozenset(items))},
+        )
+        return state
+
+    def _validate_validator_indices(self, validator_indices: Sequence[ValidatorIndex]) -> None:
+        for validator_index in validator_indices:
+            if validator_index >= self.num_validators or validator_index < 0:
+                raise IndexError("Incorrect validator index")
+
     def update_validator_registry(self,
                                   validator_index: ValidatorIndex,
                                   validator: ValidatorRecord) -> 'BeaconState':
         """
         Replace ``self.validator_registry[validator_index]`` with ``validator``.
         """
-        if validator_index >= self.num_validators or validator_index < 0:
-            raise IndexError("Incorrect validator index")
+        return self.update_validator_records({validator_index: validator})
 
-        validator_registry = list(self.validator_registry)
-        validator_registry[validator_index] = validator
-
-        updated_state = self.copy(
-            validator_registry=tuple(validator_registry),
-        )
-        return updated_state
+    def update_validator_records(
+            self,
+            validators: Mapping[ValidatorIndex, ValidatorRecord]) -> 'BeaconState':
+        """
+        Replace the ``ValidatorRecord`` of every validator index in ``validators``, with a single
+        copy of the registry.
+        """
+        self._validate_validator_indices(tuple(validators.keys()))
+        return self._update_list_items('validator_registry', validators)
 
     def update_validator_balance(self,
                                  validator_index: ValidatorIndex,
@@ -278,16 +364,37 @@ class BeaconState(ssz.Serializable):
         """
         Update the balance of validator of the given ``validator_index``.
         """
-        if validator_index >= self.num_validators or validator_index < 0:
-            raise IndexError("Incorrect validator index")
+        return self.update_validator_balances({validator_index: balance})
 
-        validator_balances = list(self.validator_balances)
-        validator_balances[validator_index] = balance
+    def update_validator_balances(self,
+                                  balances: Mapping[ValidatorIndex, Gwei]) -> 'BeaconState':
+        """
+        Update the balance of every validator index in ``balances``, with a single copy of the
+        balances.
+        """
+        self._validate_validator_indices(tuple(balances.keys()))
+        return self._update_list_items('validator_balances', balances)
 
-        updated_state = self.copy(
-            validator_balances=tuple(validator_balances),
+    def apply_validator_balance_deltas(self, deltas: Sequence[int]) -> 'BeaconState':
+        """
+        Add ``deltas[index]`` to the balance of every validator, in a single pass.
+
+        A balance which would go below zero is set to zero.
+        """
+        if len(deltas) != self.num_validators:
+            raise ValueError(
+                "Expected one balance delta per validator, got {0} for {1} validators".format(
+                    len(deltas),
+                    self.num_validators,
+                )
+            )
+
+        return self.copy(
+            validator_balances=tuple(
+                Gwei(max(balance + delta, 0))
+                for balance, delta in zip(self.validator_balances, deltas)
+            ),
         )
-        return updated_state
 
     def update_validator(self,
                          validator_index: ValidatorIndex,
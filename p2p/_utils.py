@@ -3,9 +3,16 @@ from concurrent.futures import Executor, ProcessPoolExecutor
 import logging
 import os
 import signal
-from typing import Tuple
+from typing import (
+    Iterable,
+    Tuple,
+)
 
 import rlp
+from rlp.codec import length_prefix
+
+# The offset of the first byte of the RLP encoding of a list, as opposed to a string
+LIST_PREFIX_OFFSET = 0xc0
 
 
 def sxor(s1: bytes, s2: bytes) -> bytes:
@@ -31,6 +38,16 @@ def get_devp2p_cmd_id(msg: bytes) -> int:
     return rlp.decode(msg[:1], sedes=rlp.sedes.big_endian_int)
 
 
+def encode_rlp_list(encoded_items: Iterable[bytes]) -> bytes:
+    """Return the RLP encoding of the list of the given, already RLP encoded, items.
+
+    This avoids deserializing and reserializing items which are stored or cached in their RLP
+    form.
+    """
+    encoded_list = b''.join(encoded_items)
+    return length_prefix(len(encoded_list), LIST_PREFIX_OFFSET) + encoded_list
+
+
 def time_since(start_time: datetime.datetime) -> Tuple[int, int, int, int]:
     delta = datetime.datetime.now() - start_time
     hours, remainder = divmod(delta.seconds, 3600)
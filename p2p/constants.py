@@ -43,6 +43,14 @@ MAX_REQUEST_ATTEMPTS = 3
 # Default timeout before giving up on a caller-initiated interaction
 COMPLETION_TIMEOUT = 5
 
+# When offloading of message decoding is enabled, messages of at least this many bytes are decoded
+# in the process pool, rather than on the event loop. Smaller messages decode faster than they
+# could be sent to a worker process and back.
+MSG_DECODE_OFFLOAD_THRESHOLD = 64 * 1024
+
+# Maximum number of messages being decoded in the process pool at any given time, across all peers
+MAX_OFFLOADED_MSG_DECODES = 16
+
 MAINNET_BOOTNODES = (
     'enode://a979fb575495b8d6db44f750317d0f4622bf4c2aa3365d6af7c284339968eef29b69ad0dce72a4d8db5ebb4968de0e3bec910127f134779fbcb0cb6d3331163c@52.16.188.185:30303',  # noqa: E501
     'enode://aa36fdf33dd030378a0168efe6ed7d5cc587fafa3cdd375854fe735a2e11ea3650ba29644e2db48368c46e1f60e716300ba49396cd63778bf8a818c09bded46f@13.93.211.84:30303',  # noqa: E501
@@ -98,6 +106,10 @@ DISCOVERY_V5_BOOTNODES = (
 # Maximum peers number, we'll try to keep open connections up to this number of peers
 DEFAULT_MAX_PEERS = 25
 
+# How many nodes the BasePeerPool dials at the same time, by default. Most of the candidates from
+# discovery are unreachable, so dialing them one by one would take minutes to fill the pool.
+DEFAULT_MAX_CONCURRENT_DIALS = 16
+
 # Maximum allowed depth for chain reorgs.
 MAX_REORG_DEPTH = 24
 
@@ -18,7 +18,6 @@ from typing import (
     cast,
     Dict,
     Hashable,
-    Iterable,
     Iterator,
     List,
     Sequence,
@@ -36,6 +35,8 @@ from lahja import (
     Endpoint,
 )
 
+from lru import LRU
+
 import rlp
 
 from eth_typing import Hash32
@@ -72,6 +73,7 @@ from p2p.kademlia import to_uris, Node as KademliaNode
 from p2p import kademlia
 from p2p import protocol
 from p2p.service import BaseService
+from p2p.token_bucket import TokenBucket
 
 if TYPE_CHECKING:
     # Promoted workaround for inheriting from generic stdlib class
@@ -95,6 +97,14 @@ HEAD_SIZE_V5 = len(V5_ID_STRING) + SIG_SIZE  # 87
 EXPIRATION = 60  # let messages expire after N secondes
 PROTO_VERSION = 4
 PROTO_VERSION_V5 = 5
+# Nodes which answered one of our pings this recently (in seconds) are not pinged again before
+# we send them requests, as they still remember us. Geth forgets us after 24 hours.
+BOND_EXPIRATION = 60 * 60
+BOND_CACHE_SIZE = 4096
+# The rate (in packets per second) at which lookups and bonds may send pings and find_nodes, and
+# the largest burst of them, so that big lookups don't overflow the UDP buffers on either side.
+MAX_REQUESTS_PER_SECOND = 100
+MAX_REQUESTS_BURST = 32
 
 
 class DefectiveMessage(Exception):
@@ -167,6 +177,9 @@ class DiscoveryProtocol(asyncio.DatagramProtocol):
         self.topic_nodes_callbacks = CallbackManager()
         self.parity_pong_tokens: Dict[Hash32, Hash32] = {}
         self.cancel_token = CancelToken('DiscoveryProtocol').chain(cancel_token)
+        # The time (as returned by time.monotonic()) of the last successful bond with each node
+        self._bond_times: LRU[kademlia.Node, float] = LRU(BOND_CACHE_SIZE)
+        self._request_rate = TokenBucket(MAX_REQUESTS_PER_SECOND, MAX_REQUESTS_BURST)
 
     def update_routing_table(self, node: kademlia.Node) -> None:
         """Update the routing table entry for the given node."""
@@ -188,7 +201,11 @@ class DiscoveryProtocol(asyncio.DatagramProtocol):
             return True
         elif node == self.this_node:
             return False
+        elif self.is_bonded(node):
+            self.logger.debug2("skipping bond with %s, bonded recently", node)
+            return True
 
+        await self.cancel_token.cancellable_wait(self._request_rate.take())
         if self.use_v5:
             token = self.send_ping_v5(node, [])
             log_version = "v5"
@@ -207,8 +224,11 @@ class DiscoveryProtocol(asyncio.DatagramProtocol):
 
         if not got_pong:
             self.logger.debug("bonding failed, didn't receive %s pong from %s", log_version, node)
+            if node in self._bond_times:
+                del self._bond_times[node]
             self.routing.remove_node(node)
             return False
+        self._bond_times[node] = time.monotonic()
 
         try:
             # Give the remote node a chance to ping us before we move on and
@@ -224,6 +244,16 @@ class DiscoveryProtocol(asyncio.DatagramProtocol):
         self.update_routing_table(node)
         return True
 
+    def _is_bonding(self, node: kademlia.Node) -> bool:
+        return self.ping_callbacks.locked(node) or self.pong_callbacks.locked(node)
+
+    def is_bonded(self, node: kademlia.Node) -> bool:
+        """
+        Whether the given node answered one of our pings in the last BOND_EXPIRATION seconds.
+        """
+        bond_time = self._bond_times.get(node)
+        return bond_time is not None and time.monotonic() - bond_time < BOND_EXPIRATION
+
     async def wait_ping(self, remote: kademlia.Node) -> bool:
         """Wait for a ping from the given remote.
 
@@ -314,54 +344,82 @@ class DiscoveryProtocol(asyncio.DatagramProtocol):
     async def lookup(self, node_id: int) -> Tuple[kademlia.Node, ...]:
         """Lookup performs a network search for nodes close to the given target.
 
-        It approaches the target by querying nodes that are closer to it on each iteration.  The
-        given target does not need to be an actual node identifier.
+        It approaches the target by querying the nodes closest to it that were not queried yet,
+        keeping k_find_concurrency queries in flight: a new one starts as soon as another ends,
+        instead of waiting for the slowest one of each round. The given target does not need to
+        be an actual node identifier.
         """
         nodes_asked: Set[kademlia.Node] = set()
         nodes_seen: Set[kademlia.Node] = set()
 
-        async def _find_node(node_id: int, remote: kademlia.Node) -> Tuple[kademlia.Node, ...]:
+        async def _find_node(remote: kademlia.Node) -> Tuple[kademlia.Node, ...]:
+            await self.cancel_token.cancellable_wait(self._request_rate.take())
             # Short-circuit in case our token has been triggered to avoid trying to send requests
             # over a transport that is probably closed already.
             self.cancel_token.raise_if_triggered()
             self._send_find_node(remote, node_id)
-            candidates = await self.wait_neighbours(remote)
+            try:
+                candidates = await self.wait_neighbours(remote)
+            except AlreadyWaitingDiscoveryResponse:
+                self.logger.debug("another lookup is already querying %s", remote)
+                return tuple()
             if not candidates:
                 self.logger.debug("got no candidates from %s, returning", remote)
-                return tuple()
-            all_candidates = tuple(c for c in candidates if c not in nodes_seen)
-            candidates = tuple(
-                c for c in all_candidates
-                if (not self.ping_callbacks.locked(c) and not self.pong_callbacks.locked(c))
-            )
-            self.logger.debug2("got %s new candidates", len(candidates))
-            # Add new candidates to nodes_seen so that we don't attempt to bond with failing ones
-            # in the future.
-            nodes_seen.update(candidates)
-            bonded = await asyncio.gather(*(self.bond(c) for c in candidates))
-            self.logger.debug2("bonded with %s candidates", bonded.count(True))
-            return tuple(c for c in candidates if bonded[candidates.index(c)])
-
-        def _exclude_if_asked(nodes: Iterable[kademlia.Node]) -> List[kademlia.Node]:
-            nodes_to_ask = list(set(nodes).difference(nodes_asked))
-            return kademlia.sort_by_distance(nodes_to_ask, node_id)[:kademlia.k_find_concurrency]
+            return candidates
+
+        async def _bond(candidate: kademlia.Node) -> Tuple[kademlia.Node, bool]:
+            return candidate, await self.bond(candidate)
+
+        def _get_nodes_to_ask(count: int) -> List[kademlia.Node]:
+            # Nodes which another lookup is querying at the moment are skipped
+            return [
+                node for node in closest
+                if node not in nodes_asked and not self.neighbours_callbacks.locked(node)
+            ][:count]
 
         closest = self.routing.neighbours(node_id)
         self.logger.debug("starting lookup; initial neighbours: %s", closest)
-        nodes_to_ask = _exclude_if_asked(closest)
-        while nodes_to_ask:
-            self.logger.debug2("node lookup; querying %s", nodes_to_ask)
-            nodes_asked.update(nodes_to_ask)
-            results = await asyncio.gather(*(
-                _find_node(node_id, n)
-                for n
-                in nodes_to_ask
-                if not self.neighbours_callbacks.locked(n)
-            ))
-            for candidates in results:
-                closest.extend(candidates)
-            closest = kademlia.sort_by_distance(closest, node_id)[:kademlia.k_bucket_size]
-            nodes_to_ask = _exclude_if_asked(closest)
+        queries: Set['asyncio.Future[Tuple[kademlia.Node, ...]]'] = set()
+        bonds: Set['asyncio.Future[Tuple[kademlia.Node, bool]]'] = set()
+        try:
+            while True:
+                nodes_to_ask = _get_nodes_to_ask(kademlia.k_find_concurrency - len(queries))
+                if nodes_to_ask:
+                    self.logger.debug2("node lookup; querying %s", nodes_to_ask)
+                nodes_asked.update(nodes_to_ask)
+                queries.update(asyncio.ensure_future(_find_node(n)) for n in nodes_to_ask)
+                if not queries and not bonds:
+                    break
+
+                done, _ = await self.cancel_token.cancellable_wait(asyncio.wait(
+                    queries | bonds,
+                    return_when=asyncio.FIRST_COMPLETED,
+                ))
+                for future in done:
+                    if future in queries:
+                        queries.remove(future)
+                        # Bond with the new candidates before they are queried, without holding
+                        # up the other queries
+                        candidates = tuple(
+                            c for c in future.result()
+                            if c not in nodes_seen and not self._is_bonding(c)
+                        )
+                        self.logger.debug2("got %s new candidates", len(candidates))
+                        # Add new candidates to nodes_seen so that we don't attempt to bond with
+                        # failing ones in the future.
+                        nodes_seen.update(candidates)
+                        bonds.update(asyncio.ensure_future(_bond(c)) for c in candidates)
+                    else:
+                        bonds.remove(future)
+                        candidate, bonded = future.result()
+                        if bonded:
+                            closest = kademlia.sort_by_distance(
+                                closest + [candidate],
+                                node_id,
+                            )[:kademlia.k_bucket_size]
+        finally:
+            for future in queries | bonds:
+                future.cancel()
 
         self.logger.debug(
             "lookup finished for target %s; closest neighbours: %s", to_hex(node_id), closest
@@ -421,7 +479,7 @@ class DiscoveryProtocol(asyncio.DatagramProtocol):
                 self.bond(n)
                 for n
                 in self.bootstrap_nodes
-                if (not self.ping_callbacks.locked(n) and not self.pong_callbacks.locked(n))
+                if not self._is_bonding(n)
             ))
             if not any(bonded):
                 self.logger.info("Failed to bond with bootstrap nodes %s", self.bootstrap_nodes)
@@ -499,10 +557,9 @@ class DiscoveryProtocol(asyncio.DatagramProtocol):
         # The find_node payload should have 2 elements: node_id, expiration
         self.logger.debug2('<<< find_node from %s', node)
         node_id, _ = payload
-        if node not in self.routing:
-            # FIXME: This is not correct; a node we've bonded before may have become unavailable
-            # and thus removed from self.routing, but once it's back online we should accept
-            # find_nodes from them.
+        # A node we bonded with recently may have been removed from self.routing while it was
+        # unavailable, but once it's back online we accept find_nodes from it.
+        if node not in self.routing and not self.is_bonded(node):
             self.logger.debug('Ignoring find_node request from unknown node %s', node)
             return
         self.update_routing_table(node)
@@ -195,3 +195,10 @@ class BadDatabaseError(BaseP2PError):
     The local database wasn't in quite the format we were expecting
     """
     pass
+
+
+class NotEnoughTokens(BaseP2PError):
+    """
+    Raised when taking more tokens from a :class:`~p2p.token_bucket.TokenBucket` than it holds.
+    """
+    pass
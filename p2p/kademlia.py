@@ -1,5 +1,6 @@
 import bisect
 from functools import total_ordering
+import heapq
 import ipaddress
 import logging
 import operator
@@ -9,6 +10,7 @@ import time
 from typing import (
     Any,
     cast,
+    Dict,
     Iterable,
     Iterator,
     List,
@@ -179,6 +181,15 @@ class KBucket(Sized):
     def distance_to(self, id: int) -> int:
         return self.midpoint ^ id
 
+    def min_distance_to(self, id: int) -> int:
+        """
+        The smallest distance from the given id to an id of this bucket.
+
+        Only valid for the buckets of a :class:`RoutingTable`, which cover aligned ranges of ids
+        sharing the same prefix: the distances of those all share the same high bits as well.
+        """
+        return (self.start ^ id) & ~(self.end - self.start)
+
     def nodes_by_distance_to(self, id: int) -> List[Node]:
         return sorted(self.nodes, key=operator.methodcaller('distance_to', id))
 
@@ -257,6 +268,10 @@ class RoutingTable:
         self._initialized_at = time.monotonic()
         self.this_node = node
         self.buckets = [KBucket(0, k_max_node_id)]
+        # The nodes of all buckets (but not their replacement caches) in a flat list, along with
+        # the index of each of them in it, to sample them in constant time
+        self._nodes: List[Node] = []
+        self._node_indices: Dict[Node, int] = {}
 
     def get_random_nodes(self, count: int) -> Iterator[Node]:
         if count > len(self):
@@ -267,19 +282,7 @@ class RoutingTable:
                     len(self),
                 )
             count = len(self)
-        seen: List[Node] = []
-        # This is a rather inneficient way of randomizing nodes from all buckets, but even if we
-        # iterate over all nodes in the routing table, the time it takes would still be
-        # insignificant compared to the time it takes for the network roundtrips when connecting
-        # to nodes.
-        while len(seen) < count:
-            bucket = random.choice(self.buckets)
-            if not bucket.nodes:
-                continue
-            node = random.choice(bucket.nodes)
-            if node not in seen:
-                yield node
-                seen.append(node)
+        yield from random.sample(self._nodes, count)
 
     def split_bucket(self, index: int) -> None:
         bucket = self.buckets[index]
@@ -297,14 +300,22 @@ class RoutingTable:
         return [b for b in self.buckets if not b.is_full]
 
     def remove_node(self, node: Node) -> None:
-        binary_get_bucket_for_node(self.buckets, node).remove_node(node)
+        bucket = binary_get_bucket_for_node(self.buckets, node)
+        bucket.remove_node(node)
+        if node not in bucket:
+            self._unindex_node(node)
+        # The bucket may have taken a node from its replacement cache
+        for replacement_node in bucket.nodes[-1:]:
+            self._index_node(replacement_node)
 
     def add_node(self, node: Node) -> Node:
         if node == self.this_node:
             raise ValueError("Cannot add this_node to routing table")
         bucket = binary_get_bucket_for_node(self.buckets, node)
         eviction_candidate = bucket.add(node)
-        if eviction_candidate is not None:  # bucket is full
+        if eviction_candidate is None:
+            self._index_node(node)
+        else:  # bucket is full
             # Split if the bucket has the local node in its range or if the depth is not congruent
             # to 0 mod k_b
             depth = _compute_shared_prefix_bits(bucket.nodes)
@@ -315,6 +326,21 @@ class RoutingTable:
             return eviction_candidate
         return None  # successfully added to not full bucket
 
+    def _index_node(self, node: Node) -> None:
+        if node not in self._node_indices:
+            self._node_indices[node] = len(self._nodes)
+            self._nodes.append(node)
+
+    def _unindex_node(self, node: Node) -> None:
+        index = self._node_indices.pop(node, None)
+        if index is None:
+            return
+        # Move the last node into the slot of the removed one
+        last_node = self._nodes.pop()
+        if last_node is not node:
+            self._nodes[index] = last_node
+            self._node_indices[last_node] = index
+
     def get_bucket_for_node(self, node: Node) -> KBucket:
         return binary_get_bucket_for_node(self.buckets, node)
 
@@ -322,10 +348,10 @@ class RoutingTable:
         return sorted(self.buckets, key=operator.methodcaller('distance_to', id))
 
     def __contains__(self, node: Node) -> bool:
-        return node in self.get_bucket_for_node(node)
+        return node in self._node_indices
 
     def __len__(self) -> int:
-        return sum(len(b) for b in self.buckets)
+        return len(self._nodes)
 
     def __iter__(self) -> Iterable[Node]:
         for b in self.buckets:
@@ -333,17 +359,22 @@ class RoutingTable:
                 yield n
 
     def neighbours(self, node_id: int, k: int = k_bucket_size) -> List[Node]:
-        """Return up to k neighbours of the given node."""
-        nodes = []
-        # Sorting by bucket.midpoint does not work in edge cases, so build a short list of k * 2
-        # nodes and sort it by distance_to.
-        for bucket in self.buckets_by_distance_to(node_id):
-            for n in bucket.nodes_by_distance_to(node_id):
-                if n is not node_id:
-                    nodes.append(n)
-                    if len(nodes) == k * 2:
-                        break
-        return sort_by_distance(nodes, node_id)[:k]
+        """Return up to k neighbours of the given node.
+
+        The nodes of a bucket are either all closer to node_id than the nodes of another bucket,
+        or all further from it, so only the nodes of the nearest buckets need to be sorted.
+        """
+        buckets = [
+            (bucket.min_distance_to(node_id), index, bucket)
+            for index, bucket in enumerate(self.buckets)
+            if bucket.nodes
+        ]
+        heapq.heapify(buckets)
+        nodes: List[Node] = []
+        while buckets and len(nodes) < k:
+            _, _, bucket = heapq.heappop(buckets)
+            nodes.extend(bucket.nodes_by_distance_to(node_id))
+        return nodes[:k]
 
 
 def check_relayed_addr(sender: Address, addr: Address) -> bool:
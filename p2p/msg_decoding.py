@@ -0,0 +1,82 @@
+import asyncio
+from concurrent.futures import Executor
+import time
+from typing import (
+    Tuple,
+    Type,
+)
+
+from p2p import protocol
+from p2p._utils import ensure_global_asyncio_executor
+
+from .constants import (
+    MAX_OFFLOADED_MSG_DECODES,
+    MSG_DECODE_OFFLOAD_THRESHOLD,
+)
+
+
+def _decode_msg(cmd_class: Type[protocol.Command],
+                cmd_id_offset: int,
+                snappy_support: bool,
+                msg: bytes) -> Tuple[protocol.PayloadType, float]:
+    # The command is re-created in the worker process rather than pickled, to avoid pickling
+    # whatever it may have cached (e.g. its logger).
+    cmd = cmd_class(cmd_id_offset, snappy_support)
+    start = time.perf_counter()
+    decoded_msg = cmd.decode(msg)
+    return decoded_msg, time.perf_counter() - start
+
+
+class OffloadedMsgDecoder:
+    """
+    Decode (snappy decompress and RLP decode) big messages in the global process pool, so that a
+    single big message doesn't stall the event loop, and with it every other peer.
+
+    A peer waits for each of its messages to be decoded before reading the next one, so messages
+    from a peer are still processed in the order they were received. The number of messages being
+    decoded in the pool is capped across all peers sharing a decoder.
+    """
+    def __init__(self,
+                 threshold: int = MSG_DECODE_OFFLOAD_THRESHOLD,
+                 max_concurrent_decodes: int = MAX_OFFLOADED_MSG_DECODES,
+                 executor: Executor = None) -> None:
+        self.threshold = threshold
+        self._executor = executor
+        self._max_concurrent_decodes = max_concurrent_decodes
+        self._decode_slots: asyncio.Semaphore = None
+
+        # Number and total size of messages decoded in the process pool
+        self.num_offloaded_msgs = 0
+        self.offloaded_bytes = 0
+        # Time spent decoding in the process pool, which would otherwise have stalled the event loop
+        self.loop_stall_avoided = 0.0
+        # Time peers spent waiting for their messages to be decoded in the process pool, including
+        # the pickling overhead and the wait for a free decode slot
+        self.decode_wait_time = 0.0
+
+    def should_offload(self, msg: bytes) -> bool:
+        return len(msg) >= self.threshold
+
+    async def decode(self, cmd: protocol.Command, msg: bytes) -> protocol.PayloadType:
+        if self._decode_slots is None:
+            self._decode_slots = asyncio.Semaphore(self._max_concurrent_decodes)
+        if self._executor is None:
+            # The node manages the lifecycle of the global executor
+            self._executor = ensure_global_asyncio_executor()
+
+        start = time.perf_counter()
+        async with self._decode_slots:
+            decoded_msg, decode_time = await asyncio.get_event_loop().run_in_executor(
+                self._executor,
+                _decode_msg,
+                type(cmd),
+                cmd.cmd_id_offset,
+                cmd.snappy_support,
+                msg,
+            )
+
+        self.num_offloaded_msgs += 1
+        self.offloaded_bytes += len(msg)
+        self.loop_stall_avoided += decode_time
+        self.decode_wait_time += time.perf_counter() - start
+        return decoded_msg
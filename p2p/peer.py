@@ -58,6 +58,7 @@ from p2p.exceptions import (
     UnknownProtocolCommand,
     UnreachablePeer,
 )
+from p2p.msg_decoding import OffloadedMsgDecoder
 from p2p.service import BaseService
 from p2p._utils import (
     get_devp2p_cmd_id,
@@ -162,7 +163,9 @@ class BasePeerBootManager(BaseService):
 
 
 class BasePeerContext:
-    pass
+    # Set to decode big messages from all peers sharing this context in the process pool, rather
+    # than on the event loop
+    msg_decoder: OffloadedMsgDecoder = None
 
 
 class BasePeer(BaseService):
@@ -422,12 +425,16 @@ class BasePeer(BaseService):
             )
             raise MalformedMessage from err
         cmd = self.get_protocol_command_for(msg)
-        # NOTE: This used to be a bottleneck but it doesn't seem to be so anymore. If we notice
-        # too much time is being spent on this again, we need to consider running this in a
-        # ProcessPoolExecutor(). Need to make sure we don't use all CPUs in the machine for that,
-        # though, otherwise asyncio's event loop can't run and we can't keep up with other peers.
+        # NOTE: Decoding big messages (e.g. BlockBodies, Receipts, NodeData) can stall the event
+        # loop, and with it all other peers. When the context has a msg_decoder, those are decoded
+        # in the process pool instead. Decryption always happens here, as the ingress MAC and the
+        # AES stream have to be updated in the order frames are received.
+        msg_decoder = self.context.msg_decoder
         try:
-            decoded_msg = cast(Dict[str, Any], cmd.decode(msg))
+            if msg_decoder is not None and msg_decoder.should_offload(msg):
+                decoded_msg = cast(Dict[str, Any], await self.wait(msg_decoder.decode(cmd, msg)))
+            else:
+                decoded_msg = cast(Dict[str, Any], cmd.decode(msg))
         except MalformedMessage as err:
             self.logger.debug(
                 "Malformed message from peer %s: CMD:%s Error: %r",
@@ -3,6 +3,7 @@ from abc import (
 )
 import asyncio
 import operator
+import time
 from typing import (
     AsyncIterator,
     AsyncIterable,
@@ -30,6 +31,7 @@ from lahja import (
 )
 
 from p2p.constants import (
+    DEFAULT_MAX_CONCURRENT_DIALS,
     DEFAULT_MAX_PEERS,
     DEFAULT_PEER_BOOT_TIMEOUT,
     DISCOVERY_EVENTBUS_ENDPOINT,
@@ -90,7 +92,8 @@ class BasePeerPool(BaseService, AsyncIterable[BasePeer]):
                  max_peers: int = DEFAULT_MAX_PEERS,
                  peer_info: BasePeerInfo = None,
                  token: CancelToken = None,
-                 event_bus: Endpoint = None
+                 event_bus: Endpoint = None,
+                 max_concurrent_dials: int = DEFAULT_MAX_CONCURRENT_DIALS,
                  ) -> None:
         super().__init__(token)
 
@@ -107,6 +110,17 @@ class BasePeerPool(BaseService, AsyncIterable[BasePeer]):
         self._subscribers: List[PeerSubscriber] = []
         self.event_bus = event_bus
 
+        self.max_concurrent_dials = max_concurrent_dials
+        # Peers which completed the handshake, and are still booting
+        self._num_booting_peers = 0
+
+        # Dialing metrics
+        self.num_dials = 0
+        self.num_successful_dials = 0
+        self._created_at = time.monotonic()
+        # How long (in seconds) it took to fill the pool for the first time
+        self.time_to_full_pool: float = None
+
     async def accept_connect_commands(self) -> None:
         async for command in self.wait_iter(self.event_bus.stream(ConnectToNodeCommand)):
             self.logger.debug('Received request to connect to %s', command.node)
@@ -178,6 +192,20 @@ class BasePeerPool(BaseService, AsyncIterable[BasePeer]):
     def is_full(self) -> bool:
         return len(self) >= self.max_peers
 
+    @property
+    def dial_success_rate(self) -> float:
+        if self.num_dials:
+            return self.num_successful_dials / self.num_dials
+        else:
+            return 0.0
+
+    @property
+    def capabilities(self) -> Tuple[str, ...]:
+        return tuple(
+            f'{proto.name}/{proto.version}'
+            for proto in self.get_peer_factory().peer_class._supported_sub_protocols
+        )
+
     def is_valid_connection_candidate(self, candidate: Node) -> bool:
         # connect to no more then 2 nodes with the same IP
         nodes_by_ip = groupby(
@@ -228,6 +256,9 @@ class BasePeerPool(BaseService, AsyncIterable[BasePeer]):
         """
         self.logger.info('Adding %s to pool', peer)
         self.connected_nodes[peer.remote] = peer
+        if self.is_full and self.time_to_full_pool is None:
+            self.time_to_full_pool = time.monotonic() - self._created_at
+            self.logger.info("Peer pool filled up in %.1fs", self.time_to_full_pool)
         peer.add_finished_callback(self._peer_finished)
         for subscriber in self._subscribers:
             subscriber.register_peer(peer)
@@ -242,6 +273,7 @@ class BasePeerPool(BaseService, AsyncIterable[BasePeer]):
             self.run_daemon_task(self.handle_peer_count_requests())
             self.run_daemon_task(self.maybe_connect_more_peers())
             self.run_daemon_task(self.accept_connect_commands())
+        self.run_task(self.connect_to_good_nodes())
         self.run_daemon_task(self._periodically_report_stats())
         await self.cancel_token.wait()
 
@@ -255,10 +287,13 @@ class BasePeerPool(BaseService, AsyncIterable[BasePeer]):
     async def _cleanup(self) -> None:
         await self.stop_all_peers()
 
-    async def connect(self, remote: Node) -> BasePeer:
+    async def connect(self, remote: Node, token: CancelToken = None) -> BasePeer:
         """
         Connect to the given remote and return a Peer instance when successful.
         Returns None if the remote is unreachable, times out or is useless.
+
+        Raises OperationCancelled if the given token (or ours) is triggered before the handshake
+        is complete.
         """
         if remote in self.connected_nodes:
             self.logger.debug2("Skipping %s; already connected to it", remote)
@@ -272,10 +307,12 @@ class BasePeerPool(BaseService, AsyncIterable[BasePeer]):
         )
         try:
             self.logger.debug2("Connecting to %s...", remote)
+            self.num_dials += 1
             # We use self.wait() as well as passing our CancelToken to handshake() as a workaround
             # for https://github.com/ethereum/py-evm/issues/670.
-            peer = await self.wait(handshake(remote, self.get_peer_factory()))
+            peer = await self.wait(handshake(remote, self.get_peer_factory()), token=token)
 
+            self.num_successful_dials += 1
             return peer
         except OperationCancelled:
             # Pass it on to instruct our main loop to stop.
@@ -302,16 +339,76 @@ class BasePeerPool(BaseService, AsyncIterable[BasePeer]):
         return None
 
     async def connect_to_nodes(self, nodes: Iterator[Node]) -> None:
+        """
+        Dial the given nodes, up to ``max_concurrent_dials`` of them at a time, until the pool is
+        full. The dials still in progress at that point are cancelled.
+        """
+        if self._has_free_slots:
+            nodes = iter(nodes)
+            dials_token = CancelToken('PeerPoolDials')
+            await asyncio.gather(*(
+                self._dial_nodes(nodes, dials_token)
+                for _ in range(self.max_concurrent_dials)
+            ))
+
+    async def connect_to_good_nodes(self) -> None:
+        """
+        Dial the best of the peers we were connected to before a restart, without waiting for
+        discovery to find new ones.
+        """
+        # Ask for more nodes than we have slots, as some of them will have gone away
+        nodes = self.peer_info.get_good_nodes(self.capabilities, self.max_peers * 2)
+        if nodes:
+            self.logger.info("Dialing %d peers we were connected to before", len(nodes))
+            await self.connect_to_nodes(iter(nodes))
+
+    def record_good_peer(self, peer: BasePeer) -> None:
+        """
+        Remember the given peer in our :class:`~p2p.persistence.BasePeerInfo`, so that we dial it
+        first after a restart.
+        """
+        self.peer_info.record_success(
+            peer.remote,
+            f'{peer.sub_proto.name}/{peer.sub_proto.version}',
+        )
+
+    @property
+    def _has_free_slots(self) -> bool:
+        # Peers which are booting will take a slot as well, unless they fail to boot
+        return self.is_operational and len(self) + self._num_booting_peers < self.max_peers
+
+    async def _dial_nodes(self, nodes: Iterator[Node], dials_token: CancelToken) -> None:
+        """
+        Dial the given nodes one by one, sharing them with the other dials of the same
+        connect_to_nodes() call, and cancel all of them once the pool is full.
+        """
         for node in nodes:
-            if self.is_full or not self.is_operational:
+            if not self._has_free_slots:
+                dials_token.trigger()
                 return
 
             # TODO: Consider changing connect() to raise an exception instead of returning None,
             # as discussed in
             # https://github.com/ethereum/py-evm/pull/139#discussion_r152067425
-            peer = await self.connect(node)
-            if peer is not None:
+            try:
+                peer = await self.connect(node, dials_token)
+            except OperationCancelled:
+                if dials_token.triggered and not self.cancel_token.triggered:
+                    # Another dial filled up the pool
+                    return
+                raise
+            if peer is None:
+                continue
+            elif not self._has_free_slots:
+                self.logger.debug("Pool filled up while connecting to %s, disconnecting", peer)
+                await peer.disconnect(DisconnectReason.too_many_peers)
+                return
+
+            self._num_booting_peers += 1
+            try:
                 await self.start_peer(peer)
+            finally:
+                self._num_booting_peers -= 1
 
     def _peer_finished(self, peer: BaseService) -> None:
         """Remove the given peer from our list of connected nodes.
@@ -321,6 +418,7 @@ class BasePeerPool(BaseService, AsyncIterable[BasePeer]):
         if peer.remote in self.connected_nodes:
             self.logger.info("%s finished, removing from pool", peer)
             self.connected_nodes.pop(peer.remote)
+            self.record_good_peer(peer)
         else:
             self.logger.warning(
                 "%s finished but was not found in connected_nodes (%s)", peer, self.connected_nodes)
@@ -336,6 +434,12 @@ class BasePeerPool(BaseService, AsyncIterable[BasePeer]):
                 [peer for peer in self.connected_nodes.values() if peer.inbound])
             self.logger.info("Connected peers: %d inbound, %d outbound",
                              inbound_peers, (len(self.connected_nodes) - inbound_peers))
+            self.logger.info(
+                "Dials: %d, %.0f%% successful, pool filled up in: %s",
+                self.num_dials,
+                self.dial_success_rate * 100,
+                "never" if self.time_to_full_pool is None else f"{self.time_to_full_pool:.1f}s",
+            )
             subscribers = len(self._subscribers)
             if subscribers:
                 longest_queue = max(
@@ -343,6 +447,16 @@ class BasePeerPool(BaseService, AsyncIterable[BasePeer]):
                 self.logger.info(
                     "Peer subscribers: %d, longest queue: %s(%d)",
                     subscribers, longest_queue.__class__.__name__, longest_queue.queue_size)
+            msg_decoder = self.context.msg_decoder
+            if msg_decoder is not None and msg_decoder.num_offloaded_msgs:
+                self.logger.info(
+                    "Offloaded msg decoding: %d msgs (%d KB), loop stall avoided: %.2fs, "
+                    "waited: %.2fs",
+                    msg_decoder.num_offloaded_msgs,
+                    msg_decoder.offloaded_bytes // 1024,
+                    msg_decoder.loop_stall_avoided,
+                    msg_decoder.decode_wait_time,
+                )
 
             self.logger.debug("== Peer details == ")
             for peer in self.connected_nodes.values():
@@ -350,6 +464,7 @@ class BasePeerPool(BaseService, AsyncIterable[BasePeer]):
                     self.logger.warning(
                         "%s is no longer alive but has not been removed from pool", peer)
                     continue
+                self.record_good_peer(peer)
                 most_received_type, count = max(
                     peer.received_msgs.items(), key=operator.itemgetter(1))
                 self.logger.debug(
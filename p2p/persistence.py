@@ -3,8 +3,23 @@ from collections import namedtuple
 import datetime
 import functools
 from pathlib import Path
+import queue
 import sqlite3
-from typing import Any, Callable, TypeVar, cast, Dict, Type, Optional
+import threading
+import time
+from typing import (
+    Any,
+    Callable,
+    TypeVar,
+    cast,
+    Dict,
+    List,
+    Sequence,
+    Tuple,
+    Type,
+    Optional,
+    Union,
+)
 
 from trinity._utils.logging import HasExtendedDebugLogger
 
@@ -20,9 +35,17 @@ from p2p.exceptions import (
 
 
 BadNode = namedtuple('BadNode', ['enode', 'until', 'reason', 'error_count'])
+GoodNode = namedtuple(
+    'GoodNode',
+    ['enode', 'capability', 'head_hash', 'head_number', 'head_td', 'throughput', 'last_seen'],
+)
 
 
 ONE_DAY = 60 * 60 * 24
+# Peers we have not been connected to for this long are forgotten
+GOOD_NODE_EXPIRY = 7 * ONE_DAY
+# How often (in seconds) AsyncSQLitePeerInfo commits the records it was given
+PEER_INFO_FLUSH_INTERVAL = 5
 FAILURE_TIMEOUTS: Dict[Type[Exception], int] = {
     HandshakeFailure: 10,  # 10 seconds
     WrongNetworkFailure: ONE_DAY,
@@ -62,6 +85,29 @@ class BasePeerInfo(ABC, HasExtendedDebugLogger):
     def should_connect_to(self, remote: Node) -> bool:
         pass
 
+    @abstractmethod
+    def record_success(self,
+                       remote: Node,
+                       capability: str,
+                       throughput: float = 0.0,
+                       head_hash: bytes = None,
+                       head_number: int = None,
+                       head_td: int = None) -> None:
+        """
+        Remember that we were connected to ``remote`` using the given sub-protocol capability
+        (e.g. ``eth/63``), along with the head it announced and the best throughput (in items per
+        second) it served us.
+        """
+        pass
+
+    @abstractmethod
+    def get_good_nodes(self, capabilities: Sequence[str], limit: int) -> Tuple[Node, ...]:
+        """
+        Return up to ``limit`` of the nodes we were recently connected to with one of the given
+        capabilities, the ones with the highest throughput first.
+        """
+        pass
+
 
 class NoopPeerInfo(BasePeerInfo):
     def record_failure(self, remote: Node, failure: BaseP2PError) -> None:
@@ -70,6 +116,18 @@ class NoopPeerInfo(BasePeerInfo):
     def should_connect_to(self, remote: Node) -> bool:
         return True
 
+    def record_success(self,
+                       remote: Node,
+                       capability: str,
+                       throughput: float = 0.0,
+                       head_hash: bytes = None,
+                       head_number: int = None,
+                       head_td: int = None) -> None:
+        pass
+
+    def get_good_nodes(self, capabilities: Sequence[str], limit: int) -> Tuple[Node, ...]:
+        return ()
+
 
 class ClosedException(Exception):
     'This should never happen, this represents a logic error somewhere in the code'
@@ -153,6 +211,111 @@ class SQLitePeerInfo(BasePeerInfo):
 
         return True
 
+    @must_be_open
+    def record_success(self,
+                       remote: Node,
+                       capability: str,
+                       throughput: float = 0.0,
+                       head_hash: bytes = None,
+                       head_number: int = None,
+                       head_td: int = None) -> None:
+        good_node = GoodNode(
+            remote.uri(),
+            capability,
+            head_hash,
+            head_number,
+            head_td,
+            throughput,
+            time_to_str(datetime.datetime.utcnow()),
+        )
+        with self.db:
+            self._replace_good_nodes((good_node,))
+
+    @must_be_open
+    def get_good_nodes(self, capabilities: Sequence[str], limit: int) -> Tuple[Node, ...]:
+        if not capabilities:
+            return ()
+        self._delete_expired_good_nodes()
+
+        placeholders = ', '.join('?' * len(capabilities))
+        cursor = self.db.execute(
+            f'''
+            SELECT enode FROM good_nodes
+            WHERE capability IN ({placeholders})
+            ORDER BY throughput DESC, last_seen DESC
+            LIMIT ?
+            ''',
+            (*capabilities, limit),
+        )
+        return tuple(Node.from_uri(row['enode']) for row in cursor)
+
+    @must_be_open
+    def write_batch(self, bad_nodes: Sequence[BadNode], good_nodes: Sequence[GoodNode]) -> None:
+        """
+        Replace the records of the given nodes, all in a single transaction.
+        """
+        with self.db:
+            self.db.executemany(
+                'DELETE FROM bad_nodes WHERE enode = ?',
+                ((bad_node.enode,) for bad_node in bad_nodes),
+            )
+            self.db.executemany(
+                '''
+                INSERT INTO bad_nodes (enode, until, reason, error_count)
+                VALUES (?, ?, ?, ?)
+                ''',
+                bad_nodes,
+            )
+            self._replace_good_nodes(good_nodes)
+
+    def _replace_good_nodes(self, good_nodes: Sequence[GoodNode]) -> None:
+        self.db.executemany(
+            '''
+            INSERT OR REPLACE INTO good_nodes
+            (enode, capability, head_hash, head_number, head_td, throughput, last_seen)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''',
+            (
+                # total difficulties do not fit in sqlite integers
+                good_node._replace(
+                    head_td=None if good_node.head_td is None else str(good_node.head_td),
+                )
+                for good_node in good_nodes
+            ),
+        )
+
+    def _delete_expired_good_nodes(self) -> None:
+        expired = datetime.datetime.utcnow() - datetime.timedelta(seconds=GOOD_NODE_EXPIRY)
+        with self.db:
+            self.db.execute(
+                'DELETE FROM good_nodes WHERE last_seen < ?',
+                (time_to_str(expired),),
+            )
+
+    def _fetch_all_bad_nodes(self) -> Tuple[BadNode, ...]:
+        cursor = self.db.execute('SELECT * from bad_nodes')
+        return tuple(
+            BadNode(row['enode'], row['until'], row['reason'], row['error_count'])
+            for row in cursor
+        )
+
+    def _fetch_all_good_nodes(self) -> Tuple[GoodNode, ...]:
+        self._delete_expired_good_nodes()
+        cursor = self.db.execute('SELECT * from good_nodes')
+        return tuple(self._row_to_good_node(row) for row in cursor)
+
+    @staticmethod
+    def _row_to_good_node(row: sqlite3.Row) -> GoodNode:
+        return GoodNode(
+            row['enode'],
+            row['capability'],
+            row['head_hash'],
+            row['head_number'],
+            None if row['head_td'] is None else int(row['head_td']),
+            row['throughput'],
+            row['last_seen'],
+        )
+
     def _fetch_bad_node(self, remote: Node) -> Optional[BadNode]:
         enode = remote.uri()
         cursor = self.db.execute('SELECT * from bad_nodes WHERE enode = ?', (enode,))
@@ -199,16 +362,28 @@ class SQLitePeerInfo(BasePeerInfo):
     @must_be_open
     def setup_schema(self) -> None:
         try:
-            if self._schema_already_created():
-                return
+            schema_already_created = self._schema_already_created()
         except Exception:
             self.close()
             raise
 
         with self.db:
-            self.db.execute('create table bad_nodes (enode, until, reason, error_count)')
-            self.db.execute('create table schema_version (version)')
-            self.db.execute('insert into schema_version VALUES (1)')
+            if not schema_already_created:
+                self.db.execute('create table bad_nodes (enode, until, reason, error_count)')
+                self.db.execute('create table schema_version (version)')
+                self.db.execute('insert into schema_version VALUES (1)')
+            # Added after the first version of the schema, without breaking older databases
+            self.db.execute('''
+                create table if not exists good_nodes (
+                    enode PRIMARY KEY,
+                    capability,
+                    head_hash,
+                    head_number,
+                    head_td,
+                    throughput,
+                    last_seen
+                )
+            ''')
 
     def _schema_already_created(self) -> bool:
         "Inspects the database to see if the expected tables already exist"
@@ -250,3 +425,181 @@ class MemoryPeerInfo(SQLitePeerInfo):
 
     def __str__(self) -> str:
         return '<MemoryPeerInfo()>'
+
+
+# Put in the write queue of AsyncSQLitePeerInfo to make the writer thread stop
+_STOP_WRITER = None
+
+
+class AsyncSQLitePeerInfo(BasePeerInfo):
+    """
+    Keep the same records as :class:`SQLitePeerInfo`, without ever querying the database from
+    the event loop after it is loaded: lookups are answered from an in-memory copy of it, and
+    the records are queued to a background thread, which commits them in batches, at most every
+    ``flush_interval`` seconds.
+    """
+    def __init__(self, path: Path, flush_interval: float = PEER_INFO_FLUSH_INTERVAL) -> None:
+        self.path = path
+        self.closed = False
+
+        peer_info = SQLitePeerInfo(path)
+        try:
+            self._bad_nodes: Dict[str, BadNode] = {
+                bad_node.enode: bad_node for bad_node in peer_info._fetch_all_bad_nodes()
+            }
+            self._good_nodes: Dict[str, GoodNode] = {
+                good_node.enode: good_node for good_node in peer_info._fetch_all_good_nodes()
+            }
+        finally:
+            peer_info.close()
+
+        self._writes: 'queue.Queue[Union[BadNode, GoodNode, threading.Event, None]]'
+        self._writes = queue.Queue()
+        self._writer = threading.Thread(
+            target=self._write_batches,
+            args=(flush_interval,),
+            name=str(self),
+            daemon=True,
+        )
+        self._writer.start()
+
+    def __str__(self) -> str:
+        return f'<AsyncSQLitePeerInfo({self.path})>'
+
+    @must_be_open
+    def record_failure(self, remote: Node, failure: BaseP2PError) -> None:
+        enode = remote.uri()
+        previous = self._bad_nodes.get(enode)
+        error_count = 1 if previous is None else previous.error_count + 1
+        timeout = timeout_for_failure(failure) * error_count
+        usable_time = datetime.datetime.utcnow() + datetime.timedelta(seconds=timeout)
+        reason = type(failure).__name__
+        self.logger.debug(
+            '%s will not be retried until %s because %s',
+            remote, utc_to_local(usable_time), reason,
+        )
+
+        bad_node = BadNode(enode, time_to_str(usable_time), reason, error_count)
+        self._bad_nodes[enode] = bad_node
+        self._writes.put_nowait(bad_node)
+
+    @must_be_open
+    def should_connect_to(self, remote: Node) -> bool:
+        bad_node = self._bad_nodes.get(remote.uri())
+        if not bad_node:
+            return True
+
+        until = str_to_time(bad_node.until)
+        if datetime.datetime.utcnow() < until:
+            self.logger.debug(
+                'skipping %s, it failed because "%s" and is not usable until %s',
+                remote, bad_node.reason, utc_to_local(until)
+            )
+            return False
+
+        return True
+
+    @must_be_open
+    def record_success(self,
+                       remote: Node,
+                       capability: str,
+                       throughput: float = 0.0,
+                       head_hash: bytes = None,
+                       head_number: int = None,
+                       head_td: int = None) -> None:
+        good_node = GoodNode(
+            remote.uri(),
+            capability,
+            head_hash,
+            head_number,
+            head_td,
+            throughput,
+            time_to_str(datetime.datetime.utcnow()),
+        )
+        self._good_nodes[good_node.enode] = good_node
+        self._writes.put_nowait(good_node)
+
+    @must_be_open
+    def get_good_nodes(self, capabilities: Sequence[str], limit: int) -> Tuple[Node, ...]:
+        expired = time_to_str(
+            datetime.datetime.utcnow() - datetime.timedelta(seconds=GOOD_NODE_EXPIRY)
+        )
+        good_nodes = sorted(
+            (
+                good_node for good_node in self._good_nodes.values()
+                if good_node.capability in capabilities and good_node.last_seen >= expired
+            ),
+            key=lambda good_node: (good_node.throughput, good_node.last_seen),
+            reverse=True,
+        )
+        return tuple(Node.from_uri(good_node.enode) for good_node in good_nodes[:limit])
+
+    @must_be_open
+    def flush(self) -> None:
+        """
+        Block until all the records made so far are committed to the database.
+        """
+        flushed = threading.Event()
+        self._writes.put_nowait(flushed)
+        flushed.wait()
+
+    def close(self) -> None:
+        """
+        Commit the pending records and stop the writer thread.
+        """
+        if self.closed:
+            return
+        self.closed = True
+        self._writes.put_nowait(_STOP_WRITER)
+        self._writer.join()
+
+    def _write_batches(self, flush_interval: float) -> None:
+        # SQLite connections may only be used in the thread which opened them
+        peer_info = SQLitePeerInfo(self.path)
+        try:
+            while True:
+                writes = self._get_next_batch(flush_interval)
+                # Only the latest record of each node needs to be written
+                bad_nodes = {
+                    write.enode: write for write in writes if isinstance(write, BadNode)
+                }
+                good_nodes = {
+                    write.enode: write for write in writes if isinstance(write, GoodNode)
+                }
+                if bad_nodes or good_nodes:
+                    try:
+                        peer_info.write_batch(tuple(bad_nodes.values()), tuple(good_nodes.values()))
+                    except sqlite3.Error:
+                        self.logger.exception("Failed to write peer records to %s", self.path)
+                    else:
+                        self.logger.debug2(
+                            "Wrote %d bad and %d good nodes to %s",
+                            len(bad_nodes), len(good_nodes), self.path,
+                        )
+
+                for write in writes:
+                    if isinstance(write, threading.Event):
+                        write.set()
+                if writes[-1] is _STOP_WRITER:
+                    return
+        finally:
+            peer_info.close()
+
+    def _get_next_batch(
+            self,
+            flush_interval: float) -> List[Union[BadNode, GoodNode, threading.Event, None]]:
+        """
+        Wait for a write, then collect the ones made in the following ``flush_interval`` seconds,
+        unless a flush or stop is requested earlier.
+        """
+        writes = [self._writes.get()]
+        deadline = time.monotonic() + flush_interval
+        while isinstance(writes[-1], tuple):
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                writes.append(self._writes.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return writes
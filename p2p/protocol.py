@@ -139,7 +139,13 @@ class Command:
             return raw_payload
 
     def encode(self, data: PayloadType) -> Tuple[bytes, bytes]:
-        encoded_payload = self.encode_payload(data)
+        return self.encode_rlp_payload(self.encode_payload(data))
+
+    def encode_rlp_payload(self, encoded_payload: bytes) -> Tuple[bytes, bytes]:
+        """
+        Return the header and body of a message with a payload that is already RLP encoded
+        according to this command's structure.
+        """
         compressed_payload = self.compress_payload(encoded_payload)
 
         enc_cmd_id = rlp.encode(self.cmd_id, sedes=rlp.sedes.big_endian_int)
@@ -0,0 +1,61 @@
+import asyncio
+import time
+
+from p2p.exceptions import NotEnoughTokens
+
+
+class TokenBucket:
+    """
+    Limit the rate of some operation, while allowing bursts of up to ``capacity`` tokens.
+
+    The bucket starts full, and is refilled at ``rate`` tokens per second, up to its capacity.
+    Each operation takes as many tokens from it as it costs.
+    """
+    def __init__(self, rate: float, capacity: float) -> None:
+        if rate <= 0:
+            raise ValueError("The rate of a TokenBucket must be positive")
+        if capacity <= 0:
+            raise ValueError("The capacity of a TokenBucket must be positive")
+        self.rate = rate
+        self.capacity = capacity
+        self._num_tokens = capacity
+        self._last_refill = time.perf_counter()
+        self._take_lock = asyncio.Lock()
+
+    def get_num_tokens(self) -> float:
+        """
+        Return the number of tokens currently in the bucket.
+        """
+        now = time.perf_counter()
+        self._num_tokens = min(
+            self.capacity,
+            self._num_tokens + (now - self._last_refill) * self.rate,
+        )
+        self._last_refill = now
+        return self._num_tokens
+
+    def can_take(self, num: float = 1) -> bool:
+        return self.get_num_tokens() >= num
+
+    def take_nowait(self, num: float = 1) -> None:
+        """
+        Take ``num`` tokens from the bucket, or raise NotEnoughTokens if there are not enough of
+        them.
+        """
+        if not self.can_take(num):
+            raise NotEnoughTokens(f"Not enough tokens: {self._num_tokens:.2f} < {num}")
+        self._num_tokens -= num
+
+    async def take(self, num: float = 1) -> None:
+        """
+        Take ``num`` tokens from the bucket, waiting until there are enough of them.
+
+        Concurrent calls take their tokens in the order they were made.
+        """
+        if num > self.capacity:
+            raise ValueError(f"Cannot take {num} tokens from a bucket of capacity {self.capacity}")
+
+        async with self._take_lock:
+            while not self.can_take(num):
+                await asyncio.sleep((num - self._num_tokens) / self.rate)
+            self._num_tokens -= num
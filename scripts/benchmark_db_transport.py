@@ -0,0 +1,152 @@
+"""Compare the BaseManager and framed DB transports on header and trie-node shaped workloads.
+
+Run with `python -m scripts.benchmark_db_transport [-n <num-items>]`.
+"""
+import argparse
+import asyncio
+import logging
+from multiprocessing.managers import (  # type: ignore
+    BaseManager,
+)
+import os
+from pathlib import Path
+import tempfile
+import time
+from typing import (
+    Awaitable,
+    Callable,
+    Dict,
+    Sequence,
+)
+
+from eth_hash.auto import keccak
+
+from eth.db.atomic import AtomicDB
+
+from trinity.db.base import (
+    AsyncDBProxy,
+    BaseAsyncDB,
+    BatchedAtomicDB,
+)
+from trinity.db.framed import (
+    FramedDBClient,
+    FramedDBServer,
+)
+from trinity._utils.ipc import (
+    kill_process_gracefully,
+    wait_for_ipc,
+)
+from trinity._utils.mp import (
+    TracebackRecorder,
+    ctx,
+)
+
+
+# Roughly the size of an RLP encoded mainnet header, and of a typical branch node
+HEADER_SIZE = 540
+TRIE_NODE_SIZE = 532
+
+# How many items are requested in a single multi-key call, matching MAX_HEADERS_FETCH and
+# MAX_STATE_FETCH respectively
+HEADER_BATCH_SIZE = 192
+TRIE_NODE_BATCH_SIZE = 384
+
+
+def make_workload(num_items: int, value_size: int) -> Dict[bytes, bytes]:
+    return {
+        keccak(value): value
+        for value in (os.urandom(value_size) for _ in range(num_items))
+    }
+
+
+def serve(manager_ipc_path: Path, framed_ipc_path: Path, data: Dict[bytes, bytes]) -> None:
+    db = AtomicDB()
+    for key, value in data.items():
+        db[key] = value
+
+    FramedDBServer(db).serve_in_thread(framed_ipc_path)
+
+    class DBManager(BaseManager):
+        pass
+
+    batched_db = BatchedAtomicDB(db)
+    DBManager.register(
+        'get_db', callable=lambda: TracebackRecorder(batched_db), proxytype=AsyncDBProxy)
+    manager = DBManager(address=str(manager_ipc_path))  # type: ignore
+    manager.get_server().serve_forever()
+
+
+async def time_it(label: str,
+                  num_items: int,
+                  run: Callable[[], Awaitable[None]]) -> None:
+    start = time.perf_counter()
+    await run()
+    elapsed = time.perf_counter() - start
+    logging.info("%-45s %8.0f items/s", label, num_items / elapsed)
+
+
+async def run_workload(name: str,
+                       db: BaseAsyncDB,
+                       keys: Sequence[bytes],
+                       batch_size: int) -> None:
+    async def one_at_a_time() -> None:
+        for key in keys:
+            await db.coro_get_many((key,))
+
+    async def concurrently() -> None:
+        for offset in range(0, len(keys), batch_size):
+            await asyncio.gather(*(
+                db.coro_get_many((key,)) for key in keys[offset:offset + batch_size]
+            ))
+
+    async def batched() -> None:
+        for offset in range(0, len(keys), batch_size):
+            await db.coro_get_many(tuple(keys[offset:offset + batch_size]))
+
+    await time_it(f"{name}: sequential single-key gets", len(keys), one_at_a_time)
+    await time_it(f"{name}: concurrent single-key gets", len(keys), concurrently)
+    await time_it(f"{name}: multi-key gets of {batch_size}", len(keys), batched)
+
+
+async def main(num_items: int) -> None:
+    headers = make_workload(num_items, HEADER_SIZE)
+    trie_nodes = make_workload(num_items, TRIE_NODE_SIZE)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manager_ipc_path = Path(temp_dir) / 'db.ipc'
+        framed_ipc_path = Path(temp_dir) / 'db-framed.ipc'
+        server = ctx.Process(
+            target=serve,
+            args=(manager_ipc_path, framed_ipc_path, {**headers, **trie_nodes}),
+        )
+        server.start()
+        try:
+            wait_for_ipc(manager_ipc_path)
+
+            class DBManager(BaseManager):
+                pass
+
+            DBManager.register('get_db', proxytype=AsyncDBProxy)
+            manager = DBManager(address=str(manager_ipc_path))  # type: ignore
+            manager.connect()
+
+            transports = (
+                ('manager', manager.get_db()),  # type: ignore
+                ('framed', FramedDBClient(framed_ipc_path)),
+            )
+            for transport_name, db in transports:
+                await run_workload(
+                    f"{transport_name} headers", db, tuple(headers), HEADER_BATCH_SIZE)
+                await run_workload(
+                    f"{transport_name} trie nodes", db, tuple(trie_nodes), TRIE_NODE_BATCH_SIZE)
+        finally:
+            kill_process_gracefully(server, logging.getLogger())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    parser = argparse.ArgumentParser()
+    parser.add_argument('-n', type=int, default=5000, help="Number of items in each workload")
+    args = parser.parse_args()
+
+    asyncio.get_event_loop().run_until_complete(main(args.n))
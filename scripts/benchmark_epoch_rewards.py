@@ -0,0 +1,314 @@
+"""Compare the pure-Python and the NumPy implementations of the Serenity justification and
+finalization rewards and penalties, with and without an inactivity leak.
+
+Run with `python -m scripts.benchmark_epoch_rewards [-n <num-validators> ...]`.
+"""
+import argparse
+import logging
+import random
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Sequence,
+    Tuple,
+)
+
+from eth.constants import ZERO_HASH32
+
+from eth2.beacon.constants import FAR_FUTURE_EPOCH
+from eth2.beacon.datastructures.inclusion_info import InclusionInfo
+from eth2.beacon.epoch_processing_helpers import (
+    get_base_reward,
+    get_effective_balance,
+)
+from eth2.beacon.helpers import (
+    get_active_validator_indices,
+    get_epoch_start_slot,
+)
+from eth2.beacon.state_machines.forks.serenity import (
+    epoch_processing,
+)
+from eth2.beacon.state_machines.forks.serenity.configs import SERENITY_CONFIG
+from eth2.beacon.state_machines.forks.serenity.vectorized_epoch_processing import (
+    ValidatorArrays,
+    compute_inactivity_leak_deltas,
+    compute_normal_justification_and_finalization_deltas,
+    get_base_rewards,
+    get_inclusion_arrays,
+    to_mask,
+)
+from eth2.beacon.types.states import BeaconState
+from eth2.beacon.types.validator_records import ValidatorRecord
+from eth2.beacon.typing import (
+    Gwei,
+    ValidatorIndex,
+)
+
+
+config = SERENITY_CONFIG
+
+CURRENT_EPOCH = 10
+# Finalized epochs giving the normal case, and an inactivity leak
+NORMAL_FINALIZED_EPOCH = CURRENT_EPOCH - 2
+LEAK_FINALIZED_EPOCH = CURRENT_EPOCH - 8
+
+
+def make_state(num_validators: int, finalized_epoch: int) -> BeaconState:
+    previous_epoch = CURRENT_EPOCH - 1
+    validators = tuple(
+        ValidatorRecord(
+            pubkey=index.to_bytes(48, 'little'),
+            withdrawal_credentials=ZERO_HASH32,
+            activation_epoch=config.GENESIS_EPOCH,
+            exit_epoch=FAR_FUTURE_EPOCH,
+            withdrawable_epoch=FAR_FUTURE_EPOCH,
+            initiated_exit=False,
+            slashed=False,
+        ) if random.random() > 0.05 else ValidatorRecord(
+            pubkey=index.to_bytes(48, 'little'),
+            withdrawal_credentials=ZERO_HASH32,
+            activation_epoch=config.GENESIS_EPOCH,
+            exit_epoch=previous_epoch - 1,
+            withdrawable_epoch=previous_epoch + 100,
+            initiated_exit=True,
+            slashed=True,
+        )
+        for index in range(num_validators)
+    )
+    return BeaconState.create_filled_state(
+        genesis_epoch=config.GENESIS_EPOCH,
+        genesis_start_shard=config.GENESIS_START_SHARD,
+        genesis_slot=config.GENESIS_SLOT,
+        shard_count=config.SHARD_COUNT,
+        latest_block_roots_length=config.LATEST_BLOCK_ROOTS_LENGTH,
+        latest_active_index_roots_length=config.LATEST_ACTIVE_INDEX_ROOTS_LENGTH,
+        latest_randao_mixes_length=config.LATEST_RANDAO_MIXES_LENGTH,
+        latest_slashed_exit_length=config.LATEST_SLASHED_EXIT_LENGTH,
+        activated_genesis_validators=validators,
+        genesis_balances=tuple(
+            Gwei(random.randint(config.MAX_DEPOSIT_AMOUNT // 2, 2 * config.MAX_DEPOSIT_AMOUNT))
+            for _ in validators
+        ),
+    ).copy(
+        slot=get_epoch_start_slot(CURRENT_EPOCH, config.SLOTS_PER_EPOCH),
+        finalized_epoch=finalized_epoch,
+    )
+
+
+def make_attesters(state: BeaconState) -> Dict[str, Any]:
+    """
+    Pick random attesters amongst the validators active during the previous epoch, with random
+    inclusion slots, and a random proposer for each inclusion slot.
+    """
+    previous_epoch = state.previous_epoch(config.SLOTS_PER_EPOCH, config.GENESIS_EPOCH)
+    active_indices = set(get_active_validator_indices(state.validator_registry, previous_epoch))
+    attester_indices = set(index for index in active_indices if random.random() < 0.9)
+    previous_epoch_start_slot = get_epoch_start_slot(previous_epoch, config.SLOTS_PER_EPOCH)
+    inclusion_infos = {}
+    for index in attester_indices:
+        attestation_slot = previous_epoch_start_slot + random.randrange(config.SLOTS_PER_EPOCH)
+        inclusion_infos[index] = InclusionInfo(
+            attestation_slot + config.MIN_ATTESTATION_INCLUSION_DELAY + random.randint(0, 3),
+            attestation_slot,
+        )
+    proposers = {
+        info.inclusion_slot: ValidatorIndex(random.randrange(state.num_validators))
+        for info in inclusion_infos.values()
+    }
+    return dict(
+        active_indices=active_indices,
+        attester_indices=attester_indices,
+        boundary_attester_indices=set(
+            index for index in attester_indices if random.random() < 0.9
+        ),
+        head_attester_indices=set(index for index in attester_indices if random.random() < 0.9),
+        inclusion_infos=inclusion_infos,
+        proposers=proposers,
+    )
+
+
+def reference_deltas(state: BeaconState,
+                     attesters: Dict[str, Any]) -> Tuple[Dict[int, int], Dict[int, int]]:
+    previous_total_balance = Gwei(sum(
+        get_effective_balance(state.validator_balances, index, config.MAX_DEPOSIT_AMOUNT)
+        for index in attesters['active_indices']
+    ))
+    effective_balances = {
+        ValidatorIndex(index): get_effective_balance(
+            state.validator_balances,
+            ValidatorIndex(index),
+            config.MAX_DEPOSIT_AMOUNT,
+        )
+        for index in range(state.num_validators)
+    }
+    base_rewards = {
+        ValidatorIndex(index): get_base_reward(
+            state=state,
+            index=ValidatorIndex(index),
+            base_reward_quotient=config.BASE_REWARD_QUOTIENT,
+            previous_total_balance=previous_total_balance,
+            max_deposit_amount=config.MAX_DEPOSIT_AMOUNT,
+        )
+        for index in range(state.num_validators)
+    }
+    epochs_since_finality = state.next_epoch(config.SLOTS_PER_EPOCH) - state.finalized_epoch
+    if epochs_since_finality <= 4:
+        return epoch_processing._compute_normal_justification_and_finalization_deltas(
+            state,
+            config,
+            attesters['active_indices'],
+            previous_total_balance,
+            attesters['attester_indices'],
+            attesters['boundary_attester_indices'],
+            attesters['head_attester_indices'],
+            attesters['inclusion_infos'],
+            effective_balances,
+            base_rewards,
+        )
+    else:
+        return epoch_processing._compute_inactivity_leak_deltas(
+            state,
+            config,
+            attesters['active_indices'],
+            attesters['attester_indices'],
+            attesters['boundary_attester_indices'],
+            attesters['head_attester_indices'],
+            attesters['inclusion_infos'],
+            effective_balances,
+            base_rewards,
+            epochs_since_finality,
+        )
+
+
+def vectorized_deltas(state: BeaconState,
+                      attesters: Dict[str, Any]) -> Tuple[Sequence[int], Sequence[int]]:
+    num_validators = state.num_validators
+    validator_arrays = ValidatorArrays.from_state(state, config.MAX_DEPOSIT_AMOUNT)
+    active_mask = validator_arrays.active_mask(
+        state.previous_epoch(config.SLOTS_PER_EPOCH, config.GENESIS_EPOCH),
+    )
+    previous_total_balance = Gwei(int(validator_arrays.effective_balances[active_mask].sum()))
+    attester_mask = to_mask(attesters['attester_indices'], num_validators)
+    base_rewards = get_base_rewards(
+        validator_arrays.effective_balances,
+        config.BASE_REWARD_QUOTIENT,
+        previous_total_balance,
+    )
+    inclusion_slots, inclusion_distances = get_inclusion_arrays(
+        attesters['inclusion_infos'],
+        (active_mask & attester_mask).nonzero()[0],
+    )
+    epochs_since_finality = state.next_epoch(config.SLOTS_PER_EPOCH) - state.finalized_epoch
+    if epochs_since_finality <= 4:
+        rewards, penalties = compute_normal_justification_and_finalization_deltas(
+            num_validators=num_validators,
+            min_attestation_inclusion_delay=config.MIN_ATTESTATION_INCLUSION_DELAY,
+            attestation_inclusion_reward_quotient=config.ATTESTATION_INCLUSION_REWARD_QUOTIENT,
+            previous_epoch_active_mask=active_mask,
+            previous_total_balance=previous_total_balance,
+            previous_epoch_attester_mask=attester_mask,
+            previous_epoch_boundary_attester_mask=to_mask(
+                attesters['boundary_attester_indices'],
+                num_validators,
+            ),
+            previous_epoch_head_attester_mask=to_mask(
+                attesters['head_attester_indices'],
+                num_validators,
+            ),
+            inclusion_distances=inclusion_distances,
+            inclusion_proposer_indices=[
+                attesters['proposers'][slot] for slot in inclusion_slots.tolist()
+            ],
+            effective_balances=validator_arrays.effective_balances,
+            base_rewards=base_rewards,
+        )
+    else:
+        rewards, penalties = compute_inactivity_leak_deltas(
+            num_validators=num_validators,
+            current_epoch=state.current_epoch(config.SLOTS_PER_EPOCH),
+            min_attestation_inclusion_delay=config.MIN_ATTESTATION_INCLUSION_DELAY,
+            inactivity_penalty_quotient=config.INACTIVITY_PENALTY_QUOTIENT,
+            previous_epoch_active_mask=active_mask,
+            previous_epoch_attester_mask=attester_mask,
+            previous_epoch_boundary_attester_mask=to_mask(
+                attesters['boundary_attester_indices'],
+                num_validators,
+            ),
+            previous_epoch_head_attester_mask=to_mask(
+                attesters['head_attester_indices'],
+                num_validators,
+            ),
+            inclusion_distances=inclusion_distances,
+            validator_arrays=validator_arrays,
+            base_rewards=base_rewards,
+            epochs_since_finality=epochs_since_finality,
+        )
+    return rewards.tolist(), penalties.tolist()
+
+
+def time_it(label: str, run: Callable[[], Any]) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = run()
+    elapsed = time.perf_counter() - start
+    logging.info("%-50s %9.3fs", label, elapsed)
+    return result, elapsed
+
+
+def main(sizes: Sequence[int], reference_limit: int) -> None:
+    for num_validators in sizes:
+        for case, finalized_epoch in (
+                ('normal', NORMAL_FINALIZED_EPOCH),
+                ('inactivity leak', LEAK_FINALIZED_EPOCH)):
+            state = make_state(num_validators, finalized_epoch)
+            attesters = make_attesters(state)
+
+            vectorized, vectorized_time = time_it(
+                f"{num_validators} validators, {case}: numpy",
+                lambda: vectorized_deltas(state, attesters),
+            )
+            if num_validators > reference_limit:
+                logging.info(
+                    "%-50s   skipped",
+                    f"{num_validators} validators, {case}: reference",
+                )
+                continue
+
+            # The reference implementation looks the proposers up in the state's committees,
+            # which would dominate the run time, so it gets the same random proposers instead.
+            epoch_processing.get_beacon_proposer_index = (
+                lambda state, slot, committee_config: attesters['proposers'][slot]
+            )
+            reference, reference_time = time_it(
+                f"{num_validators} validators, {case}: reference",
+                lambda: reference_deltas(state, attesters),
+            )
+            for vectorized_deltas_, reference_deltas_ in zip(vectorized, reference):
+                if vectorized_deltas_ != [reference_deltas_[i] for i in range(num_validators)]:
+                    raise AssertionError("The NumPy and the reference deltas are different")
+            logging.info("%-50s %9.1fx", "speedup", reference_time / vectorized_time)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        '-n',
+        type=int,
+        nargs='+',
+        default=[16384, 65536, 262144],
+        help="Numbers of validators to benchmark",
+    )
+    parser.add_argument(
+        '--reference-limit',
+        type=int,
+        default=4096,
+        help=(
+            "Only run the reference implementation, which is quadratic in the number of "
+            "validators, with up to this many validators"
+        ),
+    )
+    args = parser.parse_args()
+
+    main(args.n, args.reference_limit)
@@ -96,7 +96,7 @@ def _main() -> None:
         else:
             peer = cast(LESPeer, peer)
             peer.sub_proto.send_get_block_bodies(list(hashes))
-            peer.sub_proto.send_get_receipts(hashes[0])
+            peer.sub_proto.send_get_receipts(list(hashes))
 
     sigint_received = asyncio.Event()
     for sig in [signal.SIGINT, signal.SIGTERM]:
@@ -9,13 +9,13 @@ deps = {
         "asyncio-cancel-token==0.1.0a2",
         "async_lru>=0.1.0,<1.0.0",
         "eth-hash>=0.1.4,<1",
+        "lru-dict>=1.1.6",
         "netifaces>=0.10.7<1",
         "pysha3>=1.0.0,<2.0.0",
         "upnpclient>=0.0.8,<1",
     ],
     'trinity': [
         "async-generator==1.10",
-        "bloom-filter==1.3",
         "cachetools>=2.1.0,<3.0.0",
         "coincurve>=10.0.0,<11.0.0",
         "eth-utils>=1.3.0,<2",
@@ -25,6 +25,8 @@ deps = {
         "web3==4.4.1",
         "lahja==0.11.2",
         "termcolor>=1.1.0,<2.0.0",
+        # HexaryTrie.get_proof() was added in trie 1.4.0
+        "trie>=1.4.0,<2.0.0",
         "uvloop==0.11.2;platform_system=='Linux' or platform_system=='Darwin' or platform_system=='FreeBSD'",  # noqa: E501
         "websockets==5.0.1",
         "jsonschema==2.6.0",
@@ -75,6 +77,7 @@ deps = {
         "eth-typing>=2.1.0,<3.0.0",
         "eth-utils>=1.3.0b0,<2.0.0",
         "lru-dict>=1.1.6",
+        "numpy>=1.16.0,<2.0.0",
         "py-ecc>=1.6.0,<2.0.0",
         "rlp>=1.1.0,<2.0.0",
         "py-evm==0.2.0a42",
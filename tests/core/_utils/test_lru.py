@@ -0,0 +1,43 @@
+from trinity._utils.lru import ByteSizeLRU
+
+
+def test_byte_size_lru_evicts_least_recently_used():
+    cache = ByteSizeLRU(100)
+    for index in range(3):
+        cache[index] = b'x' * 30
+    # touch the oldest value, so that the second one is evicted instead
+    assert cache[0] == b'x' * 30
+
+    cache[3] = b'x' * 30
+
+    assert 1 not in cache
+    assert all(index in cache for index in (0, 2, 3))
+    assert cache.size == 90
+
+
+def test_byte_size_lru_replaces_values():
+    cache = ByteSizeLRU(100)
+    cache[0] = b'x' * 60
+    cache[0] = b'x' * 10
+    cache[1] = b'x' * 80
+
+    assert cache[0] == b'x' * 10
+    assert cache.size == 90
+
+
+def test_byte_size_lru_skips_values_larger_than_the_cache():
+    cache = ByteSizeLRU(100)
+    cache[0] = b'x' * 30
+    cache[1] = b'x' * 101
+
+    assert 1 not in cache
+    assert len(cache) == 1
+
+
+def test_byte_size_lru_with_custom_size():
+    cache = ByteSizeLRU(100, get_size=lambda items: sum(len(item) for item in items))
+    cache[0] = (b'x' * 40, b'x' * 40)
+    cache[1] = (b'x' * 40,)
+
+    assert 0 not in cache
+    assert cache.size == 40
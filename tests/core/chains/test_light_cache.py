@@ -0,0 +1,125 @@
+import asyncio
+
+import pytest
+
+from eth_hash.auto import keccak
+
+from eth.db.atomic import AtomicDB
+from eth.db.header import HeaderDB
+from eth.exceptions import HeaderNotFound
+from eth.rlp.accounts import Account
+from eth.rlp.headers import BlockHeader
+
+from trinity.sync.light.cache import (
+    CachingLightPeerChain,
+    MemoryLightCache,
+    SQLiteLightCache,
+)
+
+
+ADDRESS = b'\x01' * 20
+CODE = b'\x60\x00' * 10
+
+
+class FakeLightPeerChain:
+    def __init__(self, header):
+        self.header = header
+        self.requests = []
+
+    async def coro_get_block_header_by_hash(self, block_hash):
+        self.requests.append(('header', block_hash))
+        if block_hash != self.header.hash:
+            raise HeaderNotFound()
+        return self.header
+
+    async def coro_get_account(self, block_hash, address):
+        self.requests.append(('account', block_hash, address))
+        return Account(balance=1, code_hash=keccak(CODE))
+
+    async def coro_get_contract_code(self, block_hash, address):
+        self.requests.append(('code', block_hash, address))
+        return CODE
+
+
+@pytest.fixture
+def header():
+    return BlockHeader(difficulty=1, block_number=1, gas_limit=3141592, state_root=b'\x02' * 32)
+
+
+@pytest.mark.asyncio
+async def test_caching_light_peer_chain_serves_repeated_lookups_from_cache(header):
+    headerdb = HeaderDB(AtomicDB())
+    headerdb.persist_header(header.copy(block_number=0))
+    peer_chain = FakeLightPeerChain(header)
+    chain = CachingLightPeerChain(peer_chain, MemoryLightCache(), headerdb)
+
+    for _ in range(2):
+        assert await chain.coro_get_contract_code(header.hash, ADDRESS) == CODE
+        assert (await chain.coro_get_account(header.hash, ADDRESS)).balance == 1
+
+    # the header isn't in the headerdb, so it had to be fetched too
+    assert peer_chain.requests == [
+        ('header', header.hash),
+        ('account', header.hash, ADDRESS),
+        ('code', header.hash, ADDRESS),
+        ('header', header.hash),
+        ('header', header.hash),
+        ('header', header.hash),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_caching_light_peer_chain_survives_restarts(header, tmp_path):
+    cache_path = tmp_path / 'cache' / 'lightcache'
+    cache_path.parent.mkdir()
+    headerdb = HeaderDB(AtomicDB())
+    headerdb.persist_header(header.copy(parent_hash=b'\x00' * 32, block_number=0))
+    genesis = headerdb.get_canonical_head()
+
+    peer_chain = FakeLightPeerChain(genesis)
+    cache = SQLiteLightCache(cache_path)
+    chain = CachingLightPeerChain(peer_chain, cache, headerdb)
+    assert await chain.coro_get_contract_code(genesis.hash, ADDRESS) == CODE
+    cache.close()
+
+    peer_chain = FakeLightPeerChain(genesis)
+    chain = CachingLightPeerChain(peer_chain, SQLiteLightCache(cache_path), headerdb)
+    assert await chain.coro_get_contract_code(genesis.hash, ADDRESS) == CODE
+    assert peer_chain.requests == []
+
+
+def test_light_cache_evicts_least_recently_used():
+    cache = MemoryLightCache(max_size=100)
+    for index in range(3):
+        cache.set(bytes([index]), b'x' * 30)
+    # touch the oldest entry, so that the second one is evicted instead
+    assert cache.get(b'\x00') == b'x' * 30
+
+    cache.set(b'\x03', b'x' * 30)
+
+    assert cache.get(b'\x01') is None
+    assert all(cache.get(bytes([index])) for index in (0, 2, 3))
+
+
+def test_light_cache_writes_in_batches():
+    cache = MemoryLightCache(flush_interval=3600)
+    cache.set(b'\x00', b'x' * 30)
+    assert cache.get(b'\x00') == b'x' * 30
+    assert cache.get(b'\x01') is None
+    # neither the new value nor its usage are written yet
+    assert cache.db.total_changes == 0
+
+    cache.flush()
+    assert cache.db.total_changes == 1
+    assert cache.get(b'\x00') == b'x' * 30
+
+
+@pytest.mark.asyncio
+async def test_light_cache_flushes_on_a_timer(event_loop):
+    cache = MemoryLightCache(flush_interval=0.05, loop=event_loop)
+    cache.set(b'\x00', b'x' * 30)
+    assert cache.db.total_changes == 0
+
+    # the cache is not used again, but the new value is written anyway
+    await asyncio.sleep(0.2)
+    assert cache.db.total_changes == 1
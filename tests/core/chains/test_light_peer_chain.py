@@ -1,3 +1,7 @@
+from trinity.sync.light.cache import (
+    CachingLightPeerChain,
+    MemoryLightCache,
+)
 from trinity.sync.light.service import (
     LightPeerChain
 )
@@ -18,3 +22,8 @@ def test_can_instantiate_eventbus_light_peer_chain():
 def test_can_instantiate_light_peer_chain():
     chain = LightPeerChain(None, None)
     assert chain is not None
+
+
+def test_can_instantiate_caching_light_peer_chain():
+    chain = CachingLightPeerChain(EventBusLightPeerChain(None), MemoryLightCache(), None)
+    assert chain is not None
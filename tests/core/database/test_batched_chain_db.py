@@ -0,0 +1,192 @@
+import pytest
+
+from eth_hash.auto import keccak
+import rlp
+from trie import HexaryTrie
+
+from eth.db.atomic import AtomicDB
+from eth.db.trie import make_trie_root_and_nodes
+from eth.rlp.accounts import Account
+from eth.rlp.headers import BlockHeader
+from eth.rlp.receipts import Receipt
+from eth.rlp.transactions import BaseTransactionFields
+
+from trinity.db.eth1.chain import BatchedChainDB
+from trinity.rlp.block_body import BlockBody
+
+
+def mk_transaction(nonce):
+    return BaseTransactionFields(
+        nonce=nonce,
+        gas_price=1,
+        gas=21000,
+        to=b'\x01' * 20,
+        value=nonce,
+        data=b'',
+        v=27,
+        r=1,
+        s=1,
+    )
+
+
+def mk_receipt(gas_used):
+    return Receipt(state_root=b'\x00' * 32, gas_used=gas_used, logs=[])
+
+
+def persist_block(chaindb, parent, transactions, receipts, uncles):
+    transaction_root, transaction_nodes = make_trie_root_and_nodes(transactions)
+    receipt_root, receipt_nodes = make_trie_root_and_nodes(receipts)
+    chaindb.persist_trie_data_dict(transaction_nodes)
+    chaindb.persist_trie_data_dict(receipt_nodes)
+    uncles_hash = chaindb.persist_uncles(tuple(uncles))
+    header = BlockHeader(
+        difficulty=100,
+        block_number=parent.block_number + 1,
+        gas_limit=3000000,
+        parent_hash=parent.hash,
+        transaction_root=transaction_root,
+        receipt_root=receipt_root,
+        uncles_hash=uncles_hash,
+    )
+    chaindb.persist_header(header)
+    return header
+
+
+@pytest.fixture
+def genesis():
+    return BlockHeader(difficulty=100, block_number=0, gas_limit=3000000)
+
+
+@pytest.fixture
+def chaindb(genesis):
+    chaindb = BatchedChainDB(AtomicDB())
+    chaindb.persist_header(genesis)
+    return chaindb
+
+
+def test_get_encoded_block_bodies_and_receipts(chaindb, genesis):
+    transactions = [mk_transaction(nonce) for nonce in range(3)]
+    receipts = [mk_receipt(21000 * (index + 1)) for index in range(3)]
+    uncles = [genesis.copy(extra_data=b'uncle')]
+    header = persist_block(chaindb, genesis, transactions, receipts, uncles)
+    unknown_hash = b'\x00' * 32
+
+    bodies = chaindb.get_encoded_block_bodies((genesis.hash, header.hash, unknown_hash))
+    assert bodies == {
+        genesis.hash: rlp.encode(BlockBody([], [])),
+        header.hash: rlp.encode(BlockBody(transactions, uncles)),
+    }
+
+    encoded_receipts = chaindb.get_encoded_receipts((header.hash, unknown_hash, genesis.hash))
+    assert encoded_receipts == {
+        genesis.hash: rlp.encode([]),
+        header.hash: rlp.encode(receipts),
+    }
+
+
+def test_get_encoded_block_bodies_and_receipts_with_missing_trie_nodes(chaindb, genesis):
+    transactions = [mk_transaction(nonce) for nonce in range(3)]
+    receipts = [mk_receipt(21000 * (index + 1)) for index in range(3)]
+    header = persist_block(chaindb, genesis, transactions, receipts, [])
+    del chaindb.db[header.transaction_root]
+    del chaindb.db[header.receipt_root]
+
+    assert chaindb.get_encoded_block_bodies((header.hash, genesis.hash)) == {
+        genesis.hash: rlp.encode(BlockBody([], [])),
+    }
+    assert chaindb.get_encoded_receipts((header.hash, genesis.hash)) == {
+        genesis.hash: rlp.encode([]),
+    }
+
+
+def test_encoded_block_bodies_cache(chaindb, genesis):
+    header = persist_block(chaindb, genesis, [mk_transaction(0)], [mk_receipt(21000)], [])
+    encoded_body = chaindb.get_encoded_block_bodies((header.hash,))[header.hash]
+    encoded_receipts = chaindb.get_encoded_receipts((header.hash,))[header.hash]
+
+    # once served, bodies and receipts come from the caches
+    chaindb.db = AtomicDB()
+    assert chaindb.get_encoded_block_bodies((header.hash,)) == {header.hash: encoded_body}
+    assert chaindb.get_encoded_receipts((header.hash,)) == {header.hash: encoded_receipts}
+
+
+@pytest.fixture
+def state_header(chaindb, genesis):
+    storage = HexaryTrie(chaindb.db)
+    for slot in range(20):
+        storage[keccak(slot.to_bytes(32, 'big'))] = rlp.encode(slot + 1)
+    code = b'\x60\x00' * 10
+    chaindb.db[keccak(code)] = code
+
+    state = HexaryTrie(chaindb.db)
+    for index in range(20):
+        state[keccak(index.to_bytes(20, 'big'))] = rlp.encode(Account(balance=index))
+    state[keccak(b'contract')] = rlp.encode(Account(
+        storage_root=storage.root_hash,
+        code_hash=keccak(code),
+    ))
+
+    header = BlockHeader(
+        difficulty=100,
+        block_number=1,
+        gas_limit=3000000,
+        parent_hash=genesis.hash,
+        state_root=state.root_hash,
+    )
+    chaindb.persist_header(header)
+    return header
+
+
+def test_get_encoded_proofs(chaindb, state_header):
+    account_key = keccak((3).to_bytes(20, 'big'))
+    storage_key = keccak((5).to_bytes(32, 'big'))
+    unknown_block_hash = b'\x00' * 32
+    account_proof, storage_proof, missing_proof = chaindb.get_encoded_proofs((
+        (state_header.hash, b'', account_key),
+        (state_header.hash, keccak(b'contract'), storage_key),
+        (unknown_block_hash, b'', account_key),
+    ))
+
+    proven_account = HexaryTrie.get_from_proof(
+        state_header.state_root,
+        account_key,
+        [rlp.decode(node) for node in account_proof],
+    )
+    assert rlp.decode(proven_account, sedes=Account).balance == 3
+
+    storage_root = rlp.decode(
+        HexaryTrie(chaindb.db, state_header.state_root)[keccak(b'contract')],
+        sedes=Account,
+    ).storage_root
+    proven_value = HexaryTrie.get_from_proof(
+        storage_root,
+        storage_key,
+        [rlp.decode(node) for node in storage_proof],
+    )
+    assert rlp.decode(proven_value) == b'\x06'
+
+    assert missing_proof == ()
+
+
+def test_encoded_proofs_cache(chaindb, genesis, state_header):
+    proof_request = (state_header.hash, b'', keccak((3).to_bytes(20, 'big')))
+    proofs = chaindb.get_encoded_proofs((proof_request,))
+
+    # once served, the proof comes from the cache, even without the state
+    chaindb.db = AtomicDB()
+    chaindb.persist_header(genesis)
+    chaindb.persist_header(state_header)
+    assert chaindb.get_encoded_proofs((proof_request,)) == proofs
+
+    # but the state is still needed for other keys
+    assert chaindb.get_encoded_proofs(((state_header.hash, b'', b'\x01' * 32),)) == ((),)
+
+
+def test_get_contract_codes(chaindb, state_header):
+    codes = chaindb.get_contract_codes((
+        (state_header.hash, keccak(b'contract')),
+        (state_header.hash, keccak((3).to_bytes(20, 'big'))),
+        (state_header.hash, keccak(b'unknown account')),
+        (b'\x00' * 32, keccak(b'contract')),
+    ))
+    assert codes == (b'\x60\x00' * 10, b'', b'', b'')
@@ -0,0 +1,82 @@
+import pytest
+
+import rlp
+
+from eth.db.atomic import AtomicDB
+from eth.exceptions import HeaderNotFound
+from eth.rlp.headers import BlockHeader
+
+from trinity.db.eth1.header import BatchedHeaderDB
+
+
+def mk_header_chain(length):
+    genesis = BlockHeader(difficulty=100, block_number=0, gas_limit=3000000)
+    headers = [genesis]
+    for _ in range(length - 1):
+        headers.append(BlockHeader(
+            difficulty=100,
+            block_number=headers[-1].block_number + 1,
+            parent_hash=headers[-1].hash,
+            gas_limit=3000000,
+        ))
+    return headers
+
+
+@pytest.fixture
+def headers():
+    return mk_header_chain(10)
+
+
+@pytest.fixture
+def headerdb(headers):
+    headerdb = BatchedHeaderDB(AtomicDB())
+    headerdb.persist_header_chain(headers)
+    return headerdb
+
+
+@pytest.mark.parametrize(
+    'block_number, max_headers, skip, reverse, expected_numbers',
+    (
+        (0, 3, 0, False, (0, 1, 2)),
+        (8, 5, 0, False, (8, 9)),
+        (1, 3, 2, False, (1, 4, 7)),
+        (9, 4, 0, True, (9, 8, 7, 6)),
+        (5, 10, 1, True, (5, 3, 1)),
+        (10, 3, 0, False, ()),
+        (3, 0, 0, False, ()),
+    ),
+)
+def test_get_encoded_canonical_headers(
+        headerdb, headers, block_number, max_headers, skip, reverse, expected_numbers):
+
+    encoded_headers = headerdb.get_encoded_canonical_headers(
+        block_number,
+        max_headers,
+        skip,
+        reverse,
+    )
+
+    assert encoded_headers == tuple(rlp.encode(headers[number]) for number in expected_numbers)
+
+
+def test_get_encoded_canonical_headers_by_hash(headerdb, headers):
+    encoded_headers = headerdb.get_encoded_canonical_headers(headers[4].hash, 2)
+
+    assert tuple(rlp.decode(header, sedes=BlockHeader) for header in encoded_headers) == tuple(
+        headers[4:6]
+    )
+
+
+def test_get_encoded_canonical_headers_by_unknown_hash(headerdb):
+    with pytest.raises(HeaderNotFound):
+        headerdb.get_encoded_canonical_headers(b'\x00' * 32, 2)
+
+
+def test_get_encoded_canonical_headers_follows_reorgs(headerdb, headers):
+    assert len(headerdb.get_encoded_canonical_headers(0, 10)) == 10
+
+    fork = [headers[4].copy(difficulty=1000, parent_hash=headers[3].hash)]
+    headerdb.persist_header_chain(fork)
+
+    encoded_headers = headerdb.get_encoded_canonical_headers(3, 10)
+    assert encoded_headers[:2] == (rlp.encode(headers[3]), rlp.encode(fork[0]))
@@ -6,6 +6,7 @@ from multiprocessing.managers import (
 import tempfile
 
 import pytest
+import rlp
 
 from eth.chains.ropsten import ROPSTEN_GENESIS_HEADER
 from eth.db.atomic import (
@@ -16,6 +17,7 @@ from eth.db.chain import (
 )
 
 from trinity.db.eth1.manager import (
+    create_db_consumer_manager,
     create_db_server_manager,
 )
 from trinity.config import (
@@ -27,6 +29,10 @@ from trinity.initialization import (
 from trinity.constants import ROPSTEN_NETWORK_ID
 from trinity.db.eth1.chain import AsyncChainDBProxy
 from trinity.db.base import AsyncDBProxy
+from trinity.db.framed import (
+    FramedDBClient,
+    FramedDBServer,
+)
 from trinity._utils.ipc import (
     wait_for_ipc,
     kill_process_gracefully,
@@ -115,3 +121,57 @@ def test_atomic_batch_over_ipc_manager(manager):
     assert db[b'key-b'] == b'value-b'
     assert b'key-c' in db
     assert db[b'key-c'] == b'value-c'
+
+
+@pytest.mark.asyncio
+async def test_multi_key_db_over_ipc_manager(manager):
+    db = manager.get_db()
+
+    await db.coro_set_many({b'key-d': b'value-d', b'key-e': b'value-e'})
+
+    assert await db.coro_exists_many((b'key-a', b'key-d', b'not-present')) == (True, True, False)
+    assert await db.coro_get_many((b'key-d', b'key-e', b'not-present')) == {
+        b'key-d': b'value-d',
+        b'key-e': b'value-e',
+    }
+
+
+@pytest.mark.asyncio
+async def test_chaindb_multi_key_over_ipc_manager(manager):
+    chaindb = manager.get_chaindb()
+
+    found = await chaindb.coro_get_many((b'key-a', b'not-present'))
+
+    assert found == {b'key-a': b'value-a'}
+
+
+@pytest.mark.asyncio
+async def test_chaindb_encoded_headers_over_ipc_manager(manager):
+    chaindb = manager.get_chaindb()
+
+    encoded_headers = await chaindb.coro_get_encoded_canonical_headers(0, 2, 0, False)
+
+    assert encoded_headers == (rlp.encode(ROPSTEN_GENESIS_HEADER),)
+
+
+@pytest.mark.asyncio
+async def test_db_consumer_manager_with_framed_db(database_server_ipc_path, tmp_path):
+    framed_db = AtomicDB()
+    framed_db[b'key-f'] = b'value-f'
+    framed_ipc_path = tmp_path / 'db-framed.ipc'
+    server = FramedDBServer(framed_db)
+    server.serve_in_thread(framed_ipc_path)
+    try:
+        manager = create_db_consumer_manager(
+            database_server_ipc_path,
+            framed_ipc_path=framed_ipc_path,
+        )
+
+        db = manager.get_db()
+        assert isinstance(db, FramedDBClient)
+        assert db[b'key-f'] == b'value-f'
+        # the other databases are still served by the BaseManager
+        chaindb = manager.get_chaindb()
+        assert await chaindb.coro_get_canonical_head() == ROPSTEN_GENESIS_HEADER
+    finally:
+        server.stop_thread()
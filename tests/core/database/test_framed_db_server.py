@@ -0,0 +1,141 @@
+import asyncio
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+from eth.db.atomic import AtomicDB
+
+from trinity.db.framed import (
+    FramedDBClient,
+    FramedDBServer,
+    decode_items,
+    encode_items,
+)
+
+
+@pytest.fixture
+def ipc_path():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield Path(temp_dir) / 'db-framed.ipc'
+
+
+@pytest.fixture
+def client(ipc_path):
+    db = AtomicDB()
+    db[b'key-a'] = b'value-a'
+    FramedDBServer(db).serve_in_thread(ipc_path)
+    return FramedDBClient(ipc_path)
+
+
+def test_encode_decode_items_round_trip():
+    items = (b'', b'a', b'\x00' * 300)
+    assert decode_items(encode_items(items)) == items
+
+
+def test_sync_api(client):
+    assert b'key-a' in client
+    assert client[b'key-a'] == b'value-a'
+
+    with pytest.raises(KeyError):
+        client[b'not-present']
+
+    client[b'key-b'] = b'value-b'
+    assert client.get(b'key-b') == b'value-b'
+
+    del client[b'key-b']
+    assert not client.exists(b'key-b')
+
+
+def test_atomic_batch(client):
+    with client.atomic_batch() as batch:
+        batch.set(b'key-b', b'value-b')
+        assert batch[b'key-b'] == b'value-b'
+
+    assert client[b'key-b'] == b'value-b'
+
+
+@pytest.mark.asyncio
+async def test_async_api(client):
+    assert await client.coro_get(b'key-a') == b'value-a'
+    assert await client.coro_exists(b'key-a')
+    assert not await client.coro_exists(b'not-present')
+
+    with pytest.raises(KeyError):
+        await client.coro_get(b'not-present')
+
+    await client.coro_set(b'key-b', b'value-b')
+    assert await client.coro_get(b'key-b') == b'value-b'
+
+
+@pytest.mark.asyncio
+async def test_async_multi_key_api(client):
+    await client.coro_set_many({b'key-b': b'value-b', b'key-c': b''})
+
+    assert await client.coro_exists_many((b'key-a', b'missing', b'key-c')) == (True, False, True)
+    assert await client.coro_get_many((b'key-b', b'missing', b'key-c')) == {
+        b'key-b': b'value-b',
+        b'key-c': b'',
+    }
+
+
+@pytest.mark.asyncio
+async def test_pipelined_requests(client):
+    keys = [bytes([i]) * 32 for i in range(100)]
+    await asyncio.gather(*(client.coro_set(key, key * 2) for key in keys))
+
+    values = await asyncio.gather(*(client.coro_get(key) for key in keys))
+
+    assert values == [key * 2 for key in keys]
+
+
+class SlowReadDB(AtomicDB):
+    """
+    Reading ``b'slow'`` only returns once ``b'fast'`` was read.
+    """
+    def __init__(self):
+        super().__init__()
+        self.fast_read = threading.Event()
+
+    def __getitem__(self, key):
+        if key == b'slow':
+            self.fast_read.wait(timeout=5)
+        value = super().__getitem__(key)
+        if key == b'fast':
+            self.fast_read.set()
+        return value
+
+
+@pytest.mark.asyncio
+async def test_slow_request_does_not_block_other_requests(ipc_path):
+    db = SlowReadDB()
+    db[b'slow'] = b'slow-value'
+    db[b'fast'] = b'fast-value'
+    server = FramedDBServer(db)
+    server.serve_in_thread(ipc_path)
+    slow_client = FramedDBClient(ipc_path)
+    fast_client = FramedDBClient(ipc_path)
+
+    slow_read = asyncio.ensure_future(slow_client.coro_get(b'slow'))
+    await asyncio.sleep(0.05)
+    assert await asyncio.wait_for(fast_client.coro_get(b'fast'), timeout=1) == b'fast-value'
+    assert await slow_read == b'slow-value'
+
+    server.stop_thread()
+
+
+def test_serve_in_thread_raises_if_it_cannot_serve(ipc_path):
+    server = FramedDBServer(AtomicDB())
+    with pytest.raises(OSError):
+        server.serve_in_thread(ipc_path.parent / 'missing-dir' / 'db-framed.ipc')
+
+
+def test_stop_thread_removes_socket(ipc_path):
+    server = FramedDBServer(AtomicDB())
+    thread = server.serve_in_thread(ipc_path)
+    assert ipc_path.exists()
+
+    server.stop_thread()
+    assert not thread.is_alive()
+    assert not ipc_path.exists()
@@ -15,19 +15,23 @@ from eth.chains.base import (
 from eth.db.backends.level import LevelDB
 from eth.db.backends.memory import MemoryDB
 from eth.db.atomic import AtomicDB
-from eth.db.chain import ChainDB
 from eth.tools.builder.chain import (
     build,
     byzantium_at,
     enable_pow_mining,
     genesis,
 )
-from eth.db.header import HeaderDB
 from eth.vm.forks.byzantium import ByzantiumVM
 
 from trinity.db.base import BaseAsyncDB
-from trinity.db.eth1.chain import BaseAsyncChainDB
-from trinity.db.eth1.header import BaseAsyncHeaderDB
+from trinity.db.eth1.chain import (
+    BaseAsyncChainDB,
+    BatchedChainDB,
+)
+from trinity.db.eth1.header import (
+    BaseAsyncHeaderDB,
+    BatchedHeaderDB,
+)
 
 ZIPPED_FIXTURES_PATH = Path(__file__).parent.parent / 'integration' / 'fixtures'
 
@@ -52,25 +56,38 @@ def async_passthrough(base_name):
     return passthrough_method
 
 
-class FakeAsyncAtomicDB(AtomicDB, BaseAsyncDB):
+class FakeAsyncDBMixin(BaseAsyncDB):
     coro_set = async_passthrough('set')
     coro_exists = async_passthrough('exists')
 
+    async def coro_get_many(self, keys):
+        return {key: self[key] for key in keys if key in self}
 
-class FakeAsyncMemoryDB(MemoryDB, BaseAsyncDB):
-    coro_set = async_passthrough('set')
-    coro_exists = async_passthrough('exists')
+    async def coro_exists_many(self, keys):
+        return tuple(key in self for key in keys)
 
+    async def coro_set_many(self, key_values):
+        for key, value in key_values.items():
+            self[key] = value
 
-class FakeAsyncLevelDB(LevelDB, BaseAsyncDB):
-    coro_set = async_passthrough('set')
-    coro_exists = async_passthrough('exists')
+
+class FakeAsyncAtomicDB(AtomicDB, FakeAsyncDBMixin):
+    pass
+
+
+class FakeAsyncMemoryDB(MemoryDB, FakeAsyncDBMixin):
+    pass
+
+
+class FakeAsyncLevelDB(LevelDB, FakeAsyncDBMixin):
+    pass
 
 
-class FakeAsyncHeaderDB(BaseAsyncHeaderDB, HeaderDB):
+class FakeAsyncHeaderDB(BaseAsyncHeaderDB, BatchedHeaderDB):
     coro_get_canonical_block_hash = async_passthrough('get_canonical_block_hash')
     coro_get_canonical_block_header_by_number = async_passthrough('get_canonical_block_header_by_number')  # noqa: E501
     coro_get_canonical_head = async_passthrough('get_canonical_head')
+    coro_get_encoded_canonical_headers = async_passthrough('get_encoded_canonical_headers')
     coro_get_block_header_by_hash = async_passthrough('get_block_header_by_hash')
     coro_get_score = async_passthrough('get_score')
     coro_header_exists = async_passthrough('header_exists')
@@ -78,14 +95,22 @@ class FakeAsyncHeaderDB(BaseAsyncHeaderDB, HeaderDB):
     coro_persist_header_chain = async_passthrough('persist_header_chain')
 
 
-class FakeAsyncChainDB(BaseAsyncChainDB, FakeAsyncHeaderDB, ChainDB):
+class FakeAsyncChainDB(BaseAsyncChainDB, FakeAsyncHeaderDB, BatchedChainDB):
     coro_persist_block = async_passthrough('persist_block')
+    coro_persist_blocks = async_passthrough('persist_blocks')
     coro_persist_uncles = async_passthrough('persist_uncles')
     coro_persist_trie_data_dict = async_passthrough('persist_trie_data_dict')
+    coro_persist_trie_data_and_blocks = async_passthrough('persist_trie_data_and_blocks')
     coro_get = async_passthrough('get')
+    coro_get_many = async_passthrough('get_many')
+    coro_exists_many = async_passthrough('exists_many')
     coro_get_block_transactions = async_passthrough('get_block_transactions')
     coro_get_block_uncles = async_passthrough('get_block_uncles')
     coro_get_receipts = async_passthrough('get_receipts')
+    coro_get_encoded_block_bodies = async_passthrough('get_encoded_block_bodies')
+    coro_get_encoded_receipts = async_passthrough('get_encoded_receipts')
+    coro_get_encoded_proofs = async_passthrough('get_encoded_proofs')
+    coro_get_contract_codes = async_passthrough('get_contract_codes')
 
 
 async def coro_import_block(chain, block, perform_validation=True):
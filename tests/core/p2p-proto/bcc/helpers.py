@@ -56,6 +56,9 @@ class FakeAsyncBeaconChainDB(BaseAsyncBeaconChainDB, BeaconChainDB):
     coro_get_canonical_block_root = async_passthrough('get_canonical_block_root')
     coro_get_canonical_block_by_slot = async_passthrough('get_canonical_block_by_slot')
     coro_get_canonical_block_root_by_slot = async_passthrough('get_canonical_block_root_by_slot')
+    coro_get_encoded_canonical_block_range = async_passthrough(
+        'get_encoded_canonical_block_range'
+    )
     coro_get_canonical_head = async_passthrough('get_canonical_head')
     coro_get_finalized_head = async_passthrough('get_finalized_head')
     coro_get_block_by_root = async_passthrough('get_block_by_root')
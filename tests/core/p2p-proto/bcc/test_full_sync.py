@@ -4,11 +4,13 @@ import asyncio
 
 from eth2.beacon.types.blocks import BeaconBlock
 
+from trinity.protocol.bcc.peer import BCCPeerPool
 from trinity.protocol.bcc.servers import BCCRequestServer
 
 from trinity.sync.beacon.chain import BeaconChainSyncer
 
 from .helpers import (
+    get_directly_linked_peers,
     get_directly_linked_peers_in_peer_pools,
     get_chain_db,
     create_test_block,
@@ -38,6 +40,43 @@ async def get_sync_setup(request, event_loop, alice_chain_db, bob_chain_db):
     return alice_syncer
 
 
+async def get_multi_peer_sync_setup(request, event_loop, alice_chain_db, peer_chain_dbs):
+    alice_peer_pool = None
+    for peer_chain_db in peer_chain_dbs:
+        alice, bob = await get_directly_linked_peers(
+            request,
+            event_loop,
+            alice_chain_db=alice_chain_db,
+            bob_chain_db=peer_chain_db,
+        )
+        if alice_peer_pool is None:
+            alice_peer_pool = BCCPeerPool(alice.privkey, alice.context)
+            asyncio.ensure_future(alice_peer_pool.run())
+        alice_peer_pool._add_peer(alice, [])
+
+        bob_peer_pool = BCCPeerPool(bob.privkey, bob.context)
+        asyncio.ensure_future(bob_peer_pool.run())
+        bob_peer_pool._add_peer(bob, [])
+        bob_request_server = BCCRequestServer(bob.context.chain_db, bob_peer_pool)
+        asyncio.ensure_future(bob_request_server.run())
+
+        def finalizer(bob_peer_pool=bob_peer_pool, bob_request_server=bob_request_server):
+            event_loop.run_until_complete(bob_request_server.cancel())
+            event_loop.run_until_complete(bob_peer_pool.cancel())
+
+        request.addfinalizer(finalizer)
+
+    alice_syncer = BeaconChainSyncer(alice_chain_db, alice_peer_pool, segment_size=8, window_size=4)
+    asyncio.ensure_future(alice_syncer.run())
+
+    def finalizer():
+        event_loop.run_until_complete(alice_syncer.cancel())
+        event_loop.run_until_complete(alice_peer_pool.cancel())
+
+    request.addfinalizer(finalizer)
+    return alice_syncer
+
+
 @pytest.mark.asyncio
 async def test_sync_from_genesis(request, event_loop):
     genesis = create_test_block()
@@ -124,3 +163,64 @@ async def test_sync_when_already_at_best_head(request, event_loop):
     for slot in range(genesis.slot, genesis.slot + 100):
         alice_block = await alice_chain_db.coro_get_canonical_block_by_slot(slot, BeaconBlock)
         assert alice_block == alice_blocks[slot - genesis.slot]
+
+
+@pytest.mark.asyncio
+async def test_sync_from_multiple_peers(request, event_loop):
+    genesis = create_test_block()
+    bob_blocks = (genesis,) + create_branch(length=99, root=genesis)
+    alice_chain_db = await get_chain_db((genesis,))
+    peer_chain_dbs = (
+        await get_chain_db(bob_blocks),
+        await get_chain_db(bob_blocks),
+        # Charlie only has the beginning of the chain
+        await get_chain_db(bob_blocks[:30]),
+    )
+
+    alice_syncer = await get_multi_peer_sync_setup(
+        request,
+        event_loop,
+        alice_chain_db,
+        peer_chain_dbs,
+    )
+
+    await alice_syncer.events.finished.wait()
+
+    assert len(alice_syncer.sync_peers) == 3
+    alice_head = await alice_chain_db.coro_get_canonical_head(BeaconBlock)
+    assert alice_head == bob_blocks[-1]
+    for slot in range(genesis.slot, genesis.slot + 100):
+        alice_block = await alice_chain_db.coro_get_canonical_block_by_slot(slot, BeaconBlock)
+        assert alice_block == bob_blocks[slot - genesis.slot]
+
+
+@pytest.mark.asyncio
+async def test_sync_from_multiple_peers_on_different_branches(request, event_loop):
+    genesis = create_test_block()
+    bob_blocks = (genesis,) + create_branch(length=99, root=genesis, state_root=b"\x11" * 32)
+    charlie_blocks = bob_blocks[:20] + create_branch(
+        length=30,
+        root=bob_blocks[19],
+        state_root=b"\x22" * 32,
+    )
+    alice_chain_db = await get_chain_db((genesis,))
+    peer_chain_dbs = (
+        await get_chain_db(bob_blocks),
+        await get_chain_db(charlie_blocks),
+    )
+
+    alice_syncer = await get_multi_peer_sync_setup(
+        request,
+        event_loop,
+        alice_chain_db,
+        peer_chain_dbs,
+    )
+
+    await alice_syncer.events.finished.wait()
+
+    # Alice ends up on the branch of the peer with the highest head slot
+    alice_head = await alice_chain_db.coro_get_canonical_head(BeaconBlock)
+    assert alice_head == bob_blocks[-1]
+    for slot in range(genesis.slot, genesis.slot + 100):
+        alice_block = await alice_chain_db.coro_get_canonical_block_by_slot(slot, BeaconBlock)
+        assert alice_block == bob_blocks[slot - genesis.slot]
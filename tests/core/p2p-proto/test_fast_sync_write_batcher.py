@@ -0,0 +1,50 @@
+import asyncio
+
+import pytest
+
+from trinity.sync.full.persist import FastSyncWriteBatcher
+
+from tests.core.integration_test_helpers import (
+    FakeAsyncAtomicDB,
+    FakeAsyncChainDB,
+)
+
+
+@pytest.fixture
+def chaindb():
+    return FakeAsyncChainDB(FakeAsyncAtomicDB())
+
+
+@pytest.mark.asyncio
+async def test_flushes_when_batch_is_full(chaindb):
+    flushes = []
+    batcher = FastSyncWriteBatcher(
+        chaindb,
+        on_flush=lambda num_items, latency: flushes.append(num_items),
+        batch_size_target=3,
+        max_delay=60,
+    )
+
+    await batcher.add_trie_data({b'key-a': b'value-a', b'key-b': b'value-b'})
+    assert b'key-a' not in chaindb.db
+    assert flushes == []
+
+    await batcher.add_trie_data({b'key-c': b'value-c'})
+    assert chaindb.db[b'key-a'] == b'value-a'
+    assert chaindb.db[b'key-c'] == b'value-c'
+    assert flushes == [3]
+    assert batcher.pending_items == 0
+
+
+@pytest.mark.asyncio
+async def test_flushes_after_max_delay(chaindb):
+    batcher = FastSyncWriteBatcher(chaindb, batch_size_target=1000, max_delay=0.05)
+    asyncio.ensure_future(batcher.run())
+    try:
+        await batcher.add_trie_data({b'key-a': b'value-a'})
+        assert b'key-a' not in chaindb.db
+
+        await asyncio.sleep(0.2)
+        assert chaindb.db[b'key-a'] == b'value-a'
+    finally:
+        await batcher.cancel()
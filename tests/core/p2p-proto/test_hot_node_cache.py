@@ -0,0 +1,25 @@
+from trinity.protocol.eth.servers import HotNodeCache
+
+
+def test_hot_node_cache_only_admits_nodes_requested_repeatedly():
+    cache = HotNodeCache(size=10, min_requests=2)
+    nodes = {b'a': b'node-a', b'b': b'node-b'}
+
+    assert cache.get_many((b'a', b'b')) == {}
+    cache.add_many(nodes)
+    assert cache.get_many((b'b',)) == {}
+
+    # b has now been requested twice
+    cache.add_many({b'b': nodes[b'b']})
+    assert cache.get_many((b'a', b'b')) == {b'b': b'node-b'}
+    assert (cache.hits, cache.misses) == (1, 4)
+
+
+def test_hot_node_cache_is_bounded():
+    cache = HotNodeCache(size=2, min_requests=1)
+    nodes = {bytes([index]): b'node' for index in range(4)}
+
+    cache.get_many(tuple(nodes))
+    cache.add_many(nodes)
+
+    assert len(cache.get_many(tuple(nodes))) == 2
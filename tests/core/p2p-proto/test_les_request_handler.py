@@ -0,0 +1,113 @@
+import pytest
+
+from cancel_token import CancelToken
+from eth_hash.auto import keccak
+import rlp
+from trie import HexaryTrie
+
+from eth.db.atomic import AtomicDB
+from eth.rlp.accounts import Account
+from eth.rlp.headers import BlockHeader
+
+from p2p.exceptions import NotEnoughTokens
+
+from trinity.protocol.les import commands
+from trinity.protocol.les.constants import (
+    FLOW_CONTROL_BUFFER_LIMIT,
+    MAX_REQUEST_COSTS,
+)
+from trinity.protocol.les.proto import LESProtocolV2
+from trinity.protocol.les.servers import LESPeerRequestHandler
+
+from tests.core.integration_test_helpers import FakeAsyncChainDB
+
+
+CODE = b'\x60\x00' * 10
+CONTRACT_KEY = keccak(b'contract')
+
+
+class FakeLESPeer:
+    is_operational = True
+
+    def __init__(self):
+        self.sub_proto = LESProtocolV2(peer=None, cmd_id_offset=16, snappy_support=False)
+        self.sent_messages = []
+        self.sub_proto.send = lambda header, body: self.sent_messages.append((header, body))
+
+    def get_reply(self, cmd_class):
+        header, body = self.sent_messages[-1]
+        # strip the padding of the body to 16 bytes
+        frame_size = int.from_bytes(header[:3], 'big')
+        return cmd_class(16, False).decode(body[:frame_size])
+
+
+@pytest.fixture
+def chaindb_and_header():
+    chaindb = FakeAsyncChainDB(AtomicDB())
+    chaindb.db[keccak(CODE)] = CODE
+    state = HexaryTrie(chaindb.db)
+    for index in range(10):
+        state[keccak(index.to_bytes(20, 'big'))] = rlp.encode(Account(balance=index))
+    state[CONTRACT_KEY] = rlp.encode(Account(code_hash=keccak(CODE)))
+
+    header = BlockHeader(
+        difficulty=100,
+        block_number=0,
+        gas_limit=3000000,
+        state_root=state.root_hash,
+    )
+    chaindb.persist_header(header)
+    return chaindb, header
+
+
+@pytest.mark.asyncio
+async def test_les_serves_proofs_and_codes(chaindb_and_header):
+    chaindb, header = chaindb_and_header
+    handler = LESPeerRequestHandler(chaindb, CancelToken('test'))
+    peer = FakeLESPeer()
+
+    account_key = keccak((7).to_bytes(20, 'big'))
+    await handler.handle_get_proofs(peer, commands.GetProofsV2, {
+        'request_id': 1,
+        'proof_requests': (
+            commands.ProofRequest(header.hash, b'', account_key, 0),
+            commands.ProofRequest(header.hash, b'', CONTRACT_KEY, 0),
+        ),
+    })
+    reply = peer.get_reply(commands.ProofsV2)
+    assert reply['request_id'] == 1
+    # the buffer recharges quickly, but not within a single request
+    assert reply['buffer_value'] < FLOW_CONTROL_BUFFER_LIMIT
+    # the proofs of both accounts are merged into a single node set
+    encoded_account = HexaryTrie.get_from_proof(header.state_root, account_key, reply['proof'])
+    assert rlp.decode(encoded_account, sedes=Account).balance == 7
+    assert HexaryTrie.get_from_proof(header.state_root, CONTRACT_KEY, reply['proof'])
+
+    await handler.handle_get_contract_codes(peer, {
+        'request_id': 2,
+        'code_requests': (commands.ContractCodeRequest(header.hash, CONTRACT_KEY), ),
+    })
+    reply = peer.get_reply(commands.ContractCodes)
+    assert reply['request_id'] == 2
+    assert reply['codes'] == (CODE, )
+
+
+def test_les_flow_control_buffer(chaindb_and_header):
+    chaindb, _ = chaindb_and_header
+    handler = LESPeerRequestHandler(chaindb, CancelToken('test'))
+    peer, other_peer = FakeLESPeer(), FakeLESPeer()
+
+    _, receipt_cost = MAX_REQUEST_COSTS[commands.GetReceipts._cmd_id]
+    max_receipts = FLOW_CONTROL_BUFFER_LIMIT // receipt_cost
+    assert handler.charge_request(peer, commands.GetReceipts, max_receipts) < receipt_cost
+
+    # the buffer did not have time to recharge
+    with pytest.raises(NotEnoughTokens):
+        handler.charge_request(peer, commands.GetReceipts, max_receipts)
+
+    # each peer has its own buffer
+    handler.charge_request(other_peer, commands.GetReceipts, max_receipts)
+
+    # a peer which reconnects starts with a full buffer
+    handler.forget_peer(peer)
+    handler.charge_request(peer, commands.GetReceipts, max_receipts)
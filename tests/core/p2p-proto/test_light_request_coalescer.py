@@ -0,0 +1,151 @@
+import asyncio
+
+import pytest
+
+from trinity.protocol.les import commands
+from trinity.protocol.les.proto import LESProtocolV2
+from trinity.sync.light.coalescer import RequestCoalescer
+from trinity.sync.light.service import LightPeerChain
+
+
+class BatchRecorder:
+    def __init__(self, skip_items=()):
+        self.batches = []
+        self.skip_items = skip_items
+
+    async def send_batch(self, peer, items):
+        self.batches.append((peer, items))
+        await asyncio.sleep(0)
+        return tuple(item * 2 for item in items if item not in self.skip_items)
+
+
+@pytest.mark.asyncio
+async def test_coalescer_merges_concurrent_requests():
+    recorder = BatchRecorder()
+    coalescer = RequestCoalescer(
+        max_items=3,
+        send_batch=recorder.send_batch,
+        missing_result=None,
+        run_task=asyncio.ensure_future,
+    )
+
+    results = await asyncio.gather(*(
+        coalescer.request('peer', item) for item in (1, 2, 1, 3, 4)
+    ))
+
+    assert results == [2, 4, 2, 6, 8]
+    # the same item is requested only once, and batches are at most max_items long
+    assert recorder.batches == [('peer', (1, 2, 3)), ('peer', (4, ))]
+
+
+@pytest.mark.asyncio
+async def test_coalescer_spreads_batches_over_peers():
+    recorder = BatchRecorder()
+    coalescer = RequestCoalescer(
+        max_items=2,
+        send_batch=recorder.send_batch,
+        missing_result=None,
+        run_task=asyncio.ensure_future,
+    )
+    peers = ('peer1', 'peer2')
+
+    async def request(item):
+        return await coalescer.request(coalescer.choose_peer(peers), item)
+
+    assert await asyncio.gather(*(request(item) for item in range(4))) == [0, 2, 4, 6]
+    assert recorder.batches == [('peer1', (0, 1)), ('peer2', (2, 3))]
+
+
+@pytest.mark.asyncio
+async def test_coalescer_retries_items_one_by_one_when_some_are_missing():
+    recorder = BatchRecorder(skip_items=(2, ))
+    coalescer = RequestCoalescer(
+        max_items=3,
+        send_batch=recorder.send_batch,
+        missing_result=None,
+        run_task=asyncio.ensure_future,
+    )
+
+    results = await asyncio.gather(*(coalescer.request('peer', item) for item in (1, 2, 3)))
+
+    assert results == [2, None, 6]
+    assert recorder.batches == [
+        ('peer', (1, 2, 3)),
+        ('peer', (1, )),
+        ('peer', (2, )),
+        ('peer', (3, )),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_coalescer_fails_all_the_requests_of_a_failed_batch():
+    async def send_batch(peer, items):
+        raise TimeoutError()
+
+    coalescer = RequestCoalescer(
+        max_items=3,
+        send_batch=send_batch,
+        missing_result=None,
+        run_task=asyncio.ensure_future,
+    )
+    results = await asyncio.gather(
+        *(coalescer.request('peer', item) for item in (1, 2)),
+        return_exceptions=True,
+    )
+    assert all(isinstance(result, TimeoutError) for result in results)
+
+
+class FakeLESPeer:
+    head_td = 1
+
+    def __init__(self):
+        self.sub_proto = LESProtocolV2(peer=None, cmd_id_offset=16, snappy_support=False)
+        self.sent_messages = []
+        self.sub_proto.send = lambda header, body: self.sent_messages.append((header, body))
+
+    def get_request(self, cmd_class):
+        header, body = self.sent_messages[-1]
+        frame_size = int.from_bytes(header[:3], 'big')
+        return cmd_class(16, False).decode(body[:frame_size])
+
+
+class FakeLESPeerPool:
+    def __init__(self, *peers):
+        self.peers = peers
+
+    @property
+    def highest_td_peer(self):
+        return self.peers[0]
+
+    def get_peers(self, min_td):
+        return list(self.peers)
+
+
+@pytest.mark.asyncio
+async def test_light_peer_chain_coalesces_receipt_requests():
+    peer = FakeLESPeer()
+    peer_chain = LightPeerChain(None, FakeLESPeerPool(peer))
+    block_hashes = tuple(bytes([index]) * 32 for index in range(3))
+
+    receipts = asyncio.ensure_future(asyncio.gather(*(
+        peer_chain.coro_get_receipts(block_hash) for block_hash in block_hashes
+    )))
+    while not peer.sent_messages:
+        await asyncio.sleep(0)
+
+    assert len(peer.sent_messages) == 1
+    request = peer.get_request(commands.GetReceipts)
+    assert request['block_hashes'] == block_hashes
+
+    reply_callback = peer_chain._pending_replies.pop(request['request_id'])
+    reply_callback({'request_id': request['request_id'], 'receipts': ([], [], [])})
+    assert await receipts == [[], [], []]
+
+
+def test_les_v1_proofs_are_merged_into_a_single_node_set():
+    cmd = commands.Proofs(16, False)
+    proofs = ((b'root', b'node1'), (b'root', b'node2'))
+    header, body = cmd.encode({'request_id': 1, 'buffer_value': 0, 'proofs': proofs})
+    frame_size = int.from_bytes(header[:3], 'big')
+
+    assert cmd.decode(body[:frame_size])['proof'] == [b'root', b'node1', b'node2']
@@ -0,0 +1,95 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from eth.db.atomic import AtomicDB
+from eth.db.trie import make_trie_root_and_nodes
+from eth.tools.builder.chain import (
+    build,
+    byzantium_at,
+    disable_pow_check,
+    genesis,
+)
+from eth_utils import ValidationError
+
+from trinity.sync.common.chain import ParallelBlockImporter
+
+from tests.core.integration_fixture_builders import RECEIVER
+from tests.core.integration_test_helpers import (
+    FUNDED_ACCT,
+    FakeAsyncChain,
+)
+
+
+def load_chain():
+    return build(
+        FakeAsyncChain,
+        byzantium_at(0),
+        disable_pow_check(),
+        genesis(
+            db=AtomicDB(),
+            params={'gas_limit': 3141592, 'timestamp': 1514764800},
+            state={FUNDED_ACCT.public_key.to_canonical_address(): {"balance": 10 ** 18}},
+        ),
+    )
+
+
+@pytest.fixture(scope='module')
+def executor():
+    executor = ProcessPoolExecutor(max_workers=2)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+@pytest.fixture
+def mined_blocks():
+    chain = load_chain()
+    blocks = []
+    for nonce in range(4):
+        tx = chain.create_unsigned_transaction(
+            nonce=nonce,
+            gas_price=1234,
+            gas=123400,
+            to=RECEIVER.public_key.to_canonical_address(),
+            value=nonce,
+            data=b'',
+        )
+        chain.apply_transaction(tx.as_signed_transaction(FUNDED_ACCT))
+        blocks.append(chain.mine_block())
+    return blocks
+
+
+@pytest.mark.asyncio
+async def test_parallel_block_importer_imports_prepared_blocks(executor, mined_blocks):
+    chain = load_chain()
+    importer = ParallelBlockImporter(chain, executor=executor, lookahead=2)
+
+    importer.prepare_blocks(mined_blocks)
+    for block in mined_blocks:
+        imported_block, new_canonical_blocks, _ = await importer.import_block(block)
+        assert imported_block == block
+        assert new_canonical_blocks == (block, )
+
+    assert chain.get_canonical_head() == mined_blocks[-1].header
+
+
+@pytest.mark.asyncio
+async def test_parallel_block_importer_rejects_bad_signature(executor, mined_blocks):
+    chain = load_chain()
+    importer = ParallelBlockImporter(chain, executor=executor)
+
+    block = mined_blocks[0]
+    # no curve point has an x coordinate of 5, so no public key can be recovered
+    bad_transaction = block.transactions[0].copy(r=5)
+    # the header commits to the bad transaction, so only its signature is invalid
+    transaction_root, _ = make_trie_root_and_nodes((bad_transaction, ))
+    bad_block = block.copy(
+        header=block.header.copy(transaction_root=transaction_root),
+        transactions=[bad_transaction],
+    )
+
+    importer.prepare_blocks((bad_block, ) + tuple(mined_blocks[1:]))
+    with pytest.raises(ValidationError, match='Bad Signature'):
+        await importer.import_block(bad_block)
+
+    assert chain.get_canonical_head().block_number == 0
@@ -0,0 +1,124 @@
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+import pytest
+
+from eth.consensus.pow import mine_pow_nonce
+from eth.db.atomic import AtomicDB
+from eth.rlp.headers import BlockHeader
+from eth.tools.builder.chain import (
+    build,
+    byzantium_at,
+    disable_pow_check,
+    genesis,
+    mine_blocks,
+)
+from eth_utils import ValidationError
+
+from trinity.sync.common.constants import ETHASH_CACHES_ON_DISK
+from trinity.sync.common.seals import (
+    SealVerifier,
+    _prune_cache_files,
+)
+
+from tests.core.integration_test_helpers import FakeAsyncChain
+
+
+GENESIS_PARAMS = {'difficulty': 1, 'gas_limit': 3141592, 'timestamp': 1514764800}
+
+
+@pytest.fixture(scope='module')
+def executor():
+    executor = ProcessPoolExecutor(max_workers=2)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+def test_prune_cache_files(tmp_path):
+    cache_dir = tmp_path / 'ethash'
+    cache_dir.mkdir()
+    for epoch in range(ETHASH_CACHES_ON_DISK + 2):
+        path = cache_dir / f'cache-{epoch}'
+        path.write_bytes(b'')
+        # make the highest epochs the oldest files
+        os.utime(str(path), (1000 - epoch, 1000 - epoch))
+
+    _prune_cache_files(cache_dir)
+
+    remaining = sorted(path.name for path in cache_dir.iterdir())
+    assert remaining == [f'cache-{epoch}' for epoch in range(ETHASH_CACHES_ON_DISK)]
+
+
+@pytest.mark.asyncio
+async def test_seal_verifier_validates_chain_without_pow(executor, tmp_path):
+    chain = build(
+        FakeAsyncChain,
+        byzantium_at(0),
+        disable_pow_check(),
+        genesis(db=AtomicDB(), params=GENESIS_PARAMS),
+        mine_blocks(3),
+    )
+    headers = tuple(
+        chain.chaindb.get_canonical_block_header_by_number(block_number)
+        for block_number in range(4)
+    )
+    cache_dir = tmp_path / 'ethash'
+    verifier = SealVerifier(cache_dir, executor)
+
+    await verifier.validate_chain(chain, headers[0], headers[1:])
+
+    with pytest.raises(ValidationError):
+        await verifier.validate_chain(chain, headers[0], headers[2:])
+    # the VM doesn't use the ethash seal, so no cache had to be built
+    assert not cache_dir.exists()
+
+
+@pytest.mark.asyncio
+async def test_seal_verifier_leaves_seals_to_the_pool(executor, tmp_path):
+    unsealed_chain = build(
+        FakeAsyncChain,
+        byzantium_at(0),
+        disable_pow_check(),
+        genesis(db=AtomicDB(), params=GENESIS_PARAMS),
+        mine_blocks(3),
+    )
+    headers = tuple(
+        unsealed_chain.chaindb.get_canonical_block_header_by_number(block_number)
+        for block_number in range(4)
+    )
+    # The same chain, but checking the ethash seals, which none of the headers have
+    chain = build(
+        FakeAsyncChain,
+        byzantium_at(0),
+        genesis(db=AtomicDB(), params=GENESIS_PARAMS),
+    )
+    verifier = SealVerifier(tmp_path, executor)
+    checked_headers = []
+
+    async def check_seals(headers):
+        checked_headers.extend(headers)
+
+    verifier.check_seals = check_seals
+
+    # validate_chain() of the chain must not check any seal itself
+    await verifier.validate_chain(chain, headers[0], headers[1:])
+    assert tuple(checked_headers) == headers[1:]
+
+
+def mine_header(block_number):
+    header = BlockHeader(difficulty=1, block_number=block_number, gas_limit=3141592)
+    nonce, mix_hash = mine_pow_nonce(block_number, header.mining_hash, header.difficulty)
+    return header.copy(nonce=nonce, mix_hash=mix_hash)
+
+
+@pytest.mark.asyncio
+async def test_seal_verifier_checks_pow(executor, tmp_path):
+    headers = tuple(mine_header(block_number) for block_number in range(1, 4))
+    verifier = SealVerifier(tmp_path, executor)
+
+    await verifier.check_seals(headers)
+    assert (tmp_path / 'cache-0').exists()
+
+    bad_header = headers[-1].copy(mix_hash=headers[0].mix_hash)
+    with pytest.raises(ValidationError, match='Invalid seal on block #3'):
+        await verifier.check_seals(headers[:-1] + (bad_header, ))
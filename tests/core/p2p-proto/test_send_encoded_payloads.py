@@ -0,0 +1,159 @@
+import pytest
+
+import rlp
+
+from eth.rlp.headers import BlockHeader
+from eth.rlp.receipts import Receipt
+from eth.rlp.transactions import BaseTransactionFields
+
+from trinity.protocol.eth.proto import ETHProtocol
+from trinity.protocol.les.commands import (
+    BlockBodies,
+    Proofs,
+    ProofsV2,
+    Receipts,
+)
+from trinity.protocol.les.proto import LESProtocol, LESProtocolV2
+from trinity.rlp.block_body import BlockBody
+
+
+HEADERS = tuple(
+    BlockHeader(difficulty=100, block_number=number, gas_limit=3000000)
+    for number in range(3)
+)
+
+TRANSACTIONS = tuple(
+    BaseTransactionFields(
+        nonce=nonce,
+        gas_price=1,
+        gas=21000,
+        to=b'\x01' * 20,
+        value=nonce,
+        data=b'',
+        v=27,
+        r=1,
+        s=1,
+    )
+    for nonce in range(3)
+)
+
+
+def get_sent_messages(protocol_class, snappy_support):
+    proto = protocol_class(peer=None, cmd_id_offset=16, snappy_support=snappy_support)
+    sent_messages = []
+    proto.send = lambda header, body: sent_messages.append((header, body))
+    return proto, sent_messages
+
+
+@pytest.mark.parametrize('headers', ((), HEADERS[:1], HEADERS))
+@pytest.mark.parametrize('snappy_support', (True, False))
+def test_eth_send_encoded_block_headers(headers, snappy_support):
+    proto, sent_messages = get_sent_messages(ETHProtocol, snappy_support)
+
+    proto.send_block_headers(headers)
+    proto.send_encoded_block_headers(tuple(rlp.encode(header) for header in headers))
+
+    assert len(sent_messages) == 2
+    assert sent_messages[0] == sent_messages[1]
+
+
+@pytest.mark.parametrize('headers', ((), HEADERS))
+@pytest.mark.parametrize('request_id, buffer_value', ((0, 0), (1, 300), (2 ** 40, 2 ** 20)))
+def test_les_send_encoded_block_headers(headers, request_id, buffer_value):
+    proto, sent_messages = get_sent_messages(LESProtocolV2, snappy_support=True)
+
+    proto.send_block_headers(headers, buffer_value, request_id)
+    proto.send_encoded_block_headers(
+        tuple(rlp.encode(header) for header in headers),
+        buffer_value,
+        request_id,
+    )
+
+    assert len(sent_messages) == 2
+    assert sent_messages[0] == sent_messages[1]
+
+
+@pytest.mark.parametrize(
+    'bodies',
+    (
+        (),
+        (BlockBody([], []),),
+        (BlockBody(TRANSACTIONS, HEADERS[:1]), BlockBody([], HEADERS), BlockBody(TRANSACTIONS, [])),
+    ),
+)
+def test_eth_send_encoded_block_bodies(bodies):
+    proto, sent_messages = get_sent_messages(ETHProtocol, snappy_support=True)
+
+    proto.send_block_bodies(list(bodies))
+    proto.send_encoded_block_bodies(tuple(rlp.encode(body) for body in bodies))
+
+    assert len(sent_messages) == 2
+    assert sent_messages[0] == sent_messages[1]
+
+
+@pytest.mark.parametrize('receipts', ((), ((),), ((Receipt(b'\x00' * 32, 21000, []),), ())))
+def test_eth_send_encoded_receipts(receipts):
+    proto, sent_messages = get_sent_messages(ETHProtocol, snappy_support=True)
+
+    proto.send_receipts([list(block_receipts) for block_receipts in receipts])
+    proto.send_encoded_receipts(tuple(
+        rlp.encode(list(block_receipts)) for block_receipts in receipts
+    ))
+
+    assert len(sent_messages) == 2
+    assert sent_messages[0] == sent_messages[1]
+
+
+@pytest.mark.parametrize('protocol_class', (LESProtocol, LESProtocolV2))
+def test_les_send_encoded_block_bodies_and_receipts(protocol_class):
+    proto, sent_messages = get_sent_messages(protocol_class, snappy_support=True)
+    bodies = (BlockBody(TRANSACTIONS, HEADERS[:1]), BlockBody([], []))
+    receipts = ((Receipt(b'\x00' * 32, 21000, []),), ())
+
+    proto.send_encoded_block_bodies(tuple(rlp.encode(body) for body in bodies), 300, 7)
+    proto.send_encoded_receipts(
+        tuple(rlp.encode(list(block_receipts)) for block_receipts in receipts),
+        200,
+        8,
+    )
+
+    assert sent_messages == [
+        BlockBodies(16, True).encode({'request_id': 7, 'buffer_value': 300, 'bodies': bodies}),
+        Receipts(16, True).encode({'request_id': 8, 'buffer_value': 200, 'receipts': receipts}),
+    ]
+
+
+PROOF_NODES = (
+    [b'\x01' * 32] * 16 + [b''],
+    [b'\x20\x01', b'value'],
+)
+
+
+def test_les_send_encoded_proofs():
+    proto, sent_messages = get_sent_messages(LESProtocol, snappy_support=True)
+    proofs = ((PROOF_NODES[0], PROOF_NODES[1]), (), (PROOF_NODES[0],))
+
+    proto.send_encoded_proofs(
+        tuple(tuple(rlp.encode(node) for node in proof) for proof in proofs),
+        300,
+        7,
+    )
+
+    assert sent_messages == [
+        Proofs(16, True).encode({'request_id': 7, 'buffer_value': 300, 'proofs': proofs}),
+    ]
+
+
+def test_les_v2_send_encoded_proofs_as_node_set():
+    proto, sent_messages = get_sent_messages(LESProtocolV2, snappy_support=True)
+    proofs = ((PROOF_NODES[0], PROOF_NODES[1]), (), (PROOF_NODES[0],))
+
+    proto.send_encoded_proofs(
+        tuple(tuple(rlp.encode(node) for node in proof) for proof in proofs),
+        300,
+        7,
+    )
+
+    assert sent_messages == [
+        ProofsV2(16, True).encode({'request_id': 7, 'buffer_value': 300, 'proof': PROOF_NODES}),
+    ]
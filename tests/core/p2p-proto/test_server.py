@@ -12,11 +12,13 @@ from eth.db.chain import ChainDB
 
 from p2p.auth import HandshakeInitiator, _handshake
 from p2p.events import ConnectToNodeCommand
+from p2p.exceptions import UnreachablePeer
 from p2p.kademlia import (
     Node,
     Address,
 )
 from p2p.peer import PeerConnection
+from p2p.persistence import MemoryPeerInfo
 from p2p.tools.paragon import (
     ParagonContext,
     ParagonPeer,
@@ -27,6 +29,7 @@ from trinity.constants import TO_NETWORKING_BROADCAST_CONFIG
 from trinity.server import BaseServer
 
 from tests.p2p.auth_constants import eip8_values
+from tests.p2p.helpers import random_node
 from tests.core.integration_test_helpers import FakeAsyncHeaderDB
 
 
@@ -165,6 +168,107 @@ async def test_peer_pool_connect(monkeypatch, event_loop, server):
     await initiator_peer_pool.cancel()
 
 
+class FakeDialedPeer:
+    def __init__(self, remote):
+        self.remote = remote
+        self.is_running = False
+        self.inbound = False
+
+    def add_finished_callback(self, callback):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_peer_pool_dials_concurrently_until_full(monkeypatch, event_loop):
+    live_nodes = [random_node() for _ in range(2)]
+    dead_nodes = [random_node() for _ in range(8)]
+    dialed_nodes = []
+    cancelled_dials = []
+
+    async def mock_handshake(remote, factory):
+        dialed_nodes.append(remote)
+        try:
+            if remote in live_nodes:
+                await asyncio.sleep(0.01)
+                return FakeDialedPeer(remote)
+            else:
+                await asyncio.sleep(0.05)
+                raise UnreachablePeer()
+        except asyncio.CancelledError:
+            cancelled_dials.append(remote)
+            raise
+
+    monkeypatch.setattr('p2p.peer_pool.handshake', mock_handshake)
+
+    peer_pool = ParagonPeerPool(
+        privkey=INITIATOR_PRIVKEY,
+        context=ParagonContext(),
+        max_peers=2,
+        max_concurrent_dials=4,
+    )
+
+    async def mock_start_peer(peer):
+        peer_pool._add_peer(peer, ())
+
+    monkeypatch.setattr(peer_pool, 'start_peer', mock_start_peer)
+
+    asyncio.ensure_future(peer_pool.run(), loop=event_loop)
+    await peer_pool.events.started.wait()
+    try:
+        await peer_pool.connect_to_nodes(iter(dead_nodes[:2] + live_nodes + dead_nodes[2:]))
+    finally:
+        await peer_pool.cancel()
+
+    assert peer_pool.is_full
+    # The first 4 nodes were dialed at once, and the first dial to succeed moved on to the next
+    # node. The dials still in progress when the pool got full were cancelled, instead of dialing
+    # the remaining nodes.
+    assert dialed_nodes == dead_nodes[:2] + live_nodes + dead_nodes[2:3]
+    assert set(cancelled_dials) == set(dead_nodes[:3])
+    assert peer_pool.num_dials == 5
+    assert peer_pool.dial_success_rate == 0.4
+    assert peer_pool.time_to_full_pool is not None
+
+
+@pytest.mark.asyncio
+async def test_peer_pool_dials_good_nodes_first(monkeypatch, event_loop):
+    slow_node, fast_node, other_proto_node = [random_node() for _ in range(3)]
+    peer_info = MemoryPeerInfo()
+    peer_info.record_success(slow_node, 'paragon/1', throughput=10.0)
+    peer_info.record_success(fast_node, 'paragon/1', throughput=100.0)
+    peer_info.record_success(other_proto_node, 'eth/63', throughput=1000.0)
+    dialed_nodes = []
+
+    async def mock_handshake(remote, factory):
+        dialed_nodes.append(remote)
+        return FakeDialedPeer(remote)
+
+    monkeypatch.setattr('p2p.peer_pool.handshake', mock_handshake)
+
+    peer_pool = ParagonPeerPool(
+        privkey=INITIATOR_PRIVKEY,
+        context=ParagonContext(),
+        max_peers=1,
+        peer_info=peer_info,
+        max_concurrent_dials=1,
+    )
+
+    async def mock_start_peer(peer):
+        peer_pool._add_peer(peer, ())
+
+    monkeypatch.setattr(peer_pool, 'start_peer', mock_start_peer)
+
+    # The pool dials the good nodes as soon as it starts, without any help from discovery
+    asyncio.ensure_future(peer_pool.run(), loop=event_loop)
+    try:
+        while not peer_pool.is_full:
+            await asyncio.sleep(0)
+    finally:
+        await peer_pool.cancel()
+
+    assert dialed_nodes == [fast_node]
+
+
 @pytest.mark.asyncio
 async def test_peer_pool_answers_connect_commands(event_loop, event_bus, server):
     # This is the PeerPool which will accept our message and try to connect to {server}
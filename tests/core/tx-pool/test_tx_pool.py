@@ -11,6 +11,7 @@ from p2p.peer import PeerSubscriber
 from p2p.protocol import Command
 
 from trinity.plugins.builtin.tx_pool.pool import (
+    KnownTransactions,
     TxPool,
 )
 from trinity.plugins.builtin.tx_pool.validators import (
@@ -161,6 +162,68 @@ async def test_does_not_propagate_invalid_tx(monkeypatch,
     assert peer2_txs_recorder.recorded_tx[0].hash == txs_broadcasted_by_peer1[1].hash
 
 
+@pytest.mark.asyncio
+async def test_validates_tx_once(monkeypatch,
+                                 request,
+                                 event_loop,
+                                 chain_with_block_validation,
+                                 tx_validator):
+    validated_txs = []
+
+    def counting_validator(tx):
+        validated_txs.append(tx)
+        return tx_validator(tx)
+
+    peer1, peer1_txs_recorder, peer2, peer2_txs_recorder, pool = await bootstrap_test_setup(
+        monkeypatch,
+        request,
+        event_loop,
+        chain_with_block_validation,
+        counting_validator
+    )
+
+    txs = [
+        create_random_tx(chain_with_block_validation, is_valid=False),
+        create_random_tx(chain_with_block_validation),
+    ]
+    await pool._handle_tx(peer1, txs)
+    await pool._handle_tx(peer2, txs)
+
+    assert validated_txs == txs
+    assert [tx.hash for tx in peer2_txs_recorder.recorded_tx] == [txs[1].hash]
+    assert len(peer1_txs_recorder.recorded_tx) == 0
+
+
+def test_known_transactions_expire(monkeypatch):
+    now = 1000.0
+    monkeypatch.setattr('time.monotonic', lambda: now)
+    known_txs = KnownTransactions(expiry=10, max_generation_size=3)
+
+    known_txs.add(b'\x01' * 32)
+    now += 6
+    known_txs.add(b'\x02' * 32)
+    # the first hash moved to the previous generation, but is still known
+    assert b'\x01' * 32 in known_txs
+    assert b'\x03' * 32 not in known_txs
+
+    now += 6
+    assert b'\x01' * 32 not in known_txs
+    assert b'\x02' * 32 in known_txs
+
+    now += 20
+    assert len(known_txs) == 0
+
+    # a full generation moves to the previous one early
+    for index in range(4, 8):
+        known_txs.add(bytes([index]) * 32)
+    assert len(known_txs) == 4
+    known_txs.add(b'\x08' * 32)
+    known_txs.add(b'\x09' * 32)
+    known_txs.add(b'\x0a' * 32)
+    assert b'\x04' * 32 not in known_txs
+    assert b'\x07' * 32 in known_txs
+
+
 @pytest.mark.asyncio
 async def test_tx_sending(request, event_loop, chain_with_block_validation, tx_validator):
     # This test covers the communication end to end whereas the previous
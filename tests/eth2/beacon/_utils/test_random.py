@@ -5,6 +5,8 @@ from eth_utils import (
 )
 
 from eth2.beacon._utils.random import (
+    compute_permuted_index,
+    get_permutation,
     get_permuted_index,
     shuffle,
 )
@@ -14,7 +16,7 @@ def slow_shuffle(items, seed, shuffle_round_count):
     length = len(items)
     return tuple(
         [
-            items[get_permuted_index(i, length, seed, shuffle_round_count)]
+            items[compute_permuted_index(i, length, seed, shuffle_round_count)]
             for i in range(length)
         ]
     )
@@ -44,6 +46,35 @@ def test_shuffle_consistent(values, seed, shuffle_round_count):
     assert shuffle(values, seed, shuffle_round_count) == expect
 
 
-def test_get_permuted_index_invalid(shuffle_round_count):
+@pytest.mark.parametrize(
+    'list_size',
+    (1, 2, 255, 256, 257, 1000),
+)
+def test_get_permuted_index(list_size):
+    seed = b'\x23' * 32
+    shuffle_round_count = 10
+    for index in range(list_size):
+        permuted_index = get_permuted_index(index, list_size, seed, shuffle_round_count)
+        expected = compute_permuted_index(index, list_size, seed, shuffle_round_count)
+        assert permuted_index == expected
+
+
+def test_get_permutation_is_cached():
+    permutation = get_permutation(100, b'\x23' * 32, 90)
+    assert get_permutation(100, b'\x23' * 32, 90) is permutation
+    assert sorted(permutation.tolist()) == list(range(100))
+    with pytest.raises(ValueError):
+        permutation[0] = 1
+
+
+def test_shuffle_empty_list():
+    assert shuffle((), b'\x23' * 32, 90) == ()
+
+
+@pytest.mark.parametrize(
+    'get_index',
+    (compute_permuted_index, get_permuted_index),
+)
+def test_get_permuted_index_invalid(get_index, shuffle_round_count):
     with pytest.raises(ValidationError):
-        get_permuted_index(2, 2, b'\x12' * 32, shuffle_round_count)
+        get_index(2, 2, b'\x12' * 32, shuffle_round_count)
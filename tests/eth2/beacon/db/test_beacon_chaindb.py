@@ -163,3 +163,50 @@ def test_get_slot_by_root(chaindb, block):
     block_slot = block.slot
     result_slot = chaindb.get_slot_by_root(block.root)
     assert result_slot == block_slot
+
+
+def test_chaindb_get_encoded_canonical_block_range(chaindb, block):
+    chain = [block]
+    for _ in range(4):
+        chain.append(chain[-1].copy(
+            slot=chain[-1].slot + 1,
+            parent_root=chain[-1].root,
+        ))
+    fork = [chain[1].copy(
+        slot=chain[1].slot + 1,
+        parent_root=chain[1].root,
+        state_root=b'\x11' * 32,
+    )]
+    chaindb.persist_block_chain(chain, BeaconBlock)
+    chaindb.persist_block_chain(fork, BeaconBlock)
+
+    def get_range(start_slot, max_blocks):
+        return chaindb.get_encoded_canonical_block_range(start_slot, max_blocks)
+
+    assert get_range(block.slot, 5) == tuple(ssz.encode(b) for b in chain)
+    assert get_range(block.slot + 1, 2) == tuple(ssz.encode(b) for b in chain[1:3])
+    # stop at the canonical head
+    assert get_range(block.slot + 3, 10) == tuple(ssz.encode(b) for b in chain[3:])
+    assert get_range(block.slot, 0) == ()
+    assert get_range(block.slot + 5, 1) == ()
+
+
+def test_chaindb_get_encoded_canonical_block_range_stops_at_unlinked_block(chaindb, block):
+    chain = [block]
+    for _ in range(3):
+        chain.append(chain[-1].copy(
+            slot=chain[-1].slot + 1,
+            parent_root=chain[-1].root,
+        ))
+    chaindb.persist_block_chain(chain, BeaconBlock)
+
+    # a slot lookup which is not a child of the block at the previous slot
+    unlinked_block = chain[0].copy(slot=chain[2].slot, state_root=b'\x22' * 32)
+    chaindb.db[unlinked_block.root] = ssz.encode(unlinked_block)
+    chaindb.db[SchemaV1.make_block_slot_to_root_lookup_key(unlinked_block.slot)] = ssz.encode(
+        unlinked_block.root,
+        sedes=ssz.sedes.bytes_sedes,
+    )
+
+    encoded_blocks = chaindb.get_encoded_canonical_block_range(block.slot, 4)
+    assert encoded_blocks == tuple(ssz.encode(b) for b in chain[:2])
@@ -1,3 +1,5 @@
+import time
+
 import pytest
 
 from hypothesis import (
@@ -57,6 +59,7 @@ from eth2.beacon.types.crosslink_records import CrosslinkRecord
 from eth2.beacon.types.pending_attestation_records import PendingAttestationRecord
 from eth2.beacon.state_machines.forks.serenity.epoch_processing import (
     _check_if_update_validator_registry,
+    _compute_inactivity_leak_deltas,
     _compute_individual_penalty,
     _compute_total_penalties,
     _current_previous_epochs_justifiable,
@@ -964,6 +967,36 @@ def test_process_rewards_and_penalties_for_crosslinks(
         )
 
 
+def test_compute_inactivity_leak_deltas_is_linear(n_validators_state, config):
+    def _time_inactivity_leak_deltas(validator_count):
+        state = n_validators_state.copy(
+            validator_registry=n_validators_state.validator_registry[:1] * validator_count,
+            validator_balances=n_validators_state.validator_balances[:1] * validator_count,
+        )
+        validator_indices = set(range(validator_count))
+        balances = {index: config.MAX_DEPOSIT_AMOUNT for index in validator_indices}
+
+        start_time = time.time()
+        # No validator attested, so every one of them gets penalized several times.
+        _compute_inactivity_leak_deltas(
+            state,
+            config,
+            validator_indices,
+            set(),
+            set(),
+            set(),
+            {},
+            balances,
+            balances,
+            epochs_since_finality=5,
+        )
+        return time.time() - start_time
+
+    small_validator_count_time = _time_inactivity_leak_deltas(1000)
+    large_validator_count_time = _time_inactivity_leak_deltas(8000)
+    assert large_validator_count_time < small_validator_count_time * 8 * 3
+
+
 #
 # Ejections
 #
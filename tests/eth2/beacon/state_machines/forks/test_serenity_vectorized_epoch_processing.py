@@ -0,0 +1,254 @@
+import pytest
+
+from hypothesis import (
+    given,
+    settings,
+    strategies as st,
+)
+
+from eth.constants import (
+    ZERO_HASH32,
+)
+
+from eth2._utils.bitfield import (
+    set_voted,
+    get_empty_bitfield,
+)
+from eth2.beacon.committee_helpers import (
+    get_crosslink_committees_at_slot,
+)
+from eth2.beacon.configs import (
+    CommitteeConfig,
+)
+from eth2.beacon.helpers import (
+    get_active_validator_indices,
+    get_block_root,
+    get_epoch_start_slot,
+)
+from eth2.beacon.epoch_processing_helpers import (
+    get_base_reward,
+    get_effective_balance,
+    get_inclusion_infos,
+)
+from eth2.beacon.types.attestation_data import AttestationData
+from eth2.beacon.types.crosslink_records import CrosslinkRecord
+from eth2.beacon.types.pending_attestation_records import PendingAttestationRecord
+from eth2.beacon.state_machines.forks.serenity import (
+    epoch_processing,
+    vectorized_epoch_processing,
+)
+from eth2.beacon.state_machines.forks.serenity.vectorized_epoch_processing import (
+    ValidatorArrays,
+    get_base_rewards,
+    to_mask,
+)
+
+
+def _make_state_with_previous_epoch_attestations(random,
+                                                 state,
+                                                 config,
+                                                 current_slot,
+                                                 finalized_epoch,
+                                                 max_deposit_amount,
+                                                 sample_attestation_data_params,
+                                                 sample_pending_attestation_record_params):
+    slots_per_epoch = config.SLOTS_PER_EPOCH
+    previous_epoch = current_slot // slots_per_epoch - 1
+
+    # Some validators are slashed and exited, the others have random balances
+    validator_registry = tuple(
+        validator.copy(
+            slashed=True,
+            exit_epoch=previous_epoch - 1,
+            withdrawable_epoch=previous_epoch + 10,
+        ) if random.random() < 0.1 else validator
+        for validator in state.validator_registry
+    )
+    state = state.copy(
+        slot=current_slot,
+        finalized_epoch=finalized_epoch,
+        validator_registry=validator_registry,
+        validator_balances=tuple(
+            random.randint(0, 2 * max_deposit_amount)
+            for _ in validator_registry
+        ),
+        latest_block_roots=tuple(
+            index.to_bytes(32, 'big')
+            for index in range(config.LATEST_BLOCK_ROOTS_LENGTH)
+        ),
+    )
+
+    previous_epoch_start_slot = get_epoch_start_slot(previous_epoch, slots_per_epoch)
+    boundary_root = get_block_root(
+        state,
+        previous_epoch_start_slot,
+        config.LATEST_BLOCK_ROOTS_LENGTH,
+    )
+    previous_epoch_attestations = []
+    for slot in range(previous_epoch_start_slot, previous_epoch_start_slot + slots_per_epoch):
+        for committee, shard in get_crosslink_committees_at_slot(
+                state,
+                slot,
+                CommitteeConfig(config)):
+            # Each committee sends two attestations, from random (possibly overlapping) subsets
+            # of its members, voting for random roots and included with random delays
+            for _ in range(2):
+                participants_bitfield = get_empty_bitfield(len(committee))
+                for index in random.sample(committee, random.randint(0, len(committee))):
+                    participants_bitfield = set_voted(participants_bitfield, committee.index(index))
+                beacon_block_root = random.choice((
+                    boundary_root,
+                    get_block_root(state, slot, config.LATEST_BLOCK_ROOTS_LENGTH),
+                    b'\x99' * 32,
+                ))
+                previous_epoch_attestations.append(
+                    PendingAttestationRecord(**sample_pending_attestation_record_params).copy(
+                        data=AttestationData(**sample_attestation_data_params).copy(
+                            slot=slot,
+                            shard=shard,
+                            beacon_block_root=beacon_block_root,
+                            crosslink_data_root=random.choice((b'\x33' * 32, b'\x44' * 32)),
+                            latest_crosslink=CrosslinkRecord(
+                                epoch=config.GENESIS_EPOCH,
+                                crosslink_data_root=ZERO_HASH32,
+                            ),
+                        ),
+                        aggregation_bitfield=participants_bitfield,
+                        slot_included=(
+                            slot + config.MIN_ATTESTATION_INCLUSION_DELAY + random.randint(0, 3)
+                        ),
+                    )
+                )
+
+    return state.copy(
+        previous_epoch_attestations=tuple(previous_epoch_attestations),
+    )
+
+
+@settings(max_examples=3, deadline=None)
+@given(random=st.randoms())
+@pytest.mark.parametrize(
+    (
+        'n,'
+        'slots_per_epoch,'
+        'target_committee_size,'
+        'shard_count,'
+        'current_slot,'
+        'genesis_slot,'
+        'finalized_epoch,'
+    ),
+    [
+        # Normal justification and finalization
+        (50, 10, 5, 10, 100, 0, 8),
+        # Inactivity leak
+        (50, 10, 5, 10, 100, 0, 2),
+    ]
+)
+def test_vectorized_rewards_and_penalties_are_identical(
+        random,
+        n_validators_state,
+        config,
+        current_slot,
+        finalized_epoch,
+        max_deposit_amount,
+        sample_attestation_data_params,
+        sample_pending_attestation_record_params):
+    state = _make_state_with_previous_epoch_attestations(
+        random,
+        n_validators_state,
+        config,
+        current_slot,
+        finalized_epoch,
+        max_deposit_amount,
+        sample_attestation_data_params,
+        sample_pending_attestation_record_params,
+    )
+
+    # Inputs of the reference implementation
+    num_validators = len(state.validator_registry)
+    previous_epoch_active_validator_indices = set(
+        get_active_validator_indices(
+            state.validator_registry,
+            state.previous_epoch(config.SLOTS_PER_EPOCH, config.GENESIS_EPOCH)
+        )
+    )
+    previous_total_balance = sum(
+        get_effective_balance(state.validator_balances, index, max_deposit_amount)
+        for index in previous_epoch_active_validator_indices
+    )
+    previous_epoch_attester_indices = epoch_processing.get_attester_indices_from_attestations(
+        state=state,
+        attestations=state.previous_epoch_attestations,
+        committee_config=CommitteeConfig(config),
+    )
+    inclusion_infos = get_inclusion_infos(
+        state=state,
+        attestations=state.previous_epoch_attestations,
+        committee_config=CommitteeConfig(config),
+    )
+    effective_balances = {
+        index: get_effective_balance(state.validator_balances, index, max_deposit_amount)
+        for index in range(num_validators)
+    }
+    base_rewards = {
+        index: get_base_reward(
+            state=state,
+            index=index,
+            base_reward_quotient=config.BASE_REWARD_QUOTIENT,
+            previous_total_balance=previous_total_balance,
+            max_deposit_amount=max_deposit_amount,
+        )
+        for index in range(num_validators)
+    }
+
+    # Inputs of the vectorized implementation
+    validator_arrays = ValidatorArrays.from_state(state, max_deposit_amount)
+    vectorized_base_rewards = get_base_rewards(
+        validator_arrays.effective_balances,
+        config.BASE_REWARD_QUOTIENT,
+        previous_total_balance,
+    )
+    assert vectorized_base_rewards.tolist() == [base_rewards[index] for index in range(num_validators)]  # noqa: E501
+
+    expected_finality_deltas = epoch_processing._process_rewards_and_penalties_for_finality(
+        state,
+        config,
+        previous_epoch_active_validator_indices,
+        previous_total_balance,
+        state.previous_epoch_attestations,
+        previous_epoch_attester_indices,
+        inclusion_infos,
+        effective_balances,
+        base_rewards,
+    )
+    finality_deltas = vectorized_epoch_processing.compute_finality_deltas(
+        state,
+        config,
+        validator_arrays,
+        to_mask(previous_epoch_active_validator_indices, num_validators),
+        previous_total_balance,
+        to_mask(previous_epoch_attester_indices, num_validators),
+        inclusion_infos,
+        vectorized_base_rewards,
+    )
+    expected_crosslinks_deltas = epoch_processing._process_rewards_and_penalties_for_crosslinks(
+        state,
+        config,
+        effective_balances,
+        base_rewards,
+    )
+    crosslinks_deltas = vectorized_epoch_processing.compute_crosslinks_deltas(
+        state,
+        config,
+        validator_arrays,
+        vectorized_base_rewards,
+    )
+    for expected, actual in zip(
+            expected_finality_deltas + expected_crosslinks_deltas,
+            finality_deltas + crosslinks_deltas):
+        assert actual.tolist() == [expected[index] for index in range(num_validators)]
+
+    expected_state = epoch_processing.process_rewards_and_penalties(state, config)
+    result_state = vectorized_epoch_processing.process_rewards_and_penalties(state, config)
+    assert result_state.validator_balances == expected_state.validator_balances
+    assert all(type(balance) is int for balance in result_state.validator_balances)
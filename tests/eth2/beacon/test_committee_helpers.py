@@ -16,6 +16,7 @@ from eth2.beacon.committee_helpers import (
     get_current_epoch_committee_count,
     get_crosslink_committees_at_slot,
     get_epoch_committee_count,
+    get_epoch_committees,
     get_next_epoch_committee_count,
     get_previous_epoch_committee_count,
     get_shuffling,
@@ -495,6 +496,76 @@ def test_get_crosslink_committees_at_slot(
     assert shuffling[committees_per_slot * offset] == crosslink_committees_at_slot[0][0]
 
 
+@pytest.mark.parametrize(
+    (
+        'n,'
+        'slots_per_epoch,'
+        'target_committee_size,'
+        'shard_count,'
+        'genesis_slot,'
+    ),
+    [
+        (100, 8, 4, 16, 0),
+    ],
+)
+def test_get_epoch_committees_cache(n_validators_state, committee_config):
+    state = n_validators_state
+    epoch = state.current_epoch(committee_config.SLOTS_PER_EPOCH)
+    epoch_committees = get_epoch_committees(state, epoch, committee_config)
+
+    # Reused as long as the registry isn't replaced
+    assert get_epoch_committees(state, epoch, committee_config) is epoch_committees
+    assert get_epoch_committees(
+        state.update_validator_balance(0, 0).copy(slot=state.slot + 1),
+        epoch,
+        committee_config,
+    ) is epoch_committees
+
+    # Recomputed otherwise
+    state_with_new_registry = state.update_validator_registry(
+        0,
+        state.validator_registry[0].copy(exit_epoch=epoch),
+    )
+    assert get_epoch_committees(
+        state_with_new_registry,
+        epoch,
+        committee_config,
+    ) is not epoch_committees
+
+    # ``registry_change`` only matters for the next epoch
+    assert get_epoch_committees(
+        state,
+        epoch,
+        committee_config,
+        registry_change=True,
+    ) is epoch_committees
+
+
+@pytest.mark.parametrize(
+    (
+        'n,'
+        'slots_per_epoch,'
+        'target_committee_size,'
+        'shard_count,'
+        'genesis_slot,'
+    ),
+    [
+        (100, 8, 4, 16, 0),
+        (10, 8, 4, 16, 0),
+    ],
+)
+def test_get_epoch_committees_positions(n_validators_state, committee_config):
+    state = n_validators_state
+    epoch = state.current_epoch(committee_config.SLOTS_PER_EPOCH)
+    epoch_committees = get_epoch_committees(state, epoch, committee_config)
+
+    assert set(epoch_committees.committee_positions) == set(range(len(state.validator_registry)))
+    for validator_index, position in epoch_committees.committee_positions.items():
+        committee = epoch_committees.committees[position.slot, position.shard]
+        assert committee[position.position] == validator_index
+        assert (committee, position.shard) in epoch_committees.committees_at_slot[position.slot]
+
+
 @pytest.mark.parametrize(
     (
         'registry_change'
@@ -641,18 +712,15 @@ def test_get_attestation_participants(
 
     from eth2.beacon import committee_helpers
 
-    def mock_get_crosslink_committees_at_slot(state,
-                                              slot,
-                                              committee_config,
-                                              registry_change=False):
-        return (
-            (committee, shard,),
-        )
+    def mock_get_crosslink_committee_for_attestation(state,
+                                                     attestation_data,
+                                                     committee_config):
+        return committee
 
     monkeypatch.setattr(
         committee_helpers,
-        'get_crosslink_committees_at_slot',
-        mock_get_crosslink_committees_at_slot
+        'get_crosslink_committee_for_attestation',
+        mock_get_crosslink_committee_for_attestation
     )
 
     attestation_data = AttestationData(**sample_attestation_data_params).copy(
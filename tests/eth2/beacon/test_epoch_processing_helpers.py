@@ -246,18 +246,15 @@ def test_get_winning_root_and_participants(
 
     from eth2.beacon import committee_helpers
 
-    def mock_get_crosslink_committees_at_slot(state,
-                                              slot,
-                                              committee_config,
-                                              registry_change=False):
-        return (
-            (committee, shard,),
-        )
+    def mock_get_crosslink_committee_for_attestation(state,
+                                                     attestation_data,
+                                                     committee_config):
+        return committee
 
     monkeypatch.setattr(
         committee_helpers,
-        'get_crosslink_committees_at_slot',
-        mock_get_crosslink_committees_at_slot
+        'get_crosslink_committee_for_attestation',
+        mock_get_crosslink_committee_for_attestation
     )
 
     competing_block_roots = [
@@ -351,18 +348,15 @@ def test_get_epoch_boundary_attester_indices(monkeypatch,
 
     from eth2.beacon import committee_helpers
 
-    def mock_get_crosslink_committees_at_slot(state,
-                                              slot,
-                                              committee_config,
-                                              registry_change=False):
-        return (
-            (committee, sample_attestation_data_params['shard'],),
-        )
+    def mock_get_crosslink_committee_for_attestation(state,
+                                                     attestation_data,
+                                                     committee_config):
+        return committee
 
     monkeypatch.setattr(
         committee_helpers,
-        'get_crosslink_committees_at_slot',
-        mock_get_crosslink_committees_at_slot
+        'get_crosslink_committee_for_attestation',
+        mock_get_crosslink_committee_for_attestation
     )
 
     block_root_1 = hash_eth2(b'block_root_1')
@@ -475,18 +469,15 @@ def test_get_epoch_boundary_attesting_balances(
 
     from eth2.beacon import committee_helpers
 
-    def mock_get_crosslink_committees_at_slot(state,
-                                              slot,
-                                              committee_config,
-                                              registry_change=False):
-        return (
-            (committee, sample_attestation_data_params['shard'],),
-        )
+    def mock_get_crosslink_committee_for_attestation(state,
+                                                     attestation_data,
+                                                     committee_config):
+        return committee
 
     monkeypatch.setattr(
         committee_helpers,
-        'get_crosslink_committees_at_slot',
-        mock_get_crosslink_committees_at_slot
+        'get_crosslink_committee_for_attestation',
+        mock_get_crosslink_committee_for_attestation
     )
 
     current_epoch_boundary_root = hash_eth2(b'block_root_1')
@@ -612,18 +603,15 @@ def test_get_inclusion_infos(
     shard = 1
     from eth2.beacon import committee_helpers
 
-    def mock_get_crosslink_committees_at_slot(state,
-                                              slot,
-                                              committee_config,
-                                              registry_change=False):
-        return (
-            (committee, shard,),
-        )
+    def mock_get_crosslink_committee_for_attestation(state,
+                                                     attestation_data,
+                                                     committee_config):
+        return committee
 
     monkeypatch.setattr(
         committee_helpers,
-        'get_crosslink_committees_at_slot',
-        mock_get_crosslink_committees_at_slot
+        'get_crosslink_committee_for_attestation',
+        mock_get_crosslink_committee_for_attestation
     )
 
     aggregation_bitfield = get_empty_bitfield(target_committee_size)
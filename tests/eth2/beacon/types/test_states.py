@@ -75,7 +75,35 @@ def test_num_crosslink_records(expected,
 
 def test_hash(sample_beacon_state_params):
     state = BeaconState(**sample_beacon_state_params)
-    assert state.root == hash_eth2(ssz.encode(state))
+    assert state.hash == hash_eth2(ssz.encode(state))
+    assert state.root == ssz.hash_tree_root(state)
+
+
+def test_hash_tree_root_of_copies(n_validators_state, config):
+    state = n_validators_state
+    assert state.root == ssz.hash_tree_root(state)
+
+    # A chain of copies, which are only hashed from time to time
+    child = state.update_validator_balances({0: 1, 5: 2})
+    child = child.copy(slot=state.slot + 1)
+    child = child.update_validator_records({3: mock_validator_record(b'\x55' * 48, config)})
+    assert child.root == ssz.hash_tree_root(child)
+    grandchild = child.update_validator_balances({0: 3, 7: 4}).update_validator_balance(9, 5)
+    assert grandchild.root == ssz.hash_tree_root(grandchild)
+
+    # Siblings of states which were already hashed
+    sibling = state.update_validator_balances({1: 6})
+    assert sibling.root == ssz.hash_tree_root(sibling)
+    sibling = child.update_validator_records({3: mock_validator_record(b'\x56' * 48, config)})
+    assert sibling.root == ssz.hash_tree_root(sibling)
+
+    # Fields replaced as a whole
+    result_state = grandchild.apply_validator_balance_deltas((1,) * grandchild.num_validators)
+    assert result_state.root == ssz.hash_tree_root(result_state)
+    result_state = grandchild.copy(validator_registry=(), validator_balances=())
+    assert result_state.root == ssz.hash_tree_root(result_state)
+
+    assert state.root == ssz.hash_tree_root(state)
 
 
 @pytest.mark.parametrize(
@@ -108,3 +136,66 @@ def test_update_validator(n_validators_state,
                 validator=validator,
                 balance=new_balance,
             )
+
+
+def test_copy_shares_unchanged_fields(n_validators_state):
+    state = n_validators_state
+    result_state = state.copy(slot=state.slot + 1)
+
+    assert result_state.slot == state.slot + 1
+    assert result_state.validator_registry is state.validator_registry
+    assert result_state.validator_balances is state.validator_balances
+
+
+@pytest.mark.parametrize(
+    'balances',
+    [
+        {},
+        {0: 100},
+        {0: 100, 3: 200, 9: 0},
+        {0: 100, 100: 200},
+    ]
+)
+def test_update_validator_balances(n_validators_state, balances):
+    state = n_validators_state
+
+    if all(validator_index < state.num_validators for validator_index in balances):
+        result_state = state.update_validator_balances(balances)
+        for validator_index, balance in enumerate(result_state.validator_balances):
+            assert balance == balances.get(validator_index, state.validator_balances[validator_index])  # noqa: E501
+        assert result_state.validator_registry is state.validator_registry
+    else:
+        with pytest.raises(IndexError):
+            state.update_validator_balances(balances)
+
+
+def test_update_validator_records(n_validators_state, config):
+    state = n_validators_state
+    validators = {
+        0: mock_validator_record(5566, config),
+        3: mock_validator_record(5567, config),
+    }
+
+    result_state = state.update_validator_records(validators)
+
+    assert result_state.validator_registry[0].pubkey == 5566
+    assert result_state.validator_registry[3].pubkey == 5567
+    assert result_state.validator_registry[1] == state.validator_registry[1]
+    assert result_state.validator_balances is state.validator_balances
+
+    with pytest.raises(IndexError):
+        state.update_validator_records({state.num_validators: validators[0]})
+
+
+def test_apply_validator_balance_deltas(n_validators_state):
+    state = n_validators_state
+    balance = state.validator_balances[0]
+    deltas = (1, -1, 0, -(balance + 1)) + (0,) * (state.num_validators - 4)
+
+    result_state = state.apply_validator_balance_deltas(deltas)
+
+    assert result_state.validator_balances[:4] == (balance + 1, balance - 1, balance, 0)
+    assert result_state.validator_balances[4:] == state.validator_balances[4:]
+
+    with pytest.raises(ValueError):
+        state.apply_validator_balance_deltas(deltas[1:])
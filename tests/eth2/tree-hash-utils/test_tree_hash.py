@@ -0,0 +1,95 @@
+import pytest
+
+from hypothesis import (
+    given,
+    settings,
+    strategies as st,
+)
+
+import ssz
+from ssz.sedes import (
+    List,
+    bytes32,
+    uint64,
+)
+
+from eth2._utils.tree_hash import (
+    ContainerTreeHashCache,
+    ListTreeHashCache,
+)
+from eth2.beacon.types.crosslink_records import CrosslinkRecord
+
+
+def _make_item(random, sedes):
+    if sedes is uint64:
+        return random.randrange(2**64)
+    elif sedes is bytes32:
+        return bytes(random.randrange(256) for _ in range(32))
+    else:
+        return CrosslinkRecord(
+            epoch=random.randrange(2**64),
+            crosslink_data_root=bytes(random.randrange(256) for _ in range(32)),
+        )
+
+
+@settings(max_examples=10, deadline=None)
+@given(random=st.randoms())
+@pytest.mark.parametrize(
+    'element_sedes',
+    (
+        uint64,
+        bytes32,
+        CrosslinkRecord,
+    ),
+)
+def test_list_tree_hash_cache(random, element_sedes):
+    sedes = List(element_sedes)
+    cache = ListTreeHashCache(sedes)
+    value = ()
+    for _ in range(30):
+        new_value = list(value)
+        operation = random.choice(('append', 'truncate', 'replace', 'replace_with_indices'))
+        if operation == 'append':
+            new_value.extend(
+                _make_item(random, element_sedes)
+                for _ in range(random.randrange(300))
+            )
+        elif operation == 'truncate':
+            del new_value[random.randrange(len(new_value) + 1):]
+        elif len(new_value) > 0:
+            indices = set(random.randrange(len(new_value)) for _ in range(random.randrange(5)))
+            for index in indices:
+                new_value[index] = _make_item(random, element_sedes)
+        new_value = tuple(new_value)
+
+        if operation == 'replace_with_indices' and len(new_value) > 0:
+            root = cache.hash_tree_root(new_value, value, indices)
+        else:
+            root = cache.hash_tree_root(new_value)
+
+        assert root == ssz.hash_tree_root(new_value, sedes)
+        value = new_value
+
+
+def test_list_tree_hash_cache_ignores_stale_dirty_indices():
+    sedes = List(uint64)
+    cache = ListTreeHashCache(sedes)
+    base_value = tuple(range(100))
+    cache.hash_tree_root(base_value)
+
+    # The cache moves on to another value derived from ``base_value``...
+    sibling_value = base_value[:10] + (0,) + base_value[11:]
+    cache.hash_tree_root(sibling_value, base_value, {10})
+
+    # ... so the indices relative to ``base_value`` can't be used anymore
+    value = base_value[:20] + (0,) + base_value[21:]
+    assert cache.hash_tree_root(value, base_value, {20}) == ssz.hash_tree_root(value, sedes)
+
+
+def test_container_tree_hash_cache():
+    cache = ContainerTreeHashCache(CrosslinkRecord)
+    record = CrosslinkRecord(epoch=1, crosslink_data_root=b'\x11' * 32)
+    assert cache.hash_tree_root(record) == ssz.hash_tree_root(record)
+
+    record = record.copy(epoch=2)
+    assert cache.hash_tree_root(record) == ssz.hash_tree_root(record)
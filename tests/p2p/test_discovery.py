@@ -222,6 +222,76 @@ async def test_bond():
     assert not bonded
 
 
+@pytest.mark.asyncio
+async def test_bond_skips_recently_bonded_nodes(monkeypatch):
+    proto = MockDiscoveryProtocol([])
+    node = random_node()
+    pinged_nodes = []
+
+    def send_ping_v4(remote):
+        pinged_nodes.append(remote)
+        return b'token'
+
+    async def wait_pong_v4(remote, token):
+        return True
+
+    async def wait_ping(remote):
+        return False
+
+    proto.send_ping_v4 = send_ping_v4
+    proto.wait_pong_v4 = wait_pong_v4
+    proto.wait_ping = wait_ping
+
+    assert await proto.bond(node)
+    assert pinged_nodes == [node]
+
+    # The node is still bonded after it was dropped from the routing table, so it is not pinged
+    proto.routing.remove_node(node)
+    assert await proto.bond(node)
+    assert pinged_nodes == [node]
+
+    # Until the bond expires
+    monkeypatch.setattr(discovery, 'BOND_EXPIRATION', 0)
+    assert await proto.bond(node)
+    assert pinged_nodes == [node, node]
+
+
+@pytest.mark.asyncio
+async def test_lookup_does_not_wait_for_the_slowest_query():
+    proto = MockDiscoveryProtocol([])
+    slow_node, fast_node = random_node(), random_node()
+    new_nodes = [random_node() for _ in range(kademlia.k_find_concurrency)]
+    for node in (slow_node, fast_node):
+        assert proto.routing.add_node(node) is None
+    queried_nodes = []
+    new_nodes_queried = asyncio.Event()
+
+    async def wait_neighbours(remote):
+        queried_nodes.append(remote)
+        if remote == slow_node:
+            # Only answers once the other nodes were queried
+            await new_nodes_queried.wait()
+            return ()
+        elif remote == fast_node:
+            return tuple(new_nodes)
+        else:
+            if set(new_nodes).issubset(queried_nodes):
+                new_nodes_queried.set()
+            return ()
+
+    async def bond(node):
+        return True
+
+    proto.wait_neighbours = wait_neighbours
+    proto.bond = bond
+
+    closest = await asyncio.wait_for(proto.lookup(random_node().id), timeout=1)
+
+    assert set(closest) == {slow_node, fast_node, *new_nodes}
+    assert set(queried_nodes) == {slow_node, fast_node, *new_nodes}
+    assert len(queried_nodes) == len(set(queried_nodes))
+
+
 def test_update_routing_table():
     proto = MockDiscoveryProtocol([])
     node = random_node()
@@ -78,6 +78,17 @@ def test_routingtable_neighbours():
         assert node_a == table.neighbours(node_b.id)[0]
 
 
+def test_routingtable_neighbours_are_the_closest_nodes():
+    table = kademlia.RoutingTable(random_node())
+    for _ in range(1000):
+        table.add_node(random_node())
+
+    for _ in range(100):
+        target_id = random_node().id
+        assert table.neighbours(target_id) == kademlia.sort_by_distance(
+            list(table), target_id)[:kademlia.k_bucket_size]
+
+
 def test_routingtable_get_random_nodes():
     table = kademlia.RoutingTable(random_node())
     for _ in range(100):
@@ -94,6 +105,22 @@ def test_routingtable_get_random_nodes():
     assert len(set(nodes)) == 100
 
 
+def test_routingtable_samples_nodes_of_all_buckets():
+    table = kademlia.RoutingTable(random_node())
+    nodes = [random_node() for _ in range(200)]
+    for node in nodes:
+        table.add_node(node)
+    for node in nodes[::2]:
+        # buckets may take a node from their replacement cache when one is removed
+        table.remove_node(node)
+
+    bucket_nodes = set(table)
+    assert len(table) == len(bucket_nodes)
+    assert set(table.get_random_nodes(len(nodes))) == bucket_nodes
+    assert all(node in table for node in bucket_nodes)
+    assert not any(node in table for node in set(nodes) - bucket_nodes)
+
+
 def test_kbucket_add():
     bucket = kademlia.KBucket(0, 100)
     node = random_node()
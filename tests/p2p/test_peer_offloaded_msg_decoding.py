@@ -0,0 +1,57 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+import os
+
+import pytest
+
+from cancel_token import CancelToken
+
+from p2p import ecies
+from p2p.msg_decoding import OffloadedMsgDecoder
+from p2p.tools.paragon import BroadcastData
+from p2p.tools.paragon.helpers import (
+    get_directly_linked_peers,
+)
+from p2p.tools.paragon.peer import (
+    ParagonContext,
+    ParagonPeerFactory,
+)
+
+
+@pytest.fixture
+def executor():
+    executor = ProcessPoolExecutor(max_workers=1)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+@pytest.mark.asyncio
+async def test_big_msgs_are_decoded_in_order_off_the_event_loop(request, event_loop, executor):
+    msg_decoder = OffloadedMsgDecoder(threshold=1024, executor=executor)
+    context = ParagonContext()
+    context.msg_decoder = msg_decoder
+    factory = ParagonPeerFactory(
+        privkey=ecies.generate_privkey(),
+        context=context,
+        token=CancelToken('test_big_msgs_are_decoded_in_order_off_the_event_loop'),
+    )
+    peer, remote = await get_directly_linked_peers(request, event_loop, alice_factory=factory)
+
+    # random data, so that snappy compression doesn't shrink the big messages below the threshold
+    payloads = (b'small-a', os.urandom(4096), b'small-b', os.urandom(8192))
+    messages = ()
+    with peer.collect_sub_proto_messages() as collector:
+        for payload in payloads:
+            remote.sub_proto.send_broadcast_data(payload)
+        for _ in range(100):
+            await asyncio.sleep(0.05)
+            messages += collector.get_messages()
+            if len(messages) == len(payloads):
+                break
+
+    assert all(isinstance(cmd, BroadcastData) for _, cmd, _ in messages)
+    assert tuple(msg['data'] for _, _, msg in messages) == payloads
+
+    assert msg_decoder.num_offloaded_msgs == 2
+    assert msg_decoder.offloaded_bytes > 4096 + 8192
+    assert msg_decoder.loop_stall_avoided > 0
@@ -168,3 +168,104 @@ def test_fails_when_closed():
     node = random_node()
     with pytest.raises(persistence.ClosedException):
         peer_info.record_failure(node, HandshakeFailure())
+
+
+def random_public_node(port=30303):
+    address = kademlia.Address('127.0.0.1', port)
+    return kademlia.Node(generate_privkey().public_key, address)
+
+
+def test_records_successes_by_throughput(temp_path):
+    dbpath = temp_path / "nodedb"
+    slow, fast, les = random_public_node(1), random_public_node(2), random_public_node(3)
+
+    peer_info = SQLitePeerInfo(dbpath)
+    peer_info.record_success(slow, 'eth/63', throughput=10.0)
+    peer_info.record_success(fast, 'eth/63', throughput=100.0, head_td=2 ** 80)
+    peer_info.record_success(les, 'les/2', throughput=1000.0)
+    peer_info.close()
+
+    # the good nodes are remembered after a restart
+    peer_info = SQLitePeerInfo(dbpath)
+    assert peer_info.get_good_nodes(['eth/62', 'eth/63'], limit=10) == (fast, slow)
+    assert peer_info.get_good_nodes(['eth/63'], limit=1) == (fast, )
+    head_tds = {
+        good_node.enode: good_node.head_td for good_node in peer_info._fetch_all_good_nodes()
+    }
+    assert head_tds[fast.uri()] == 2 ** 80
+
+    # a reconnected node gets its new throughput
+    peer_info.record_success(slow, 'eth/63', throughput=200.0)
+    assert peer_info.get_good_nodes(['eth/63'], limit=10) == (slow, fast)
+    peer_info.close()
+
+
+def test_good_nodes_expire(monkeypatch):
+    node = random_public_node()
+
+    current_time = datetime.datetime.utcnow()
+
+    class patched_datetime(datetime.datetime):
+        @classmethod
+        def utcnow(cls):
+            return current_time
+
+    monkeypatch.setattr(datetime, 'datetime', patched_datetime)
+
+    peer_info = MemoryPeerInfo()
+    peer_info.record_success(node, 'eth/63')
+    assert peer_info.get_good_nodes(['eth/63'], limit=10) == (node, )
+
+    current_time += datetime.timedelta(seconds=persistence.GOOD_NODE_EXPIRY + 1)
+    assert peer_info.get_good_nodes(['eth/63'], limit=10) == ()
+
+
+def test_adds_good_nodes_to_existing_database(temp_path):
+    dbpath = temp_path / "nodedb"
+
+    # a database created before good nodes were recorded
+    db = sqlite3.connect(str(dbpath))
+    with db:
+        db.execute('create table bad_nodes (enode, until, reason, error_count)')
+        db.execute('create table schema_version (version)')
+        db.execute('insert into schema_version VALUES (1)')
+    db.close()
+
+    node = random_public_node()
+    peer_info = SQLitePeerInfo(dbpath)
+    peer_info.record_success(node, 'eth/63')
+    assert peer_info.get_good_nodes(['eth/63'], limit=10) == (node, )
+
+
+def test_async_peer_info_batches_writes(temp_path):
+    dbpath = temp_path / "nodedb"
+    bad_node, good_node = random_public_node(1), random_public_node(2)
+
+    # a long flush interval, so that nothing is written until we flush
+    peer_info = persistence.AsyncSQLitePeerInfo(dbpath, flush_interval=60)
+    peer_info.record_failure(bad_node, HandshakeFailure())
+    peer_info.record_failure(bad_node, HandshakeFailure())
+    peer_info.record_success(good_node, 'eth/63', throughput=10.0)
+
+    # lookups are answered before the records reach the database
+    assert peer_info.should_connect_to(bad_node) is False
+    assert peer_info.get_good_nodes(['eth/63'], limit=10) == (good_node, )
+    sqlite_peer_info = SQLitePeerInfo(dbpath)
+    assert sqlite_peer_info.should_connect_to(bad_node) is True
+
+    peer_info.flush()
+    assert sqlite_peer_info.should_connect_to(bad_node) is False
+    assert sqlite_peer_info._fetch_bad_node(bad_node).error_count == 2
+    assert sqlite_peer_info.get_good_nodes(['eth/63'], limit=10) == (good_node, )
+    sqlite_peer_info.close()
+
+    # closing commits the pending records, which are loaded again on the next start
+    peer_info.record_success(good_node, 'eth/63', throughput=20.0)
+    peer_info.close()
+    with pytest.raises(persistence.ClosedException):
+        peer_info.should_connect_to(bad_node)
+
+    peer_info = persistence.AsyncSQLitePeerInfo(dbpath)
+    assert peer_info.should_connect_to(bad_node) is False
+    assert peer_info._good_nodes[good_node.uri()].throughput == 20.0
+    peer_info.close()
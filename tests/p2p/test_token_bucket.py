@@ -0,0 +1,69 @@
+import asyncio
+import time
+
+import pytest
+
+from p2p.exceptions import NotEnoughTokens
+from p2p.token_bucket import TokenBucket
+
+
+def test_token_bucket_starts_full():
+    bucket = TokenBucket(rate=1, capacity=10)
+
+    assert bucket.can_take(10)
+    assert not bucket.can_take(11)
+
+
+def test_token_bucket_take_nowait():
+    bucket = TokenBucket(rate=1, capacity=10)
+
+    bucket.take_nowait(8)
+    assert not bucket.can_take(3)
+    with pytest.raises(NotEnoughTokens):
+        bucket.take_nowait(3)
+    bucket.take_nowait(2)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_refills_up_to_capacity():
+    bucket = TokenBucket(rate=1000, capacity=10)
+    bucket.take_nowait(10)
+
+    await asyncio.sleep(0.05)
+
+    assert bucket.get_num_tokens() == 10
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_take_waits_for_tokens():
+    bucket = TokenBucket(rate=100, capacity=10)
+
+    start = time.perf_counter()
+    await bucket.take(10)
+    await bucket.take(5)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed >= 0.05
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_take_in_order():
+    bucket = TokenBucket(rate=100, capacity=10)
+    bucket.take_nowait(10)
+    taken = []
+
+    async def take(name, num):
+        await bucket.take(num)
+        taken.append(name)
+
+    await asyncio.gather(take('big', 10), take('small', 1))
+
+    assert taken == ['big', 'small']
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_take_more_than_capacity():
+    bucket = TokenBucket(rate=100, capacity=10)
+
+    with pytest.raises(ValueError):
+        await bucket.take(11)
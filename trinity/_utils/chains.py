@@ -83,6 +83,19 @@ def get_database_socket_path(data_dir: Path) -> Path:
     ))
 
 
+FRAMED_DATABASE_SOCKET_FILENAME = 'db-framed.ipc'
+
+
+def get_framed_database_socket_path(data_dir: Path) -> Path:
+    """
+    Returns the path to the ipc socket of the framed (asyncio-native) database server.
+    """
+    return Path(os.environ.get(
+        'TRINITY_FRAMED_DATABASE_IPC',
+        data_dir / FRAMED_DATABASE_SOCKET_FILENAME,
+    ))
+
+
 JSONRPC_SOCKET_FILENAME = 'jsonrpc.ipc'
 
 
@@ -117,6 +130,8 @@ def construct_trinity_config_params(
     """
     yield 'network_id', args.network_id
     yield 'use_discv5', args.discv5
+    yield 'db_server_mode', args.db_server
+    yield 'offload_msg_decoding', args.offload_msg_decoding
 
     if args.trinity_root_dir is not None:
         yield 'trinity_root_dir', args.trinity_root_dir
@@ -0,0 +1,58 @@
+import collections
+from typing import (
+    Any,
+    Callable,
+    Generic,
+    TypeVar,
+)
+
+
+TKey = TypeVar('TKey')
+TValue = TypeVar('TValue')
+
+
+class ByteSizeLRU(Generic[TKey, TValue]):
+    """
+    Cache of the most recently used values whose sizes add up to at most ``max_size`` bytes.
+
+    ``get_size`` returns the size of a value, ``len(value)`` by default. A value larger than
+    ``max_size`` is never cached.
+    """
+    def __init__(self, max_size: int, get_size: Callable[[Any], int] = len) -> None:
+        self.max_size = max_size
+        self._get_size = get_size
+        self._size = 0
+        # Least recently used first
+        self._values: 'collections.OrderedDict[TKey, TValue]' = collections.OrderedDict()
+
+    @property
+    def size(self) -> int:
+        """
+        Total size of the cached values, in bytes.
+        """
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._values
+
+    def __getitem__(self, key: TKey) -> TValue:
+        value = self._values[key]
+        self._values.move_to_end(key)
+        return value
+
+    def __setitem__(self, key: TKey, value: TValue) -> None:
+        if key in self._values:
+            self._size -= self._get_size(self._values.pop(key))
+
+        value_size = self._get_size(value)
+        if value_size > self.max_size:
+            return
+
+        self._values[key] = value
+        self._size += value_size
+        while self._size > self.max_size:
+            _, evicted_value = self._values.popitem(last=False)
+            self._size -= self._get_size(evicted_value)
@@ -14,6 +14,8 @@ from p2p.kademlia import Node
 
 from trinity import __version__
 from trinity.constants import (
+    DB_SERVER_FRAMED,
+    DB_SERVER_MANAGER,
     MAINNET_NETWORK_ID,
     ROPSTEN_NETWORK_ID,
 )
@@ -166,6 +168,16 @@ trinity_parser.add_argument(
         "Port on which trinity should listen for incoming p2p/discovery connections. Default: 30303"
     ),
 )
+trinity_parser.add_argument(
+    '--db-server',
+    choices=(DB_SERVER_MANAGER, DB_SERVER_FRAMED),
+    default=DB_SERVER_MANAGER,
+    help=(
+        "Transport used by the database process to serve the raw key/value store. "
+        "`framed` uses an asyncio-native, pickle-free protocol that can pipeline many "
+        "requests over a single connection. Default: manager"
+    ),
+)
 
 
 #
@@ -241,6 +253,14 @@ network_parser.add_argument(
     type=int,
 )
 
+network_parser.add_argument(
+    '--offload-msg-decoding',
+    action='store_true',
+    help=(
+        "Decode big messages from peers in a process pool, instead of the networking event loop"
+    ),
+)
+
 
 #
 # Chain configuration
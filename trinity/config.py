@@ -40,6 +40,7 @@ from p2p.constants import (
 
 from trinity.constants import (
     ASSETS_DIR,
+    DB_SERVER_MANAGER,
     DEFAULT_PREFERRED_NODES,
     IPC_DIR,
     LOG_DIR,
@@ -53,6 +54,7 @@ from trinity._utils.chains import (
     construct_trinity_config_params,
     get_data_dir_for_network_id,
     get_database_socket_path,
+    get_framed_database_socket_path,
     get_jsonrpc_socket_path,
     get_nodekey_path,
     load_nodekey,
@@ -246,6 +248,8 @@ class TrinityConfig:
                  nodekey: PrivateKey=None,
                  port: int=30303,
                  use_discv5: bool = False,
+                 db_server_mode: str = DB_SERVER_MANAGER,
+                 offload_msg_decoding: bool = False,
                  preferred_nodes: Tuple[KademliaNode, ...]=None,
                  bootstrap_nodes: Tuple[KademliaNode, ...]=None) -> None:
         self.app_identifier = app_identifier
@@ -253,6 +257,8 @@ class TrinityConfig:
         self.max_peers = max_peers
         self.port = port
         self.use_discv5 = use_discv5
+        self.db_server_mode = db_server_mode
+        self.offload_msg_decoding = offload_msg_decoding
         self._app_configs = {}
 
         if genesis_config is not None:
@@ -385,6 +391,14 @@ class TrinityConfig:
         """
         return get_database_socket_path(self.ipc_dir)
 
+    @property
+    def database_framed_ipc_path(self) -> Path:
+        """
+        Path for the IPC socket of the framed database server, only used when
+        ``db_server_mode`` is ``framed``.
+        """
+        return get_framed_database_socket_path(self.ipc_dir)
+
     @property
     def ipc_dir(self) -> Path:
         """
@@ -587,6 +601,14 @@ class Eth1AppConfig(BaseAppConfig):
         config = self.trinity_config
         return config.with_app_suffix(config.data_dir / "nodedb")
 
+    @property
+    def light_cache_path(self) -> Path:
+        """
+        Path of the on-disk cache of the accounts and contract codes that a light node fetched.
+        """
+        config = self.trinity_config
+        return config.with_app_suffix(config.data_dir / "lightcache")
+
 
 class BeaconChainConfig:
     def __init__(self,
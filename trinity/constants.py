@@ -32,6 +32,10 @@ SYNC_FULL = 'full'
 SYNC_FAST = 'fast'
 SYNC_LIGHT = 'light'
 
+# transports used to serve the raw key/value database from the DB process
+DB_SERVER_MANAGER = 'manager'
+DB_SERVER_FRAMED = 'framed'
+
 # lahja endpoint names
 MAIN_EVENTBUS_ENDPOINT = 'main'
 NETWORKING_EVENTBUS_ENDPOINT = 'networking'
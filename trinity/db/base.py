@@ -1,7 +1,12 @@
 from abc import abstractmethod
 from contextlib import contextmanager
 from typing import (
+    Any,
+    Dict,
     Generator,
+    Iterable,
+    Sequence,
+    Tuple,
 )
 # Typeshed definitions for multiprocessing.managers is incomplete, so ignore them for now:
 # https://github.com/python/typeshed/blob/85a788dbcaa5e9e9a62e55f15d44530cd28ba830/stdlib/3/multiprocessing/managers.pyi#L3
@@ -9,7 +14,7 @@ from multiprocessing.managers import (  # type: ignore
     BaseProxy,
 )
 
-from eth.db.backends.base import BaseDB
+from eth.db.backends.base import BaseAtomicDB, BaseDB
 from eth.db.atomic import AtomicDBWriteBatch
 
 from trinity._utils.mp import async_method
@@ -28,6 +33,73 @@ class BaseAsyncDB(BaseDB):
     async def coro_exists(self, key: bytes) -> bool:
         pass
 
+    #
+    # Multi-key API: each call crosses the process boundary only once
+    #
+    @abstractmethod
+    async def coro_get_many(self, keys: Sequence[bytes]) -> Dict[bytes, bytes]:
+        """
+        Return a mapping of every key in ``keys`` that is present in the database to its value.
+        Missing keys are left out of the result rather than raising a ``KeyError``.
+        """
+        pass
+
+    @abstractmethod
+    async def coro_exists_many(self, keys: Sequence[bytes]) -> Tuple[bool, ...]:
+        """
+        Return, in the same order as ``keys``, whether each key is present in the database.
+        """
+        pass
+
+    @abstractmethod
+    async def coro_set_many(self, key_values: Dict[bytes, bytes]) -> None:
+        """
+        Write all the given key/value pairs in a single atomic batch.
+        """
+        pass
+
+
+class BatchedAtomicDB(BaseAtomicDB):
+    """
+    Server side counterpart of the multi-key API in ``BaseAsyncDB``. Wraps the database served
+    by the DB process so that many keys can be read or written in a single IPC round trip.
+    """
+
+    def __init__(self, wrapped_db: BaseAtomicDB) -> None:
+        self.wrapped_db = wrapped_db
+
+    def __getitem__(self, key: bytes) -> bytes:
+        return self.wrapped_db[key]
+
+    def __setitem__(self, key: bytes, value: bytes) -> None:
+        self.wrapped_db[key] = value
+
+    def __delitem__(self, key: bytes) -> None:
+        del self.wrapped_db[key]
+
+    def _exists(self, key: bytes) -> bool:
+        return key in self.wrapped_db
+
+    def atomic_batch(self) -> Any:
+        return self.wrapped_db.atomic_batch()
+
+    def get_many(self, keys: Iterable[bytes]) -> Dict[bytes, bytes]:
+        found = {}
+        for key in keys:
+            try:
+                found[key] = self.wrapped_db[key]
+            except KeyError:
+                continue
+        return found
+
+    def exists_many(self, keys: Iterable[bytes]) -> Tuple[bool, ...]:
+        return tuple(key in self.wrapped_db for key in keys)
+
+    def set_many(self, key_values: Dict[bytes, bytes]) -> None:
+        with self.wrapped_db.atomic_batch() as db:
+            for key, value in key_values.items():
+                db[key] = value
+
 
 class AsyncDBPreProxy(BaseAsyncDB):
     """
@@ -43,10 +115,16 @@ class AsyncDBPreProxy(BaseAsyncDB):
         'atomic_batch',
         'coro_set',
         'coro_exists',
+        'coro_exists_many',
+        'coro_get_many',
+        'coro_set_many',
         'delete',
         'exists',
+        'exists_many',
         'get',
+        'get_many',
         'set',
+        'set_many',
     )
 
     def __init__(self) -> None:
@@ -54,6 +132,9 @@ class AsyncDBPreProxy(BaseAsyncDB):
 
     coro_set = async_method('set')
     coro_exists = async_method('exists')
+    coro_get_many = async_method('get_many')
+    coro_exists_many = async_method('exists_many')
+    coro_set_many = async_method('set_many')
 
     def get(self, key: bytes) -> bytes:
         return self._callmethod('get', (key,))
@@ -15,6 +15,9 @@ from typing import (
 
 from eth_typing import Hash32
 
+from eth2.beacon.typing import (
+    Slot,
+)
 from eth2.beacon.types.states import (
     BeaconState,
 )
@@ -59,6 +62,12 @@ class BaseAsyncBeaconChainDB(ABC):
     async def coro_get_canonical_block_root_by_slot(self, slot: int) -> Hash32:
         pass
 
+    @abstractmethod
+    async def coro_get_encoded_canonical_block_range(self,
+                                                     start_slot: Slot,
+                                                     max_blocks: int) -> Tuple[bytes, ...]:
+        pass
+
     @abstractmethod
     async def coro_get_canonical_head(self, block_class: Type[BaseBeaconBlock]) -> BaseBeaconBlock:
         pass
@@ -123,6 +132,7 @@ class AsyncBeaconChainDBPreProxy(BaseAsyncBeaconChainDB):
     coro_get_canonical_block_root = async_method('get_canonical_block_root')
     coro_get_canonical_block_by_slot = async_method('get_canonical_block_by_slot')
     coro_get_canonical_block_root_by_slot = async_method('get_canonical_block_root_by_slot')
+    coro_get_encoded_canonical_block_range = async_method('get_encoded_canonical_block_range')
     coro_get_canonical_head = async_method('get_canonical_head')
     coro_get_finalized_head = async_method('get_finalized_head')
     coro_get_block_by_root = async_method('get_block_by_root')
@@ -10,7 +10,10 @@ from trinity.config import (
     BeaconAppConfig,
     TrinityConfig,
 )
-from trinity.db.base import AsyncDBProxy
+from trinity.db.base import (
+    AsyncDBProxy,
+    BatchedAtomicDB,
+)
 from trinity.db.beacon.chain import AsyncBeaconChainDBProxy
 
 from trinity._utils.mp import TracebackRecorder
@@ -27,6 +30,7 @@ def create_db_server_manager(trinity_config: TrinityConfig,
                              base_db: BaseAtomicDB) -> BaseManager:
     app_config = trinity_config.get_app_config(BeaconAppConfig)
     chain_config = app_config.get_chain_config()
+    base_db = BatchedAtomicDB(base_db)
     chaindb = BeaconChainDB(base_db)
 
     if not is_beacon_database_initialized(chaindb, BeaconBlock):
@@ -1,4 +1,5 @@
 from abc import abstractmethod
+import itertools
 # Typeshed definitions for multiprocessing.managers is incomplete, so ignore them for now:
 # https://github.com/python/typeshed/blob/85a788dbcaa5e9e9a62e55f15d44530cd28ba830/stdlib/3/multiprocessing/managers.pyi#L3
 from multiprocessing.managers import (  # type: ignore
@@ -8,23 +9,54 @@ from typing import (
     Dict,
     Iterable,
     List,
+    Sequence,
     Tuple,
     Type,
 )
 
 from eth_typing import Hash32
+import rlp
+from trie import HexaryTrie
+from trie.exceptions import MissingTrieNode
 
+from eth.constants import (
+    BLANK_ROOT_HASH,
+    EMPTY_SHA3,
+    EMPTY_UNCLE_HASH,
+)
 from eth.db.backends.base import BaseAtomicDB
+from eth.db.chain import ChainDB
+from eth.exceptions import HeaderNotFound
+from eth.rlp.accounts import Account
 from eth.rlp.blocks import BaseBlock
 from eth.rlp.headers import BlockHeader
 from eth.rlp.receipts import Receipt
 from eth.rlp.transactions import BaseTransaction
 
-from trinity.db.eth1.header import BaseAsyncHeaderDB
+from p2p._utils import encode_rlp_list
+
+from trinity.db.eth1.header import (
+    ENCODED_HEADER_CACHE_MAX_SIZE,
+    BaseAsyncHeaderDB,
+    BatchedHeaderDB,
+)
+from trinity._utils.lru import ByteSizeLRU
 from trinity._utils.mp import (
     async_method,
 )
 
+# Peers syncing from us ask for the bodies and receipts of the same recent blocks, in batches of
+# up to a couple hundred blocks, so these caches hold a few batches of them. In bytes.
+ENCODED_BLOCK_BODY_CACHE_MAX_SIZE = 16 * 1024 * 1024
+ENCODED_RECEIPTS_CACHE_MAX_SIZE = 16 * 1024 * 1024
+
+# Light clients mostly ask for the proofs of the same hot accounts (tokens, exchanges...) at the
+# recent blocks, so this cache holds the proofs of a few thousand of them. In bytes.
+ENCODED_PROOF_CACHE_MAX_SIZE = 8 * 1024 * 1024
+
+# The RLP encoding of an empty list, which is the encoding of the uncles of most blocks
+EMPTY_UNCLES_RLP = rlp.encode([])
+
 
 class BaseAsyncChainDB(BaseAsyncHeaderDB):
     """
@@ -39,10 +71,22 @@ class BaseAsyncChainDB(BaseAsyncHeaderDB):
     async def coro_get(self, key: bytes) -> bytes:
         pass
 
+    @abstractmethod
+    async def coro_get_many(self, keys: Sequence[bytes]) -> Dict[bytes, bytes]:
+        pass
+
+    @abstractmethod
+    async def coro_exists_many(self, keys: Sequence[bytes]) -> Tuple[bool, ...]:
+        pass
+
     @abstractmethod
     async def coro_persist_block(self, block: BaseBlock) -> None:
         pass
 
+    @abstractmethod
+    async def coro_persist_blocks(self, blocks: Sequence[BaseBlock]) -> None:
+        pass
+
     @abstractmethod
     async def coro_persist_uncles(self, uncles: Tuple[BlockHeader]) -> Hash32:
         pass
@@ -51,6 +95,12 @@ class BaseAsyncChainDB(BaseAsyncHeaderDB):
     async def coro_persist_trie_data_dict(self, trie_data_dict: Dict[Hash32, bytes]) -> None:
         pass
 
+    @abstractmethod
+    async def coro_persist_trie_data_and_blocks(self,
+                                                trie_data_dict: Dict[Hash32, bytes],
+                                                blocks: Sequence[BaseBlock]) -> None:
+        pass
+
     @abstractmethod
     async def coro_get_block_transactions(
             self,
@@ -67,6 +117,232 @@ class BaseAsyncChainDB(BaseAsyncHeaderDB):
             self, header: BlockHeader, receipt_class: Type[Receipt]) -> List[Receipt]:
         pass
 
+    @abstractmethod
+    async def coro_get_encoded_block_bodies(
+            self, block_hashes: Sequence[Hash32]) -> Dict[Hash32, bytes]:
+        pass
+
+    @abstractmethod
+    async def coro_get_encoded_receipts(
+            self, block_hashes: Sequence[Hash32]) -> Dict[Hash32, bytes]:
+        pass
+
+    @abstractmethod
+    async def coro_get_encoded_proofs(
+            self,
+            proof_requests: Sequence[Tuple[Hash32, bytes, bytes]]) -> Tuple[Tuple[bytes, ...], ...]:
+        pass
+
+    @abstractmethod
+    async def coro_get_contract_codes(
+            self, code_requests: Sequence[Tuple[Hash32, bytes]]) -> Tuple[bytes, ...]:
+        pass
+
+
+class BatchedChainDB(BatchedHeaderDB, ChainDB):
+    """
+    ``ChainDB`` served by the DB process, extended with the multi-item methods that back the
+    ``coro_*_many``, ``coro_get_encoded_*``, ``coro_get_contract_codes`` and
+    ``coro_persist_blocks`` APIs of ``BaseAsyncChainDB``, and the header range method of
+    ``BatchedHeaderDB``.
+    """
+
+    def __init__(self,
+                 db: BaseAtomicDB,
+                 encoded_header_cache_max_size: int = ENCODED_HEADER_CACHE_MAX_SIZE,
+                 encoded_block_body_cache_max_size: int = ENCODED_BLOCK_BODY_CACHE_MAX_SIZE,
+                 encoded_receipts_cache_max_size: int = ENCODED_RECEIPTS_CACHE_MAX_SIZE,
+                 encoded_proof_cache_max_size: int = ENCODED_PROOF_CACHE_MAX_SIZE) -> None:
+        super().__init__(db, encoded_header_cache_max_size)
+        self._encoded_block_bodies: ByteSizeLRU[Hash32, bytes] = ByteSizeLRU(
+            encoded_block_body_cache_max_size,
+        )
+        self._encoded_receipts: ByteSizeLRU[Hash32, bytes] = ByteSizeLRU(
+            encoded_receipts_cache_max_size,
+        )
+        self._encoded_proofs: ByteSizeLRU[Tuple[Hash32, bytes, bytes], Tuple[bytes, ...]] = (
+            ByteSizeLRU(
+                encoded_proof_cache_max_size,
+                get_size=lambda proof: sum(len(node) for node in proof),
+            )
+        )
+
+    def get_many(self, keys: Iterable[bytes]) -> Dict[bytes, bytes]:
+        found = {}
+        for key in keys:
+            try:
+                found[key] = self.db[key]
+            except KeyError:
+                continue
+        return found
+
+    def exists_many(self, keys: Iterable[bytes]) -> Tuple[bool, ...]:
+        return tuple(key in self.db for key in keys)
+
+    def get_encoded_block_bodies(self, block_hashes: Iterable[Hash32]) -> Dict[Hash32, bytes]:
+        """
+        Return the RLP encoded bodies of the given blocks, by block hash, leaving out the blocks
+        which are unknown or incomplete, including those with missing transaction trie nodes.
+
+        The bodies are built from the RLP of the transactions and uncles as stored in the
+        database, without decoding them.
+        """
+        found = {}
+        for block_hash in block_hashes:
+            if block_hash in self._encoded_block_bodies:
+                found[block_hash] = self._encoded_block_bodies[block_hash]
+                continue
+
+            try:
+                header = self.get_block_header_by_hash(block_hash)
+            except HeaderNotFound:
+                continue
+
+            if header.uncles_hash == EMPTY_UNCLE_HASH:
+                encoded_uncles = EMPTY_UNCLES_RLP
+            else:
+                try:
+                    encoded_uncles = self.db[header.uncles_hash]
+                except KeyError:
+                    continue
+
+            try:
+                encoded_transactions = encode_rlp_list(
+                    self._get_block_transaction_data(self.db, header.transaction_root)
+                )
+            except MissingTrieNode:
+                continue
+            encoded_body = encode_rlp_list((encoded_transactions, encoded_uncles))
+            self._encoded_block_bodies[block_hash] = encoded_body
+            found[block_hash] = encoded_body
+        return found
+
+    def get_encoded_receipts(self, block_hashes: Iterable[Hash32]) -> Dict[Hash32, bytes]:
+        """
+        Return the RLP encoded lists of receipts of the given blocks, by block hash, leaving out
+        the blocks which are unknown, or which have missing receipt trie nodes.
+
+        The receipts are read as they are stored in the database, without decoding them.
+        """
+        found = {}
+        for block_hash in block_hashes:
+            if block_hash in self._encoded_receipts:
+                found[block_hash] = self._encoded_receipts[block_hash]
+                continue
+
+            try:
+                header = self.get_block_header_by_hash(block_hash)
+            except HeaderNotFound:
+                continue
+
+            try:
+                encoded_receipts = encode_rlp_list(self._get_receipt_data(header.receipt_root))
+            except MissingTrieNode:
+                continue
+            self._encoded_receipts[block_hash] = encoded_receipts
+            found[block_hash] = encoded_receipts
+        return found
+
+    def _get_receipt_data(self, receipt_root: Hash32) -> Iterable[bytes]:
+        receipt_db = HexaryTrie(db=self.db, root_hash=receipt_root)
+        for receipt_index in itertools.count():
+            receipt_key = rlp.encode(receipt_index)
+            if receipt_key in receipt_db:
+                yield receipt_db[receipt_key]
+            else:
+                break
+
+    def get_encoded_proofs(
+            self,
+            proof_requests: Iterable[Tuple[Hash32, bytes, bytes]]) -> Tuple[Tuple[bytes, ...], ...]:
+        """
+        Return the RLP encoded trie nodes, from the root down, on the path to each
+        ``(block_hash, account_key, key)``: in the state trie of the block if ``account_key`` is
+        empty, or else in the storage trie of the account at ``account_key``. Keys are the
+        hashed keys under which the tries store their values.
+
+        The proof is empty when the block or the trie nodes are missing.
+        """
+        proofs: List[Tuple[bytes, ...]] = []
+        for block_hash, account_key, key in proof_requests:
+            try:
+                header = self.get_block_header_by_hash(block_hash)
+            except HeaderNotFound:
+                proofs.append(())
+                continue
+
+            cache_key = (header.state_root, account_key, key)
+            if cache_key in self._encoded_proofs:
+                proofs.append(self._encoded_proofs[cache_key])
+                continue
+
+            try:
+                if account_key:
+                    trie_root = self._get_account(header.state_root, account_key).storage_root
+                else:
+                    trie_root = header.state_root
+                proof = tuple(
+                    rlp.encode(node)
+                    for node in HexaryTrie(self.db, trie_root).get_proof(key)
+                )
+            except KeyError:
+                # Some trie nodes are missing (MissingTrieNode is a KeyError)
+                proofs.append(())
+            else:
+                self._encoded_proofs[cache_key] = proof
+                proofs.append(proof)
+        return tuple(proofs)
+
+    def get_contract_codes(
+            self, code_requests: Iterable[Tuple[Hash32, bytes]]) -> Tuple[bytes, ...]:
+        """
+        Return the code of the account at each ``(block_hash, account_key)``, or ``b''`` when the
+        account has no code, or when the block, the account or its code are missing.
+        """
+        codes = []
+        for block_hash, account_key in code_requests:
+            try:
+                header = self.get_block_header_by_hash(block_hash)
+                code_hash = self._get_account(header.state_root, account_key).code_hash
+            except (HeaderNotFound, KeyError):
+                codes.append(b'')
+                continue
+
+            if code_hash == EMPTY_SHA3:
+                codes.append(b'')
+            else:
+                codes.append(self.db.get(code_hash, b''))
+        return tuple(codes)
+
+    def _get_account(self, state_root: Hash32, account_key: bytes) -> Account:
+        encoded_account = HexaryTrie(self.db, state_root)[account_key]
+        if encoded_account:
+            return rlp.decode(encoded_account, sedes=Account)
+        else:
+            return Account(storage_root=BLANK_ROOT_HASH, code_hash=EMPTY_SHA3)
+
+    def persist_blocks(self, blocks: Iterable[BaseBlock]) -> None:
+        """
+        Persist the given blocks, in order, in a single atomic batch.
+
+        Assumes all block transactions have been persisted already.
+        """
+        with self.db.atomic_batch() as db:
+            for block in blocks:
+                self._persist_block(db, block)
+
+    def persist_trie_data_and_blocks(self,
+                                     trie_data_dict: Dict[Hash32, bytes],
+                                     blocks: Iterable[BaseBlock]) -> None:
+        """
+        Store raw trie data and then persist the given blocks, all in a single atomic batch.
+        """
+        with self.db.atomic_batch() as db:
+            for key, value in trie_data_dict.items():
+                db[key] = value
+            for block in blocks:
+                self._persist_block(db, block)
+
 
 class AsyncChainDBPreProxy(BaseAsyncChainDB):
     """
@@ -79,19 +355,28 @@ class AsyncChainDBPreProxy(BaseAsyncChainDB):
 
     coro_exists = async_method('exists')
     coro_get = async_method('get')
+    coro_get_many = async_method('get_many')
+    coro_exists_many = async_method('exists_many')
     coro_get_block_header_by_hash = async_method('get_block_header_by_hash')
     coro_get_canonical_head = async_method('get_canonical_head')
+    coro_get_encoded_canonical_headers = async_method('get_encoded_canonical_headers')
     coro_get_score = async_method('get_score')
     coro_header_exists = async_method('header_exists')
     coro_get_canonical_block_hash = async_method('get_canonical_block_hash')
     coro_get_canonical_block_header_by_number = async_method('get_canonical_block_header_by_number')
     coro_persist_header = async_method('persist_header')
     coro_persist_block = async_method('persist_block')
+    coro_persist_blocks = async_method('persist_blocks')
     coro_persist_uncles = async_method('persist_uncles')
     coro_persist_trie_data_dict = async_method('persist_trie_data_dict')
+    coro_persist_trie_data_and_blocks = async_method('persist_trie_data_and_blocks')
     coro_get_block_transactions = async_method('get_block_transactions')
     coro_get_block_uncles = async_method('get_block_uncles')
     coro_get_receipts = async_method('get_receipts')
+    coro_get_encoded_block_bodies = async_method('get_encoded_block_bodies')
+    coro_get_encoded_receipts = async_method('get_encoded_receipts')
+    coro_get_encoded_proofs = async_method('get_encoded_proofs')
+    coro_get_contract_codes = async_method('get_contract_codes')
 
 
 class AsyncChainDBProxy(BaseProxy, AsyncChainDBPreProxy):
@@ -10,19 +10,28 @@ from typing import (
 )
 
 from eth_typing import (
-    Hash32,
+    BlockIdentifier,
     BlockNumber,
+    Hash32,
 )
-
 from eth.db.backends.base import (
     BaseAtomicDB,
 )
+from eth.db.header import HeaderDB
+from eth.exceptions import HeaderNotFound
 from eth.rlp.headers import BlockHeader
 
+from trinity._utils.headers import sequence_builder
+from trinity._utils.lru import ByteSizeLRU
 from trinity._utils.mp import (
     async_method,
 )
 
+# The headers peers ask for the most are the ones of the blocks close to the head of the chain,
+# so a few thousand of them (about 500 bytes each) are enough to answer most requests without
+# reading the database. In bytes.
+ENCODED_HEADER_CACHE_MAX_SIZE = 2 * 1024 * 1024
+
 
 class BaseAsyncHeaderDB:
     """
@@ -40,6 +49,14 @@ class BaseAsyncHeaderDB:
     async def coro_get_canonical_head(self) -> BlockHeader:
         raise NotImplementedError("ChainDB classes must implement this method")
 
+    @abstractmethod
+    async def coro_get_encoded_canonical_headers(self,
+                                                 block_number_or_hash: BlockIdentifier,
+                                                 max_headers: int,
+                                                 skip: int,
+                                                 reverse: bool) -> Tuple[bytes, ...]:
+        raise NotImplementedError("ChainDB classes must implement this method")
+
     #
     # Header API
     #
@@ -65,6 +82,60 @@ class BaseAsyncHeaderDB:
         raise NotImplementedError("ChainDB classes must implement this method")
 
 
+class BatchedHeaderDB(HeaderDB):
+    """
+    ``HeaderDB`` served by the DB process, extended with the header range method that backs
+    ``coro_get_encoded_canonical_headers``.
+    """
+
+    def __init__(self,
+                 db: BaseAtomicDB,
+                 encoded_header_cache_max_size: int = ENCODED_HEADER_CACHE_MAX_SIZE) -> None:
+        super().__init__(db)
+        self._encoded_headers: ByteSizeLRU[Hash32, bytes] = ByteSizeLRU(
+            encoded_header_cache_max_size,
+        )
+
+    def get_encoded_canonical_headers(self,
+                                      block_number_or_hash: BlockIdentifier,
+                                      max_headers: int,
+                                      skip: int = 0,
+                                      reverse: bool = False) -> Tuple[bytes, ...]:
+        """
+        Return the RLP encodings of up to ``max_headers`` canonical headers, starting at the
+        given block number, or at the number of the block with the given hash, with ``skip``
+        blocks between each, in reverse order if ``reverse`` is True.
+
+        Stop at the first block number without a canonical header. Raise HeaderNotFound if
+        the starting block hash is unknown.
+        """
+        if isinstance(block_number_or_hash, bytes):
+            start_number = self.get_block_header_by_hash(Hash32(block_number_or_hash)).block_number
+        elif isinstance(block_number_or_hash, int):
+            start_number = BlockNumber(block_number_or_hash)
+        else:
+            actual_type = type(block_number_or_hash)
+            raise TypeError(f"Invariant: unexpected type for 'block_number_or_hash': {actual_type}")
+
+        encoded_headers = []
+        for block_number in sequence_builder(start_number, max_headers, skip, reverse):
+            try:
+                block_hash = self.get_canonical_block_hash(block_number)
+            except HeaderNotFound:
+                break
+            encoded_headers.append(self._get_encoded_header(block_hash))
+        return tuple(encoded_headers)
+
+    def _get_encoded_header(self, block_hash: Hash32) -> bytes:
+        # Headers are stored by hash, so a cached encoding never goes stale
+        try:
+            return self._encoded_headers[block_hash]
+        except KeyError:
+            encoded_header = self.db[block_hash]
+            self._encoded_headers[block_hash] = encoded_header
+            return encoded_header
+
+
 class AsyncHeaderDBPreProxy(BaseAsyncHeaderDB):
     """
     Proxy implementation of ``BaseAsyncHeaderDB`` that does not derive from
@@ -78,6 +149,7 @@ class AsyncHeaderDBPreProxy(BaseAsyncHeaderDB):
     coro_get_canonical_block_hash = async_method('get_canonical_block_hash')
     coro_get_canonical_block_header_by_number = async_method('get_canonical_block_header_by_number')
     coro_get_canonical_head = async_method('get_canonical_head')
+    coro_get_encoded_canonical_headers = async_method('get_encoded_canonical_headers')
     coro_get_score = async_method('get_score')
     coro_header_exists = async_method('header_exists')
     coro_get_canonical_block_hash = async_method('get_canonical_block_hash')
@@ -3,15 +3,21 @@ from multiprocessing.managers import (
 )
 import pathlib
 
-from eth.db.chain import ChainDB
 from eth.db.backends.base import BaseAtomicDB
-from eth.db.header import HeaderDB
 
 from trinity.config import TrinityConfig
-from trinity.db.base import AsyncDBProxy
-from trinity.db.eth1.chain import AsyncChainDBProxy
+from trinity.db.base import (
+    AsyncDBProxy,
+    BatchedAtomicDB,
+)
+from trinity.db.eth1.chain import (
+    AsyncChainDBProxy,
+    BatchedChainDB,
+)
+from trinity.db.framed import FramedDBClient
 from trinity.db.eth1.header import (
-    AsyncHeaderDBProxy
+    AsyncHeaderDBProxy,
+    BatchedHeaderDB,
 )
 from trinity.initialization import (
     is_database_initialized,
@@ -24,12 +30,13 @@ def create_db_server_manager(trinity_config: TrinityConfig,
                              base_db: BaseAtomicDB) -> BaseManager:
 
     chain_config = trinity_config.get_chain_config()
-    chaindb = ChainDB(base_db)
+    base_db = BatchedAtomicDB(base_db)
+    chaindb = BatchedChainDB(base_db)
 
     if not is_database_initialized(chaindb):
         initialize_database(chain_config, chaindb, base_db)
 
-    headerdb = HeaderDB(base_db)
+    headerdb = BatchedHeaderDB(base_db)
 
     class DBManager(BaseManager):
         pass
@@ -53,19 +60,40 @@ def create_db_server_manager(trinity_config: TrinityConfig,
     return manager
 
 
-def create_db_consumer_manager(ipc_path: pathlib.Path, connect: bool=True) -> BaseManager:
+class DBConsumerManager(BaseManager):
+    """
+    ``BaseManager`` connected to the DB process, whose ``get_db()`` returns a client for the
+    framed DB server listening on ``framed_ipc_path``.
+
+    Subclasses serve ``get_db()`` through a ``BaseManager`` proxy instead by registering it.
+    """
+    def __init__(self, address: str, framed_ipc_path: pathlib.Path) -> None:
+        super().__init__(address=address)
+        self.framed_ipc_path = framed_ipc_path
+
+    def get_db(self) -> FramedDBClient:
+        return FramedDBClient(self.framed_ipc_path)
+
+
+def create_db_consumer_manager(ipc_path: pathlib.Path,
+                               connect: bool=True,
+                               framed_ipc_path: pathlib.Path=None) -> BaseManager:
     """
     We're still using 'str' here on param ipc_path because an issue with
     multi-processing not being able to interpret 'Path' objects correctly
+
+    If ``framed_ipc_path`` is given, ``get_db()`` returns a client for the framed DB server
+    listening on that path, instead of a ``BaseManager`` proxy.
     """
-    class DBManager(BaseManager):
+    class DBManager(DBConsumerManager):
         pass
 
-    DBManager.register('get_db', proxytype=AsyncDBProxy)
+    if framed_ipc_path is None:
+        DBManager.register('get_db', proxytype=AsyncDBProxy)
     DBManager.register('get_chaindb', proxytype=AsyncChainDBProxy)
     DBManager.register('get_headerdb', proxytype=AsyncHeaderDBProxy)
 
-    manager = DBManager(address=str(ipc_path))  # type: ignore
+    manager = DBManager(str(ipc_path), framed_ipc_path)
     if connect:
         manager.connect()
     return manager
@@ -0,0 +1,411 @@
+"""
+An asyncio-native alternative to serving the raw key/value database through
+``multiprocessing.managers.BaseManager``.
+
+Requests and responses are length-prefixed binary frames exchanged over a unix socket, so keys and
+values cross the process boundary as raw bytes, without being pickled. Every frame carries a
+request id, which lets a client keep many requests in flight over a single connection and lets the
+server answer them in any order. The server runs every request in a thread, so that slow database
+reads don't hold up the other requests.
+
+Frame layout (all integers are big-endian)::
+
+    | payload length (4 bytes) | opcode or status (1 byte) | request id (4 bytes) | payload |
+"""
+import asyncio
+from contextlib import contextmanager
+import itertools
+import logging
+import pathlib
+import socket
+import struct
+import threading
+from typing import (
+    Dict,
+    Generator,
+    Iterable,
+    List,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from eth.db.atomic import AtomicDBWriteBatch
+from eth.db.backends.base import BaseAtomicDB
+
+from trinity.db.base import BaseAsyncDB
+from trinity.exceptions import DBServerError
+
+
+FRAME_HEADER = struct.Struct('>IBI')
+ITEM_LENGTH = struct.Struct('>I')
+
+# Marks a missing value in the response to a GET_MANY request
+MISSING_ITEM_LENGTH = 2 ** 32 - 1
+
+# opcodes
+GET = 1
+SET = 2
+EXISTS = 3
+DELETE = 4
+GET_MANY = 5
+EXISTS_MANY = 6
+SET_MANY = 7
+
+# response statuses
+STATUS_OK = 0
+STATUS_MISSING = 1
+STATUS_ERROR = 2
+
+
+def encode_items(items: Iterable[bytes]) -> bytes:
+    """
+    Encode the given byte strings as a sequence of length-prefixed items.
+    """
+    return b''.join(ITEM_LENGTH.pack(len(item)) + item for item in items)
+
+
+def decode_items(payload: bytes) -> Tuple[bytes, ...]:
+    """
+    Decode a sequence of length-prefixed items, as produced by :func:`encode_items`.
+    """
+    view = memoryview(payload)
+    items = []
+    offset = 0
+    while offset < len(view):
+        item_length, = ITEM_LENGTH.unpack_from(view, offset)
+        offset += ITEM_LENGTH.size
+        items.append(bytes(view[offset:offset + item_length]))
+        offset += item_length
+    return tuple(items)
+
+
+def encode_optional_items(items: Iterable[bytes]) -> bytes:
+    return b''.join(
+        ITEM_LENGTH.pack(MISSING_ITEM_LENGTH) if item is None
+        else ITEM_LENGTH.pack(len(item)) + item
+        for item in items
+    )
+
+
+def decode_optional_items(payload: bytes) -> List[bytes]:
+    view = memoryview(payload)
+    items: List[bytes] = []
+    offset = 0
+    while offset < len(view):
+        item_length, = ITEM_LENGTH.unpack_from(view, offset)
+        offset += ITEM_LENGTH.size
+        if item_length == MISSING_ITEM_LENGTH:
+            items.append(None)
+        else:
+            items.append(bytes(view[offset:offset + item_length]))
+            offset += item_length
+    return items
+
+
+def encode_frame(code: int, request_id: int, payload: bytes) -> bytes:
+    return FRAME_HEADER.pack(len(payload), code, request_id) + payload
+
+
+class FramedDBServer:
+    """
+    Serve the given database over the framed protocol, on a unix socket.
+    """
+    logger = logging.getLogger('trinity.db.framed.FramedDBServer')
+
+    def __init__(self, db: BaseAtomicDB) -> None:
+        self.db = db
+        self._connections: Set['asyncio.Future[None]'] = set()
+        self._thread_loop: asyncio.AbstractEventLoop = None
+        self._thread: threading.Thread = None
+
+    async def serve(self, ipc_path: pathlib.Path) -> asyncio.AbstractServer:
+        return await asyncio.start_unix_server(self._accept_connection, str(ipc_path))
+
+    def serve_in_thread(self, ipc_path: pathlib.Path) -> threading.Thread:
+        """
+        Serve from a daemon thread running its own event loop, so that the framed server can run
+        alongside the blocking ``BaseManager`` server in the DB process.
+
+        Raise the error of the thread if it fails to start serving.
+        """
+        ready = threading.Event()
+        startup_errors: List[BaseException] = []
+        loop = asyncio.new_event_loop()
+
+        def run() -> None:
+            asyncio.set_event_loop(loop)
+            try:
+                # keep a reference to the server, it stops listening when garbage collected
+                server = loop.run_until_complete(self.serve(ipc_path))
+            except BaseException as exc:
+                startup_errors.append(exc)
+                loop.close()
+                return
+            finally:
+                ready.set()
+
+            try:
+                loop.run_forever()
+            finally:
+                server.close()
+                loop.run_until_complete(server.wait_closed())
+                loop.run_until_complete(self._close_connections())
+                loop.close()
+                if ipc_path.exists():
+                    ipc_path.unlink()
+
+        thread = threading.Thread(target=run, name='framed-db-server', daemon=True)
+        thread.start()
+        ready.wait()
+        if startup_errors:
+            raise startup_errors[0]
+
+        self._thread_loop = loop
+        self._thread = thread
+        return thread
+
+    def stop_thread(self) -> None:
+        """
+        Stop serving from the thread started by :meth:`serve_in_thread`, and remove its socket.
+        """
+        if self._thread is None:
+            return
+        self._thread_loop.call_soon_threadsafe(self._thread_loop.stop)
+        self._thread.join()
+        self._thread = None
+
+    def _accept_connection(self,
+                           reader: asyncio.StreamReader,
+                           writer: asyncio.StreamWriter) -> None:
+        connection = asyncio.ensure_future(self._handle_connection(reader, writer))
+        self._connections.add(connection)
+        connection.add_done_callback(self._connections.discard)
+
+    async def _close_connections(self) -> None:
+        connections = tuple(self._connections)
+        for connection in connections:
+            connection.cancel()
+        await asyncio.gather(*connections, return_exceptions=True)
+
+    async def _handle_connection(self,
+                                 reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter) -> None:
+        requests: Set['asyncio.Future[None]'] = set()
+        try:
+            while True:
+                header = await reader.readexactly(FRAME_HEADER.size)
+                payload_length, opcode, request_id = FRAME_HEADER.unpack(header)
+                payload = await reader.readexactly(payload_length)
+                request = asyncio.ensure_future(
+                    self._handle_request(writer, opcode, request_id, payload)
+                )
+                requests.add(request)
+                request.add_done_callback(requests.discard)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            # The client went away
+            pass
+        finally:
+            for unfinished_request in requests:
+                unfinished_request.cancel()
+            await asyncio.gather(*requests, return_exceptions=True)
+            writer.close()
+
+    async def _handle_request(self,
+                              writer: asyncio.StreamWriter,
+                              opcode: int,
+                              request_id: int,
+                              payload: bytes) -> None:
+        # The database is already shared with the threads of the BaseManager server, so it can
+        # be used from the executor's threads as well.
+        loop = asyncio.get_event_loop()
+        status, response = await loop.run_in_executor(None, self._dispatch, opcode, payload)
+        writer.write(FRAME_HEADER.pack(len(response), status, request_id))
+        writer.write(response)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            # The client went away, its connection is closed by _handle_connection()
+            pass
+
+    def _get_or_none(self, key: bytes) -> bytes:
+        try:
+            return self.db[key]
+        except KeyError:
+            return None
+
+    def _dispatch(self, opcode: int, payload: bytes) -> Tuple[int, bytes]:
+        try:
+            if opcode == GET:
+                return STATUS_OK, self.db[payload]
+            elif opcode == SET:
+                key, value = decode_items(payload)
+                self.db[key] = value
+                return STATUS_OK, b''
+            elif opcode == EXISTS:
+                return STATUS_OK, b'\x01' if payload in self.db else b'\x00'
+            elif opcode == DELETE:
+                del self.db[payload]
+                return STATUS_OK, b''
+            elif opcode == GET_MANY:
+                return STATUS_OK, encode_optional_items(
+                    self._get_or_none(key) for key in decode_items(payload)
+                )
+            elif opcode == EXISTS_MANY:
+                return STATUS_OK, bytes(key in self.db for key in decode_items(payload))
+            elif opcode == SET_MANY:
+                items = decode_items(payload)
+                with self.db.atomic_batch() as db:
+                    for key, value in zip(items[::2], items[1::2]):
+                        db[key] = value
+                return STATUS_OK, b''
+            else:
+                return STATUS_ERROR, f"Unknown opcode: {opcode}".encode()
+        except KeyError:
+            return STATUS_MISSING, b''
+        except Exception as exc:
+            self.logger.exception("Unexpected error serving framed DB request")
+            return STATUS_ERROR, repr(exc).encode()
+
+
+def _raise_for_status(status: int, payload: bytes) -> None:
+    if status == STATUS_MISSING:
+        raise KeyError()
+    elif status == STATUS_ERROR:
+        raise DBServerError(payload.decode())
+
+
+class FramedDBClient(BaseAsyncDB):
+    """
+    Client for a :class:`FramedDBServer`.
+
+    The ``coro_*`` methods share a single asyncio connection, over which any number of requests
+    can be in flight at the same time. The synchronous ``BaseDB`` API uses a separate blocking
+    connection, for callers that are not running in an event loop (e.g. EVM execution).
+    """
+
+    def __init__(self, ipc_path: pathlib.Path) -> None:
+        self.ipc_path = ipc_path
+        self._request_ids = itertools.count()
+
+        self._reader: asyncio.StreamReader = None
+        self._writer: asyncio.StreamWriter = None
+        self._connect_lock: asyncio.Lock = None
+        self._pending: Dict[int, 'asyncio.Future[Tuple[int, bytes]]'] = {}
+
+        self._sync_socket: socket.socket = None
+        self._sync_lock = threading.Lock()
+
+    #
+    # Async API
+    #
+    async def _connect(self) -> None:
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._writer is not None:
+                return
+            self._reader, self._writer = await asyncio.open_unix_connection(str(self.ipc_path))
+            asyncio.ensure_future(self._read_responses())
+
+    async def _read_responses(self) -> None:
+        try:
+            while True:
+                header = await self._reader.readexactly(FRAME_HEADER.size)
+                payload_length, status, request_id = FRAME_HEADER.unpack(header)
+                payload = await self._reader.readexactly(payload_length)
+                future = self._pending.pop(request_id, None)
+                if future is not None and not future.done():
+                    future.set_result((status, payload))
+        except (asyncio.IncompleteReadError, ConnectionError) as exc:
+            self._writer = None
+            pending, self._pending = self._pending, {}
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(DBServerError(f"Lost connection to DB server: {exc!r}"))
+
+    async def _request(self, opcode: int, payload: bytes) -> bytes:
+        if self._writer is None:
+            await self._connect()
+        request_id = next(self._request_ids) % 2 ** 32
+        future: 'asyncio.Future[Tuple[int, bytes]]' = asyncio.get_event_loop().create_future()
+        self._pending[request_id] = future
+        self._writer.write(encode_frame(opcode, request_id, payload))
+        status, response = await future
+        _raise_for_status(status, response)
+        return response
+
+    async def coro_get(self, key: bytes) -> bytes:
+        return await self._request(GET, key)
+
+    async def coro_set(self, key: bytes, value: bytes) -> None:
+        await self._request(SET, encode_items((key, value)))
+
+    async def coro_exists(self, key: bytes) -> bool:
+        return await self._request(EXISTS, key) == b'\x01'
+
+    async def coro_delete(self, key: bytes) -> None:
+        try:
+            await self._request(DELETE, key)
+        except KeyError:
+            pass
+
+    async def coro_get_many(self, keys: Sequence[bytes]) -> Dict[bytes, bytes]:
+        values = decode_optional_items(await self._request(GET_MANY, encode_items(keys)))
+        return {key: value for key, value in zip(keys, values) if value is not None}
+
+    async def coro_exists_many(self, keys: Sequence[bytes]) -> Tuple[bool, ...]:
+        return tuple(bool(flag) for flag in await self._request(EXISTS_MANY, encode_items(keys)))
+
+    async def coro_set_many(self, key_values: Dict[bytes, bytes]) -> None:
+        await self._request(SET_MANY, encode_items(itertools.chain(*key_values.items())))
+
+    #
+    # Sync API
+    #
+    def _request_sync(self, opcode: int, payload: bytes) -> bytes:
+        with self._sync_lock:
+            if self._sync_socket is None:
+                self._sync_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self._sync_socket.connect(str(self.ipc_path))
+            self._sync_socket.sendall(encode_frame(opcode, 0, payload))
+            payload_length, status, _ = FRAME_HEADER.unpack(
+                self._recv_exactly(FRAME_HEADER.size))
+            response = self._recv_exactly(payload_length)
+        _raise_for_status(status, response)
+        return response
+
+    def _recv_exactly(self, length: int) -> bytes:
+        buffer = bytearray(length)
+        view = memoryview(buffer)
+        received = 0
+        while received < length:
+            chunk_size = self._sync_socket.recv_into(view[received:], length - received)
+            if chunk_size == 0:
+                self._sync_socket = None
+                raise DBServerError("Lost connection to DB server")
+            received += chunk_size
+        return bytes(buffer)
+
+    def __getitem__(self, key: bytes) -> bytes:
+        try:
+            return self._request_sync(GET, key)
+        except KeyError:
+            raise KeyError(key)
+
+    def __setitem__(self, key: bytes, value: bytes) -> None:
+        self._request_sync(SET, encode_items((key, value)))
+
+    def __delitem__(self, key: bytes) -> None:
+        try:
+            self._request_sync(DELETE, key)
+        except KeyError:
+            raise KeyError(key)
+
+    def _exists(self, key: bytes) -> bool:
+        return self._request_sync(EXISTS, key) == b'\x01'
+
+    @contextmanager
+    def atomic_batch(self) -> Generator['AtomicDBWriteBatch', None, None]:
+        with AtomicDBWriteBatch._commit_unless_raises(self) as readable_batch:
+            yield readable_batch
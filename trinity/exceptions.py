@@ -39,6 +39,13 @@ class SyncRequestAlreadyProcessed(BaseTrinityError):
     pass
 
 
+class DBServerError(BaseTrinityError):
+    """
+    Raised when the DB process fails to serve a request sent over the framed DB protocol.
+    """
+    pass
+
+
 class OversizeObject(BaseTrinityError):
     """
     Raised when an object is bigger than comfortably fits in memory.
@@ -30,12 +30,14 @@ from trinity.config import (
 )
 from trinity.constants import (
     APP_IDENTIFIER_ETH1,
+    DB_SERVER_FRAMED,
     MAIN_EVENTBUS_ENDPOINT,
     NETWORKING_EVENTBUS_ENDPOINT,
 )
 from trinity.db.eth1.manager import (
     create_db_server_manager,
 )
+from trinity.db.framed import FramedDBServer
 from trinity.endpoint import (
     TrinityMainEventBusEndpoint,
     TrinityEventBusEndpoint,
@@ -205,7 +207,17 @@ def run_database_process(trinity_config: TrinityConfig, db_class: Type[BaseDB])
         base_db = db_class(db_path=app_config.database_dir)
 
         manager = create_db_server_manager(trinity_config, base_db)
-        serve_until_sigint(manager)
+        framed_server = None
+        if trinity_config.db_server_mode == DB_SERVER_FRAMED:
+            # The manager still serves the chain and header DBs, but raw key/value access goes
+            # through the framed server.
+            framed_server = FramedDBServer(base_db)
+            framed_server.serve_in_thread(trinity_config.database_framed_ipc_path)
+        try:
+            serve_until_sigint(manager)
+        finally:
+            if framed_server is not None:
+                framed_server.stop_thread()
 
 
 async def handle_networking_exit(service: BaseService,
@@ -26,6 +26,7 @@ from trinity.config import (
     ChainConfig,
     TrinityConfig,
 )
+from trinity.constants import DB_SERVER_FRAMED
 from trinity.endpoint import (
     TrinityEventBusEndpoint,
 )
@@ -49,7 +50,14 @@ class Node(BaseService):
     def __init__(self, event_bus: TrinityEventBusEndpoint, trinity_config: TrinityConfig) -> None:
         super().__init__()
         self.trinity_config = trinity_config
-        self._db_manager = create_db_consumer_manager(trinity_config.database_ipc_path)
+        if trinity_config.db_server_mode == DB_SERVER_FRAMED:
+            framed_ipc_path = trinity_config.database_framed_ipc_path
+        else:
+            framed_ipc_path = None
+        self._db_manager = create_db_consumer_manager(
+            trinity_config.database_ipc_path,
+            framed_ipc_path=framed_ipc_path,
+        )
         self._headerdb = self._db_manager.get_headerdb()  # type: ignore
 
         self._jsonrpc_ipc_path: Path = trinity_config.jsonrpc_ipc_path
@@ -1,7 +1,7 @@
 from typing import Type
 
 from p2p.peer_pool import BasePeerPool
-from p2p.persistence import SQLitePeerInfo
+from p2p.persistence import AsyncSQLitePeerInfo
 
 from trinity.chains.full import FullChain
 from trinity.config import TrinityConfig, Eth1AppConfig
@@ -14,6 +14,7 @@ from .base import Node
 class FullNode(Node):
     _chain: FullChain = None
     _p2p_server: FullServer = None
+    _peer_info: AsyncSQLitePeerInfo = None
 
     def __init__(self, event_bus: TrinityEventBusEndpoint, trinity_config: TrinityConfig) -> None:
         super().__init__(event_bus, trinity_config)
@@ -22,6 +23,7 @@ class FullNode(Node):
         self._node_key = trinity_config.nodekey
         self._node_port = trinity_config.port
         self._max_peers = trinity_config.max_peers
+        self._offload_msg_decoding = trinity_config.offload_msg_decoding
 
         app_config = trinity_config.get_app_config(Eth1AppConfig)
         self._nodedb_path = app_config.nodedb_path
@@ -36,7 +38,7 @@ class FullNode(Node):
     def get_p2p_server(self) -> FullServer:
         if self._p2p_server is None:
             manager = self.db_manager
-            peer_info = SQLitePeerInfo(self._nodedb_path)
+            self._peer_info = AsyncSQLitePeerInfo(self._nodedb_path)
             self._p2p_server = FullServer(
                 privkey=self._node_key,
                 port=self._node_port,
@@ -45,8 +47,9 @@ class FullNode(Node):
                 headerdb=self.headerdb,
                 base_db=manager.get_db(),  # type: ignore
                 network_id=self._network_id,
-                peer_info=peer_info,
+                peer_info=self._peer_info,
                 max_peers=self._max_peers,
+                offload_msg_decoding=self._offload_msg_decoding,
                 bootstrap_nodes=self._bootstrap_nodes,
                 preferred_nodes=self._preferred_nodes,
                 token=self.cancel_token,
@@ -56,3 +59,9 @@ class FullNode(Node):
 
     def get_peer_pool(self) -> BasePeerPool:
         return self.get_p2p_server().peer_pool
+
+    async def _cleanup(self) -> None:
+        if self._peer_info is not None:
+            # Commits whatever the peer pool recorded while shutting down
+            self._peer_info.close()
+        await super()._cleanup()
@@ -37,6 +37,7 @@ class LightNode(Node):
         self._nodekey = trinity_config.nodekey
         self._port = trinity_config.port
         self._max_peers = trinity_config.max_peers
+        self._offload_msg_decoding = trinity_config.offload_msg_decoding
         self._bootstrap_nodes = trinity_config.bootstrap_nodes
         self._preferred_nodes = trinity_config.preferred_nodes
 
@@ -77,6 +78,7 @@ class LightNode(Node):
                 base_db=manager.get_db(),  # type: ignore
                 network_id=self._network_id,
                 max_peers=self._max_peers,
+                offload_msg_decoding=self._offload_msg_decoding,
                 bootstrap_nodes=self._bootstrap_nodes,
                 preferred_nodes=self._preferred_nodes,
                 token=self.cancel_token,
@@ -38,6 +38,10 @@ from trinity.rpc.modules import (
 from trinity.rpc.ipc import (
     IPCServer,
 )
+from trinity.sync.light.cache import (
+    CachingLightPeerChain,
+    SQLiteLightCache,
+)
 from trinity._utils.shutdown import (
     exit_with_service_and_endpoint,
 )
@@ -45,6 +49,8 @@ from trinity._utils.shutdown import (
 
 class JsonRpcServerPlugin(BaseIsolatedPlugin):
 
+    _light_cache: SQLiteLightCache = None
+
     @property
     def name(self) -> str:
         return "JSON-RPC API"
@@ -71,7 +77,16 @@ class JsonRpcServerPlugin(BaseIsolatedPlugin):
         if eth1_app_config.database_mode is Eth1DbMode.LIGHT:
             header_db = db_manager.get_headerdb()  # type: ignore
             event_bus_light_peer_chain = EventBusLightPeerChain(self.context.event_bus)
-            chain = chain_config.light_chain_class(header_db, peer_chain=event_bus_light_peer_chain)
+            self._light_cache = SQLiteLightCache(
+                eth1_app_config.light_cache_path,
+                loop=asyncio.get_event_loop(),
+            )
+            caching_light_peer_chain = CachingLightPeerChain(
+                event_bus_light_peer_chain,
+                self._light_cache,
+                header_db,
+            )
+            chain = chain_config.light_chain_class(header_db, peer_chain=caching_light_peer_chain)
         elif eth1_app_config.database_mode is Eth1DbMode.FULL:
             db = db_manager.get_db()  # type: ignore
             chain = chain_config.full_chain_class(db)
@@ -102,4 +117,7 @@ class JsonRpcServerPlugin(BaseIsolatedPlugin):
         asyncio.ensure_future(exit_with_service_and_endpoint(ipc_server, self.context.event_bus))
         asyncio.ensure_future(ipc_server.run())
         loop.run_forever()
+        if self._light_cache is not None:
+            # Write the cache entries which were not flushed yet
+            self._light_cache.close()
         loop.close()
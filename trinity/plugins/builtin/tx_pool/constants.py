@@ -0,0 +1,15 @@
+# How many transactions to remember the validity of, so that each of them is only validated once,
+# however many peers it is relayed to
+TX_VALIDITY_CACHE_SIZE = 65536
+
+# For how long (in seconds) to remember that a peer knows about a transaction, because it sent it
+# to us or we sent it to it
+KNOWN_TX_EXPIRY = 600
+
+# How many transactions of a peer to remember at most within half of KNOWN_TX_EXPIRY, the same
+# limit as geth keeps per peer
+KNOWN_TX_GENERATION_SIZE = 32768
+
+# How many bytes of the transaction hashes to remember. Two different transactions only get
+# mistaken for each other with a chance of one in 2**64.
+KNOWN_TX_HASH_PREFIX_SIZE = 8
@@ -1,24 +1,29 @@
+import time
 from typing import (
     cast,
     Callable,
+    Dict,
     Iterable,
     List,
     FrozenSet,
+    Set,
+    Sequence,
+    Tuple,
     Type,
 )
-import uuid
-
-from bloom_filter import (
-    BloomFilter
-)
 
 from cancel_token import CancelToken
 
+from eth_typing import Hash32
+
+from lru import LRU
+
 from eth.rlp.transactions import (
     BaseTransactionFields
 )
 
 from p2p.peer import (
+    BasePeer,
     PeerSubscriber,
 )
 from p2p.protocol import Command
@@ -31,6 +36,59 @@ from trinity.protocol.eth.commands import (
     Transactions,
 )
 
+from .constants import (
+    KNOWN_TX_EXPIRY,
+    KNOWN_TX_GENERATION_SIZE,
+    KNOWN_TX_HASH_PREFIX_SIZE,
+    TX_VALIDITY_CACHE_SIZE,
+)
+
+HashedTransaction = Tuple[Hash32, BaseTransactionFields]
+
+
+class KnownTransactions:
+    """
+    The hashes of the transactions that a peer knows about, each of them forgotten after
+    ``expiry`` seconds at most.
+
+    Only a prefix of each hash is kept, in one of two generations: new hashes go to the current
+    one, which replaces the previous one after ``expiry / 2`` seconds, or once it has
+    ``max_generation_size`` hashes.
+    """
+    def __init__(self,
+                 expiry: float = KNOWN_TX_EXPIRY,
+                 max_generation_size: int = KNOWN_TX_GENERATION_SIZE) -> None:
+        self._expiry = expiry
+        self._max_generation_size = max_generation_size
+        self._current: Set[bytes] = set()
+        self._previous: Set[bytes] = set()
+        self._current_since = time.monotonic()
+
+    def add(self, tx_hash: Hash32) -> None:
+        self._expire()
+        self._current.add(tx_hash[:KNOWN_TX_HASH_PREFIX_SIZE])
+
+    def __contains__(self, tx_hash: Hash32) -> bool:
+        self._expire()
+        prefix = tx_hash[:KNOWN_TX_HASH_PREFIX_SIZE]
+        return prefix in self._current or prefix in self._previous
+
+    def __len__(self) -> int:
+        self._expire()
+        return len(self._current) + len(self._previous)
+
+    def _expire(self) -> None:
+        now = time.monotonic()
+        age = now - self._current_since
+        if age >= self._expiry:
+            self._previous = set()
+        elif age >= self._expiry / 2 or len(self._current) >= self._max_generation_size:
+            self._previous = self._current
+        else:
+            return
+        self._current = set()
+        self._current_since = now
+
 
 class TxPool(BaseService, PeerSubscriber):
     """
@@ -55,10 +113,9 @@ class TxPool(BaseService, PeerSubscriber):
             raise ValueError('Must pass a tx validation function')
 
         self.tx_validation_fn = tx_validation_fn
-        # 1m should give us 9000 blocks before that filter becomes less reliable
-        # It should take up about 1mb of memory
-        self._bloom = BloomFilter(max_elements=1000000)
-        self._bloom_salt = str(uuid.uuid4())
+        # Whether each recent transaction is valid, by hash
+        self._tx_validity: LRU[Hash32, bool] = LRU(TX_VALIDITY_CACHE_SIZE)
+        self._known_txs: Dict[BasePeer, KnownTransactions] = {}
 
     subscription_msg_types: FrozenSet[Type[Command]] = frozenset({Transactions})
 
@@ -79,11 +136,20 @@ class TxPool(BaseService, PeerSubscriber):
                     msg = cast(List[BaseTransactionFields], msg)
                     await self._handle_tx(peer, msg)
 
+    def deregister_peer(self, peer: BasePeer) -> None:
+        self._known_txs.pop(peer, None)
+
     async def _handle_tx(self, peer: ETHPeer, txs: List[BaseTransactionFields]) -> None:
 
         self.logger.debug('Received %d transactions from %s', len(txs), peer)
 
-        self._add_txs_to_bloom(peer, txs)
+        hashed_txs = [(tx.hash, tx) for tx in txs]
+        self._add_known_txs(peer, hashed_txs)
+
+        # Validate each transaction once, rather than for every peer it gets relayed to
+        valid_txs = [(tx_hash, tx) for tx_hash, tx in hashed_txs if self._is_valid(tx_hash, tx)]
+        if not valid_txs:
+            return
 
         async for receiving_peer in self._peer_pool:
             receiving_peer = cast(ETHPeer, receiving_peer)
@@ -91,7 +157,7 @@ class TxPool(BaseService, PeerSubscriber):
             if receiving_peer is peer:
                 continue
 
-            filtered_tx = self._filter_tx_for_peer(receiving_peer, txs)
+            filtered_tx = self._filter_tx_for_peer(receiving_peer, valid_txs)
             if len(filtered_tx) == 0:
                 continue
 
@@ -100,27 +166,35 @@ class TxPool(BaseService, PeerSubscriber):
                 len(filtered_tx),
                 receiving_peer,
             )
-            receiving_peer.sub_proto.send_transactions(filtered_tx)
-            self._add_txs_to_bloom(receiving_peer, filtered_tx)
+            receiving_peer.sub_proto.send_transactions([tx for _, tx in filtered_tx])
+            self._add_known_txs(receiving_peer, filtered_tx)
 
     def _filter_tx_for_peer(
             self,
             peer: ETHPeer,
-            txs: List[BaseTransactionFields]) -> List[BaseTransactionFields]:
+            txs: Sequence[HashedTransaction]) -> List[HashedTransaction]:
 
+        known_txs = self._get_known_txs(peer)
         return [
-            val for val in txs
-            if self._construct_bloom_entry(peer, val) not in self._bloom
-            # TODO: we need to keep track of invalid txs and eventually blacklist nodes
-            if self.tx_validation_fn(val)
+            (tx_hash, tx) for tx_hash, tx in txs
+            if tx_hash not in known_txs
         ]
 
-    def _construct_bloom_entry(self, peer: ETHPeer, tx: BaseTransactionFields) -> bytes:
-        return f"{repr(peer.remote)}-{tx.hash}-{self._bloom_salt}".encode()
-
-    def _add_txs_to_bloom(self, peer: ETHPeer, txs: Iterable[BaseTransactionFields]) -> None:
-        for val in txs:
-            self._bloom.add(self._construct_bloom_entry(peer, val))
+    def _is_valid(self, tx_hash: Hash32, tx: BaseTransactionFields) -> bool:
+        if tx_hash not in self._tx_validity:
+            # TODO: we need to keep track of invalid txs and eventually blacklist nodes
+            self._tx_validity[tx_hash] = self.tx_validation_fn(tx)
+        return self._tx_validity[tx_hash]
+
+    def _get_known_txs(self, peer: BasePeer) -> KnownTransactions:
+        if peer not in self._known_txs:
+            self._known_txs[peer] = KnownTransactions()
+        return self._known_txs[peer]
+
+    def _add_known_txs(self, peer: ETHPeer, txs: Iterable[HashedTransaction]) -> None:
+        known_txs = self._get_known_txs(peer)
+        for tx_hash, _ in txs:
+            known_txs.add(tx_hash)
 
     async def do_cleanup(self) -> None:
         self.logger.info("Stopping Tx Pool...")
@@ -25,8 +25,6 @@ from trinity.rlp.sedes import (
     HashOrNumber,
 )
 
-from eth2.beacon.types.blocks import BeaconBlock
-
 
 class RequestMessage(TypedDict):
     request_id: int
@@ -70,7 +68,7 @@ class GetBeaconBlocks(Command):
 
 class BeaconBlocksMessage(TypedDict):
     request_id: int
-    encoded_blocks: Tuple[BeaconBlock, ...]
+    encoded_blocks: Tuple[bytes, ...]
 
 
 class BeaconBlocks(Command):
@@ -67,10 +67,13 @@ class BCCProtocol(HasExtendedDebugLogger, Protocol):
         self.send(header, body)
 
     def send_blocks(self, blocks: Tuple[BaseBeaconBlock, ...], request_id: int) -> None:
+        self.send_encoded_blocks(tuple(ssz.encode(block) for block in blocks), request_id)
+
+    def send_encoded_blocks(self, encoded_blocks: Tuple[bytes, ...], request_id: int) -> None:
         cmd = BeaconBlocks(self.cmd_id_offset, self.snappy_support)
         header, body = cmd.encode(BeaconBlocksMessage(
             request_id=request_id,
-            encoded_blocks=tuple(ssz.encode(block) for block in blocks),
+            encoded_blocks=encoded_blocks,
         ))
         self.send(header, body)
 
@@ -1,13 +1,18 @@
 from typing import (
     cast,
-    AsyncIterator,
     FrozenSet,
+    Tuple,
     Type,
 )
 
 from eth_typing import (
     Hash32,
 )
+from eth_utils import (
+    encode_hex,
+)
+
+import ssz
 
 from cancel_token import CancelToken
 
@@ -19,7 +24,6 @@ from eth.exceptions import BlockNotFound
 
 from trinity.db.beacon.chain import BaseAsyncBeaconChainDB
 from eth2.beacon.types.blocks import (
-    BaseBeaconBlock,
     BeaconBlock,
 )
 from eth2.beacon.typing import (
@@ -66,70 +70,65 @@ class BCCRequestServer(BaseRequestServer):
         max_blocks = msg["max_blocks"]
         block_slot_or_root = msg["block_slot_or_root"]
 
-        try:
-            if isinstance(block_slot_or_root, int):
-                # TODO: pass accurate `block_class: Type[BaseBeaconBlock]` under
-                # per BeaconStateMachine fork
-                start_block = await self.db.coro_get_canonical_block_by_slot(
-                    Slot(block_slot_or_root),
-                    BeaconBlock,
-                )
-            elif isinstance(block_slot_or_root, bytes):
-                # TODO: pass accurate `block_class: Type[BaseBeaconBlock]` under
-                # per BeaconStateMachine fork
-                start_block = await self.db.coro_get_block_by_root(
-                    Hash32(block_slot_or_root),
-                    BeaconBlock,
-                )
-            else:
-                raise TypeError(
-                    f"Invariant: unexpected type for 'block_slot_or_root': "
-                    f"{type(block_slot_or_root)}"
-                )
-        except BlockNotFound:
-            start_block = None
-
-        if start_block is not None:
+        if isinstance(block_slot_or_root, int):
+            start_slot = Slot(block_slot_or_root)
             self.logger.debug2(
-                "%s requested %d blocks starting with %s",
+                "%s requested %d blocks starting with slot #%d",
                 peer,
                 max_blocks,
-                start_block,
+                start_slot,
+            )
+            encoded_blocks = await self._get_encoded_blocks(start_slot, max_blocks)
+        elif isinstance(block_slot_or_root, bytes):
+            encoded_blocks = await self._get_encoded_blocks_by_root(
+                peer,
+                Hash32(block_slot_or_root),
+                max_blocks,
             )
-            blocks = tuple([b async for b in self._get_blocks(start_block, max_blocks)])
-
         else:
-            self.logger.debug2("%s requested unknown block %s", block_slot_or_root)
-            blocks = ()
+            raise TypeError(
+                f"Invariant: unexpected type for 'block_slot_or_root': "
+                f"{type(block_slot_or_root)}"
+            )
 
-        self.logger.debug2("Replying to %s with %d blocks", peer, len(blocks))
-        peer.sub_proto.send_blocks(blocks, request_id)
+        self.logger.debug2("Replying to %s with %d blocks", peer, len(encoded_blocks))
+        peer.sub_proto.send_encoded_blocks(encoded_blocks, request_id)
 
-    async def _get_blocks(self,
-                          start_block: BaseBeaconBlock,
-                          max_blocks: int) -> AsyncIterator[BaseBeaconBlock]:
-        if max_blocks < 0:
-            raise Exception("Invariant: max blocks cannot be negative")
+    async def _get_encoded_blocks_by_root(self,
+                                          peer: BCCPeer,
+                                          start_root: Hash32,
+                                          max_blocks: int) -> Tuple[bytes, ...]:
+        try:
+            # TODO: pass accurate `block_class: Type[BaseBeaconBlock]` under
+            # per BeaconStateMachine fork
+            start_block = await self.db.coro_get_block_by_root(start_root, BeaconBlock)
+        except BlockNotFound:
+            self.logger.debug2("%s requested unknown block %s", peer, encode_hex(start_root))
+            return ()
+
+        self.logger.debug2(
+            "%s requested %d blocks starting with %s",
+            peer,
+            max_blocks,
+            start_block,
+        )
+        try:
+            canonical_root = await self.db.coro_get_canonical_block_root(start_block.slot)
+        except BlockNotFound:
+            canonical_root = None
 
-        if max_blocks == 0:
-            return
+        if canonical_root == start_block.root:
+            return await self._get_encoded_blocks(start_block.slot, max_blocks)
+        elif max_blocks > 0:
+            # no block of the canonical chain is a child of a non-canonical block
+            return (ssz.encode(start_block),)
+        else:
+            return ()
 
-        yield start_block
+    async def _get_encoded_blocks(self, start_slot: Slot, max_blocks: int) -> Tuple[bytes, ...]:
+        if max_blocks < 0:
+            raise Exception("Invariant: max blocks cannot be negative")
 
-        try:
-            # ensure only a connected chain is returned (breaks might occur if the start block is
-            # not part of the canonical chain or if the canonical chain changes during execution)
-            start = start_block.slot + 1
-            end = start + max_blocks - 1
-            parent = start_block
-            for slot in range(start, end):
-                # TODO: pass accurate `block_class: Type[BaseBeaconBlock]` under
-                # per BeaconStateMachine fork
-                block = await self.db.coro_get_canonical_block_by_slot(slot, BeaconBlock)
-                if block.parent_root == parent.hash:
-                    yield block
-                else:
-                    break
-                parent = block
-        except BlockNotFound:
-            return
+        # The blocks are read, and sent, as SSZ without being decoded. Only a connected chain of
+        # canonical blocks is returned, see ``get_encoded_canonical_block_range``.
+        return await self.db.coro_get_encoded_canonical_block_range(start_slot, max_blocks)
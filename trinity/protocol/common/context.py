@@ -5,6 +5,7 @@ from typing import (
 
 from eth.vm.base import BaseVM
 
+from p2p.msg_decoding import OffloadedMsgDecoder
 from p2p.peer import BasePeerContext
 
 from trinity.db.eth1.header import BaseAsyncHeaderDB
@@ -14,7 +15,9 @@ class ChainContext(BasePeerContext):
     def __init__(self,
                  headerdb: BaseAsyncHeaderDB,
                  network_id: int,
-                 vm_configuration: Tuple[Tuple[int, Type[BaseVM]], ...]) -> None:
+                 vm_configuration: Tuple[Tuple[int, Type[BaseVM]], ...],
+                 msg_decoder: OffloadedMsgDecoder = None) -> None:
         self.headerdb = headerdb
         self.network_id = network_id
         self.vm_configuration = vm_configuration
+        self.msg_decoder = msg_decoder
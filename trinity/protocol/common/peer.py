@@ -7,6 +7,7 @@ from typing import (
     NamedTuple,
     Tuple,
     Type,
+    cast,
 )
 
 from eth_typing import (
@@ -111,6 +112,22 @@ class BaseChainPeerPool(BasePeerPool):
         max_td = max(peers_by_td.keys())
         return random.choice(peers_by_td[max_td])
 
+    def record_good_peer(self, peer: BasePeer) -> None:
+        chain_peer = cast(BaseChainPeer, peer)
+        # Items per second of the request type the peer serves best
+        throughput = max(
+            (exchange.tracker.items_per_second_ema.value for exchange in chain_peer.requests),
+            default=0.0,
+        )
+        self.peer_info.record_success(
+            chain_peer.remote,
+            f'{chain_peer.sub_proto.name}/{chain_peer.sub_proto.version}',
+            throughput=throughput,
+            head_hash=chain_peer.head_hash,
+            head_number=chain_peer.head_number,
+            head_td=chain_peer.head_td,
+        )
+
     def get_peers(self, min_td: int) -> List[BaseChainPeer]:
         # TODO: Consider turning this into a method that returns an AsyncIterator, to make it
         # harder for callsites to get a list of peers while making blocking calls, as those peers
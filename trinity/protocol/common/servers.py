@@ -1,7 +1,10 @@
 from abc import abstractmethod
+import collections
 from typing import (
-    AsyncIterator,
+    DefaultDict,
+    Dict,
     Tuple,
+    Type,
     cast,
 )
 
@@ -10,11 +13,6 @@ from cancel_token import CancelToken, OperationCancelled
 from eth.exceptions import (
     HeaderNotFound,
 )
-from eth_typing import (
-    BlockNumber,
-    Hash32,
-)
-from eth.rlp.headers import BlockHeader
 from p2p import protocol
 from p2p.cancellable import CancellableMixin
 from p2p.peer import BasePeer, PeerSubscriber
@@ -27,6 +25,7 @@ from p2p.service import BaseService
 from trinity.db.eth1.header import BaseAsyncHeaderDB
 from trinity.protocol.common.peer import BasePeerPool
 from trinity.protocol.common.requests import BaseHeaderRequest
+from trinity.protocol.common.trackers import ServeTracker
 from trinity._utils.logging import HasExtendedDebugLogger
 
 
@@ -40,6 +39,9 @@ class BaseRequestServer(BaseService, PeerSubscriber):
     # now.
     msg_queue_maxsize = 2000
 
+    # Seconds between two reports of the serve stats
+    _report_interval = 60
+
     def __init__(
             self,
             peer_pool: BasePeerPool,
@@ -49,9 +51,22 @@ class BaseRequestServer(BaseService, PeerSubscriber):
 
     async def _run(self) -> None:
         self.run_daemon_task(self._handle_msg_loop())
+        self.run_daemon_task(self._periodically_report_stats())
         with self.subscribe(self._peer_pool):
             await self.cancellation()
 
+    def get_serve_stats(self) -> Dict[str, str]:
+        """
+        Return human readable stats about the requests served, by command name.
+        """
+        return {}
+
+    async def _periodically_report_stats(self) -> None:
+        while self.is_operational:
+            for cmd_name, stats in self.get_serve_stats().items():
+                self.logger.debug("Served %s: %s", cmd_name, stats)
+            await self.sleep(self._report_interval)
+
     async def _handle_msg_loop(self) -> None:
         while self.is_operational:
             peer, cmd, msg = await self.wait(self.msg_queue.get())
@@ -83,59 +98,41 @@ class BasePeerRequestHandler(CancellableMixin, HasExtendedDebugLogger):
     def __init__(self, db: BaseAsyncHeaderDB, token: CancelToken) -> None:
         self.db = db
         self.cancel_token = token
+        self.serve_trackers: DefaultDict[Type[Command], ServeTracker] = collections.defaultdict(
+            ServeTracker,
+        )
+
+    def record_served(self, cmd_type: Type[Command], elapsed: float, num_items: int) -> None:
+        """
+        Record that a request of the given command type was served with ``num_items`` items
+        in ``elapsed`` seconds.
+        """
+        self.serve_trackers[cmd_type].record_served(elapsed, num_items)
+
+    def get_serve_stats(self) -> Dict[str, str]:
+        return {
+            cmd_type.__name__: tracker.get_stats()
+            for cmd_type, tracker in self.serve_trackers.items()
+        }
 
-    async def lookup_headers(self,
-                             request: BaseHeaderRequest) -> Tuple[BlockHeader, ...]:
+    async def lookup_encoded_headers(self,
+                                     request: BaseHeaderRequest) -> Tuple[bytes, ...]:
         """
-        Lookup :max_headers: headers starting at :block_number_or_hash:, skipping :skip: items
-        between each, in reverse order if :reverse: is True.
+        Lookup the RLP encodings of :max_headers: headers starting at :block_number_or_hash:,
+        skipping :skip: items between each, in reverse order if :reverse: is True.
+
+        The headers are read with a single DB call, halting on the first header that is not
+        locally available, and are meant to be sent as they are, without being decoded.
         """
         try:
-            block_numbers = await self._get_block_numbers_for_request(request)
+            return await self.wait(self.db.coro_get_encoded_canonical_headers(
+                request.block_number_or_hash,
+                min(request.max_headers, request.max_size),
+                request.skip,
+                request.reverse,
+            ))
         except HeaderNotFound:
             self.logger.debug(
                 "Peer requested starting header %r that is unavailable, returning nothing",
                 request.block_number_or_hash)
             return tuple()
-
-        headers: Tuple[BlockHeader, ...] = tuple([
-            header
-            async for header
-            in self._generate_available_headers(block_numbers)
-        ])
-        return headers
-
-    async def _get_block_numbers_for_request(self,
-                                             request: BaseHeaderRequest,
-                                             ) -> Tuple[BlockNumber, ...]:
-        """
-        Generate the block numbers for a given `HeaderRequest`.
-        """
-        if isinstance(request.block_number_or_hash, bytes):
-            header = await self.wait(
-                self.db.coro_get_block_header_by_hash(cast(Hash32, request.block_number_or_hash)))
-            return request.generate_block_numbers(header.block_number)
-        elif isinstance(request.block_number_or_hash, int):
-            # We don't need to pass in the block number to
-            # `generate_block_numbers` since the request is based on a numbered
-            # block identifier.
-            return request.generate_block_numbers()
-        else:
-            actual_type = type(request.block_number_or_hash)
-            raise TypeError(f"Invariant: unexpected type for 'block_number_or_hash': {actual_type}")
-
-    async def _generate_available_headers(
-            self, block_numbers: Tuple[BlockNumber, ...]) -> AsyncIterator[BlockHeader]:
-        """
-        Generates the headers requested, halting on the first header that is not locally available.
-        """
-        for block_num in block_numbers:
-            try:
-                yield await self.wait(
-                    self.db.coro_get_canonical_block_header_by_number(block_num))
-            except HeaderNotFound:
-                self.logger.debug(
-                    "Peer requested header number %s that is unavailable, stopping search.",
-                    block_num,
-                )
-                break
@@ -169,3 +169,48 @@ class BasePerformanceTracker(ABC, HasExtendedDebugLogger, Generic[TRequest, TRes
                 "%s encountered response time of zero.  This should never happen",
                 type(self).__name__,
             )
+
+
+class ServeTracker:
+    """
+    Track how long the local node takes to serve the requests of a single command type, to all
+    peers, from the moment they are handled until the reply is sent.
+    """
+    def __init__(self) -> None:
+        self.total_msgs = 0
+        self.total_items = 0
+        self.total_serve_time = 0.0
+
+        # Started with the first serve time, as there is no sensible default for it
+        self.serve_time_ema: EMA = None
+        self.serve_time_99th = Percentile(percentile=0.99, window_size=200)
+
+    def record_served(self, elapsed: float, num_items: int) -> None:
+        self.total_msgs += 1
+        self.total_items += num_items
+        self.total_serve_time += elapsed
+
+        if self.serve_time_ema is None:
+            self.serve_time_ema = EMA(initial_value=elapsed, smoothing_factor=0.05)
+        else:
+            self.serve_time_ema.update(elapsed)
+        self.serve_time_99th.update(elapsed)
+
+    def get_stats(self) -> str:
+        """
+        Return a human readable string representing the stats for this tracker.
+        """
+        if not self.total_msgs:
+            return 'None'
+
+        # msgs: total number of requests served
+        # items: total number of items served
+        # serve: serve time (ema/99th)
+        # total: total serve time
+        return 'msgs=%d  items=%d  serve=%.4f/%.4f  total=%.2f' % (
+            self.total_msgs,
+            self.total_items,
+            self.serve_time_ema.value,
+            self.serve_time_99th.value,
+            self.total_serve_time,
+        )
@@ -4,3 +4,11 @@ MAX_STATE_FETCH = 384
 MAX_BODIES_FETCH = 128
 MAX_RECEIPTS_FETCH = 256
 MAX_HEADERS_FETCH = 192
+
+# Trie nodes served per second to each peer, and the most we serve to a peer in a burst. Peers
+# asking for more have their GetNodeData requests delayed.
+NODE_DATA_SERVE_RATE = 4 * MAX_STATE_FETCH
+NODE_DATA_SERVE_BURST = 4 * MAX_STATE_FETCH
+
+# Number of frequently requested trie nodes kept in memory, to be served without reading the DB
+HOT_NODE_CACHE_SIZE = 16384
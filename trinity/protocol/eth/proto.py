@@ -14,6 +14,7 @@ from eth.rlp.headers import BlockHeader
 from eth.rlp.receipts import Receipt
 from eth.rlp.transactions import BaseTransactionFields
 
+from p2p._utils import encode_rlp_list
 from p2p.protocol import (
     Protocol,
 )
@@ -109,6 +110,11 @@ class ETHProtocol(HasExtendedDebugLogger, Protocol):
         header, body = cmd.encode(headers)
         self.send(header, body)
 
+    def send_encoded_block_headers(self, encoded_headers: Tuple[bytes, ...]) -> None:
+        cmd = BlockHeaders(self.cmd_id_offset, self.snappy_support)
+        header, body = cmd.encode_rlp_payload(encode_rlp_list(encoded_headers))
+        self.send(header, body)
+
     #
     # Block Bodies
     #
@@ -122,6 +128,11 @@ class ETHProtocol(HasExtendedDebugLogger, Protocol):
         header, body = cmd.encode(blocks)
         self.send(header, body)
 
+    def send_encoded_block_bodies(self, encoded_bodies: Tuple[bytes, ...]) -> None:
+        cmd = BlockBodies(self.cmd_id_offset, self.snappy_support)
+        header, body = cmd.encode_rlp_payload(encode_rlp_list(encoded_bodies))
+        self.send(header, body)
+
     #
     # Receipts
     #
@@ -135,6 +146,14 @@ class ETHProtocol(HasExtendedDebugLogger, Protocol):
         header, body = cmd.encode(receipts)
         self.send(header, body)
 
+    def send_encoded_receipts(self, encoded_receipts: Tuple[bytes, ...]) -> None:
+        """
+        Send the given lists of receipts, each of them already RLP encoded as a whole.
+        """
+        cmd = Receipts(self.cmd_id_offset, self.snappy_support)
+        header, body = cmd.encode_rlp_payload(encode_rlp_list(encoded_receipts))
+        self.send(header, body)
+
     #
     # Transactions
     #
@@ -2,6 +2,8 @@ from typing import (
     Any,
     Dict,
     FrozenSet,
+    Iterable,
+    Mapping,
     Sequence,
     Type,
     Union,
@@ -9,10 +11,9 @@ from typing import (
 )
 
 from cancel_token import CancelToken
+from cytoolz import unique
+from lru import LRU
 
-from eth.exceptions import (
-    HeaderNotFound,
-)
 from eth_typing import (
     BlockIdentifier,
     Hash32,
@@ -27,28 +28,74 @@ from p2p.peer import BasePeer
 from p2p.protocol import (
     Command,
 )
+from p2p.token_bucket import TokenBucket
 
 from trinity.db.eth1.chain import BaseAsyncChainDB
 from trinity.protocol.common.servers import BaseRequestServer, BasePeerRequestHandler
 from trinity.protocol.eth import commands
 from trinity.protocol.eth.peer import ETHPeer, ETHPeerPool
 
-from eth.rlp.receipts import Receipt
-from eth.rlp.transactions import BaseTransactionFields
-
 from trinity.protocol.eth.constants import (
+    HOT_NODE_CACHE_SIZE,
     MAX_BODIES_FETCH,
     MAX_RECEIPTS_FETCH,
     MAX_STATE_FETCH,
+    NODE_DATA_SERVE_BURST,
+    NODE_DATA_SERVE_RATE,
 )
 from trinity.protocol.eth.requests import HeaderRequest as ETHHeaderRequest
-from trinity.rlp.block_body import BlockBody
+from trinity._utils.timer import Timer
+
+
+class HotNodeCache:
+    """
+    Bounded cache of the trie nodes served to peers.
+
+    Syncing peers all ask for the nodes at the top of the same state tries, while each of the
+    nodes further down is usually asked for once. So a node is only admitted into the cache
+    once it has been requested ``min_requests`` times recently, and the rarely requested nodes
+    do not evict the hot ones.
+    """
+    def __init__(self, size: int, min_requests: int = 2) -> None:
+        self.min_requests = min_requests
+        self._nodes: LRU[Hash32, bytes] = LRU(size)
+        # The number of recent requests for each node hash, cached or not
+        self._request_counts: LRU[Hash32, int] = LRU(4 * size)
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, node_hashes: Iterable[Hash32]) -> Dict[Hash32, bytes]:
+        """
+        Return the cached nodes amongst the given ones, and count a request for each of them.
+        """
+        found = {}
+        for node_hash in node_hashes:
+            self._request_counts[node_hash] = self._request_counts.get(node_hash, 0) + 1
+            if node_hash in self._nodes:
+                found[node_hash] = self._nodes[node_hash]
+                self.hits += 1
+            else:
+                self.misses += 1
+        return found
+
+    def add_many(self, nodes: Mapping[Hash32, bytes]) -> None:
+        """
+        Cache the given nodes which were requested often enough.
+        """
+        for node_hash, node in nodes.items():
+            if self._request_counts.get(node_hash, 0) >= self.min_requests:
+                self._nodes[node_hash] = node
+
+    def get_stats(self) -> str:
+        return 'size=%d  hits=%d  misses=%d' % (len(self._nodes), self.hits, self.misses)
 
 
 class ETHPeerRequestHandler(BasePeerRequestHandler):
     def __init__(self, db: BaseAsyncChainDB, token: CancelToken) -> None:
         super().__init__(db, token)
         self.db: BaseAsyncChainDB = db
+        self._hot_nodes = HotNodeCache(HOT_NODE_CACHE_SIZE)
+        self._node_data_buckets: Dict[BasePeer, TokenBucket] = {}
 
     async def handle_get_block_headers(
             self,
@@ -56,6 +103,7 @@ class ETHPeerRequestHandler(BasePeerRequestHandler):
             msg: Dict[str, Any]) -> None:
         if not peer.is_operational:
             return
+        timer = Timer()
         query = cast(Dict[Any, Union[bool, int]], msg)
         self.logger.debug("%s requested headers: %s", peer, query)
         request = ETHHeaderRequest(
@@ -65,67 +113,100 @@ class ETHPeerRequestHandler(BasePeerRequestHandler):
             cast(bool, query['reverse']),
         )
 
-        headers = await self.lookup_headers(request)
-        self.logger.debug2("Replying to %s with %d headers", peer, len(headers))
-        peer.sub_proto.send_block_headers(headers)
+        encoded_headers = await self.lookup_encoded_headers(request)
+        self.logger.debug2("Replying to %s with %d headers", peer, len(encoded_headers))
+        peer.sub_proto.send_encoded_block_headers(encoded_headers)
+        self.record_served(commands.GetBlockHeaders, timer.elapsed, len(encoded_headers))
 
     async def handle_get_block_bodies(self, peer: ETHPeer, block_hashes: Sequence[Hash32]) -> None:
         if not peer.is_operational:
             return
+        timer = Timer()
         self.logger.debug2("%s requested bodies for %d blocks", peer, len(block_hashes))
-        bodies = []
         # Only serve up to MAX_BODIES_FETCH items in every request.
-        for block_hash in block_hashes[:MAX_BODIES_FETCH]:
-            try:
-                header = await self.wait(self.db.coro_get_block_header_by_hash(block_hash))
-            except HeaderNotFound:
+        requested_hashes = tuple(block_hashes[:MAX_BODIES_FETCH])
+        found_bodies = await self.wait(self.db.coro_get_encoded_block_bodies(requested_hashes))
+        encoded_bodies = []
+        for block_hash in requested_hashes:
+            if block_hash not in found_bodies:
                 self.logger.debug(
                     "%s asked for a block we don't have: %s", peer, to_hex(block_hash)
                 )
                 continue
-            transactions = await self.wait(
-                self.db.coro_get_block_transactions(header, BaseTransactionFields))
-            uncles = await self.wait(self.db.coro_get_block_uncles(header.uncles_hash))
-            bodies.append(BlockBody(transactions, uncles))
-        self.logger.debug2("Replying to %s with %d block bodies", peer, len(bodies))
-        peer.sub_proto.send_block_bodies(bodies)
+            encoded_bodies.append(found_bodies[block_hash])
+        self.logger.debug2("Replying to %s with %d block bodies", peer, len(encoded_bodies))
+        peer.sub_proto.send_encoded_block_bodies(tuple(encoded_bodies))
+        self.record_served(commands.GetBlockBodies, timer.elapsed, len(encoded_bodies))
 
     async def handle_get_receipts(self, peer: ETHPeer, block_hashes: Sequence[Hash32]) -> None:
         if not peer.is_operational:
             return
+        timer = Timer()
         self.logger.debug2("%s requested receipts for %d blocks", peer, len(block_hashes))
-        receipts = []
         # Only serve up to MAX_RECEIPTS_FETCH items in every request.
-        for block_hash in block_hashes[:MAX_RECEIPTS_FETCH]:
-            try:
-                header = await self.wait(self.db.coro_get_block_header_by_hash(block_hash))
-            except HeaderNotFound:
+        requested_hashes = tuple(block_hashes[:MAX_RECEIPTS_FETCH])
+        found_receipts = await self.wait(self.db.coro_get_encoded_receipts(requested_hashes))
+        encoded_receipts = []
+        for block_hash in requested_hashes:
+            if block_hash not in found_receipts:
                 self.logger.debug(
                     "%s asked receipts for a block we don't have: %s", peer, to_hex(block_hash)
                 )
                 continue
-            block_receipts = await self.wait(self.db.coro_get_receipts(header, Receipt))
-            receipts.append(block_receipts)
-        self.logger.debug2("Replying to %s with receipts for %d blocks", peer, len(receipts))
-        peer.sub_proto.send_receipts(receipts)
+            encoded_receipts.append(found_receipts[block_hash])
+        self.logger.debug2(
+            "Replying to %s with receipts for %d blocks", peer, len(encoded_receipts))
+        peer.sub_proto.send_encoded_receipts(tuple(encoded_receipts))
+        self.record_served(commands.GetReceipts, timer.elapsed, len(encoded_receipts))
 
     async def handle_get_node_data(self, peer: ETHPeer, node_hashes: Sequence[Hash32]) -> None:
         if not peer.is_operational:
             return
         self.logger.debug2("%s requested %d trie nodes", peer, len(node_hashes))
-        nodes = []
         # Only serve up to MAX_STATE_FETCH items in every request.
-        for node_hash in node_hashes[:MAX_STATE_FETCH]:
-            try:
-                node = await self.wait(self.db.coro_get(node_hash))
-            except KeyError:
+        requested_hashes = tuple(unique(node_hashes[:MAX_STATE_FETCH]))
+        await self.wait(self._get_node_data_bucket(peer).take(len(requested_hashes)))
+
+        timer = Timer()
+        found_nodes = self._hot_nodes.get_many(requested_hashes)
+        missing_hashes = tuple(
+            node_hash for node_hash in requested_hashes if node_hash not in found_nodes
+        )
+        if missing_hashes:
+            db_nodes = cast(
+                Dict[Hash32, bytes],
+                await self.wait(self.db.coro_get_many(missing_hashes)),
+            )
+            self._hot_nodes.add_many(db_nodes)
+            found_nodes.update(db_nodes)
+
+        nodes = []
+        for node_hash in requested_hashes:
+            if node_hash not in found_nodes:
                 self.logger.debug(
                     "%s asked for a trie node we don't have: %s", peer, to_hex(node_hash)
                 )
                 continue
-            nodes.append(node)
+            nodes.append(found_nodes[node_hash])
         self.logger.debug2("Replying to %s with %d trie nodes", peer, len(nodes))
         peer.sub_proto.send_node_data(tuple(nodes))
+        self.record_served(commands.GetNodeData, timer.elapsed, len(nodes))
+
+    def _get_node_data_bucket(self, peer: ETHPeer) -> TokenBucket:
+        if peer not in self._node_data_buckets:
+            self._node_data_buckets[peer] = TokenBucket(
+                NODE_DATA_SERVE_RATE,
+                NODE_DATA_SERVE_BURST,
+            )
+        return self._node_data_buckets[peer]
+
+    def forget_peer(self, peer: BasePeer) -> None:
+        self._node_data_buckets.pop(peer, None)
+
+    def get_serve_stats(self) -> Dict[str, str]:
+        stats = super().get_serve_stats()
+        stats['HotNodeCache'] = self._hot_nodes.get_stats()
+        return stats
 
 
 class ETHRequestServer(BaseRequestServer):
@@ -152,6 +233,12 @@ class ETHRequestServer(BaseRequestServer):
         super().__init__(peer_pool, token)
         self._handler = ETHPeerRequestHandler(db, self.cancel_token)
 
+    def get_serve_stats(self) -> Dict[str, str]:
+        return self._handler.get_serve_stats()
+
+    def deregister_peer(self, peer: BasePeer) -> None:
+        self._handler.forget_peer(peer)
+
     async def _handle_msg(self, base_peer: BasePeer, cmd: Command,
                           msg: protocol._DecodedMsgType) -> None:
         peer = cast(ETHPeer, base_peer)
@@ -11,6 +11,10 @@ from typing import (
 from eth_utils import (
     to_dict,
 )
+from eth_utils.toolz import (
+    concat,
+    unique,
+)
 
 import rlp
 from rlp import sedes
@@ -199,10 +203,8 @@ class Proofs(Command):
         # This is just to make Proofs messages compatible with ProofsV2, so that LightPeerChain
         # doesn't have to special-case them. Soon we should be able to drop support for LES/1
         # anyway, and then all this code will go away.
-        if not decoded['proofs']:
-            decoded['proof'] = []
-        else:
-            decoded['proof'] = decoded['proofs'][0]
+        # The proofs of all the requests are merged into a single set of nodes, like in ProofsV2.
+        decoded['proof'] = list(unique(concat(decoded['proofs'])))
         return decoded
 
 
@@ -10,3 +10,19 @@ MAX_HEADER_PROOFS_FETCH = 64
 # Types of LES Announce messages
 LES_ANNOUNCE_SIMPLE = 1
 LES_ANNOUNCE_SIGNED = 2
+
+# The flow control parameters we give to each peer we serve: the size of the buffer which pays for
+# their requests (BL), and the minimum rate at which it recharges, per millisecond (MRR)
+FLOW_CONTROL_BUFFER_LIMIT = 300000000
+FLOW_CONTROL_MIN_RECHARGE = 50000
+
+# The (base cost, cost per requested item) that a request takes from the flow control buffer, by
+# LES message code. These are the default costs of geth.
+MAX_REQUEST_COSTS = {
+    2: (150000, 30000),  # GetBlockHeaders
+    4: (0, 700000),  # GetBlockBodies
+    6: (0, 1000000),  # GetReceipts
+    8: (0, 600000),  # GetProofs
+    10: (0, 450000),  # GetContractCodes
+    15: (0, 600000),  # GetProofsV2
+}
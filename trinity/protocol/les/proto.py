@@ -1,7 +1,12 @@
 from typing import (
+    Any,
+    Dict,
+    Iterable,
     List,
+    Sequence,
     Tuple,
     TYPE_CHECKING,
+    Type,
     Union,
 )
 
@@ -10,9 +15,14 @@ from eth_typing import (
     Hash32,
 )
 
+import rlp
+from rlp import sedes
+
 from eth.rlp.headers import BlockHeader
 
+from p2p._utils import encode_rlp_list
 from p2p.protocol import (
+    Command,
     Protocol,
 )
 
@@ -45,11 +55,22 @@ if TYPE_CHECKING:
     from .peer import LESPeer  # noqa: F401
 
 
+def _get_flow_control_params() -> Dict[str, Any]:
+    return {
+        'flowControl/BL': constants.FLOW_CONTROL_BUFFER_LIMIT,
+        'flowControl/MRC': [
+            (cmd_id, base_cost, request_cost)
+            for cmd_id, (base_cost, request_cost) in sorted(constants.MAX_REQUEST_COSTS.items())
+        ],
+        'flowControl/MRR': constants.FLOW_CONTROL_MIN_RECHARGE,
+    }
+
+
 class LESProtocol(Protocol):
     name = 'les'
     version = 1
-    _commands = [Status, Announce, BlockHeaders, GetBlockHeaders, BlockBodies, Receipts, Proofs,
-                 ContractCodes]
+    _commands = [Status, Announce, BlockHeaders, GetBlockHeaders, GetBlockBodies, BlockBodies,
+                 GetReceipts, Receipts, GetProofs, Proofs, GetContractCodes, ContractCodes]
     cmd_length = 15
     peer: 'LESPeer'
 
@@ -63,8 +84,10 @@ class LESProtocol(Protocol):
             'genesisHash': chain_info.genesis_hash,
             'serveHeaders': None,
             'serveChainSince': 0,
+            'serveStateSince': 0,
             # TODO: Uncomment once we start relaying transactions.
             # 'txRelay': None,
+            **_get_flow_control_params(),
         }
         cmd = Status(self.cmd_id_offset, self.snappy_support)
         self.send(*cmd.encode(resp))
@@ -130,12 +153,104 @@ class LESProtocol(Protocol):
 
         return request_id
 
-    def send_get_receipts(self, block_hash: bytes, request_id: int=None) -> int:
+    def send_encoded_block_headers(self,
+                                   encoded_headers: Tuple[bytes, ...],
+                                   buffer_value: int,
+                                   request_id: int=None) -> int:
+        return self._send_encoded_reply(
+            BlockHeaders,
+            encode_rlp_list(encoded_headers),
+            buffer_value,
+            request_id,
+        )
+
+    def send_encoded_block_bodies(self,
+                                  encoded_bodies: Tuple[bytes, ...],
+                                  buffer_value: int,
+                                  request_id: int=None) -> int:
+        return self._send_encoded_reply(
+            BlockBodies,
+            encode_rlp_list(encoded_bodies),
+            buffer_value,
+            request_id,
+        )
+
+    def send_encoded_receipts(self,
+                              encoded_receipts: Tuple[bytes, ...],
+                              buffer_value: int,
+                              request_id: int=None) -> int:
+        """
+        Send the given lists of receipts, each of them already RLP encoded as a whole.
+        """
+        return self._send_encoded_reply(
+            Receipts,
+            encode_rlp_list(encoded_receipts),
+            buffer_value,
+            request_id,
+        )
+
+    def send_encoded_proofs(self,
+                            encoded_proofs: Sequence[Tuple[bytes, ...]],
+                            buffer_value: int,
+                            request_id: int=None) -> int:
+        """
+        Send the proof of each request, as a list of its RLP encoded trie nodes.
+        """
+        return self._send_encoded_reply(
+            Proofs,
+            encode_rlp_list(encode_rlp_list(proof) for proof in encoded_proofs),
+            buffer_value,
+            request_id,
+        )
+
+    def send_contract_codes(self,
+                            codes: Sequence[bytes],
+                            buffer_value: int,
+                            request_id: int=None) -> int:
         if request_id is None:
             request_id = gen_request_id()
         data = {
             'request_id': request_id,
-            'block_hashes': [block_hash],
+            'buffer_value': buffer_value,
+            'codes': codes,
+        }
+        header, body = ContractCodes(self.cmd_id_offset, self.snappy_support).encode(data)
+        self.send(header, body)
+
+        return request_id
+
+    def _send_encoded_reply(self,
+                            cmd_class: Type[Command],
+                            encoded_items: bytes,
+                            buffer_value: int,
+                            request_id: int=None) -> int:
+        if request_id is None:
+            request_id = gen_request_id()
+        # The RLP of the payload is built by hand, in the order of the (request_id, buffer_value,
+        # items) structure of all the replies, so that the items do not have to be decoded and
+        # encoded again
+        encoded_payload = encode_rlp_list((
+            rlp.encode(request_id, sedes=sedes.big_endian_int),
+            rlp.encode(buffer_value, sedes=sedes.big_endian_int),
+            encoded_items,
+        ))
+        cmd = cmd_class(self.cmd_id_offset, self.snappy_support)
+        header, body = cmd.encode_rlp_payload(encoded_payload)
+        self.send(header, body)
+
+        return request_id
+
+    def send_get_receipts(self, block_hashes: Sequence[bytes], request_id: int=None) -> int:
+        if request_id is None:
+            request_id = gen_request_id()
+        if len(block_hashes) > constants.MAX_RECEIPTS_FETCH:
+            raise ValueError(
+                f"Cannot ask for more than {constants.MAX_RECEIPTS_FETCH} receipts in a single "
+                "request"
+            )
+        data = {
+            'request_id': request_id,
+            'block_hashes': block_hashes,
         }
         header, body = GetReceipts(self.cmd_id_offset, self.snappy_support).encode(data)
         self.send(header, body)
@@ -144,23 +259,50 @@ class LESProtocol(Protocol):
 
     def send_get_proof(self, block_hash: bytes, account_key: bytes, key: bytes, from_level: int,
                        request_id: int=None) -> int:
+        return self.send_get_proofs(
+            [ProofRequest(block_hash, account_key, key, from_level)],
+            request_id,
+        )
+
+    def send_get_proofs(self,
+                        proof_requests: Sequence[ProofRequest],
+                        request_id: int=None) -> int:
+        return self._send_get_proofs(GetProofs, proof_requests, request_id)
+
+    def _send_get_proofs(self,
+                         cmd_class: Type[GetProofs],
+                         proof_requests: Sequence[ProofRequest],
+                         request_id: int=None) -> int:
         if request_id is None:
             request_id = gen_request_id()
+        if len(proof_requests) > constants.MAX_PROOFS_FETCH:
+            raise ValueError(
+                f"Cannot ask for more than {constants.MAX_PROOFS_FETCH} proofs in a single request"
+            )
         data = {
             'request_id': request_id,
-            'proof_requests': [ProofRequest(block_hash, account_key, key, from_level)],
+            'proof_requests': proof_requests,
         }
-        header, body = GetProofs(self.cmd_id_offset, self.snappy_support).encode(data)
+        header, body = cmd_class(self.cmd_id_offset, self.snappy_support).encode(data)
         self.send(header, body)
 
         return request_id
 
     def send_get_contract_code(self, block_hash: bytes, key: bytes, request_id: int=None) -> int:
+        return self.send_get_contract_codes([ContractCodeRequest(block_hash, key)], request_id)
+
+    def send_get_contract_codes(self,
+                                code_requests: Sequence[ContractCodeRequest],
+                                request_id: int=None) -> int:
         if request_id is None:
             request_id = gen_request_id()
+        if len(code_requests) > constants.MAX_CODE_FETCH:
+            raise ValueError(
+                f"Cannot ask for more than {constants.MAX_CODE_FETCH} codes in a single request"
+            )
         data = {
             'request_id': request_id,
-            'code_requests': [ContractCodeRequest(block_hash, key)],
+            'code_requests': code_requests,
         }
         header, body = GetContractCodes(self.cmd_id_offset, self.snappy_support).encode(data)
         self.send(header, body)
@@ -170,8 +312,8 @@ class LESProtocol(Protocol):
 
 class LESProtocolV2(LESProtocol):
     version = 2
-    _commands = [StatusV2, Announce, BlockHeaders, GetBlockHeaders, BlockBodies, Receipts,
-                 ProofsV2, ContractCodes]
+    _commands = [StatusV2, Announce, BlockHeaders, GetBlockHeaders, GetBlockBodies, BlockBodies,
+                 GetReceipts, Receipts, GetContractCodes, ContractCodes, GetProofsV2, ProofsV2]
     cmd_length = 21
 
     def send_handshake(self, chain_info: ChainInfo) -> None:
@@ -185,25 +327,38 @@ class LESProtocolV2(LESProtocol):
             'genesisHash': chain_info.genesis_hash,
             'serveHeaders': None,
             'serveChainSince': 0,
+            'serveStateSince': 0,
             'txRelay': None,
+            **_get_flow_control_params(),
         }
         cmd = StatusV2(self.cmd_id_offset, self.snappy_support)
         self.logger.debug("Sending LES/Status msg: %s", resp)
         self.send(*cmd.encode(resp))
 
-    def send_get_proof(self,
-                       block_hash: bytes,
-                       account_key: bytes,
-                       key: bytes,
-                       from_level: int,
-                       request_id: int=None) -> int:
-        if request_id is None:
-            request_id = gen_request_id()
-        data = {
-            'request_id': request_id,
-            'proof_requests': [ProofRequest(block_hash, account_key, key, from_level)],
-        }
-        header, body = GetProofsV2(self.cmd_id_offset, self.snappy_support).encode(data)
-        self.send(header, body)
+    def send_get_proofs(self,
+                        proof_requests: Sequence[ProofRequest],
+                        request_id: int=None) -> int:
+        return self._send_get_proofs(GetProofsV2, proof_requests, request_id)
 
-        return request_id
+    def send_encoded_proofs(self,
+                            encoded_proofs: Sequence[Tuple[bytes, ...]],
+                            buffer_value: int,
+                            request_id: int=None) -> int:
+        """
+        Send the proofs of all the requests at once, as a single set of RLP encoded trie nodes.
+        """
+        return self._send_encoded_reply(
+            ProofsV2,
+            encode_rlp_list(_unique_nodes(encoded_proofs)),
+            buffer_value,
+            request_id,
+        )
+
+
+def _unique_nodes(encoded_proofs: Iterable[Tuple[bytes, ...]]) -> Iterable[bytes]:
+    seen = set()
+    for proof in encoded_proofs:
+        for node in proof:
+            if node not in seen:
+                seen.add(node)
+                yield node
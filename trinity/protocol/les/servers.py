@@ -8,24 +8,72 @@ from typing import (
 
 from cancel_token import CancelToken
 
+from p2p.exceptions import NotEnoughTokens
+from p2p.p2p_proto import DisconnectReason
 from p2p.peer import BasePeer
 from p2p.protocol import (
     Command,
     _DecodedMsgType,
 )
+from p2p.token_bucket import TokenBucket
 
-from trinity.db.eth1.header import BaseAsyncHeaderDB
+from trinity.db.eth1.chain import BaseAsyncChainDB
 from trinity.protocol.common.servers import BaseRequestServer, BasePeerRequestHandler
 from trinity.protocol.les import commands
+from trinity.protocol.les.constants import (
+    FLOW_CONTROL_BUFFER_LIMIT,
+    FLOW_CONTROL_MIN_RECHARGE,
+    MAX_BODIES_FETCH,
+    MAX_CODE_FETCH,
+    MAX_PROOFS_FETCH,
+    MAX_RECEIPTS_FETCH,
+    MAX_REQUEST_COSTS,
+)
 from trinity.protocol.les.peer import LESPeer, LESPeerPool
 
 from trinity.protocol.les.requests import HeaderRequest as LightHeaderRequest
+from trinity._utils.timer import Timer
 
 
 class LESPeerRequestHandler(BasePeerRequestHandler):
+    """
+    Serve the requests of light clients, charging each of them to the flow control buffer of the
+    peer which made it, as announced in our Status message.
+    """
+    db: BaseAsyncChainDB
+
+    def __init__(self, db: BaseAsyncChainDB, token: CancelToken) -> None:
+        super().__init__(db, token)
+        self._flow_control_buffers: Dict[BasePeer, TokenBucket] = {}
+
+    def charge_request(self, peer: BasePeer, cmd_type: Type[Command], num_items: int) -> int:
+        """
+        Take the cost of a request for ``num_items`` items from the flow control buffer of
+        ``peer``, and return the value left in the buffer, to send back with the reply.
+
+        :raise NotEnoughTokens: if the peer did not wait for its buffer to recharge enough
+        """
+        base_cost, item_cost = MAX_REQUEST_COSTS[cmd_type._cmd_id]
+        flow_control_buffer = self._get_flow_control_buffer(peer)
+        flow_control_buffer.take_nowait(base_cost + item_cost * num_items)
+        return int(flow_control_buffer.get_num_tokens())
+
+    def _get_flow_control_buffer(self, peer: BasePeer) -> TokenBucket:
+        if peer not in self._flow_control_buffers:
+            self._flow_control_buffers[peer] = TokenBucket(
+                # the recharge rate is announced per millisecond
+                FLOW_CONTROL_MIN_RECHARGE * 1000,
+                FLOW_CONTROL_BUFFER_LIMIT,
+            )
+        return self._flow_control_buffers[peer]
+
+    def forget_peer(self, peer: BasePeer) -> None:
+        self._flow_control_buffers.pop(peer, None)
+
     async def handle_get_block_headers(self, peer: LESPeer, msg: Dict[str, Any]) -> None:
         if not peer.is_operational:
             return
+        timer = Timer()
         self.logger.debug("Peer %s made header request: %s", peer, msg)
         request = LightHeaderRequest(
             msg['query'].block_number_or_hash,
@@ -34,9 +82,112 @@ class LESPeerRequestHandler(BasePeerRequestHandler):
             msg['query'].reverse,
             msg['request_id'],
         )
-        headers = await self.lookup_headers(request)
-        self.logger.debug2("Replying to %s with %d headers", peer, len(headers))
-        peer.sub_proto.send_block_headers(headers, buffer_value=0, request_id=request.request_id)
+        buffer_value = self.charge_request(
+            peer,
+            commands.GetBlockHeaders,
+            min(request.max_headers, request.max_size),
+        )
+        encoded_headers = await self.lookup_encoded_headers(request)
+        self.logger.debug2("Replying to %s with %d headers", peer, len(encoded_headers))
+        peer.sub_proto.send_encoded_block_headers(
+            encoded_headers,
+            buffer_value=buffer_value,
+            request_id=request.request_id,
+        )
+        self.record_served(commands.GetBlockHeaders, timer.elapsed, len(encoded_headers))
+
+    async def handle_get_block_bodies(self, peer: LESPeer, msg: Dict[str, Any]) -> None:
+        if not peer.is_operational:
+            return
+        timer = Timer()
+        block_hashes = msg['block_hashes'][:MAX_BODIES_FETCH]
+        buffer_value = self.charge_request(peer, commands.GetBlockBodies, len(block_hashes))
+
+        found_bodies = await self.wait(self.db.coro_get_encoded_block_bodies(block_hashes))
+        encoded_bodies = tuple(
+            found_bodies[block_hash] for block_hash in block_hashes if block_hash in found_bodies
+        )
+        self.logger.debug2("Replying to %s with %d block bodies", peer, len(encoded_bodies))
+        peer.sub_proto.send_encoded_block_bodies(
+            encoded_bodies,
+            buffer_value=buffer_value,
+            request_id=msg['request_id'],
+        )
+        self.record_served(commands.GetBlockBodies, timer.elapsed, len(encoded_bodies))
+
+    async def handle_get_receipts(self, peer: LESPeer, msg: Dict[str, Any]) -> None:
+        if not peer.is_operational:
+            return
+        timer = Timer()
+        block_hashes = msg['block_hashes'][:MAX_RECEIPTS_FETCH]
+        buffer_value = self.charge_request(peer, commands.GetReceipts, len(block_hashes))
+
+        found_receipts = await self.wait(self.db.coro_get_encoded_receipts(block_hashes))
+        encoded_receipts = tuple(
+            found_receipts[block_hash]
+            for block_hash in block_hashes
+            if block_hash in found_receipts
+        )
+        self.logger.debug2(
+            "Replying to %s with receipts for %d blocks",
+            peer,
+            len(encoded_receipts),
+        )
+        peer.sub_proto.send_encoded_receipts(
+            encoded_receipts,
+            buffer_value=buffer_value,
+            request_id=msg['request_id'],
+        )
+        self.record_served(commands.GetReceipts, timer.elapsed, len(encoded_receipts))
+
+    async def handle_get_proofs(self,
+                                peer: LESPeer,
+                                cmd_type: Type[commands.GetProofs],
+                                msg: Dict[str, Any]) -> None:
+        """
+        Serve both GetProofs and GetProofsV2: the protocol version of the peer decides whether
+        the proofs are sent one by one, or merged into a single set of trie nodes.
+        """
+        if not peer.is_operational:
+            return
+        timer = Timer()
+        proof_requests = msg['proof_requests'][:MAX_PROOFS_FETCH]
+        buffer_value = self.charge_request(peer, cmd_type, len(proof_requests))
+
+        encoded_proofs = await self.wait(self.db.coro_get_encoded_proofs(tuple(
+            (proof_request.block_hash, proof_request.account_key, proof_request.key)
+            for proof_request in proof_requests
+        )))
+        # The requester already has the nodes above from_level
+        encoded_proofs = tuple(
+            proof[proof_request.from_level:]
+            for proof_request, proof in zip(proof_requests, encoded_proofs)
+        )
+        self.logger.debug2("Replying to %s with %d proofs", peer, len(encoded_proofs))
+        peer.sub_proto.send_encoded_proofs(
+            encoded_proofs,
+            buffer_value=buffer_value,
+            request_id=msg['request_id'],
+        )
+        self.record_served(cmd_type, timer.elapsed, len(encoded_proofs))
+
+    async def handle_get_contract_codes(self, peer: LESPeer, msg: Dict[str, Any]) -> None:
+        if not peer.is_operational:
+            return
+        timer = Timer()
+        code_requests = msg['code_requests'][:MAX_CODE_FETCH]
+        buffer_value = self.charge_request(peer, commands.GetContractCodes, len(code_requests))
+
+        codes = await self.wait(self.db.coro_get_contract_codes(tuple(
+            (code_request.block_hash, code_request.key) for code_request in code_requests
+        )))
+        self.logger.debug2("Replying to %s with %d contract codes", peer, len(codes))
+        peer.sub_proto.send_contract_codes(
+            codes,
+            buffer_value=buffer_value,
+            request_id=msg['request_id'],
+        )
+        self.record_served(commands.GetContractCodes, timer.elapsed, len(codes))
 
 
 class LightRequestServer(BaseRequestServer):
@@ -46,21 +197,48 @@ class LightRequestServer(BaseRequestServer):
     """
     subscription_msg_types: FrozenSet[Type[Command]] = frozenset({
         commands.GetBlockHeaders,
+        commands.GetBlockBodies,
+        commands.GetReceipts,
+        commands.GetProofs,
+        commands.GetProofsV2,
+        commands.GetContractCodes,
     })
 
     def __init__(
             self,
-            db: BaseAsyncHeaderDB,
+            db: BaseAsyncChainDB,
             peer_pool: LESPeerPool,
             token: CancelToken = None) -> None:
         super().__init__(peer_pool, token)
         self._handler = LESPeerRequestHandler(db, self.cancel_token)
 
+    def get_serve_stats(self) -> Dict[str, str]:
+        return self._handler.get_serve_stats()
+
+    def deregister_peer(self, peer: BasePeer) -> None:
+        self._handler.forget_peer(peer)
+
     async def _handle_msg(self, base_peer: BasePeer, cmd: Command,
                           msg: _DecodedMsgType) -> None:
         peer = cast(LESPeer, base_peer)
-        if isinstance(cmd, commands.GetBlockHeaders):
-            block_request_kwargs = cast(Dict[str, Any], msg)
-            await self._handler.handle_get_block_headers(peer, block_request_kwargs)
-        else:
-            self.logger.debug("%s msg from %s not implemented", cmd, peer)
+        request_kwargs = cast(Dict[str, Any], msg)
+        try:
+            if isinstance(cmd, commands.GetBlockHeaders):
+                await self._handler.handle_get_block_headers(peer, request_kwargs)
+            elif isinstance(cmd, commands.GetBlockBodies):
+                await self._handler.handle_get_block_bodies(peer, request_kwargs)
+            elif isinstance(cmd, commands.GetReceipts):
+                await self._handler.handle_get_receipts(peer, request_kwargs)
+            elif isinstance(cmd, commands.GetProofs):
+                await self._handler.handle_get_proofs(peer, type(cmd), request_kwargs)
+            elif isinstance(cmd, commands.GetContractCodes):
+                await self._handler.handle_get_contract_codes(peer, request_kwargs)
+            else:
+                self.logger.debug("%s msg from %s not implemented", cmd, peer)
+        except NotEnoughTokens:
+            self.logger.debug(
+                "%s sent %s before its flow control buffer recharged, disconnecting",
+                peer,
+                cmd,
+            )
+            await peer.disconnect(DisconnectReason.subprotocol_error)
@@ -36,6 +36,7 @@ from p2p.kademlia import (
     Address,
     Node,
 )
+from p2p.msg_decoding import OffloadedMsgDecoder
 from p2p.nat import UPnPService
 from p2p.p2p_proto import (
     DisconnectReason,
@@ -86,6 +87,7 @@ class BaseServer(BaseService, Generic[TPeerPool]):
                  bootstrap_nodes: Tuple[Node, ...] = None,
                  preferred_nodes: Sequence[Node] = None,
                  event_bus: TrinityEventBusEndpoint = None,
+                 offload_msg_decoding: bool = False,
                  token: CancelToken = None,
                  ) -> None:
         super().__init__(token)
@@ -104,6 +106,7 @@ class BaseServer(BaseService, Generic[TPeerPool]):
         self.network_id = network_id
         self.peer_info = peer_info
         self.max_peers = max_peers
+        self.offload_msg_decoding = offload_msg_decoding
         self.bootstrap_nodes = bootstrap_nodes
         self.preferred_nodes = preferred_nodes
         if self.preferred_nodes is None and network_id in DEFAULT_PREFERRED_NODES:
@@ -121,6 +124,12 @@ class BaseServer(BaseService, Generic[TPeerPool]):
     def _make_peer_pool(self) -> TPeerPool:
         pass
 
+    def _make_msg_decoder(self) -> OffloadedMsgDecoder:
+        if self.offload_msg_decoding:
+            return OffloadedMsgDecoder()
+        else:
+            return None
+
     @abstractmethod
     def _make_request_server(self) -> BaseRequestServer:
         pass
@@ -281,6 +290,7 @@ class FullServer(BaseServer[ETHPeerPool]):
             headerdb=self.headerdb,
             network_id=self.network_id,
             vm_configuration=self.chain.vm_configuration,
+            msg_decoder=self._make_msg_decoder(),
         )
         return ETHPeerPool(
             privkey=self.privkey,
@@ -305,6 +315,7 @@ class LightServer(BaseServer[LESPeerPool]):
             headerdb=self.headerdb,
             network_id=self.network_id,
             vm_configuration=self.chain.vm_configuration,
+            msg_decoder=self._make_msg_decoder(),
         )
         return LESPeerPool(
             privkey=self.privkey,
@@ -316,7 +327,7 @@ class LightServer(BaseServer[LESPeerPool]):
 
     def _make_request_server(self) -> LightRequestServer:
         return LightRequestServer(
-            self.headerdb,
+            self.chaindb,
             self.peer_pool,
             token=self.cancel_token,
         )
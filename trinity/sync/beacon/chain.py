@@ -1,8 +1,13 @@
 import asyncio
+import heapq
 import itertools
 import operator
 from typing import (
+    Any,
     cast,
+    Dict,
+    List,
+    Set,
     Tuple,
     Iterable,
     AsyncGenerator,
@@ -17,8 +22,12 @@ from eth_utils.toolz import (
 
 from cancel_token import (
     CancelToken,
+    OperationCancelled,
 )
 
+from p2p.exceptions import (
+    BaseP2PError,
+)
 from p2p.service import (
     BaseService,
 )
@@ -40,22 +49,44 @@ from trinity.sync.beacon.constants import (
     MAX_BLOCKS_PER_REQUEST,
     PEER_SELECTION_RETRY_INTERVAL,
     PEER_SELECTION_MAX_RETRIES,
+    SYNC_WINDOW_SEGMENTS,
 )
 
+# A range of slots to download, as its first slot and its number of slots
+Segment = Tuple[Slot, int]
+# The blocks which became canonical, and the ones which stopped being canonical
+PersistResult = Tuple[Tuple[BaseBeaconBlock, ...], Tuple[BaseBeaconBlock, ...]]
+# The blocks of a segment, and the peer they were downloaded from
+DownloadedSegment = Tuple[BCCPeer, Tuple[BaseBeaconBlock, ...]]
+
 
 class BeaconChainSyncer(BaseService):
-    """Sync from our finalized head until their preliminary head."""
+    """
+    Sync from our finalized head until their preliminary head.
+
+    With a single suitable peer, blocks are requested from it one batch at a time. With several,
+    the slots to sync are split into segments of ``segment_size`` slots, which are downloaded from
+    all the peers at once, the fastest peers getting the lowest segments. Downloaded segments are
+    persisted in order while the following ones download, and at most ``window_size`` segments are
+    downloaded ahead of the last persisted block. If the peers turn out to be on different branches,
+    the sync goes on from the peer with the highest head slot alone.
+    """
 
     def __init__(self,
                  chain_db: BaseAsyncBeaconChainDB,
                  peer_pool: BCCPeerPool,
-                 token: CancelToken = None) -> None:
+                 token: CancelToken = None,
+                 segment_size: int = MAX_BLOCKS_PER_REQUEST,
+                 window_size: int = SYNC_WINDOW_SEGMENTS) -> None:
         super().__init__(token)
 
         self.chain_db = chain_db
         self.peer_pool = peer_pool
+        self.segment_size = segment_size
+        self.window_size = window_size
 
         self.sync_peer: BCCPeer = None
+        self.sync_peers: Tuple[BCCPeer, ...] = ()
 
     @property
     def is_sync_peer_selected(self) -> bool:
@@ -68,7 +99,7 @@ class BeaconChainSyncer(BaseService):
                 raise Exception("Invariant: Cannot exceed max retries")
 
             try:
-                self.sync_peer = await self.wait(self.select_sync_peer())
+                self.sync_peers = await self.wait(self.select_sync_peers())
             except ValidationError as exception:
                 self.logger.info(f"No suitable peers to sync with: {exception}")
                 if is_last_retry:
@@ -80,6 +111,7 @@ class BeaconChainSyncer(BaseService):
                     continue
             else:
                 # sync peer selected successfully
+                self.sync_peer = first(self.sync_peers)
                 break
 
             raise Exception("Unreachable")
@@ -94,21 +126,32 @@ class BeaconChainSyncer(BaseService):
         self.logger.info(f"Sync with {self.sync_peer} finished, new head: {new_head}")
 
     async def select_sync_peer(self) -> BCCPeer:
+        return first(await self.select_sync_peers())
+
+    async def select_sync_peers(self) -> Tuple[BCCPeer, ...]:
+        """
+        Return all the peers which are ahead of our finalized head, the highest head slot first.
+        """
         if len(self.peer_pool) == 0:
             raise ValidationError("Not connected to anyone")
 
-        # choose the peer with the highest head slot
         peers = cast(Iterable[BCCPeer], self.peer_pool.connected_nodes.values())
         sorted_peers = sorted(peers, key=operator.attrgetter("head_slot"), reverse=True)
-        best_peer = first(sorted_peers)
 
         finalized_head = await self.chain_db.coro_get_finalized_head(BeaconBlock)
-        if best_peer.head_slot <= finalized_head.slot:
+        sync_peers = tuple(peer for peer in sorted_peers if peer.head_slot > finalized_head.slot)
+        if len(sync_peers) == 0:
             raise ValidationError("No peer that is ahead of us")
 
-        return best_peer
+        return sync_peers
 
     async def sync(self) -> None:
+        if len(self.sync_peers) > 1:
+            await self.sync_from_multiple_peers()
+        else:
+            await self.sync_from_single_peer()
+
+    async def sync_from_single_peer(self) -> None:
         finalized_head = await self.chain_db.coro_get_finalized_head(BeaconBlock)
         self.logger.info(
             "Syncing with %s (their head slot: %d, our finalized slot: %d)",
@@ -139,6 +182,209 @@ class BeaconChainSyncer(BaseService):
                 self.logger.info(f"Received invalid batch from {self.sync_peer}: {exception}")
                 break
 
+    async def sync_from_multiple_peers(self) -> None:
+        finalized_head = await self.chain_db.coro_get_finalized_head(BeaconBlock)
+        start_slot = Slot(finalized_head.slot + 1)
+        self.logger.info(
+            "Syncing with %d peers (best head slot: %d, our finalized slot: %d)",
+            len(self.sync_peers),
+            self.sync_peer.head_slot,
+            finalized_head.slot,
+        )
+
+        # The highest slot which each peer is expected to serve. It is lowered when a peer can't
+        # serve a segment, and a peer which fails a request is not used anymore.
+        peer_head_slots = {peer: peer.head_slot for peer in self.sync_peers}
+        idle_peers: Set[BCCPeer] = set(self.sync_peers)
+
+        # Segments still to download, lowest first
+        target_slot = self.sync_peer.head_slot
+        missing_segments: List[Segment] = [
+            (Slot(slot), min(self.segment_size, target_slot - slot + 1))
+            for slot in range(start_slot, target_slot + 1, self.segment_size)
+        ]
+        # Downloaded segments waiting to be persisted, by start slot, with the peer they came from
+        downloaded_segments: Dict[Slot, DownloadedSegment] = {}
+        downloads: Dict['asyncio.Future[Tuple[BaseBeaconBlock, ...]]', Tuple[BCCPeer, Segment]] = {}
+        persisting: 'asyncio.Future[PersistResult]' = None
+
+        # The last block persisted, or being persisted
+        last_block = finalized_head
+        is_on_different_branches = False
+
+        try:
+            while True:
+                if persisting is None:
+                    try:
+                        batch = self._pop_linked_segments(last_block, downloaded_segments)
+                    except ValidationError as exception:
+                        self.logger.info(
+                            "%s, syncing from %s alone",
+                            exception,
+                            self.sync_peer,
+                        )
+                        is_on_different_branches = True
+                        break
+
+                    if batch:
+                        persisting = asyncio.ensure_future(
+                            self.chain_db.coro_persist_block_chain(batch, BeaconBlock)
+                        )
+                        last_block = batch[-1]
+
+                # Downloads may not get further than the window ahead of the persisted blocks
+                window_end_slot = last_block.slot + self.window_size * self.segment_size
+                for peer, (segment_start_slot, num_slots) in self._assign_segments(
+                        missing_segments,
+                        idle_peers,
+                        peer_head_slots,
+                        window_end_slot):
+                    self.logger.debug(
+                        "Requesting %d blocks from %s starting at #%d",
+                        num_slots,
+                        peer,
+                        segment_start_slot,
+                    )
+                    download: 'asyncio.Future[Tuple[BaseBeaconBlock, ...]]' = asyncio.ensure_future(
+                        peer.requests.get_beacon_blocks(segment_start_slot, num_slots)
+                    )
+                    downloads[download] = (peer, (segment_start_slot, num_slots))
+
+                pending: Set['asyncio.Future[Any]'] = set(downloads)
+                if persisting is not None:
+                    pending.add(persisting)
+                if not pending:
+                    break
+
+                done, _ = await self.wait(
+                    asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                )
+
+                if persisting in done:
+                    try:
+                        persisting.result()
+                    except ValidationError as exception:
+                        self.logger.info(f"Received invalid blocks: {exception}")
+                        return
+                    persisting = None
+
+                for download in done.intersection(downloads):
+                    peer, segment = downloads.pop(download)
+                    self._complete_download(
+                        download,
+                        peer,
+                        segment,
+                        idle_peers,
+                        peer_head_slots,
+                        missing_segments,
+                        downloaded_segments,
+                    )
+        finally:
+            for download in downloads:
+                download.cancel()
+            if persisting is not None:
+                persisting.cancel()
+
+        if is_on_different_branches:
+            await self.sync_from_single_peer()
+        elif missing_segments:
+            self.logger.info(
+                "No peer could serve the blocks from slot #%d on",
+                missing_segments[0][0],
+            )
+
+    def _assign_segments(self,
+                         missing_segments: List[Segment],
+                         idle_peers: Set[BCCPeer],
+                         peer_head_slots: Dict[BCCPeer, Slot],
+                         window_end_slot: Slot) -> Tuple[Tuple[BCCPeer, Segment], ...]:
+        """
+        Assign the lowest missing segments within the window to the fastest idle peers that can
+        serve them, and remove them from ``missing_segments`` and the peers from ``idle_peers``.
+        """
+        unassigned_segments = []
+        assigned_segments = []
+        while missing_segments and missing_segments[0][0] <= window_end_slot and idle_peers:
+            segment = heapq.heappop(missing_segments)
+            candidates = tuple(
+                peer for peer in idle_peers
+                if peer.is_operational and peer_head_slots[peer] >= segment[0]
+            )
+            if candidates:
+                peer = max(candidates, key=_get_peer_throughput)
+                idle_peers.remove(peer)
+                assigned_segments.append((peer, segment))
+            else:
+                unassigned_segments.append(segment)
+
+        for segment in unassigned_segments:
+            heapq.heappush(missing_segments, segment)
+        return tuple(assigned_segments)
+
+    def _complete_download(self,
+                           download: 'asyncio.Future[Tuple[BaseBeaconBlock, ...]]',
+                           peer: BCCPeer,
+                           segment: Segment,
+                           idle_peers: Set[BCCPeer],
+                           peer_head_slots: Dict[BCCPeer, Slot],
+                           missing_segments: List[Segment],
+                           downloaded_segments: Dict[Slot, DownloadedSegment]) -> None:
+        segment_start_slot, num_slots = segment
+        try:
+            blocks = download.result()
+        except (TimeoutError, BaseP2PError, OperationCancelled, ValidationError) as exception:
+            self.logger.info(
+                "Failed to download blocks from %s, not syncing from it anymore: %r",
+                peer,
+                exception,
+            )
+            heapq.heappush(missing_segments, segment)
+            return
+
+        idle_peers.add(peer)
+        if len(blocks) == 0:
+            self.logger.debug(
+                "%s doesn't have the block at slot #%d",
+                peer,
+                segment_start_slot,
+            )
+            peer_head_slots[peer] = min(peer_head_slots[peer], Slot(segment_start_slot - 1))
+            heapq.heappush(missing_segments, segment)
+            return
+
+        downloaded_segments[segment_start_slot] = (peer, blocks)
+        if len(blocks) < num_slots:
+            # The rest of the segment is missing
+            next_slot = Slot(blocks[-1].slot + 1)
+            peer_head_slots[peer] = min(peer_head_slots[peer], blocks[-1].slot)
+            heapq.heappush(
+                missing_segments,
+                (next_slot, num_slots - (next_slot - segment_start_slot)),
+            )
+
+    def _pop_linked_segments(
+            self,
+            last_block: BaseBeaconBlock,
+            downloaded_segments: Dict[Slot, DownloadedSegment],
+    ) -> Tuple[BaseBeaconBlock, ...]:
+        """
+        Remove the downloaded segments which follow ``last_block`` from ``downloaded_segments``,
+        and return their blocks.
+
+        Raise ``ValidationError`` if a segment doesn't link to the previous blocks, which means
+        that the peers the segments were downloaded from are on different branches.
+        """
+        batch: Tuple[BaseBeaconBlock, ...] = ()
+        while last_block.slot + 1 in downloaded_segments:
+            peer, blocks = downloaded_segments.pop(Slot(last_block.slot + 1))
+            if blocks[0].parent_root != last_block.hash:
+                raise ValidationError(f"Blocks received from {peer} are not linked to ours")
+
+            batch += blocks
+            last_block = blocks[-1]
+
+        return batch
+
     async def request_batches(self,
                               start_slot: Slot,
                               ) -> AsyncGenerator[Tuple[BaseBeaconBlock, ...], None]:
@@ -180,3 +426,7 @@ class BeaconChainSyncer(BaseService):
             message = f"Peer has different block finalized at slot #{parent_slot}"
             self.logger.info(message)
             raise ValidationError(message)
+
+
+def _get_peer_throughput(peer: BCCPeer) -> float:
+    return peer.requests.get_beacon_blocks.tracker.items_per_second_ema.value
@@ -1,3 +1,7 @@
 MAX_BLOCKS_PER_REQUEST = 64
 PEER_SELECTION_RETRY_INTERVAL = 5
 PEER_SELECTION_MAX_RETRIES = 6
+
+# Number of segments of MAX_BLOCKS_PER_REQUEST slots which may be downloading, or waiting to be
+# persisted, ahead of the last persisted block when syncing from several peers
+SYNC_WINDOW_SEGMENTS = 16
@@ -1,7 +1,16 @@
 from abc import ABC, abstractmethod
+import asyncio
+import collections
+from concurrent.futures import Executor
+import functools
+import logging
 from typing import (
     AsyncIterator,
+    Deque,
+    Dict,
+    Sequence,
     Tuple,
+    Type,
 )
 
 from cancel_token import (
@@ -9,11 +18,14 @@ from cancel_token import (
     OperationCancelled,
 )
 
+import rlp
+
 from eth.constants import GENESIS_BLOCK_NUMBER
 from eth.exceptions import (
     HeaderNotFound,
 )
 from eth_typing import (
+    Address,
     BlockNumber,
     Hash32,
 )
@@ -27,6 +39,9 @@ from eth.rlp.blocks import (
 from eth.rlp.headers import (
     BlockHeader,
 )
+from eth.rlp.transactions import (
+    BaseTransaction,
+)
 
 from p2p.constants import (
     MAX_REORG_DEPTH,
@@ -38,6 +53,7 @@ from p2p.p2p_proto import (
 from p2p.service import (
     BaseService,
 )
+from p2p._utils import ensure_global_asyncio_executor
 
 from trinity.chains.base import BaseAsyncChain
 from trinity.db.eth1.header import BaseAsyncHeaderDB
@@ -45,6 +61,8 @@ from trinity.protocol.common.peer import (
     BaseChainPeer,
 )
 
+from .constants import BLOCK_IMPORT_LOOKAHEAD
+from .seals import SealVerifier
 from .types import SyncProgress
 
 
@@ -61,10 +79,14 @@ class PeerHeaderSyncer(BaseService):
                  chain: BaseAsyncChain,
                  db: BaseAsyncHeaderDB,
                  peer: BaseChainPeer,
-                 token: CancelToken = None) -> None:
+                 token: CancelToken = None,
+                 seal_verifier: SealVerifier = None) -> None:
         super().__init__(token)
         self.chain = chain
         self.db = db
+        if seal_verifier is None:
+            seal_verifier = SealVerifier()
+        self._seal_verifier = seal_verifier
         self.sync_progress: SyncProgress = None
         self._peer = peer
         self._target_header_hash = peer.head_hash
@@ -202,7 +224,8 @@ class PeerHeaderSyncer(BaseService):
                 headers[-1],
             )
             try:
-                await self.chain.coro_validate_chain(
+                await self._seal_verifier.validate_chain(
+                    self.chain,
                     last_received_header or first_parent,
                     headers,
                     self._seal_check_random_sample_rate,
@@ -265,6 +288,13 @@ class BaseBlockImporter(ABC):
             block: BaseBlock) -> Tuple[BaseBlock, Tuple[BaseBlock, ...], Tuple[BaseBlock, ...]]:
         pass
 
+    def prepare_blocks(self, blocks: Sequence[BaseBlock]) -> None:
+        """
+        Announce blocks that are about to be imported, in order, so that the importer can start
+        working on them ahead of time. Importers may ignore this.
+        """
+        pass
+
 
 class SimpleBlockImporter(BaseBlockImporter):
     def __init__(self, chain: BaseAsyncChain) -> None:
@@ -274,3 +304,132 @@ class SimpleBlockImporter(BaseBlockImporter):
             self,
             block: BaseBlock) -> Tuple[BaseBlock, Tuple[BaseBlock, ...], Tuple[BaseBlock, ...]]:
         return await self._chain.coro_import_block(block, perform_validation=True)
+
+
+class PrevalidatedTransactionMixin:
+    """
+    A transaction whose signature was already validated, and whose sender was already recovered.
+
+    EVM execution asks for the sender of a transaction several times, each of which would
+    otherwise recover it from the signature again. Copies of the transaction lose the
+    prevalidated sender, and fall back to validating the signature themselves.
+    """
+    _prevalidated_sender: Address = None
+
+    def check_signature_validity(self) -> None:
+        if self._prevalidated_sender is None:
+            super().check_signature_validity()  # type: ignore
+
+    def get_sender(self) -> Address:
+        if self._prevalidated_sender is None:
+            return super().get_sender()  # type: ignore
+        else:
+            return self._prevalidated_sender
+
+
+@functools.lru_cache(maxsize=64)
+def _get_prevalidated_transaction_class(
+        transaction_class: Type[BaseTransaction]) -> Type[BaseTransaction]:
+    return type(
+        'Prevalidated' + transaction_class.__name__,
+        (PrevalidatedTransactionMixin, transaction_class),
+        {},
+    )
+
+
+def _with_prevalidated_senders(block: BaseBlock, senders: Sequence[Address]) -> BaseBlock:
+    transaction_class = _get_prevalidated_transaction_class(block.transaction_class)
+    transactions = []
+    for transaction, sender in zip(block.transactions, senders):
+        prevalidated = transaction_class(*transaction)
+        prevalidated._prevalidated_sender = sender
+        transactions.append(prevalidated)
+    return type(block)(block.header, transactions, block.uncles)
+
+
+def _prevalidate_block(block_class: Type[BaseBlock], encoded_block: bytes) -> Tuple[Address, ...]:
+    """
+    Validate the transactions of a block, including their signatures, which does not depend on
+    the state or on ancestor blocks.
+
+    Runs in a worker process, so the block crosses the process boundary RLP-encoded. Seals are
+    left to the import, which checks them anyway, with the ethash cache of the main process.
+
+    :return: the sender of each transaction in the block
+    """
+    block = rlp.decode(encoded_block, sedes=block_class)
+    for transaction in block.transactions:
+        transaction.validate()
+    return tuple(transaction.sender for transaction in block.transactions)
+
+
+class ParallelBlockImporter(BaseBlockImporter):
+    """
+    Import blocks one at a time through the chain, like :class:`SimpleBlockImporter`, but validate
+    transactions of upcoming blocks in a process pool, while the current block executes.
+
+    Blocks passed to :meth:`prepare_blocks` are prevalidated up to ``lookahead`` blocks ahead of
+    the one being imported. Execution then reuses the transaction senders recovered in the pool.
+    The full validation of :meth:`~eth.chains.base.Chain.import_block` still runs, so a block
+    that was not prepared (or is invalid) is handled exactly like before.
+    """
+    logger = logging.getLogger('trinity.sync.common.chain.ParallelBlockImporter')
+
+    def __init__(self,
+                 chain: BaseAsyncChain,
+                 executor: Executor = None,
+                 lookahead: int = BLOCK_IMPORT_LOOKAHEAD) -> None:
+        self._chain = chain
+        self._executor = executor
+        self._lookahead = lookahead
+        self._upcoming: Deque[BaseBlock] = collections.deque()
+        self._prevalidations: Dict[Hash32, 'asyncio.Future[Tuple[Address, ...]]'] = {}
+
+    def prepare_blocks(self, blocks: Sequence[BaseBlock]) -> None:
+        self._upcoming.extend(blocks)
+        self._prevalidate_upcoming()
+
+    async def import_block(
+            self,
+            block: BaseBlock) -> Tuple[BaseBlock, Tuple[BaseBlock, ...], Tuple[BaseBlock, ...]]:
+        try:
+            prevalidation = self._prevalidations.pop(block.hash)
+        except KeyError:
+            prevalidation = self._prevalidate(block)
+
+        # keep the pool busy with the next blocks while this one waits and executes
+        self._prevalidate_upcoming()
+
+        try:
+            senders = await prevalidation
+            return await self._chain.coro_import_block(
+                _with_prevalidated_senders(block, senders),
+                perform_validation=True,
+            )
+        except BaseException:
+            # The blocks that were prepared after this one will not be imported either
+            self._discard_upcoming()
+            raise
+
+    def _prevalidate_upcoming(self) -> None:
+        while self._upcoming and len(self._prevalidations) < self._lookahead:
+            block = self._upcoming.popleft()
+            if block.hash not in self._prevalidations:
+                self._prevalidations[block.hash] = self._prevalidate(block)
+
+    def _prevalidate(self, block: BaseBlock) -> 'asyncio.Future[Tuple[Address, ...]]':
+        if self._executor is None:
+            self._executor = ensure_global_asyncio_executor()
+
+        return asyncio.get_event_loop().run_in_executor(
+            self._executor,
+            _prevalidate_block,
+            type(block),
+            rlp.encode(block),
+        )
+
+    def _discard_upcoming(self) -> None:
+        self._upcoming.clear()
+        prevalidations, self._prevalidations = self._prevalidations, {}
+        for prevalidation in prevalidations.values():
+            prevalidation.cancel()
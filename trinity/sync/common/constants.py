@@ -4,3 +4,15 @@ EMPTY_PEER_RESPONSE_PENALTY = 15.0
 # Picked a reorg number that is covered by a single skeleton header request,
 # which covers about 6 days at 15s blocks
 MAX_SKELETON_REORG_DEPTH = 35000
+
+# How many blocks ahead of the one being executed to validate in the process pool, during a
+# regular sync. Enough to keep every core busy while a single block executes.
+BLOCK_IMPORT_LOOKAHEAD = 32
+
+# How many proof of work seals to check in a single process pool task. Each seal check is a few
+# milliseconds, so this amortizes the overhead of the task, while spreading big batches over
+# several workers.
+SEAL_CHECKS_PER_TASK = 16
+
+# How many ethash caches (one per epoch of 30000 blocks) to keep on disk for the seal checks
+ETHASH_CACHES_ON_DISK = 3
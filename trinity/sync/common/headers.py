@@ -57,6 +57,7 @@ from trinity.sync.common.constants import (
     MAX_SKELETON_REORG_DEPTH,
 )
 from trinity.sync.common.peers import TChainPeer, WaitingPeers
+from trinity.sync.common.seals import SealVerifier
 from trinity._utils.datastructures import (
     DuplicateTasks,
     OrderedTaskPreparation,
@@ -82,11 +83,15 @@ class SkeletonSyncer(BaseService, Generic[TChainPeer]):
                  chain: BaseAsyncChain,
                  db: BaseAsyncHeaderDB,
                  peer: TChainPeer,
-                 token: CancelToken) -> None:
+                 token: CancelToken,
+                 seal_verifier: SealVerifier = None) -> None:
         super().__init__(token=token)
         self._chain = chain
         self._db = db
         self.peer = peer
+        if seal_verifier is None:
+            seal_verifier = SealVerifier()
+        self._seal_verifier = seal_verifier
         max_pending_headers = peer.max_headers_fetch * 8
         self._fetched_headers = asyncio.Queue(max_pending_headers)
 
@@ -161,7 +166,7 @@ class SkeletonSyncer(BaseService, Generic[TChainPeer]):
             pairs = tuple(zip(parents, children))
             try:
                 validate_pair_coros = [
-                    self.wait(self._chain.coro_validate_chain(parent, (child, )))
+                    self.wait(self._seal_verifier.validate_chain(self._chain, parent, (child, )))
                     for parent, child in pairs
                 ]
                 await asyncio.gather(*validate_pair_coros, loop=self.get_event_loop())
@@ -215,7 +220,8 @@ class SkeletonSyncer(BaseService, Generic[TChainPeer]):
             if len(final_headers) == 0:
                 break
 
-            await self.wait(self._chain.coro_validate_chain(
+            await self.wait(self._seal_verifier.validate_chain(
+                self._chain,
                 previous_tail_header,
                 final_headers,
                 SEAL_CHECK_RANDOM_SAMPLE_RATE,
@@ -310,7 +316,8 @@ class SkeletonSyncer(BaseService, Generic[TChainPeer]):
                 ) from exc
 
             # validate new headers against the parent in the database
-            await self.wait(self._chain.coro_validate_chain(
+            await self.wait(self._seal_verifier.validate_chain(
+                self._chain,
                 launch_parent,
                 new_headers,
                 SEAL_CHECK_RANDOM_SAMPLE_RATE,
@@ -366,7 +373,8 @@ class SkeletonSyncer(BaseService, Generic[TChainPeer]):
         # validate the filled headers
         filled_gap_children = tuple(concatv(gap_headers, pairs[gap_index + 1]))
         try:
-            await self.wait(self._chain.coro_validate_chain(
+            await self.wait(self._seal_verifier.validate_chain(
+                self._chain,
                 gap_parent,
                 filled_gap_children,
                 SEAL_CHECK_RANDOM_SAMPLE_RATE,
@@ -509,10 +517,14 @@ class HeaderMeatSyncer(BaseService, PeerSubscriber, Generic[TChainPeer]):
             chain: BaseAsyncChain,
             peer_pool: BaseChainPeerPool,
             stitcher: HeaderStitcher,
-            token: CancelToken) -> None:
+            token: CancelToken,
+            seal_verifier: SealVerifier = None) -> None:
         super().__init__(token=token)
         self._chain = chain
         self._stitcher = stitcher
+        if seal_verifier is None:
+            seal_verifier = SealVerifier()
+        self._seal_verifier = seal_verifier
         max_pending_fillers = 50
         self._filler_header_tasks = TaskQueue(
             max_pending_fillers,
@@ -659,7 +671,8 @@ class HeaderMeatSyncer(BaseService, PeerSubscriber, Generic[TChainPeer]):
             return tuple()
         else:
             try:
-                await self.wait(self._chain.coro_validate_chain(
+                await self.wait(self._seal_verifier.validate_chain(
+                    self._chain,
                     parent_header,
                     headers,
                     SEAL_CHECK_RANDOM_SAMPLE_RATE,
@@ -733,6 +746,8 @@ class BaseHeaderChainSyncer(BaseService, HeaderSyncerAPI, Generic[TChainPeer]):
         self._tip_monitor = self.tip_monitor_class(peer_pool, token=self.cancel_token)
         self._last_target_header_hash: Hash32 = None
         self._skeleton: SkeletonSyncer[TChainPeer] = None
+        # shared by the skeleton and the meat syncers, so that they share ethash cache files
+        self._seal_verifier = SealVerifier()
 
         # Track if there is capacity for syncing more headers
         self._buffer_capacity = asyncio.Event()
@@ -757,6 +772,7 @@ class BaseHeaderChainSyncer(BaseService, HeaderSyncerAPI, Generic[TChainPeer]):
             self._peer_pool,
             self._stitcher,
             self.cancel_token,
+            self._seal_verifier,
         )
 
         # Queue has reset, so always start with capacity
@@ -828,6 +844,7 @@ class BaseHeaderChainSyncer(BaseService, HeaderSyncerAPI, Generic[TChainPeer]):
             self._db,
             peer,
             self.cancel_token,
+            self._seal_verifier,
         )
         self.run_child_service(self._skeleton)
         await self._skeleton.events.started.wait()
@@ -881,7 +898,8 @@ class BaseHeaderChainSyncer(BaseService, HeaderSyncerAPI, Generic[TChainPeer]):
                 raise ValidationError(f"Header skeleton gap of {gap_length} > {MAX_HEADERS_FETCH}")
             elif gap_length == 0:
                 # no need to fill in when there is no gap, just verify against previous header
-                await self.wait(self._chain.coro_validate_chain(
+                await self.wait(self._seal_verifier.validate_chain(
+                    self._chain,
                     previous_segment[-1],
                     segment,
                     SEAL_CHECK_RANDOM_SAMPLE_RATE,
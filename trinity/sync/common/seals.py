@@ -0,0 +1,282 @@
+"""
+Proof of work seal checks for header sync, in the process pool.
+
+A seal check needs the ethash cache of the header's epoch, which takes seconds to build, so having
+every worker process build its own would waste most of the pool. Instead, the first check in an
+epoch builds its cache once, into a file which every worker then loads.
+"""
+import asyncio
+import collections
+import contextlib
+from concurrent.futures import Executor
+import os
+from pathlib import Path
+import random
+import tempfile
+from typing import (
+    Dict,
+    Iterable,
+    Sequence,
+    Tuple,
+    Type,
+)
+
+from eth_typing import (
+    BlockNumber,
+    Hash32,
+)
+from eth_utils import (
+    big_endian_to_int,
+    encode_hex,
+    ValidationError,
+)
+from eth_utils.toolz import (
+    groupby,
+    partition_all,
+)
+
+from eth.rlp.headers import BlockHeader
+from eth.validation import (
+    validate_length,
+    validate_lte,
+)
+from eth.vm.base import (
+    BaseVM,
+    VM,
+)
+from pyethash import (
+    EPOCH_LENGTH,
+    hashimoto_light,
+    mkcache_bytes,
+)
+
+from p2p._utils import ensure_global_asyncio_executor
+
+from trinity.chains.base import BaseAsyncChain
+from trinity._utils.xdg import get_xdg_cache_home
+
+from .constants import (
+    ETHASH_CACHES_ON_DISK,
+    SEAL_CHECKS_PER_TASK,
+)
+
+
+# What the seal check of a header needs: its block number, mining hash, mix hash, nonce and
+# difficulty
+Seal = Tuple[BlockNumber, Hash32, Hash32, bytes, int]
+
+CACHE_FILE_PREFIX = 'cache-'
+
+# The ethash caches loaded by this (worker) process, by epoch, least recently used first
+_loaded_caches: 'collections.OrderedDict[int, bytes]' = collections.OrderedDict()
+
+
+def get_default_ethash_cache_dir() -> Path:
+    return get_xdg_cache_home() / 'trinity' / 'ethash'
+
+
+def uses_ethash_seal(vm_class: Type[BaseVM]) -> bool:
+    """
+    Return whether ``vm_class`` validates seals with the default, ethash, proof of work check.
+    """
+    return getattr(vm_class.validate_seal, '__func__', None) is VM.validate_seal.__func__
+
+
+def _get_cache_path(cache_dir: Path, epoch: int) -> Path:
+    return cache_dir / f'{CACHE_FILE_PREFIX}{epoch}'
+
+
+def _build_cache_file(cache_dir: Path, epoch: int) -> bytes:
+    cache = mkcache_bytes(epoch * EPOCH_LENGTH)
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    # Write to a temporary file first, so that other processes never load a partial cache
+    fd, temp_path = tempfile.mkstemp(dir=str(cache_dir))
+    try:
+        with os.fdopen(fd, 'wb') as temp_file:
+            temp_file.write(cache)
+        os.replace(temp_path, str(_get_cache_path(cache_dir, epoch)))
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temp_path)
+        raise
+
+    _prune_cache_files(cache_dir)
+    return cache
+
+
+def _prune_cache_files(cache_dir: Path) -> None:
+    """
+    Remove all but the ``ETHASH_CACHES_ON_DISK`` most recently built cache files.
+    """
+    mtimes = {}
+    for path in cache_dir.glob(f'{CACHE_FILE_PREFIX}*'):
+        with contextlib.suppress(FileNotFoundError):
+            mtimes[path] = path.stat().st_mtime
+
+    oldest_first = sorted(mtimes, key=mtimes.__getitem__)
+    for path in oldest_first[:-ETHASH_CACHES_ON_DISK]:
+        # another process may be pruning at the same time
+        with contextlib.suppress(FileNotFoundError):
+            path.unlink()
+
+
+def _ensure_cache_file(cache_dir: Path, epoch: int) -> None:
+    """
+    Build the cache file of ``epoch``, unless it already exists.
+
+    Runs in a worker process.
+    """
+    if not _get_cache_path(cache_dir, epoch).exists():
+        _build_cache_file(cache_dir, epoch)
+
+
+def _load_cache(cache_dir: Path, epoch: int) -> bytes:
+    if epoch in _loaded_caches:
+        _loaded_caches.move_to_end(epoch)
+        return _loaded_caches[epoch]
+
+    try:
+        cache = _get_cache_path(cache_dir, epoch).read_bytes()
+    except FileNotFoundError:
+        # The file was pruned in the meantime, so there is no other choice than building it again
+        cache = _build_cache_file(cache_dir, epoch)
+
+    _loaded_caches[epoch] = cache
+    while len(_loaded_caches) > ETHASH_CACHES_ON_DISK:
+        _loaded_caches.popitem(last=False)
+    return cache
+
+
+def _check_seal(cache: bytes, seal: Seal) -> None:
+    # The same checks as eth.consensus.pow.check_pow, which can only use its own cache
+    block_number, mining_hash, mix_hash, nonce, difficulty = seal
+    validate_length(mix_hash, 32, title="Mix Hash")
+    validate_length(mining_hash, 32, title="Mining Hash")
+    validate_length(nonce, 8, title="POW Nonce")
+    mining_output = hashimoto_light(block_number, cache, mining_hash, big_endian_to_int(nonce))
+    if mining_output[b'mix digest'] != mix_hash:
+        raise ValidationError("mix hash mismatch; {0} != {1}".format(
+            encode_hex(mining_output[b'mix digest']), encode_hex(mix_hash)))
+    result = big_endian_to_int(mining_output[b'result'])
+    validate_lte(result, 2**256 // difficulty, title="POW Difficulty")
+
+
+def _check_seals(cache_dir: Path, epoch: int, seals: Sequence[Seal]) -> None:
+    """
+    Check the seals of headers of the same ``epoch``.
+
+    Runs in a worker process.
+    """
+    cache = _load_cache(cache_dir, epoch)
+    for seal in seals:
+        try:
+            _check_seal(cache, seal)
+        except ValidationError as exc:
+            raise ValidationError(f"Invalid seal on block #{seal[0]}: {exc}") from exc
+
+
+def _get_seal(header: BlockHeader) -> Seal:
+    return (
+        header.block_number,
+        header.mining_hash,
+        header.mix_hash,
+        header.nonce,
+        header.difficulty,
+    )
+
+
+class SealVerifier:
+    """
+    Check the proof of work seals of headers in the process pool, spreading big batches of headers
+    over several workers.
+
+    The ethash cache of each epoch is built once, by a single worker, into a file of ``cache_dir``
+    where all the other workers load it from. The cache of the following epoch is built ahead of
+    time, so that header sync doesn't stall at the epoch boundary.
+    """
+    def __init__(self, cache_dir: Path = None, executor: Executor = None) -> None:
+        if cache_dir is None:
+            cache_dir = get_default_ethash_cache_dir()
+        self._cache_dir = cache_dir
+        self._executor = executor
+        self._cache_files: Dict[int, 'asyncio.Future[None]'] = {}
+
+    async def validate_chain(self,
+                             chain: BaseAsyncChain,
+                             parent: BlockHeader,
+                             headers: Tuple[BlockHeader, ...],
+                             seal_check_random_sample_rate: int = 1) -> None:
+        """
+        Validate ``headers`` like :meth:`~trinity.chains.base.BaseAsyncChain.coro_validate_chain`,
+        but check their seals in the process pool, at the same time as the rest.
+        """
+        if seal_check_random_sample_rate == 1:
+            sampled_headers: Sequence[BlockHeader] = headers
+        else:
+            sampled_headers = random.sample(
+                headers,
+                len(headers) // seal_check_random_sample_rate,
+            )
+        seal_headers = tuple(
+            header for header in sampled_headers
+            if uses_ethash_seal(chain.get_vm_class_for_block_number(header.block_number))
+        )
+
+        # validate_chain() checks len(headers) // rate seals, so none with this rate
+        no_seal_check_sample_rate = len(headers) + 1
+        if seal_headers:
+            await asyncio.gather(
+                chain.coro_validate_chain(parent, headers, no_seal_check_sample_rate),
+                self.check_seals(seal_headers),
+            )
+        else:
+            await chain.coro_validate_chain(parent, headers, no_seal_check_sample_rate)
+
+    async def check_seals(self, headers: Iterable[BlockHeader]) -> None:
+        """
+        Check the ethash seals of ``headers``.
+
+        :raise ValidationError: if any of the seals is invalid
+        """
+        if self._executor is None:
+            self._executor = ensure_global_asyncio_executor()
+
+        seals_by_epoch = groupby(
+            lambda seal: seal[0] // EPOCH_LENGTH,
+            (_get_seal(header) for header in headers),
+        )
+        await asyncio.gather(*(
+            self._wait_cache_file(epoch) for epoch in seals_by_epoch
+        ))
+
+        loop = asyncio.get_event_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(self._executor, _check_seals, self._cache_dir, epoch, batch)
+            for epoch, seals in seals_by_epoch.items()
+            for batch in partition_all(SEAL_CHECKS_PER_TASK, seals)
+        ))
+
+    async def _wait_cache_file(self, epoch: int) -> None:
+        for upcoming_epoch in (epoch, epoch + 1):
+            if upcoming_epoch not in self._cache_files:
+                self._cache_files[upcoming_epoch] = asyncio.get_event_loop().run_in_executor(
+                    self._executor,
+                    _ensure_cache_file,
+                    self._cache_dir,
+                    upcoming_epoch,
+                )
+        for old_epoch in tuple(self._cache_files):
+            if old_epoch < epoch - ETHASH_CACHES_ON_DISK:
+                del self._cache_files[old_epoch]
+
+        cache_file = self._cache_files[epoch]
+        try:
+            # Shielded, so that cancelling one of the checks waiting for the cache doesn't cancel
+            # the build for all the others
+            await asyncio.shield(cache_file)
+        except Exception:
+            if cache_file.done():
+                # The build failed: let the next check retry it
+                self._cache_files.pop(epoch, None)
+            raise
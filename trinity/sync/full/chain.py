@@ -37,6 +37,7 @@ from eth.constants import (
     EMPTY_UNCLE_HASH,
 )
 from eth.exceptions import HeaderNotFound
+from eth.rlp.blocks import BaseBlock
 from eth.rlp.headers import BlockHeader
 from eth.rlp.receipts import Receipt
 from eth.rlp.transactions import BaseTransaction
@@ -60,7 +61,7 @@ from trinity.protocol.eth.sync import ETHHeaderChainSyncer
 from trinity.rlp.block_body import BlockBody
 from trinity.sync.common.chain import (
     BaseBlockImporter,
-    SimpleBlockImporter,
+    ParallelBlockImporter,
 )
 from trinity.sync.common.constants import (
     EMPTY_PEER_RESPONSE_PENALTY,
@@ -71,6 +72,7 @@ from trinity.sync.full.constants import (
     HEADER_QUEUE_SIZE_TARGET,
     BLOCK_QUEUE_SIZE_TARGET,
 )
+from trinity.sync.full.persist import FastSyncWriteBatcher
 from trinity._utils.datastructures import (
     BaseOrderedTaskPreparation,
     MissingDependency,
@@ -478,6 +480,10 @@ class ChainSyncStats(NamedTuple):
     num_transactions: int
     transactions_per_second: float
 
+    num_flushes: int
+    items_per_flush: float
+    flush_latency: float
+
 
 class ChainSyncPerformanceTracker:
     def __init__(self, head: BlockHeader) -> None:
@@ -498,9 +504,19 @@ class ChainSyncPerformanceTracker:
         # Number of transactions processed
         self.num_transactions = 0
 
+        # Number of DB write batches flushed, with their total size and latency
+        self.num_flushes = 0
+        self.num_flushed_items = 0
+        self.flush_latency = 0.0
+
     def record_transactions(self, count: int) -> None:
         self.num_transactions += count
 
+    def record_flush(self, num_items: int, latency: float) -> None:
+        self.num_flushes += 1
+        self.num_flushed_items += num_items
+        self.flush_latency += latency
+
     def set_latest_head(self, head: BlockHeader) -> None:
         self.latest_head = head
 
@@ -522,10 +538,16 @@ class ChainSyncPerformanceTracker:
             blocks_per_second=self.blocks_per_second_ema.value,
             num_transactions=self.num_transactions,
             transactions_per_second=self.transactions_per_second_ema.value,
+            num_flushes=self.num_flushes,
+            items_per_flush=self.num_flushed_items / max(self.num_flushes, 1),
+            flush_latency=self.flush_latency / max(self.num_flushes, 1),
         )
 
         # reset the counters
         self.num_transactions = 0
+        self.num_flushes = 0
+        self.num_flushed_items = 0
+        self.flush_latency = 0.0
         self.prev_head = self.latest_head
 
         return stats
@@ -569,6 +591,12 @@ class FastChainBodySyncer(BaseBodyChainSyncer):
     async def _run(self) -> None:
         head = await self.wait(self.db.coro_get_canonical_head())
         self.tracker = ChainSyncPerformanceTracker(head)
+        self._write_batcher = FastSyncWriteBatcher(
+            self.db,
+            on_flush=self.tracker.record_flush,
+            token=self.cancel_token,
+        )
+        self.run_child_service(self._write_batcher)
 
         self._block_persist_tracker.set_finished_dependency(head)
         self.run_daemon_task(self._launch_prerequisite_tasks())
@@ -636,7 +664,10 @@ class FastChainBodySyncer(BaseBodyChainSyncer):
                     "tps=%-4d  "
                     "elapsed=%0.1f  "
                     "head=#%d %s  "
-                    "age=%s"
+                    "age=%s  "
+                    "flushes=%d  "
+                    "flush_size=%d  "
+                    "flush_ms=%d"
                 ),
                 stats.num_blocks,
                 stats.num_transactions,
@@ -646,6 +677,9 @@ class FastChainBodySyncer(BaseBodyChainSyncer):
                 stats.latest_head.block_number,
                 humanize_hash(stats.latest_head.hash),
                 humanize_elapsed(head_age),
+                stats.num_flushes,
+                stats.items_per_flush,
+                stats.flush_latency * 1000,
             )
 
     async def _persist_ready_blocks(self) -> None:
@@ -675,7 +709,8 @@ class FastChainBodySyncer(BaseBodyChainSyncer):
             target_hash = self._header_syncer.get_target_header_hash()
 
             if target_hash in [header.hash for header in completed_headers]:
-                # exit the service when reaching the target hash
+                # exit the service when reaching the target hash, once everything is on disk
+                await self._write_batcher.flush()
                 self._mark_complete()
                 break
 
@@ -689,6 +724,7 @@ class FastChainBodySyncer(BaseBodyChainSyncer):
 
         :param headers: headers for which block bodies and receipts have been downloaded
         """
+        blocks = []
         for header in headers:
             vm_class = self.chain.get_vm_class(header)
             block_class = vm_class.get_block_class()
@@ -708,9 +744,12 @@ class FastChainBodySyncer(BaseBodyChainSyncer):
                 # record progress in the tracker
                 self.tracker.record_transactions(len(transactions))
 
-            block = block_class(header, transactions, uncles)
-            await self.wait(self.db.coro_persist_block(block))
-            self.tracker.set_latest_head(header)
+            blocks.append(block_class(header, transactions, uncles))
+
+        # the blocks are written along with the trie data queued before them
+        await self._write_batcher.add_blocks(blocks)
+        if headers:
+            self.tracker.set_latest_head(headers[-1])
 
     async def _assign_receipt_download_to_peers(self) -> None:
         """
@@ -777,7 +816,7 @@ class FastChainBodySyncer(BaseBodyChainSyncer):
         in order to make it... fast.
         """
         for (_, (_, trie_data_dict), _) in bundles:
-            await self.wait(self.db.coro_persist_trie_data_dict(trie_data_dict))
+            await self._write_batcher.add_trie_data(trie_data_dict)
 
     async def _process_receipts(
             self,
@@ -830,8 +869,7 @@ class FastChainBodySyncer(BaseBodyChainSyncer):
         # dicts in the database
         receipts, trie_roots_and_data_dicts = zip(*receipt_bundles)
         receipt_roots, trie_data_dicts = zip(*trie_roots_and_data_dicts)
-        for trie_data in trie_data_dicts:
-            await self.wait(self.db.coro_persist_trie_data_dict(trie_data))
+        await self._write_batcher.add_trie_data(merge(*trie_data_dicts))
 
         # Identify which headers have the receipt roots that are now complete.
         completed_header_groups = tuple(
@@ -923,7 +961,7 @@ class RegularChainSyncer(BaseService):
             db,
             peer_pool,
             self._header_syncer,
-            SimpleBlockImporter(chain),
+            ParallelBlockImporter(chain),
             self.cancel_token,
         )
 
@@ -1044,21 +1082,11 @@ class RegularChainBodySyncer(BaseBodyChainSyncer):
 
         :param headers: headers that have the block bodies downloaded
         """
-        for header in headers:
-            vm_class = self.chain.get_vm_class(header)
-            block_class = vm_class.get_block_class()
-
-            if _is_body_empty(header):
-                transactions: List[BaseTransaction] = []
-                uncles: List[BlockHeader] = []
-            else:
-                body = self._pending_bodies.pop(header)
-                tx_class = block_class.get_transaction_class()
-                transactions = [tx_class.from_base_transaction(tx)
-                                for tx in body.transactions]
-                uncles = body.uncles
+        blocks = tuple(self._get_block(header) for header in headers)
+        # let the importer prepare the following blocks while the first ones are executing
+        self._block_importer.prepare_blocks(blocks)
 
-            block = block_class(header, transactions, uncles)
+        for block in blocks:
             timer = Timer()
             _, new_canonical_blocks, old_canonical_blocks = await self.wait(
                 self._block_importer.import_block(block)
@@ -1067,17 +1095,17 @@ class RegularChainBodySyncer(BaseBodyChainSyncer):
             if new_canonical_blocks == (block,):
                 # simple import of a single new block.
                 self.logger.info("Imported block %d (%d txs) in %.2f seconds",
-                                 block.number, len(transactions), timer.elapsed)
+                                 block.number, len(block.transactions), timer.elapsed)
             elif not new_canonical_blocks:
                 # imported block from a fork.
                 self.logger.info("Imported non-canonical block %d (%d txs) in %.2f seconds",
-                                 block.number, len(transactions), timer.elapsed)
+                                 block.number, len(block.transactions), timer.elapsed)
             elif old_canonical_blocks:
                 self.logger.info(
                     "Chain Reorganization: Imported block %d (%d txs) in %.2f "
                     "seconds, %d blocks discarded and %d new canonical blocks added",
                     block.number,
-                    len(transactions),
+                    len(block.transactions),
                     timer.elapsed,
                     len(old_canonical_blocks),
                     len(new_canonical_blocks),
@@ -1085,6 +1113,22 @@ class RegularChainBodySyncer(BaseBodyChainSyncer):
             else:
                 raise Exception("Invariant: unreachable code path")
 
+    def _get_block(self, header: BlockHeader) -> BaseBlock:
+        vm_class = self.chain.get_vm_class(header)
+        block_class = vm_class.get_block_class()
+
+        if _is_body_empty(header):
+            transactions: List[BaseTransaction] = []
+            uncles: List[BlockHeader] = []
+        else:
+            body = self._pending_bodies.pop(header)
+            tx_class = block_class.get_transaction_class()
+            transactions = [tx_class.from_base_transaction(tx)
+                            for tx in body.transactions]
+            uncles = body.uncles
+
+        return block_class(header, transactions, uncles)
+
 
 def _is_body_empty(header: BlockHeader) -> bool:
     return header.transaction_root == BLANK_ROOT_HASH and header.uncles_hash == EMPTY_UNCLE_HASH
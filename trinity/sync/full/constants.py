@@ -16,3 +16,11 @@ HEADER_QUEUE_SIZE_TARGET = 6000
 # How many blocks to persist at a time
 # Only need a few seconds of buffer on the DB write side.
 BLOCK_QUEUE_SIZE_TARGET = 1000
+
+# How many items (trie nodes and blocks) to collect before writing them to the DB in a single
+# atomic batch, during fast sync. A ropsten block body with ~100 transactions yields ~200 trie
+# nodes for its transactions and receipts, so this is roughly a few hundred blocks.
+PERSIST_BATCH_SIZE_TARGET = 50000
+
+# Longest time (in seconds) that fast sync data may wait in a pending write batch
+PERSIST_BATCH_MAX_DELAY = 2.0
@@ -169,6 +169,25 @@ class HexaryTrieSync:
             return
         self._schedule(node_key, parent, depth, leaf_callback, is_raw)
 
+    async def _schedule_references(self,
+                                   references: List[Tuple[int, Hash32]],
+                                   parent: SyncRequest) -> None:
+        """Schedule requests for all the given (depth, node_key) references of ``parent``.
+
+        Unlike calling schedule() for each reference, this checks the DB for all the references
+        not in our nodes_cache with a single call.
+        """
+        unknown = [(depth, ref) for depth, ref in references if ref not in self.nodes_cache]
+        if not unknown:
+            return
+        exist_in_db = await self.db.coro_exists_many(tuple(ref for _, ref in unknown))
+        for (depth, ref), exists in zip(unknown, exist_in_db):
+            if exists:
+                self.nodes_cache[ref] = b''
+                self.logger.debug2("Node %s already exists in db", encode_hex(ref))
+            else:
+                self._schedule(ref, parent, depth, parent.leaf_callback)
+
     def _schedule(self, node_key: Hash32, parent: SyncRequest, depth: int,
                   leaf_callback: Callable[[bytes, 'SyncRequest'], Awaitable[None]],
                   is_raw: bool = False) -> None:
@@ -216,8 +235,7 @@ class HexaryTrieSync:
             node = decode_node(request.data)
             references, leaves = _get_children(node, request.depth)
 
-            for depth, ref in references:
-                await self.schedule(ref, request, depth, request.leaf_callback)
+            await self._schedule_references(references, request)
 
             if request.leaf_callback is not None:
                 for leaf in leaves:
@@ -232,11 +250,19 @@ class HexaryTrieSync:
         The request's data attribute must be set (done by the process() method) before this can be
         called.
         """
-        self.committed_nodes += 1
-        await self.db.coro_set(request.node_key, request.data)
-        self.nodes_cache[request.node_key] = b''
-        self.requests.pop(request.node_key)
-        for ancestor in request.parents:
-            ancestor.dependencies -= 1
-            if ancestor.dependencies == 0:
-                await self.commit(ancestor)
+        # Committing a node may unblock its ancestors, so gather all of them (the node itself
+        # first) and write them to the DB in one go.
+        committable = [request]
+        for committed in committable:
+            for ancestor in committed.parents:
+                ancestor.dependencies -= 1
+                if ancestor.dependencies == 0:
+                    committable.append(ancestor)
+
+        await self.db.coro_set_many({
+            committed.node_key: committed.data for committed in committable
+        })
+        for committed in committable:
+            self.committed_nodes += 1
+            self.nodes_cache[committed.node_key] = b''
+            self.requests.pop(committed.node_key)
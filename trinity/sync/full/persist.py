@@ -0,0 +1,109 @@
+import asyncio
+from typing import (
+    Callable,
+    Dict,
+    List,
+)
+
+from cancel_token import CancelToken
+from eth_typing import Hash32
+
+from eth.rlp.blocks import BaseBlock
+
+from p2p.service import BaseService
+
+from trinity.db.eth1.chain import BaseAsyncChainDB
+from trinity.sync.full.constants import (
+    PERSIST_BATCH_MAX_DELAY,
+    PERSIST_BATCH_SIZE_TARGET,
+)
+from trinity._utils.timer import Timer
+
+
+class FastSyncWriteBatcher(BaseService):
+    """
+    Collect the trie data (transactions and receipts) and the blocks written during a fast sync,
+    and persist them in large atomic batches, each with a single call to the DB process.
+
+    A batch is flushed as soon as it holds ``batch_size_target`` items (trie nodes + blocks), or
+    when its oldest item has been waiting for ``max_delay`` seconds, whichever comes first.
+
+    Items are written in the order they were added, and all items of a batch are written
+    atomically, so a block is never persisted before the trie data it was added after.
+    """
+    def __init__(self,
+                 db: BaseAsyncChainDB,
+                 on_flush: Callable[[int, float], None] = None,
+                 batch_size_target: int = PERSIST_BATCH_SIZE_TARGET,
+                 max_delay: float = PERSIST_BATCH_MAX_DELAY,
+                 token: CancelToken = None) -> None:
+        super().__init__(token)
+        self.db = db
+        self._on_flush = on_flush
+        self._batch_size_target = batch_size_target
+        self._max_delay = max_delay
+
+        self._trie_data: Dict[Hash32, bytes] = {}
+        self._blocks: List[BaseBlock] = []
+        # Started when the first item of a batch is added
+        self._batch_age: Timer = None
+        self._flush_lock = asyncio.Lock()
+
+    @property
+    def pending_items(self) -> int:
+        return len(self._trie_data) + len(self._blocks)
+
+    async def add_trie_data(self, trie_data_dict: Dict[Hash32, bytes]) -> None:
+        self._start_batch()
+        self._trie_data.update(trie_data_dict)
+        await self._flush_if_full()
+
+    async def add_blocks(self, blocks: List[BaseBlock]) -> None:
+        self._start_batch()
+        self._blocks.extend(blocks)
+        await self._flush_if_full()
+
+    async def flush(self) -> None:
+        """
+        Persist everything that was added so far, in a single atomic batch.
+        """
+        async with self._flush_lock:
+            if self.pending_items == 0:
+                return
+
+            trie_data, self._trie_data = self._trie_data, {}
+            blocks, self._blocks = self._blocks, []
+            self._batch_age = None
+
+            timer = Timer()
+            await self.wait(self.db.coro_persist_trie_data_and_blocks(trie_data, tuple(blocks)))
+            latency = timer.elapsed
+
+            self.logger.debug2(
+                "Flushed %d trie nodes and %d blocks in %.3fs",
+                len(trie_data),
+                len(blocks),
+                latency,
+            )
+            if self._on_flush is not None:
+                self._on_flush(len(trie_data) + len(blocks), latency)
+
+    def _start_batch(self) -> None:
+        if self._batch_age is None:
+            self._batch_age = Timer()
+
+    async def _flush_if_full(self) -> None:
+        # Waiting for the flush here, rather than in the background, applies back-pressure
+        # to the downloads when the DB cannot keep up.
+        if self.pending_items >= self._batch_size_target:
+            await self.flush()
+
+    async def _run(self) -> None:
+        while self.is_operational:
+            if self._batch_age is not None and self._batch_age.elapsed >= self._max_delay:
+                await self.flush()
+                continue
+            elif self._batch_age is not None:
+                await self.sleep(self._max_delay - self._batch_age.elapsed)
+            else:
+                await self.sleep(self._max_delay)
@@ -0,0 +1,264 @@
+from abc import (
+    ABC,
+    abstractmethod,
+)
+import asyncio
+from pathlib import Path
+import sqlite3
+import time
+from typing import (
+    Dict,
+    List,
+    Optional,
+)
+
+import rlp
+
+from eth_hash.auto import keccak
+from eth_typing import (
+    Address,
+    Hash32,
+)
+
+from eth.constants import EMPTY_SHA3
+from eth.db.header import BaseHeaderDB
+from eth.exceptions import HeaderNotFound
+from eth.rlp.accounts import Account
+from eth.rlp.headers import BlockHeader
+from eth.rlp.receipts import Receipt
+
+from trinity._utils.logging import HasExtendedDebugLogger
+from trinity.rlp.block_body import BlockBody
+
+from .constants import (
+    LIGHT_CACHE_EVICTION_FRACTION,
+    LIGHT_CACHE_FLUSH_INTERVAL,
+    LIGHT_CACHE_MAX_SIZE,
+)
+from .service import BaseLightPeerChain
+
+
+class BaseLightCache(ABC):
+    """
+    Key-value store of the data that a light node fetched and verified, which never changes once
+    it is known under its key.
+    """
+    @abstractmethod
+    def get(self, key: bytes) -> Optional[bytes]:
+        pass
+
+    @abstractmethod
+    def set(self, key: bytes, value: bytes) -> None:
+        pass
+
+
+class SQLiteLightCache(BaseLightCache, HasExtendedDebugLogger):
+    """
+    Keep up to ``max_size`` bytes of values in a SQLite database, evicting the least recently used
+    ones. Several processes may use the same database at once.
+
+    New values and usage times are kept in memory, and written to the database at most every
+    ``flush_interval`` seconds, before evicting entries, and on :meth:`close`. When a ``loop`` is
+    given, they are also written ``flush_interval`` seconds after they were added, even if the
+    cache is not used in the meantime.
+    """
+    def __init__(self,
+                 path: Path,
+                 max_size: int = LIGHT_CACHE_MAX_SIZE,
+                 flush_interval: float = LIGHT_CACHE_FLUSH_INTERVAL,
+                 loop: asyncio.AbstractEventLoop = None) -> None:
+        self.path = path
+        self._max_size = max_size
+        self._flush_interval = flush_interval
+        self._loop = loop
+        self._flush_handle: asyncio.TimerHandle = None
+        self._pending_values: Dict[bytes, bytes] = {}
+        self._pending_last_used: Dict[bytes, float] = {}
+        self._last_flush = time.monotonic()
+
+        # python 3.6 does not support sqlite3.connect(Path)
+        self.db = sqlite3.connect(str(self.path))
+        with self.db:
+            self.db.execute('''
+                CREATE TABLE IF NOT EXISTS light_cache (
+                    key BLOB PRIMARY KEY,
+                    value BLOB NOT NULL,
+                    last_used REAL NOT NULL
+                )
+            ''')
+            self.db.execute(
+                'CREATE INDEX IF NOT EXISTS light_cache_last_used ON light_cache (last_used)'
+            )
+        self._size = self._get_size()
+
+    def __str__(self) -> str:
+        return f'<SQLiteLightCache({self.path})>'
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        value = self._pending_values.get(key)
+        if value is None:
+            row = self.db.execute(
+                'SELECT value FROM light_cache WHERE key = ?',
+                (key, ),
+            ).fetchone()
+            if row is None:
+                return None
+            value = row[0]
+
+        self._pending_last_used[key] = time.time()
+        self._flush_if_due()
+        return value
+
+    def set(self, key: bytes, value: bytes) -> None:
+        self._pending_values[key] = value
+        self._pending_last_used[key] = time.time()
+        self._size += len(value)
+        if self._size > self._max_size:
+            self._evict()
+        else:
+            self._flush_if_due()
+
+    def flush(self) -> None:
+        """
+        Write the new values and usage times kept in memory to the database, in one transaction.
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        with self.db:
+            self.db.executemany(
+                'INSERT OR REPLACE INTO light_cache (key, value, last_used) VALUES (?, ?, ?)',
+                (
+                    (key, value, self._pending_last_used[key])
+                    for key, value in self._pending_values.items()
+                ),
+            )
+            self.db.executemany(
+                'UPDATE light_cache SET last_used = ? WHERE key = ?',
+                (
+                    (last_used, key)
+                    for key, last_used in self._pending_last_used.items()
+                    if key not in self._pending_values
+                ),
+            )
+        self._pending_values.clear()
+        self._pending_last_used.clear()
+        self._last_flush = time.monotonic()
+
+    def _flush_if_due(self) -> None:
+        if time.monotonic() - self._last_flush >= self._flush_interval:
+            self.flush()
+        elif self._loop is not None and self._flush_handle is None:
+            self._flush_handle = self._loop.call_later(self._flush_interval, self.flush)
+
+    def _get_size(self) -> int:
+        return int(self.db.execute('SELECT total(length(value)) FROM light_cache').fetchone()[0])
+
+    def _evict(self) -> None:
+        self.flush()
+        # Other processes add to the same database, so the tracked size is only an estimate
+        self._size = self._get_size()
+        size_to_free = self._size - int(self._max_size * (1 - LIGHT_CACHE_EVICTION_FRACTION))
+        if size_to_free <= 0:
+            return
+
+        evicted_keys: List[bytes] = []
+        cursor = self.db.execute(
+            'SELECT key, length(value) FROM light_cache ORDER BY last_used ASC'
+        )
+        for key, size in cursor:
+            evicted_keys.append(key)
+            size_to_free -= size
+            self._size -= size
+            if size_to_free <= 0:
+                break
+        cursor.close()
+
+        with self.db:
+            self.db.executemany(
+                'DELETE FROM light_cache WHERE key = ?',
+                ((key, ) for key in evicted_keys),
+            )
+        self.logger.debug2("Evicted %d entries from %s", len(evicted_keys), self)
+
+    def close(self) -> None:
+        self.flush()
+        self.db.close()
+
+
+class MemoryLightCache(SQLiteLightCache):
+    def __init__(self,
+                 max_size: int = LIGHT_CACHE_MAX_SIZE,
+                 flush_interval: float = LIGHT_CACHE_FLUSH_INTERVAL,
+                 loop: asyncio.AbstractEventLoop = None) -> None:
+        super().__init__(Path(":memory:"), max_size, flush_interval, loop)
+
+    def __str__(self) -> str:
+        return '<MemoryLightCache()>'
+
+
+def _get_account_key(state_root: Hash32, address: Address) -> bytes:
+    return b'account:' + state_root + address
+
+
+def _get_code_key(code_hash: Hash32) -> bytes:
+    return b'code:' + code_hash
+
+
+class CachingLightPeerChain(BaseLightPeerChain):
+    """
+    Serve accounts and contract codes from a :class:`BaseLightCache`, only fetching the missing
+    ones from ``peer_chain``.
+
+    Accounts are cached by the state root and the address, and codes by their hash, so that the
+    same code is never downloaded twice, even for different contracts or blocks.
+    """
+    def __init__(self,
+                 peer_chain: BaseLightPeerChain,
+                 cache: BaseLightCache,
+                 headerdb: BaseHeaderDB) -> None:
+        self._peer_chain = peer_chain
+        self._cache = cache
+        self._headerdb = headerdb
+
+    async def coro_get_block_header_by_hash(self, block_hash: Hash32) -> BlockHeader:
+        return await self._peer_chain.coro_get_block_header_by_hash(block_hash)
+
+    async def coro_get_block_body_by_hash(self, block_hash: Hash32) -> BlockBody:
+        return await self._peer_chain.coro_get_block_body_by_hash(block_hash)
+
+    async def coro_get_receipts(self, block_hash: Hash32) -> List[Receipt]:
+        return await self._peer_chain.coro_get_receipts(block_hash)
+
+    async def coro_get_account(self, block_hash: Hash32, address: Address) -> Account:
+        header = await self._get_header(block_hash)
+        key = _get_account_key(header.state_root, address)
+        encoded_account = self._cache.get(key)
+        if encoded_account is not None:
+            return rlp.decode(encoded_account, sedes=Account)
+
+        account = await self._peer_chain.coro_get_account(block_hash, address)
+        self._cache.set(key, rlp.encode(account))
+        return account
+
+    async def coro_get_contract_code(self, block_hash: Hash32, address: Address) -> bytes:
+        account = await self.coro_get_account(block_hash, address)
+        if account.code_hash == EMPTY_SHA3:
+            return b''
+
+        key = _get_code_key(account.code_hash)
+        code = self._cache.get(key)
+        if code is not None:
+            return code
+
+        code = await self._peer_chain.coro_get_contract_code(block_hash, address)
+        if keccak(code) == account.code_hash:
+            self._cache.set(key, code)
+        return code
+
+    async def _get_header(self, block_hash: Hash32) -> BlockHeader:
+        try:
+            return self._headerdb.get_block_header_by_hash(block_hash)
+        except HeaderNotFound:
+            return await self._peer_chain.coro_get_block_header_by_hash(block_hash)
@@ -0,0 +1,113 @@
+import asyncio
+import collections
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+from trinity.protocol.les.peer import LESPeer
+
+
+TItem = TypeVar('TItem', bound=Hashable)
+TResult = TypeVar('TResult')
+
+
+class RequestCoalescer(Generic[TItem, TResult]):
+    """
+    Merge the requests of one kind which concurrent callers make to the same peer, during the same
+    iteration of the event loop, into a single LES request of up to ``max_items`` items. Callers
+    asking for the same item share its result.
+
+    ``send_batch`` makes the request for some items to a peer, and returns their results in the
+    same order. Peers may leave out the items they don't have: those get ``missing_result``.
+
+    Batches are sent in the background through ``run_task``, usually the one of the service making
+    the requests, so that they are cancelled along with it.
+    """
+    def __init__(self,
+                 max_items: int,
+                 send_batch: Callable[[LESPeer, Tuple[TItem, ...]], Awaitable[Sequence[TResult]]],
+                 missing_result: TResult,
+                 run_task: Callable[[Awaitable[Any]], Any]) -> None:
+        self._max_items = max_items
+        self._send_batch = send_batch
+        self._missing_result = missing_result
+        self._run_task = run_task
+        # The batch of each peer which still accepts new items
+        self._open_batches: Dict[LESPeer, Dict[TItem, 'asyncio.Future[TResult]']] = {}
+        # The number of batches of each peer which are not answered yet
+        self._num_batches: Dict[LESPeer, int] = collections.Counter()
+
+    def choose_peer(self, peers: Sequence[LESPeer]) -> LESPeer:
+        """
+        Pick which of ``peers`` should get the next request: one which has an open batch to add it
+        to, or else the one with the fewest batches in flight, so that big bursts of requests are
+        spread over all of them.
+        """
+        for peer in peers:
+            if peer in self._open_batches:
+                return peer
+        return min(peers, key=self._num_batches.__getitem__)
+
+    async def request(self, peer: LESPeer, item: TItem) -> TResult:
+        batch = self._open_batches.get(peer)
+        if batch is None:
+            batch = {}
+            self._open_batches[peer] = batch
+            self._num_batches[peer] += 1
+            # The batch is sent in the next iteration of the event loop, so that all the requests
+            # of this one end up in it
+            self._run_task(self._send(peer, batch))
+
+        if item not in batch:
+            batch[item] = asyncio.Future()
+            if len(batch) >= self._max_items:
+                del self._open_batches[peer]
+
+        # Shielded, so that a cancelled caller doesn't cancel the result for the others
+        return await asyncio.shield(batch[item])
+
+    async def _send(self, peer: LESPeer, batch: Dict[TItem, 'asyncio.Future[TResult]']) -> None:
+        if self._open_batches.get(peer) is batch:
+            del self._open_batches[peer]
+        items = tuple(batch)
+        try:
+            results = await self._get_results(peer, items)
+        except Exception as exc:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(exc)
+        else:
+            for item, result in zip(items, results):
+                if not batch[item].done():
+                    batch[item].set_result(result)
+        finally:
+            self._num_batches[peer] -= 1
+            if not self._num_batches[peer]:
+                del self._num_batches[peer]
+            for future in batch.values():
+                future.cancel()
+
+    async def _get_results(self, peer: LESPeer, items: Tuple[TItem, ...]) -> Tuple[TResult, ...]:
+        results = await self._send_batch(peer, items)
+        if len(results) == len(items):
+            return tuple(results)
+        elif len(items) == 1:
+            return (self._missing_result, )
+
+        # The results which the peer left out can't be told apart any more, so ask for each item
+        # on its own instead
+        single_results = await asyncio.gather(*(
+            self._send_batch(peer, (item, )) for item in items
+        ))
+        return tuple(
+            results[0] if results else self._missing_result
+            for results in single_results
+        )
@@ -0,0 +1,11 @@
+# Most bytes of contract code and accounts to keep in the on-disk cache of a light node, before
+# evicting the least recently used entries
+LIGHT_CACHE_MAX_SIZE = 64 * 1024 * 1024
+
+# When the on-disk cache is full, how much of it to free at once, so that a full cache doesn't
+# have to evict entries on every new one
+LIGHT_CACHE_EVICTION_FRACTION = 0.1
+
+# Most seconds between writes of the light node cache to disk. New entries and usage times are
+# kept in memory in the meantime, instead of committing on every cache access.
+LIGHT_CACHE_FLUSH_INTERVAL = 5
@@ -13,6 +13,8 @@ from typing import (
     Dict,
     List,
     FrozenSet,
+    Sequence,
+    Tuple,
     Type,
 )
 
@@ -67,9 +69,24 @@ from p2p.service import (
 )
 
 from trinity.db.eth1.header import BaseAsyncHeaderDB
+from trinity.protocol.les import commands
+from trinity.protocol.les.constants import (
+    MAX_BODIES_FETCH,
+    MAX_CODE_FETCH,
+    MAX_PROOFS_FETCH,
+    MAX_RECEIPTS_FETCH,
+)
 from trinity.protocol.les.peer import LESPeer, LESPeerPool
 from trinity.rlp.block_body import BlockBody
 
+from .coalescer import RequestCoalescer
+
+
+# What a proof request asks for: its block hash, account key, key and from level
+ProofRequestItem = Tuple[Hash32, bytes, bytes, int]
+# What a contract code request asks for: its block hash and account key
+CodeRequestItem = Tuple[Hash32, bytes]
+
 
 class BaseLightPeerChain(ABC):
 
@@ -95,6 +112,13 @@ class BaseLightPeerChain(ABC):
 
 
 class LightPeerChain(PeerSubscriber, BaseService, BaseLightPeerChain):
+    """
+    Fetch chain data on demand from LES peers.
+
+    Concurrent requests for proofs, contract codes, receipts or block bodies are coalesced into
+    multi-item requests, spread over all the peers with the highest total difficulty. With
+    ``prefetch_bodies``, the body of each announced block is fetched ahead of time.
+    """
     reply_timeout = REPLY_TIMEOUT
     headerdb: BaseAsyncHeaderDB = None
 
@@ -102,13 +126,40 @@ class LightPeerChain(PeerSubscriber, BaseService, BaseLightPeerChain):
             self,
             headerdb: BaseAsyncHeaderDB,
             peer_pool: LESPeerPool,
-            token: CancelToken = None) -> None:
+            token: CancelToken = None,
+            prefetch_bodies: bool = False) -> None:
         PeerSubscriber.__init__(self)
         BaseService.__init__(self, token)
         self.headerdb = headerdb
         self.peer_pool = peer_pool
+        self._prefetch_bodies = prefetch_bodies
         self._pending_replies: Dict[int, Callable[[protocol._DecodedMsgType], None]] = {}
 
+        self._proofs: RequestCoalescer[ProofRequestItem, Sequence[bytes]] = RequestCoalescer(
+            MAX_PROOFS_FETCH,
+            self._send_get_proofs,
+            missing_result=(),
+            run_task=self.run_task,
+        )
+        self._codes: RequestCoalescer[CodeRequestItem, bytes] = RequestCoalescer(
+            MAX_CODE_FETCH,
+            self._send_get_contract_codes,
+            missing_result=b'',
+            run_task=self.run_task,
+        )
+        self._receipts: RequestCoalescer[Hash32, List[Receipt]] = RequestCoalescer(
+            MAX_RECEIPTS_FETCH,
+            self._send_get_receipts,
+            missing_result=None,
+            run_task=self.run_task,
+        )
+        self._bodies: RequestCoalescer[Hash32, BlockBody] = RequestCoalescer(
+            MAX_BODIES_FETCH,
+            self._send_get_block_bodies,
+            missing_result=None,
+            run_task=self.run_task,
+        )
+
     # TODO: be more specific about what messages we want.
     subscription_msg_types: FrozenSet[Type[Command]] = frozenset({Command})
 
@@ -120,7 +171,10 @@ class LightPeerChain(PeerSubscriber, BaseService, BaseLightPeerChain):
         with self.subscribe(self.peer_pool):
             while self.is_operational:
                 peer, cmd, msg = await self.wait(self.msg_queue.get())
-                if isinstance(msg, dict):
+                if isinstance(cmd, commands.Announce) and self._prefetch_bodies:
+                    head_hash = cast(Dict[str, Any], msg)['head_hash']
+                    self.run_task(self._prefetch_block_body(head_hash))
+                elif isinstance(msg, dict):
                     request_id = msg.get('request_id')
                     # request_id can be None here because not all LES messages include one. For
                     # instance, the Announce msg doesn't.
@@ -164,26 +218,34 @@ class LightPeerChain(PeerSubscriber, BaseService, BaseLightPeerChain):
     @alru_cache(maxsize=1024, cache_exceptions=False)
     @service_timeout(COMPLETION_TIMEOUT)
     async def coro_get_block_body_by_hash(self, block_hash: Hash32) -> BlockBody:
-        peer = cast(LESPeer, self.peer_pool.highest_td_peer)
+        peer = self._choose_peer(self._bodies)
         self.logger.debug("Fetching block %s from %s", encode_hex(block_hash), peer)
-        request_id = peer.sub_proto.send_get_block_bodies([block_hash])
-        reply = await self._wait_for_reply(request_id)
-        if not reply['bodies']:
+        body = await self._bodies.request(peer, block_hash)
+        if body is None:
             raise BlockNotFound(f"Peer {peer} has no block with hash {block_hash}")
-        return reply['bodies'][0]
+        return body
+
+    async def _prefetch_block_body(self, block_hash: Hash32) -> None:
+        try:
+            await self.coro_get_block_body_by_hash(block_hash)
+        except (BlockNotFound, NoEligiblePeers, TimeoutError) as exc:
+            self.logger.debug(
+                "Could not prefetch body of announced block %s: %s",
+                encode_hex(block_hash),
+                exc,
+            )
 
     # TODO add a get_receipts() method to BaseChain API, and dispatch to this, as needed
 
     @alru_cache(maxsize=1024, cache_exceptions=False)
     @service_timeout(COMPLETION_TIMEOUT)
     async def coro_get_receipts(self, block_hash: Hash32) -> List[Receipt]:
-        peer = cast(LESPeer, self.peer_pool.highest_td_peer)
+        peer = self._choose_peer(self._receipts)
         self.logger.debug("Fetching %s receipts from %s", encode_hex(block_hash), peer)
-        request_id = peer.sub_proto.send_get_receipts(block_hash)
-        reply = await self._wait_for_reply(request_id)
-        if not reply['receipts']:
+        receipts = await self._receipts.request(peer, block_hash)
+        if receipts is None:
             raise BlockNotFound(f"No block with hash {block_hash} found")
-        return reply['receipts'][0]
+        return receipts
 
     # TODO implement AccountDB exceptions that provide the info needed to
     # request accounts and code (and storage?)
@@ -192,7 +254,8 @@ class LightPeerChain(PeerSubscriber, BaseService, BaseLightPeerChain):
     @service_timeout(COMPLETION_TIMEOUT)
     async def coro_get_account(self, block_hash: Hash32, address: Address) -> Account:
         return await self._retry_on_bad_response(
-            partial(self._get_account_from_peer, block_hash, address)
+            partial(self._get_account_from_peer, block_hash, address),
+            self._proofs,
         )
 
     async def _get_account_from_peer(
@@ -201,8 +264,10 @@ class LightPeerChain(PeerSubscriber, BaseService, BaseLightPeerChain):
             address: Address,
             peer: LESPeer) -> Account:
         key = keccak(address)
+        # The header is looked up first, so that the proof requests of concurrent calls for the
+        # same block resume at the same time, and get coalesced
+        header = await self.coro_get_block_header_by_hash(block_hash)
         proof = await self._get_proof(peer, block_hash, account_key=b'', key=key)
-        header = await self._get_block_header_by_hash(block_hash, peer)
         try:
             rlp_account = HexaryTrie.get_from_proof(header.state_root, key, proof)
         except BadTrieProof as exc:
@@ -235,7 +300,8 @@ class LightPeerChain(PeerSubscriber, BaseService, BaseLightPeerChain):
         code_hash = account.code_hash
 
         return await self._retry_on_bad_response(
-            partial(self._get_contract_code_from_peer, block_hash, address, code_hash)
+            partial(self._get_contract_code_from_peer, block_hash, address, code_hash),
+            self._codes,
         )
 
     async def _get_contract_code_from_peer(
@@ -250,14 +316,7 @@ class LightPeerChain(PeerSubscriber, BaseService, BaseLightPeerChain):
         :raise BadLESResponse: if the peer replies with contract code that does not match the
             account's code hash
         """
-        # request contract code
-        request_id = peer.sub_proto.send_get_contract_code(block_hash, keccak(address))
-        reply = await self._wait_for_reply(request_id)
-
-        if not reply['codes']:
-            bytecode = b''
-        else:
-            bytecode = reply['codes'][0]
+        bytecode = await self._codes.request(peer, (block_hash, keccak(address)))
 
         # validate bytecode against a proven account
         if code_hash == keccak(bytecode):
@@ -362,28 +421,82 @@ class LightPeerChain(PeerSubscriber, BaseService, BaseLightPeerChain):
 
     async def _get_proof(self,
                          peer: LESPeer,
-                         block_hash: bytes,
+                         block_hash: Hash32,
                          account_key: bytes,
                          key: bytes,
-                         from_level: int = 0) -> List[bytes]:
-        request_id = peer.sub_proto.send_get_proof(block_hash, account_key, key, from_level)
+                         from_level: int = 0) -> Sequence[bytes]:
+        return await self._proofs.request(peer, (block_hash, account_key, key, from_level))
+
+    async def _send_get_proofs(
+            self,
+            peer: LESPeer,
+            items: Tuple[ProofRequestItem, ...]) -> Tuple[Sequence[bytes], ...]:
+        request_id = peer.sub_proto.send_get_proofs(
+            [commands.ProofRequest(*item) for item in items]
+        )
+        reply = await self._wait_for_reply(request_id)
+        # The proofs of all the items come as a single set of trie nodes, which proves each of them
+        return (reply['proof'], ) * len(items)
+
+    async def _send_get_contract_codes(
+            self,
+            peer: LESPeer,
+            items: Tuple[CodeRequestItem, ...]) -> Sequence[bytes]:
+        request_id = peer.sub_proto.send_get_contract_codes(
+            [commands.ContractCodeRequest(*item) for item in items]
+        )
+        reply = await self._wait_for_reply(request_id)
+        return reply['codes']
+
+    async def _send_get_receipts(
+            self,
+            peer: LESPeer,
+            block_hashes: Tuple[Hash32, ...]) -> Sequence[List[Receipt]]:
+        request_id = peer.sub_proto.send_get_receipts(block_hashes)
+        reply = await self._wait_for_reply(request_id)
+        return reply['receipts']
+
+    async def _send_get_block_bodies(
+            self,
+            peer: LESPeer,
+            block_hashes: Tuple[Hash32, ...]) -> Sequence[BlockBody]:
+        request_id = peer.sub_proto.send_get_block_bodies(list(block_hashes))
         reply = await self._wait_for_reply(request_id)
-        return reply['proof']
+        return reply['bodies']
+
+    def _choose_peer(self, coalescer: RequestCoalescer[Any, Any] = None) -> LESPeer:
+        """
+        Pick a peer with the highest total difficulty, the one which the coalesced requests of
+        ``coalescer`` should go to, if given.
+
+        :raise NoEligiblePeers: if no peers are connected
+        """
+        try:
+            best_peer = cast(LESPeer, self.peer_pool.highest_td_peer)
+        except NoConnectedPeers as exc:
+            raise NoEligiblePeers() from exc
+
+        if coalescer is None:
+            return best_peer
+        else:
+            best_peers = cast(List[LESPeer], self.peer_pool.get_peers(best_peer.head_td))
+            return coalescer.choose_peer(best_peers)
 
-    async def _retry_on_bad_response(self, make_request_to_peer: Callable[[LESPeer], Any]) -> Any:
+    async def _retry_on_bad_response(
+            self,
+            make_request_to_peer: Callable[[LESPeer], Any],
+            coalescer: RequestCoalescer[Any, Any] = None) -> Any:
         """
         Make a call to a peer. If it behaves badly, drop it and retry with a different peer.
 
         :param make_request_to_peer: an abstract call to a peer that may raise a BadLESResponse
+        :param coalescer: the coalescer of the requests that the call makes, if any
 
         :raise NoEligiblePeers: if no peers are available to fulfill the request
         :raise TimeoutError: if an individual request or the overall process times out
         """
         for _ in range(MAX_REQUEST_ATTEMPTS):
-            try:
-                peer = cast(LESPeer, self.peer_pool.highest_td_peer)
-            except NoConnectedPeers as exc:
-                raise NoEligiblePeers() from exc
+            peer = self._choose_peer(coalescer)
 
             try:
                 return await make_request_to_peer(peer)